@@ -20,12 +20,18 @@ from app.core.config import settings
 from app.models import (  # noqa: F401
     Fichaje,
     FichajeStatus,
+    Job,
+    JobStatus,
+    RevokedToken,
     Solicitud,
     SolicitudStatus,
     SolicitudTipo,
     User,
     UserRole,
+    VacationRollover,
+    VacationRolloverEntry,
 )
+from app.repositories.partitions import is_partition_name
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -45,6 +51,17 @@ if config.config_file_name is not None:
 
 target_metadata = SQLModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:  # noqa: ARG001
+    """
+    Excluye del autogenerate las particiones de fichaje (PostgreSQL).
+
+    Las crea la migración de particionado y el trabajo `fichajes.partitions`;
+    no están en los modelos, así que sin este filtro se propondría borrarlas.
+    """
+    return not (type_ == "table" and reflected and is_partition_name("fichaje", name))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -70,6 +87,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
         render_as_batch=True,  # Para SQLite
     )
 
@@ -88,6 +106,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
         render_as_batch=True,  # Para SQLite
     )
 
@@ -0,0 +1,53 @@
+"""add_revoked_token_table
+
+Revision ID: 5b7e2c41d9a3
+Revises: e6241f909849
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2c41d9a3"
+down_revision: Union[str, Sequence[str], None] = "e6241f909849"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table("revoked_token",
+    sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("jti", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=False),
+    sa.Column("token_type", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+    sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(["user_id"], ["user.id"], ),
+    sa.PrimaryKeyConstraint("id")
+    )
+    with op.batch_alter_table("revoked_token", schema=None) as batch_op:
+        batch_op.create_index("ix_revoked_token_created_at", ["created_at"], unique=False)
+        batch_op.create_index(batch_op.f("ix_revoked_token_expires_at"), ["expires_at"], unique=False)
+        batch_op.create_index(batch_op.f("ix_revoked_token_id"), ["id"], unique=False)
+        batch_op.create_index(batch_op.f("ix_revoked_token_jti"), ["jti"], unique=True)
+        batch_op.create_index(batch_op.f("ix_revoked_token_user_id"), ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("revoked_token", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_revoked_token_user_id"))
+        batch_op.drop_index(batch_op.f("ix_revoked_token_jti"))
+        batch_op.drop_index(batch_op.f("ix_revoked_token_id"))
+        batch_op.drop_index(batch_op.f("ix_revoked_token_expires_at"))
+        batch_op.drop_index("ix_revoked_token_created_at")
+
+    op.drop_table("revoked_token")
@@ -0,0 +1,64 @@
+"""add_job_table
+
+Revision ID: 8c3f1a7d2e54
+Revises: 5b7e2c41d9a3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3f1a7d2e54"
+down_revision: Union[str, Sequence[str], None] = "5b7e2c41d9a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table("job",
+    sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column("payload", sa.JSON(), nullable=False),
+    sa.Column("status", sa.Enum("PENDING", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED", name="jobstatus"), nullable=False),
+    sa.Column("progress", sa.Float(), nullable=False),
+    sa.Column("progress_message", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column("result", sa.JSON(), nullable=True),
+    sa.Column("error", sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+    sa.Column("attempts", sa.Integer(), nullable=False),
+    sa.Column("max_attempts", sa.Integer(), nullable=False),
+    sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+    sa.Column("worker_id", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True),
+    sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("created_by", sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(["created_by"], ["user.id"], ),
+    sa.PrimaryKeyConstraint("id")
+    )
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_job_created_by"), ["created_by"], unique=False)
+        batch_op.create_index(batch_op.f("ix_job_id"), ["id"], unique=False)
+        batch_op.create_index(batch_op.f("ix_job_kind"), ["kind"], unique=False)
+        batch_op.create_index("ix_job_status_run_after", ["status", "run_after"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.drop_index("ix_job_status_run_after")
+        batch_op.drop_index(batch_op.f("ix_job_kind"))
+        batch_op.drop_index(batch_op.f("ix_job_id"))
+        batch_op.drop_index(batch_op.f("ix_job_created_by"))
+
+    op.drop_table("job")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
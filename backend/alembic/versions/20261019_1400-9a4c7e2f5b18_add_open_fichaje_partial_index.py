@@ -0,0 +1,37 @@
+"""add_open_fichaje_partial_index
+
+Revision ID: 9a4c7e2f5b18
+Revises: 6e2d9b4a1f07
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c7e2f5b18"
+down_revision: Union[str, Sequence[str], None] = "6e2d9b4a1f07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice parcial de los fichajes abiertos (censo de presencia)
+    op.create_index(
+        "ix_fichaje_open_user_id",
+        "fichaje",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("check_out IS NULL"),
+        sqlite_where=sa.text("check_out IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fichaje_open_user_id", table_name="fichaje")
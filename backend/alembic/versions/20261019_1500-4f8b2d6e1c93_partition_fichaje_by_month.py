@@ -0,0 +1,106 @@
+"""partition_fichaje_by_month
+
+Revision ID: 4f8b2d6e1c93
+Revises: 9a4c7e2f5b18
+Create Date: 2026-10-19 15:00:00.000000
+
+Solo PostgreSQL: convierte `fichaje` en una tabla particionada por mes de
+`check_in` (una partición por mes desde el primer fichaje hasta
+FUTURE_MONTHS meses después del actual, más `fichaje_default`). La clave
+primaria pasa a ser (id, check_in), como exige PostgreSQL; el id sigue
+saliendo de la misma secuencia. Copia todos los fichajes con la tabla
+bloqueada: hay que aplicarla en una ventana de mantenimiento.
+
+En SQLite no hace nada.
+"""
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8b2d6e1c93"
+down_revision: Union[str, Sequence[str], None] = "9a4c7e2f5b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses futuros creados por la migración (después los crea fichajes.partitions)
+FUTURE_MONTHS = 3
+
+OPEN = sa.text("check_out IS NULL")
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _copy_table(source: str, partition_by: str = "") -> None:
+    """Sustituye `fichaje` por una copia (vacía) con las mismas columnas y defaults."""
+    op.execute(f"ALTER TABLE fichaje RENAME TO {source}")
+    op.execute(f"CREATE TABLE fichaje (LIKE {source} INCLUDING DEFAULTS) {partition_by}")
+
+
+def _fill_and_index(source: str, primary_key: list[str]) -> None:
+    """Copia las filas, traspasa la secuencia del id y recrea índices y claves."""
+    op.execute(f"INSERT INTO fichaje SELECT * FROM {source}")
+    op.execute("ALTER SEQUENCE fichaje_id_seq OWNED BY fichaje.id")
+    op.drop_table(source)
+
+    op.create_primary_key("fichaje_pkey", "fichaje", primary_key)
+    op.create_index("ix_fichaje_check_in", "fichaje", ["check_in"], unique=False)
+    op.create_index("ix_fichaje_check_out", "fichaje", ["check_out"], unique=False)
+    op.create_index("ix_fichaje_id", "fichaje", ["id"], unique=False)
+    op.create_index("ix_fichaje_user_id", "fichaje", ["user_id"], unique=False)
+    op.create_index(
+        "ix_fichaje_open_user_id", "fichaje", ["user_id"], unique=False, postgresql_where=OPEN
+    )
+    op.create_foreign_key("fichaje_user_id_fkey", "fichaje", "user", ["user_id"], ["id"])
+    op.create_foreign_key("fichaje_approved_by_fkey", "fichaje", "user", ["approved_by"], ["id"])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    _copy_table("fichaje_unpartitioned", "PARTITION BY RANGE (check_in)")
+
+    # Un mes por partición desde el primer fichaje; el resto, en la de por defecto
+    first = bind.execute(sa.text("SELECT min(check_in) FROM fichaje_unpartitioned")).scalar()
+    current = datetime.now(UTC).date().replace(day=1)
+    if first is None:
+        month = current
+    elif first.tzinfo is None:
+        # Columna sin zona horaria: las fechas ya están en UTC
+        month = first.date().replace(day=1)
+    else:
+        month = first.astimezone(UTC).date().replace(day=1)
+    while month <= _add_months(current, FUTURE_MONTHS):
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE fichaje_y{month.year:04d}m{month.month:02d} PARTITION OF fichaje "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(following)})"
+        )
+        month = following
+    op.execute("CREATE TABLE fichaje_default PARTITION OF fichaje DEFAULT")
+
+    _fill_and_index("fichaje_unpartitioned", ["id", "check_in"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Al borrar la tabla particionada se borran también sus particiones
+    _copy_table("fichaje_partitioned")
+    _fill_and_index("fichaje_partitioned", ["id"])
@@ -9,11 +9,17 @@ from app.api.dependencies.auth import (
     get_current_user,
     require_hr,
 )
+from app.api.dependencies.database import ReadSessionDep, get_read_session
+from app.api.dependencies.preconditions import IfMatch, get_if_match
 
 __all__ = [
     "CurrentHR",
     "CurrentUser",
+    "IfMatch",
+    "ReadSessionDep",
     "get_current_active_user",
     "get_current_user",
+    "get_if_match",
+    "get_read_session",
     "require_hr",
 ]
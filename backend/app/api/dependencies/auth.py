@@ -12,8 +12,9 @@ from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.security import HTTPBearer as FastAPIHTTPBearer
 
 from app.core.exceptions import AuthenticationException
-from app.core.security import decode_token
-from app.database import SessionDep
+from app.core.revocation import RevocationStore, get_revocation_store
+from app.core.security import REFRESH_TOKEN_TYPE, decode_token
+from app.database import SESSION_USER_ID_KEY, SessionDep
 from app.models.user import User, UserRole
 from app.services.user_service import UserService
 
@@ -49,14 +50,20 @@ security = HTTPBearer()
 
 
 async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)], session: SessionDep
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    session: SessionDep,
+    store: Annotated[RevocationStore, Depends(get_revocation_store)],
 ) -> User:
     """
     Obtiene el usuario actual desde el token JWT.
 
+    Los refresh tokens no se aceptan como tokens de acceso. La comprobación
+    de revocación se resuelve en memoria para los tokens no revocados.
+
     Args:
         credentials: Credenciales HTTP Bearer (token)
         session: Sesión de base de datos
+        store: Almacén de revocaciones
 
     Returns:
         User: Usuario autenticado
@@ -69,13 +76,21 @@ async def get_current_user(
         payload = decode_token(credentials.credentials)
         user_id: int | None = payload.get("sub")
 
-        if user_id is None:
+        if user_id is None or payload.get("type") == REFRESH_TOKEN_TYPE:
             raise HTTPException(  # noqa: TRY301
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token inválido",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        jti = payload.get("jti")
+        if jti is not None and await store.is_revoked(session, jti):
+            raise HTTPException(  # noqa: TRY301
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revocado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
         # Obtener usuario
         user_service = UserService(session)
         user = await user_service.get_user_by_id(int(user_id))
@@ -89,6 +104,8 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Identifica al autor de las escrituras de la sesión (read-your-writes)
+        session.info[SESSION_USER_ID_KEY] = user.id
         return user
 
     except jwt.ExpiredSignatureError as exc:
@@ -0,0 +1,50 @@
+"""
+Dependencies de base de datos.
+
+Sesión de lectura que enruta a una réplica cuando es seguro hacerlo.
+"""
+
+from collections.abc import AsyncGenerator
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import CurrentUser
+from app.database import ReadReplicaRouter, SessionDep, get_read_router
+
+
+async def get_read_session(
+    request: Request,
+    session: SessionDep,
+    current_user: CurrentUser,
+    router: Annotated[ReadReplicaRouter, Depends(get_read_router)],
+) -> AsyncGenerator[AsyncSession]:
+    """
+    Obtiene una sesión para endpoints de solo lectura.
+
+    Usa una réplica si hay alguna configurada, salvo que el usuario haya
+    escrito recientemente (read-your-writes), en cuyo caso reutiliza la
+    sesión del primario de la petición. La escritura se reconoce por la
+    cookie firmada que devolvió la petición que escribió, así que da igual
+    qué worker la atendiera.
+
+    Args:
+        request: Petición en curso (con la cookie de escritura, si la hay)
+        session: Sesión del primario de la petición
+        current_user: Usuario autenticado
+        router: Router de lecturas
+
+    Yields:
+        AsyncSession: Sesión de réplica o del primario
+    """
+    if router.use_primary(current_user.id, request.cookies.get(router.COOKIE_NAME)):
+        yield session
+        return
+
+    async with router.replica_session() as replica_session:
+        yield replica_session
+
+
+# Type hint para dependency injection
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
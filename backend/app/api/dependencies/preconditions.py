@@ -0,0 +1,36 @@
+"""
+Dependencies de precondiciones HTTP.
+
+Cabecera `If-Match` de los endpoints que modifican recursos versionados
+(ver `app.core.versioning`).
+"""
+
+from typing import Annotated
+
+from fastapi import Depends, Header
+
+from app.core.versioning import parse_if_match
+
+
+async def get_if_match(
+    if_match: Annotated[
+        str | None,
+        Header(description="Versión (ETag) del recurso leída por el cliente"),
+    ] = None,
+) -> int | None:
+    """
+    Obtiene la versión esperada de la cabecera `If-Match`.
+
+    Args:
+        if_match: Valor de la cabecera
+
+    Returns:
+        int | None: Versión esperada o None si no se envió
+
+    Raises:
+        BadRequestException: Si la cabecera no contiene una versión
+    """
+    return parse_if_match(if_match)
+
+
+IfMatch = Annotated[int | None, Depends(get_if_match)]
@@ -0,0 +1,37 @@
+"""
+Clases de respuesta HTTP.
+
+`PydanticJSONResponse` serializa directamente con el serializador nativo de
+Pydantic (pydantic-core), sin el paso intermedio de FastAPI que convierte el
+modelo a dict y luego lo codifica con `json.dumps`.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Respuesta JSON renderizada por pydantic-core.
+
+    Si el endpoint devuelve directamente esta respuesta con un modelo ya
+    construido, FastAPI omite la revalidación contra `response_model` y la
+    conversión a dict; el modelo se serializa a bytes en una sola pasada.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serializa el contenido a JSON.
+
+        Args:
+            content: Modelo Pydantic o cualquier valor serializable
+
+        Returns:
+            bytes: JSON codificado en UTF-8
+        """
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
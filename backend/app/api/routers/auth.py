@@ -4,16 +4,23 @@ Router de autenticación.
 Endpoints para login, logout y refresh tokens.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated
 
-from app.api.dependencies.auth import CurrentUser
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.dependencies.auth import CurrentHR, CurrentUser, security
 from app.core.exceptions import AuthenticationException
-from app.core.security import create_access_token
-from app.database import SessionDep
+from app.core.rate_limit import LoginRateLimiter, get_client_ip, get_login_rate_limiter
+from app.core.revocation import RevocationStore, get_revocation_store
+from app.core.security import decode_token, token_service
+from app.database import SessionDep, UnitOfWorkRoute
+from app.schemas.auth import LoginRateLimitMetrics, RefreshTokenRequest
 from app.schemas.user import UserLogin, UserResponse
+from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.post(
@@ -22,24 +29,37 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
     summary="Iniciar sesión",
     description="Autenticar usuario con email y contraseña, devuelve JWT token",
+    responses={status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Demasiados intentos"}},
 )
 async def login(
     credentials: UserLogin,
-    session: SessionDep
+    request: Request,
+    session: SessionDep,
+    store: Annotated[RevocationStore, Depends(get_revocation_store)],
+    limiter: Annotated[LoginRateLimiter, Depends(get_login_rate_limiter)],
 ) -> dict:
     """
     Inicia sesión con email y contraseña.
 
+    Los intentos se limitan por IP y por email antes de consultar la base de
+    datos o verificar la contraseña.
+
     Args:
         credentials: Email y contraseña
+        request: Petición HTTP (IP del cliente)
         session: Sesión de base de datos
+        store: Almacén de revocaciones
+        limiter: Limitador de intentos de login
 
     Returns:
-        dict: Access token y tipo de token
+        dict: Access token, refresh token y tipo de token
 
     Raises:
         HTTPException: Si las credenciales son inválidas
+        RateLimitException: Si se supera el límite de intentos (429)
     """
+    await limiter.check(get_client_ip(request), credentials.email)
+
     try:
         user_service = UserService(session)
         user = await user_service.authenticate_user(
@@ -47,12 +67,11 @@ async def login(
             password=credentials.password
         )
 
-        # Crear access token
-        access_token = create_access_token(data={"sub": str(user.id)})
+        # Crear access token y refresh token
+        tokens = AuthService(session, store).issue_tokens(user)
 
         return {
-            "access_token": access_token,
-            "token_type": "bearer",
+            **tokens,
             "user": UserResponse.model_validate(user)
         }
 
@@ -64,32 +83,146 @@ async def login(
         ) from e
 
 
+@router.post(
+    "/refresh",
+    response_model=dict,
+    status_code=status.HTTP_200_OK,
+    summary="Renovar tokens",
+    description="Cambia un refresh token por un par nuevo; el token usado queda revocado",
+)
+async def refresh(
+    body: RefreshTokenRequest,
+    session: SessionDep,
+    store: Annotated[RevocationStore, Depends(get_revocation_store)],
+) -> dict:
+    """
+    Renueva los tokens con rotación del refresh token.
+
+    Cada refresh token solo se puede usar una vez: reutilizarlo devuelve 401.
+
+    Args:
+        body: Refresh token actual
+        session: Sesión de base de datos
+        store: Almacén de revocaciones
+
+    Returns:
+        dict: Nuevo access token, nuevo refresh token y tipo de token
+
+    Raises:
+        HTTPException: Si el refresh token es inválido, ha expirado o ya se usó
+    """
+    try:
+        user, tokens = await AuthService(session, store).refresh(body.refresh_token)
+    except AuthenticationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=e.message,
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
+    return {
+        **tokens,
+        "user": UserResponse.model_validate(user)
+    }
+
+
 @router.post(
     "/logout",
     status_code=status.HTTP_200_OK,
     summary="Cerrar sesión",
-    description="Cierra la sesión del usuario actual (token invalidation)",
+    description="Cierra la sesión del usuario actual revocando sus tokens en el servidor",
 )
 async def logout(
-    _current_user: CurrentUser
+    _current_user: CurrentUser,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    session: SessionDep,
+    store: Annotated[RevocationStore, Depends(get_revocation_store)],
+    body: RefreshTokenRequest | None = None,
 ) -> dict:
     """
     Cierra la sesión del usuario actual.
 
-    En esta implementación básica, el logout es del lado del cliente
-    (eliminar el token). Para logout del lado del servidor se necesitaría
-    una blacklist de tokens.
+    Revoca el access token de la petición y, si se envía, el refresh token
+    de la sesión: ninguno de los dos se acepta después.
 
     Args:
         _current_user: Usuario actual (no usado pero requerido para auth)
+        credentials: Credenciales HTTP Bearer (token a revocar)
+        session: Sesión de base de datos
+        store: Almacén de revocaciones
+        body: Refresh token de la sesión (opcional)
 
     Returns:
         dict: Mensaje de éxito
+
+    Raises:
+        HTTPException: Si el refresh token es inválido o de otro usuario
     """
+    try:
+        await AuthService(session, store).logout(
+            decode_token(credentials.credentials),
+            body.refresh_token if body is not None else None,
+        )
+    except AuthenticationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=e.message,
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
     return {
         "message": "Sesión cerrada exitosamente",
-        "detail": "Elimine el token del lado del cliente"
+        "detail": "Tokens revocados en el servidor"
     }
+
+
+@router.get(
+    "/jwks",
+    response_model=dict,
+    status_code=status.HTTP_200_OK,
+    summary="Claves públicas de firma (JWKS)",
+    description="Claves públicas para verificar los tokens sin llamar a esta API",
+)
+async def get_jwks() -> dict:
+    """
+    Publica las claves públicas activas en formato JWKS.
+
+    Solo incluye claves asimétricas (RS*/ES*/EdDSA); con HS256 la lista está
+    vacía porque el secreto compartido nunca se publica.
+
+    Returns:
+        dict: Documento JWKS
+    """
+    return token_service.jwks()
+
+
+@router.get(
+    "/login-rate-limit",
+    response_model=LoginRateLimitMetrics,
+    status_code=status.HTTP_200_OK,
+    summary="Métricas del limitador de login",
+    description="Contadores del limitador de intentos de login de este worker (solo RRHH)",
+)
+async def login_rate_limit_metrics(
+    _current_hr: CurrentHR,
+    limiter: Annotated[LoginRateLimiter, Depends(get_login_rate_limiter)],
+) -> LoginRateLimitMetrics:
+    """
+    Métricas del limitador de login.
+
+    Solo para RRHH: revelan cuántos intentos se rechazan y cuántas IPs y
+    emails se están siguiendo.
+
+    Args:
+        _current_hr: Usuario de RRHH autenticado
+        limiter: Limitador de intentos de login del worker
+
+    Returns:
+        LoginRateLimitMetrics: Contadores desde el arranque del worker
+    """
+    return LoginRateLimitMetrics(enabled=limiter.enabled, **limiter.snapshot())
+
+
 @router.get(
     "/me",
     response_model=UserResponse,
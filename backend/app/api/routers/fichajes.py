@@ -3,18 +3,28 @@
 from datetime import UTC, date, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies.auth import CurrentHR, CurrentUser
+from app.api.dependencies.database import ReadSessionDep
+from app.api.dependencies.preconditions import IfMatch
+from app.api.responses import PydanticJSONResponse
 from app.core.exceptions import NotFoundException
-from app.database import get_session
+from app.core.presence import PresenceRoster, get_presence_roster
+from app.core.versioning import etag
+from app.database import UnitOfWorkRoute, get_session
 from app.models.fichaje import Fichaje, FichajeStatus
 from app.models.user import User
 from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.pagination import Page
+from app.repositories.rows import FichajeRow, UserSnapshot
 from app.repositories.user_repository import UserRepository
+from app.schemas.compliance import ComplianceReport
 from app.schemas.fichaje import (
     FichajeApproval,
+    FichajeBulkApproval,
+    FichajeBulkApprovalResponse,
     FichajeCheckIn,
     FichajeCheckOut,
     FichajeCorrection,
@@ -22,24 +32,34 @@ from app.schemas.fichaje import (
     FichajeListResponse,
     FichajeResponse,
     FichajeStats,
+    OccupancyHeatmap,
+    PresenceResponse,
 )
+from app.schemas.pagination import CountStrategy
+from app.services.compliance_service import ComplianceService
 from app.services.fichaje_service import FichajeService
 
-router = APIRouter(tags=["Fichajes"])
+router = APIRouter(tags=["Fichajes"], route_class=UnitOfWorkRoute)
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
 
-def _build_fichaje_response(fichaje: Fichaje, user: User | None = None) -> FichajeResponse:
+def _build_fichaje_response(
+    fichaje: Fichaje | FichajeRow, user: User | UserSnapshot | None = None
+) -> FichajeResponse:
     """Construye una respuesta de fichaje con todos los campos.
 
     Args:
-        fichaje: Instancia de Fichaje con relaciones cargadas.
+        fichaje: Instancia de Fichaje con relaciones cargadas, o fila de solo
+            lectura (que ya incluye email y nombre del usuario).
         user: Usuario opcional para sobrescribir email y nombre.
 
     Returns:
         FichajeResponse con todos los campos.
     """
+    if isinstance(fichaje, FichajeRow) and user is None:
+        return FichajeResponse.model_validate(fichaje)
+
     user_email = user.email if user else (fichaje.user.email if fichaje.user else "")
     user_full_name = user.full_name if user else (fichaje.user.full_name if fichaje.user else "")
 
@@ -62,9 +82,43 @@ def _build_fichaje_response(fichaje: Fichaje, user: User | None = None) -> Ficha
         approval_notes=fichaje.approval_notes,
         created_at=fichaje.created_at,  # type: ignore
         updated_at=fichaje.updated_at,  # type: ignore
+        version=fichaje.version,
     )
 
 
+def _build_list_response(
+    page: Page[FichajeRow], skip: int, limit: int, total_hours: float
+) -> PydanticJSONResponse:
+    """Construye la respuesta paginada de fichajes.
+
+    Valida toda la página en una sola llamada desde las filas del listado
+    (`from_attributes`) y la serializa con pydantic-core, sin la
+    revalidación de FastAPI.
+
+    Args:
+        page: Página de fichajes.
+        skip: Registros saltados.
+        limit: Tamaño de página.
+        total_hours: Suma de horas trabajadas en el periodo.
+
+    Returns:
+        PydanticJSONResponse con el `FichajeListResponse` serializado.
+    """
+    response = FichajeListResponse.model_validate(
+        {
+            "fichajes": page.items,
+            "total": page.total,
+            "has_more": page.has_more,
+            "total_estimated": page.total_estimated,
+            "page": (skip // limit) + 1 if limit > 0 else 1,
+            "page_size": limit,
+            "total_hours": total_hours,
+        },
+        from_attributes=True,
+    )
+    return PydanticJSONResponse(response)
+
+
 def _date_to_datetime(d: date | None) -> datetime | None:
     """Convierte date a datetime (inicio del día en UTC)."""
     if d is None:
@@ -89,6 +143,16 @@ def get_fichaje_service(session: SessionDep) -> FichajeService:
 FichajeServiceDep = Annotated[FichajeService, Depends(get_fichaje_service)]
 
 
+def get_read_fichaje_service(session: ReadSessionDep) -> FichajeService:
+    """Dependency para obtener el service de fichajes sobre la sesión de lectura."""
+    fichaje_repo = FichajeRepository(session)
+    user_repo = UserRepository(session)
+    return FichajeService(fichaje_repo, user_repo)
+
+
+FichajeReadServiceDep = Annotated[FichajeService, Depends(get_read_fichaje_service)]
+
+
 @router.post(
     "/check-in",
     response_model=FichajeResponse,
@@ -138,7 +202,7 @@ async def check_out(
     description="Lista todos los fichajes con filtros. Solo accesible para usuarios HR.",
 )
 async def list_fichajes(
-    fichaje_service: FichajeServiceDep,
+    fichaje_service: FichajeReadServiceDep,
     current_hr: CurrentHR,
     skip: int = Query(default=0, ge=0, description="Registros a saltar"),
     limit: int = Query(default=10, ge=1, le=100, description="Límite de registros"),
@@ -147,7 +211,10 @@ async def list_fichajes(
     date_to: date | None = Query(default=None, description="Fecha hasta"),
     status: str | None = Query(default=None, description="Filtrar por estado"),
     incomplete_only: bool = Query(default=False, description="Solo fichajes sin check-out"),
-) -> FichajeListResponse:
+    count_strategy: CountStrategy = Query(
+        default=CountStrategy.EXACT, description="Cálculo del total: exact, estimated o none"
+    ),
+) -> PydanticJSONResponse:
     """Lista todos los fichajes con filtros (solo HR)."""
     filters = FichajeFilters(
         user_id=user_id,
@@ -157,25 +224,15 @@ async def list_fichajes(
         incomplete_only=incomplete_only,
     )
 
-    fichajes, total, total_hours = await fichaje_service.get_all(
+    result, total_hours = await fichaje_service.get_all(
         filters=filters,
         skip=skip,
         limit=limit,
         current_user=current_hr,
+        count_strategy=count_strategy,
     )
 
-    # Convertir a responses
-    fichaje_responses = [_build_fichaje_response(f) for f in fichajes]
-
-    page = (skip // limit) + 1 if limit > 0 else 1
-
-    return FichajeListResponse(
-        fichajes=fichaje_responses,
-        total=total,
-        page=page,
-        page_size=limit,
-        total_hours=total_hours,
-    )
+    return _build_list_response(result, skip, limit, total_hours)
 
 
 @router.get(
@@ -185,33 +242,25 @@ async def list_fichajes(
     description="Obtiene los fichajes del usuario actual.",
 )
 async def get_my_fichajes(
-    fichaje_service: FichajeServiceDep,
+    fichaje_service: FichajeReadServiceDep,
     current_user: CurrentUser,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=10, ge=1, le=100),
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
-) -> FichajeListResponse:
+    count_strategy: CountStrategy = Query(default=CountStrategy.EXACT),
+) -> PydanticJSONResponse:
     """Obtiene fichajes del usuario actual."""
-    fichajes, total, total_hours = await fichaje_service.get_my_fichajes(
+    result, total_hours = await fichaje_service.get_my_fichajes(
         user_id=current_user.id,  # type: ignore
         date_from=_date_to_datetime(date_from),
         date_to=_date_to_datetime_end(date_to),
         skip=skip,
         limit=limit,
+        count_strategy=count_strategy,
     )
 
-    fichaje_responses = [_build_fichaje_response(f, current_user) for f in fichajes]
-
-    page = (skip // limit) + 1 if limit > 0 else 1
-
-    return FichajeListResponse(
-        fichajes=fichaje_responses,
-        total=total,
-        page=page,
-        page_size=limit,
-        total_hours=total_hours,
-    )
+    return _build_list_response(result, skip, limit, total_hours)
 
 
 @router.get(
@@ -221,7 +270,7 @@ async def get_my_fichajes(
     description="Obtiene el fichaje activo (sin check-out) del usuario actual.",
 )
 async def get_my_active_fichaje(
-    fichaje_service: FichajeServiceDep,
+    fichaje_service: FichajeReadServiceDep,
     current_user: CurrentUser,
 ) -> FichajeResponse:
     """Obtiene el fichaje activo del usuario actual."""
@@ -244,7 +293,7 @@ async def get_my_active_fichaje(
     description="Obtiene estadísticas de fichajes del usuario actual.",
 )
 async def get_my_stats(
-    fichaje_service: FichajeServiceDep,
+    fichaje_service: FichajeReadServiceDep,
     current_user: CurrentUser,
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
@@ -258,6 +307,63 @@ async def get_my_stats(
     )
 
 
+@router.get(
+    "/presence",
+    response_model=PresenceResponse,
+    summary="Quién está dentro (solo HR)",
+    description="Usuarios con un fichaje abierto ahora mismo. Se sirve desde memoria.",
+)
+async def get_presence(
+    _current_hr: CurrentHR,
+    roster: Annotated[PresenceRoster, Depends(get_presence_roster)],
+) -> PydanticJSONResponse:
+    """Lista los usuarios con un fichaje abierto sin consultar la base de datos."""
+    entries = roster.entries()
+    response = PresenceResponse.model_validate(
+        {"present": entries, "total": len(entries), "synced_at": roster.synced_at},
+        from_attributes=True,
+    )
+    return PydanticJSONResponse(response)
+
+
+@router.get(
+    "/occupancy",
+    response_model=OccupancyHeatmap,
+    summary="Mapa de ocupación por hora (solo HR)",
+    description="Personas dentro por hora (UTC) de cada día de un rango de hasta 366 días.",
+)
+async def get_occupancy(
+    fichaje_service: FichajeReadServiceDep,
+    _current_hr: CurrentHR,
+    date_from: date = Query(description="Primer día (YYYY-MM-DD)"),
+    date_to: date = Query(description="Último día, incluido (YYYY-MM-DD)"),
+) -> PydanticJSONResponse:
+    """Devuelve, por día y hora, el máximo y la media de personas dentro."""
+    heatmap = await fichaje_service.get_occupancy(date_from, date_to)
+    return PydanticJSONResponse(heatmap)
+
+
+@router.get(
+    "/compliance",
+    response_model=ComplianceReport,
+    summary="Cumplimiento de jornada y descansos (solo HR)",
+    description=(
+        "Días y semanas por encima de la jornada máxima y descansos entre jornadas por "
+        "debajo del mínimo, en un rango de hasta 366 días."
+    ),
+)
+async def get_compliance_report(
+    session: ReadSessionDep,
+    _current_hr: CurrentHR,
+    date_from: date = Query(description="Primer día (YYYY-MM-DD)"),
+    date_to: date = Query(description="Último día, incluido (YYYY-MM-DD)"),
+    user_id: int | None = Query(default=None, description="Comprobar solo este usuario"),
+) -> PydanticJSONResponse:
+    """Informe de incumplimientos con los límites de la configuración."""
+    report = await ComplianceService(session).get_report(date_from, date_to, user_id)
+    return PydanticJSONResponse(report)
+
+
 @router.get(
     "/{fichaje_id}",
     response_model=FichajeResponse,
@@ -266,12 +372,14 @@ async def get_my_stats(
 )
 async def get_fichaje(
     fichaje_id: int,
-    fichaje_service: FichajeServiceDep,
+    response: Response,
+    fichaje_service: FichajeReadServiceDep,
     current_user: CurrentUser,
 ) -> FichajeResponse:
-    """Obtiene un fichaje por ID."""
+    """Obtiene un fichaje por ID (con su versión en la cabecera `ETag`)."""
     fichaje = await fichaje_service.get_by_id(fichaje_id=fichaje_id, current_user=current_user)
 
+    response.headers["ETag"] = etag(fichaje.version)
     return _build_fichaje_response(fichaje)
 
 
@@ -284,16 +392,20 @@ async def get_fichaje(
 async def request_correction(
     fichaje_id: int,
     correction_data: FichajeCorrection,
+    response: Response,
     fichaje_service: FichajeServiceDep,
     current_user: CurrentUser,
+    if_match: IfMatch,
 ) -> FichajeResponse:
-    """Solicita corrección de un fichaje."""
+    """Solicita corrección de un fichaje (409 si cambió desde la versión de `If-Match`)."""
     fichaje = await fichaje_service.request_correction(
         fichaje_id=fichaje_id,
         correction_data=correction_data,
         user=current_user,
+        expected_version=if_match,
     )
 
+    response.headers["ETag"] = etag(fichaje.version)
     return _build_fichaje_response(fichaje, current_user)
 
 
@@ -306,19 +418,38 @@ async def request_correction(
 async def approve_correction(
     fichaje_id: int,
     approval: FichajeApproval,
+    response: Response,
     fichaje_service: FichajeServiceDep,
     current_hr: CurrentHR,
+    if_match: IfMatch,
 ) -> FichajeResponse:
-    """Aprueba o rechaza una corrección."""
+    """Aprueba o rechaza una corrección (409 si cambió desde la versión de `If-Match`)."""
     fichaje = await fichaje_service.approve_correction(
         fichaje_id=fichaje_id,
         approval=approval,
         hr_user=current_hr,
+        expected_version=if_match,
     )
 
+    response.headers["ETag"] = etag(fichaje.version)
     return _build_fichaje_response(fichaje)
 
 
+@router.post(
+    "/bulk-approve",
+    response_model=FichajeBulkApprovalResponse,
+    summary="Aprobar/rechazar correcciones en lote",
+    description="Aprueba o rechaza varias correcciones de fichaje a la vez. Solo HR puede hacerlo.",
+)
+async def approve_corrections(
+    approval: FichajeBulkApproval,
+    fichaje_service: FichajeServiceDep,
+    current_hr: CurrentHR,
+) -> FichajeBulkApprovalResponse:
+    """Aprueba o rechaza varias correcciones con resultado por decisión (fallos parciales)."""
+    return await fichaje_service.approve_corrections(approval=approval, hr_user=current_hr)
+
+
 @router.get(
     "/stats/general",
     response_model=FichajeStats,
@@ -326,7 +457,7 @@ async def approve_correction(
     description="Obtiene estadísticas generales. HR puede ver de cualquier usuario.",
 )
 async def get_stats(
-    fichaje_service: FichajeServiceDep,
+    fichaje_service: FichajeReadServiceDep,
     current_user: CurrentUser,
     user_id: int | None = Query(default=None),
     date_from: date | None = Query(default=None),
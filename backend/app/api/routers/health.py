@@ -0,0 +1,102 @@
+"""
+Router de health checks.
+
+Sondas de liveness y readiness para el orquestador.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+
+from app.core.config import settings
+from app.core.health import ReadinessProbe
+from app.database import engine
+from app.schemas.health import LivenessResponse, ReadinessResponse
+
+router = APIRouter(tags=["Health"])
+
+# Sonda compartida por todas las peticiones del worker (mantiene la caché)
+readiness_probe = ReadinessProbe(
+    engine,
+    timeout=settings.health_db_timeout_seconds,
+    cache_ttl=settings.health_cache_ttl_seconds,
+    max_overflow=settings.database_max_overflow,
+)
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Dependency para obtener la sonda de readiness del worker."""
+    return readiness_probe
+
+
+ReadinessProbeDep = Annotated[ReadinessProbe, Depends(get_readiness_probe)]
+
+
+def _liveness() -> LivenessResponse:
+    """Construye la respuesta de liveness (no toca dependencias externas)."""
+    return LivenessResponse(
+        app=settings.app_name,
+        version=settings.app_version,
+        environment=settings.env,
+    )
+
+
+@router.get(
+    "/health",
+    response_model=LivenessResponse,
+    summary="Health check",
+    description="Alias de /health/live, se mantiene por compatibilidad.",
+)
+async def health_check() -> LivenessResponse:
+    """
+    Verifica el estado de la aplicación.
+
+    Returns:
+        LivenessResponse: Estado de la aplicación
+    """
+    return _liveness()
+
+
+@router.get(
+    "/health/live",
+    response_model=LivenessResponse,
+    summary="Liveness",
+    description="Indica que el proceso está vivo. No consulta la base de datos.",
+)
+async def liveness() -> LivenessResponse:
+    """
+    Sonda de liveness.
+
+    Returns:
+        LivenessResponse: Estado del proceso
+    """
+    return _liveness()
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness",
+    description=(
+        "Comprueba la base de datos con un ping acotado en tiempo y reporta la saturación "
+        "del pool. Devuelve 503 si el worker no puede atender tráfico."
+    ),
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse}},
+)
+async def readiness(probe: ReadinessProbeDep, response: Response) -> ReadinessResponse:
+    """
+    Sonda de readiness.
+
+    Args:
+        probe: Sonda de readiness del worker
+        response: Respuesta HTTP (para ajustar el status code)
+
+    Returns:
+        ReadinessResponse: Estado de la base de datos y del pool
+    """
+    result = await probe.check()
+
+    if result.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return result
@@ -0,0 +1,151 @@
+"""
+Router de trabajos en segundo plano.
+
+Endpoints para que RRHH encole operaciones pesadas, siga su progreso y las
+cancele. Los errores de negocio los traducen los handlers globales.
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Query, status
+
+from app.api.dependencies.auth import CurrentHR
+from app.api.dependencies.database import ReadSessionDep
+from app.database import SessionDep, UnitOfWorkRoute
+from app.models.job import JobStatus
+from app.schemas.job import JobCreate, JobKindResponse, JobListResponse, JobResponse
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=UnitOfWorkRoute)
+
+
+@router.get(
+    "/kinds",
+    response_model=list[JobKindResponse],
+    summary="Tipos de trabajo",
+    description="Lista los tipos de trabajo que se pueden encolar (solo HR).",
+)
+async def list_job_kinds(session: ReadSessionDep, _current_hr: CurrentHR) -> list[JobKindResponse]:
+    """
+    Lista los tipos de trabajo registrados.
+
+    Args:
+        session: Sesión de base de datos
+        _current_hr: Usuario HR actual (requerido para auth)
+
+    Returns:
+        list[JobKindResponse]: Tipos de trabajo
+    """
+    return [JobKindResponse.model_validate(d) for d in JobService(session).list_kinds()]
+
+
+@router.post(
+    "",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Encolar trabajo",
+    description="Encola un trabajo en segundo plano (solo HR). Devuelve 202 con el trabajo.",
+)
+async def create_job(data: JobCreate, session: SessionDep, current_hr: CurrentHR) -> JobResponse:
+    """
+    Encola un trabajo.
+
+    Args:
+        data: Tipo, parámetros y opciones del trabajo
+        session: Sesión de base de datos
+        current_hr: Usuario HR que lo encola
+
+    Returns:
+        JobResponse: Trabajo encolado (pendiente)
+    """
+    job = await JobService(session).enqueue(
+        kind=data.kind,
+        payload=data.payload,
+        created_by=current_hr,
+        max_attempts=data.max_attempts,
+        run_after=data.run_after,
+    )
+    return JobResponse.model_validate(job)
+
+
+@router.get(
+    "",
+    response_model=JobListResponse,
+    summary="Listar trabajos",
+    description="Lista los trabajos, los más recientes primero (solo HR).",
+)
+async def list_jobs(
+    session: ReadSessionDep,
+    _current_hr: CurrentHR,
+    job_status: Annotated[JobStatus | None, Query(alias="status")] = None,
+    kind: Annotated[str | None, Query(max_length=64)] = None,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+) -> JobListResponse:
+    """
+    Lista trabajos con filtros y paginación.
+
+    Args:
+        session: Sesión de base de datos
+        _current_hr: Usuario HR actual (requerido para auth)
+        job_status: Filtrar por estado
+        kind: Filtrar por tipo
+        skip: Registros a omitir
+        limit: Registros máximos
+
+    Returns:
+        JobListResponse: Lista paginada de trabajos
+    """
+    page = await JobService(session).list_jobs(status=job_status, kind=kind, skip=skip, limit=limit)
+    return JobListResponse(
+        jobs=[JobResponse.model_validate(job) for job in page.items],
+        total=page.total,
+        has_more=page.has_more,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Estado de un trabajo",
+    description="Obtiene el estado, el progreso y el resultado de un trabajo (solo HR).",
+)
+async def get_job(job_id: int, session: ReadSessionDep, _current_hr: CurrentHR) -> JobResponse:
+    """
+    Obtiene un trabajo.
+
+    Args:
+        job_id: ID del trabajo
+        session: Sesión de base de datos
+        _current_hr: Usuario HR actual (requerido para auth)
+
+    Returns:
+        JobResponse: Trabajo con su progreso
+    """
+    return JobResponse.model_validate(await JobService(session).get_job(job_id))
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=JobResponse,
+    summary="Cancelar trabajo",
+    description=(
+        "Cancela un trabajo (solo HR). Si está pendiente se cancela al momento; "
+        "si está en ejecución, su worker lo detiene en cuanto lo detecta."
+    ),
+)
+async def cancel_job(job_id: int, session: SessionDep, _current_hr: CurrentHR) -> JobResponse:
+    """
+    Cancela un trabajo.
+
+    Args:
+        job_id: ID del trabajo
+        session: Sesión de base de datos
+        _current_hr: Usuario HR actual (requerido para auth)
+
+    Returns:
+        JobResponse: Trabajo actualizado
+    """
+    return JobResponse.model_validate(await JobService(session).cancel_job(job_id))
@@ -9,6 +9,7 @@ from typing import Annotated
 from fastapi import APIRouter, HTTPException, Query, status
 
 from app.api.dependencies.auth import CurrentHR, CurrentUser
+from app.api.dependencies.database import ReadSessionDep
 from app.core.exceptions import (
     AuthenticationException,
     AuthorizationException,
@@ -16,7 +17,7 @@ from app.core.exceptions import (
     NotFoundException,
     ValidationException,
 )
-from app.database import SessionDep
+from app.database import SessionDep, UnitOfWorkRoute
 from app.models.user import UserRole
 from app.schemas.user import (
     UserChangePassword,
@@ -29,7 +30,7 @@ from app.schemas.user import (
 )
 from app.services.user_service import UserService
 
-router = APIRouter(tags=["Usuarios"])
+router = APIRouter(tags=["Usuarios"], route_class=UnitOfWorkRoute)
 
 
 @router.post(
@@ -83,7 +84,7 @@ async def create_user(
     description="Lista todos los usuarios (solo HR). Soporta paginación y filtros.",
 )
 async def list_users(
-    session: SessionDep,
+    session: ReadSessionDep,
     _current_hr: CurrentHR,
     skip: Annotated[int, Query(ge=0, description="Número de registros a omitir")] = 0,
     limit: Annotated[int, Query(ge=1, le=100, description="Número máximo de registros")] = 10,
@@ -147,7 +148,9 @@ async def get_current_user_profile(current_user: CurrentUser) -> UserResponse:
     summary="Obtener usuario por ID",
     description="Obtiene un usuario específico. HR puede ver cualquiera, empleados solo a sí mismos.",
 )
-async def get_user(user_id: int, session: SessionDep, current_user: CurrentUser) -> UserResponse:
+async def get_user(
+    user_id: int, session: ReadSessionDep, current_user: CurrentUser
+) -> UserResponse:
     """
     Obtiene un usuario por ID.
 
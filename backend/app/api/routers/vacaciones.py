@@ -7,14 +7,25 @@ Implementa separación de permisos entre empleados y RRHH.
 
 from datetime import date as date_type
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import get_current_hr, get_current_user
-from app.database import get_session
-from app.models.solicitud import SolicitudStatus, SolicitudTipo
+from app.api.dependencies.database import get_read_session
+from app.api.dependencies.preconditions import get_if_match
+from app.api.responses import PydanticJSONResponse
+from app.core.versioning import etag
+from app.database import UnitOfWorkRoute, get_session
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
 from app.models.user import User
+from app.repositories.pagination import Page
+from app.repositories.rows import SolicitudRow
+from app.schemas.job import JobResponse
+from app.schemas.pagination import CountStrategy
 from app.schemas.solicitud import (
+    AbsenceCalendarResponse,
+    SolicitudBulkReview,
+    SolicitudBulkReviewResponse,
     SolicitudCreate,
     SolicitudFilters,
     SolicitudListResponse,
@@ -23,9 +34,18 @@ from app.schemas.solicitud import (
     SolicitudUpdate,
     VacationBalance,
 )
+from app.schemas.vacation_rollover import (
+    VacationRolloverEntryListResponse,
+    VacationRolloverEntryResponse,
+    VacationRolloverReport,
+    VacationRolloverRequest,
+    VacationRolloverResponse,
+)
+from app.services.job_service import JobService
 from app.services.solicitud_service import SolicitudService
+from app.services.vacation_rollover_service import VacationRolloverService
 
-router = APIRouter(prefix="/vacaciones", tags=["Vacaciones"])
+router = APIRouter(prefix="/vacaciones", tags=["Vacaciones"], route_class=UnitOfWorkRoute)
 
 
 # ============================================================================
@@ -33,31 +53,30 @@ router = APIRouter(prefix="/vacaciones", tags=["Vacaciones"])
 # ============================================================================
 
 
-def _build_solicitud_response(solicitud) -> SolicitudResponse:
-    """Construye respuesta de solicitud con datos de usuario."""
-    return SolicitudResponse(
-        id=solicitud.id,
-        created_at=solicitud.created_at,
-        updated_at=solicitud.updated_at,
-        user_id=solicitud.user_id,
-        user_email=solicitud.user.email if solicitud.user else "",
-        user_full_name=solicitud.user.full_name if solicitud.user else "",
-        tipo=solicitud.tipo,
-        fecha_inicio=solicitud.fecha_inicio,
-        fecha_fin=solicitud.fecha_fin,
-        dias_solicitados=solicitud.dias_solicitados,
-        motivo=solicitud.motivo,
-        status=solicitud.status,
-        reviewed_by=solicitud.reviewed_by,
-        reviewed_by_name=solicitud.reviewed_by_user.full_name
-        if solicitud.reviewed_by_user
-        else None,
-        reviewed_at=solicitud.reviewed_at,
-        comentarios_revision=solicitud.comentarios_revision,
-        is_pending=solicitud.is_pending,
-        is_approved=solicitud.is_approved,
-        is_active=solicitud.is_active,
+def _build_solicitud_response(solicitud: Solicitud | SolicitudRow) -> SolicitudResponse:
+    """Construye respuesta de solicitud con datos de usuario (entidad o fila de solo lectura)."""
+    return SolicitudResponse.model_validate(solicitud)
+
+
+def _build_list_response(page: Page[SolicitudRow], skip: int, limit: int) -> PydanticJSONResponse:
+    """
+    Construye respuesta paginada de solicitudes a partir de una página.
+
+    Valida toda la página en una sola llamada desde las filas del listado y la
+    serializa con pydantic-core, sin la revalidación de FastAPI.
+    """
+    response = SolicitudListResponse.model_validate(
+        {
+            "solicitudes": page.items,
+            "total": page.total,
+            "has_more": page.has_more,
+            "total_estimated": page.total_estimated,
+            "skip": skip,
+            "limit": limit,
+        },
+        from_attributes=True,
     )
+    return PydanticJSONResponse(response)
 
 
 def _build_filters(
@@ -158,9 +177,6 @@ async def create_solicitud(
     service = SolicitudService(session)
     solicitud = await service.create_solicitud(current_user, data)
 
-    # Recargar con relaciones para respuesta completa
-    solicitud = await service.get_solicitud_by_id(solicitud.id, current_user)  # type: ignore
-
     return _build_solicitud_response(solicitud)
 
 
@@ -182,9 +198,12 @@ async def get_my_solicitudes(
     activas_only: bool = Query(False, description="Solo solicitudes actualmente en curso"),
     skip: int = Query(0, ge=0, description="Registros a saltar (paginación)"),
     limit: int = Query(100, ge=1, le=100, description="Máximo de registros a retornar"),
-    session: AsyncSession = Depends(get_session),
+    count_strategy: CountStrategy = Query(
+        CountStrategy.EXACT, description="Cálculo del total: exact, estimated o none"
+    ),
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
-) -> SolicitudListResponse:
+) -> PydanticJSONResponse:
     """
     Obtener mis solicitudes con filtros opcionales.
 
@@ -205,19 +224,15 @@ async def get_my_solicitudes(
     )
 
     service = SolicitudService(session)
-    solicitudes, total = await service.get_my_solicitudes(
+    page = await service.get_my_solicitudes(
         user=current_user,
         filters=filters,
         skip=skip,
         limit=limit,
+        count_strategy=count_strategy,
     )
 
-    return SolicitudListResponse(
-        solicitudes=[_build_solicitud_response(s) for s in solicitudes],
-        total=total,
-        skip=skip,
-        limit=limit,
-    )
+    return _build_list_response(page, skip, limit)
 
 
 @router.get(
@@ -227,7 +242,7 @@ async def get_my_solicitudes(
     description="Obtener información completa del balance de vacaciones disponible.",
 )
 async def get_my_balance(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ) -> VacationBalance:
     """
@@ -255,8 +270,11 @@ async def get_my_balance(
 async def get_pending_solicitudes(
     skip: int = Query(0, ge=0, description="Registros a saltar (paginación)"),
     limit: int = Query(100, ge=1, le=100, description="Máximo de registros a retornar"),
-    session: AsyncSession = Depends(get_session),
-) -> SolicitudListResponse:
+    count_strategy: CountStrategy = Query(
+        CountStrategy.EXACT, description="Cálculo del total: exact, estimated o none"
+    ),
+    session: AsyncSession = Depends(get_read_session),
+) -> PydanticJSONResponse:
     """
     Obtener solicitudes pendientes de revisión (solo HR).
 
@@ -268,17 +286,51 @@ async def get_pending_solicitudes(
     priorizando las que llevan más tiempo esperando.
     """
     service = SolicitudService(session)
-    solicitudes, total = await service.solicitud_repo.get_pending(
+    page = await service.solicitud_repo.get_pending(
         skip=skip,
         limit=limit,
+        count_strategy=count_strategy,
     )
 
-    return SolicitudListResponse(
-        solicitudes=[_build_solicitud_response(s) for s in solicitudes],
-        total=total,
-        skip=skip,
-        limit=limit,
-    )
+    return _build_list_response(page, skip, limit)
+
+
+@router.get(
+    "/calendar",
+    response_model=AbsenceCalendarResponse,
+    summary="[HR] Calendario de ausencias",
+    description="Ausencias aprobadas y pendientes de todo el equipo, día a día.",
+    dependencies=[Depends(get_current_hr)],
+)
+async def get_absence_calendar(
+    fecha_desde: date_type = Query(..., description="Primer día del calendario (YYYY-MM-DD)"),
+    fecha_hasta: date_type = Query(..., description="Último día del calendario (YYYY-MM-DD)"),
+    include_pending: bool = Query(True, description="Incluir solicitudes pendientes de revisión"),
+    session: AsyncSession = Depends(get_session),
+) -> PydanticJSONResponse:
+    """
+    Calendario de ausencias del equipo (solo HR).
+
+    **Acceso:** Solo usuarios con rol HR.
+
+    **Respuesta:**
+    - `absences`: cada solicitud aprobada (y pendiente, salvo
+      `include_pending=false`) que toca el rango, una sola vez
+    - `days`: todos los días del rango con los IDs de las solicitudes que
+      los incluyen
+
+    **Restricciones:** como máximo 366 días por consulta.
+
+    Los meses consultados se cachean en cada proceso; crear, modificar,
+    cancelar o revisar una solicitud invalida sus meses. Se leen del
+    primario, no de una réplica: un mes leído de una réplica con retraso
+    justo después de una invalidación quedaría cacheado, ya obsoleto,
+    durante todo el TTL.
+    """
+    service = SolicitudService(session)
+    calendar = await service.get_absence_calendar(fecha_desde, fecha_hasta, include_pending)
+
+    return PydanticJSONResponse(calendar)
 
 
 @router.get(
@@ -289,7 +341,8 @@ async def get_pending_solicitudes(
 )
 async def get_solicitud(
     solicitud_id: int,
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ) -> SolicitudResponse:
     """
@@ -298,10 +351,14 @@ async def get_solicitud(
     **Permisos:**
     - Empleados: Solo pueden ver sus propias solicitudes
     - HR: Puede ver cualquier solicitud
+
+    La cabecera `ETag` contiene la versión, que se puede enviar en `If-Match`
+    al modificarla.
     """
     service = SolicitudService(session)
     solicitud = await service.get_solicitud_by_id(solicitud_id, current_user)
 
+    response.headers["ETag"] = etag(solicitud.version)
     return _build_solicitud_response(solicitud)
 
 
@@ -314,8 +371,10 @@ async def get_solicitud(
 async def update_solicitud(
     solicitud_id: int,
     data: SolicitudUpdate,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
+    if_match: int | None = Depends(get_if_match),
 ) -> SolicitudResponse:
     """
     Actualizar solicitud propia (solo si está pendiente).
@@ -329,10 +388,12 @@ async def update_solicitud(
     - Solo el propietario puede actualizar
     - Se recalculan días hábiles automáticamente
     - Se valida balance si cambian las fechas
+    - Con `If-Match`, 409 si la solicitud cambió desde que se leyó
     """
     service = SolicitudService(session)
-    solicitud = await service.update_solicitud(solicitud_id, current_user, data)
+    solicitud = await service.update_solicitud(solicitud_id, current_user, data, if_match)
 
+    response.headers["ETag"] = etag(solicitud.version)
     return _build_solicitud_response(solicitud)
 
 
@@ -344,8 +405,10 @@ async def update_solicitud(
 )
 async def cancel_solicitud(
     solicitud_id: int,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
+    if_match: int | None = Depends(get_if_match),
 ) -> SolicitudResponse:
     """
     Cancelar solicitud propia (solo si está pendiente).
@@ -358,10 +421,12 @@ async def cancel_solicitud(
     **Restricciones:**
     - Solo solicitudes en estado PENDING
     - Solo el propietario puede cancelar
+    - Con `If-Match`, 409 si la solicitud cambió desde que se leyó
     """
     service = SolicitudService(session)
-    solicitud = await service.cancel_solicitud(solicitud_id, current_user)
+    solicitud = await service.cancel_solicitud(solicitud_id, current_user, if_match)
 
+    response.headers["ETag"] = etag(solicitud.version)
     return _build_solicitud_response(solicitud)
 
 
@@ -386,8 +451,11 @@ async def list_all_solicitudes(
     activas_only: bool = Query(False, description="Solo solicitudes actualmente en curso"),
     skip: int = Query(0, ge=0, description="Registros a saltar (paginación)"),
     limit: int = Query(100, ge=1, le=100, description="Máximo de registros a retornar"),
-    session: AsyncSession = Depends(get_session),
-) -> SolicitudListResponse:
+    count_strategy: CountStrategy = Query(
+        CountStrategy.EXACT, description="Cálculo del total: exact, estimated o none"
+    ),
+    session: AsyncSession = Depends(get_read_session),
+) -> PydanticJSONResponse:
     """
     Listar todas las solicitudes (solo HR).
 
@@ -412,18 +480,14 @@ async def list_all_solicitudes(
     )
 
     service = SolicitudService(session)
-    solicitudes, total = await service.get_all_solicitudes(
+    page = await service.get_all_solicitudes(
         filters=filters,
         skip=skip,
         limit=limit,
+        count_strategy=count_strategy,
     )
 
-    return SolicitudListResponse(
-        solicitudes=[_build_solicitud_response(s) for s in solicitudes],
-        total=total,
-        skip=skip,
-        limit=limit,
-    )
+    return _build_list_response(page, skip, limit)
 
 
 @router.post(
@@ -436,8 +500,10 @@ async def list_all_solicitudes(
 async def review_solicitud(
     solicitud_id: int,
     data: SolicitudReview,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     current_hr: User = Depends(get_current_hr),
+    if_match: int | None = Depends(get_if_match),
 ) -> SolicitudResponse:
     """
     Aprobar o rechazar una solicitud (solo HR).
@@ -459,13 +525,46 @@ async def review_solicitud(
     **Restricciones:**
     - Solo solicitudes en estado PENDING
     - No se puede deshacer (cambio permanente)
+    - 409 si otro revisor se adelantó o, con `If-Match`, si cambió desde que se leyó
     """
     service = SolicitudService(session)
-    solicitud = await service.review_solicitud(solicitud_id, current_hr, data)
+    solicitud = await service.review_solicitud(solicitud_id, current_hr, data, if_match)
 
+    response.headers["ETag"] = etag(solicitud.version)
     return _build_solicitud_response(solicitud)
 
 
+@router.post(
+    "/bulk-review",
+    response_model=SolicitudBulkReviewResponse,
+    summary="[HR] Revisar solicitudes en lote",
+    description="Aprobar o rechazar varias solicitudes pendientes en una sola operación.",
+    dependencies=[Depends(get_current_hr)],
+)
+async def bulk_review_solicitudes(
+    data: SolicitudBulkReview,
+    session: AsyncSession = Depends(get_session),
+    current_hr: User = Depends(get_current_hr),
+) -> SolicitudBulkReviewResponse:
+    """
+    Aprobar o rechazar varias solicitudes a la vez (solo HR).
+
+    **Acceso:** Solo usuarios con rol HR.
+
+    Cada decisión sigue las mismas reglas que la revisión individual y puede
+    incluir la `version` leída (equivale a `If-Match`). Hasta 500 decisiones
+    por petición.
+
+    **Fallos parciales:**
+    - Las decisiones inválidas no impiden aplicar el resto
+    - La respuesta incluye el resultado de cada decisión en el orden recibido
+    - Motivos de fallo: `not_found`, `duplicate`, `not_pending`, `own_request`,
+      `version_conflict` y `conflict` (revisada o modificada a la vez)
+    """
+    service = SolicitudService(session)
+    return await service.review_many(current_hr, data)
+
+
 @router.get(
     "/balance/{user_id}",
     response_model=VacationBalance,
@@ -475,7 +574,7 @@ async def review_solicitud(
 )
 async def get_user_balance(
     user_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> VacationBalance:
     """
     Obtener balance de vacaciones de un usuario (solo HR).
@@ -492,3 +591,114 @@ async def get_user_balance(
     """
     service = SolicitudService(session)
     return await service.get_user_balance(user_id)
+
+
+# ============================================================================
+# CIERRE ANUAL DE VACACIONES (HR)
+# ============================================================================
+
+
+@router.post(
+    "/rollover/preview",
+    response_model=VacationRolloverReport,
+    summary="[HR] Simular cierre anual",
+    description="Calcular el resultado del cierre anual de balances sin aplicarlo (dry-run).",
+    dependencies=[Depends(get_current_hr)],
+)
+async def preview_rollover(
+    data: VacationRolloverRequest,
+    session: AsyncSession = Depends(get_read_session),
+) -> VacationRolloverReport:
+    """
+    Simular el cierre anual de vacaciones (solo HR).
+
+    **Cálculo por usuario:**
+    - No disfrutado = balance actual + días aprobados que empiezan el año siguiente
+    - Arrastrado = no disfrutado hasta el tope (días y/o fracción de los anuales)
+    - Un balance negativo se arrastra entero como deuda
+    - Nuevo balance = días anuales + arrastrado - días aprobados del año siguiente
+
+    No modifica ningún dato.
+    """
+    service = VacationRolloverService(session)
+    return await service.preview(data.year, data.max_carryover_days, data.max_carryover_ratio)
+
+
+@router.post(
+    "/rollover",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="[HR] Ejecutar cierre anual",
+    description="Encolar el cierre anual de balances como trabajo en segundo plano.",
+)
+async def run_rollover(
+    data: VacationRolloverRequest,
+    session: AsyncSession = Depends(get_session),
+    current_hr: User = Depends(get_current_hr),
+) -> JobResponse:
+    """
+    Ejecutar el cierre anual de vacaciones (solo HR).
+
+    Se valida que el año se pueda cerrar y se encola el trabajo
+    `vacaciones.rollover`; su progreso se consulta en `/api/jobs/{id}`.
+
+    **Restricciones:**
+    - Un año solo se cierra una vez (409 si ya está cerrado)
+    - No se puede cerrar un año que no ha terminado ni uno anterior al último cerrado
+    - Un cierre interrumpido se retoma con los mismos topes
+    """
+    _, days, ratio = await VacationRolloverService(session).validate_start(
+        data.year, data.max_carryover_days, data.max_carryover_ratio
+    )
+    job = await JobService(session).enqueue(
+        "vacaciones.rollover",
+        payload={
+            "year": data.year,
+            "max_carryover_days": days,
+            "max_carryover_ratio": ratio,
+            "executed_by": current_hr.id,
+        },
+        created_by=current_hr,
+    )
+    return JobResponse.model_validate(job)
+
+
+@router.get(
+    "/rollover/{year}",
+    response_model=VacationRolloverResponse,
+    summary="[HR] Consultar cierre anual",
+    description="Obtener el estado y los totales del cierre anual de un año.",
+    dependencies=[Depends(get_current_hr)],
+)
+async def get_rollover(
+    year: int,
+    session: AsyncSession = Depends(get_read_session),
+) -> VacationRolloverResponse:
+    """Obtener el cierre anual de un año (solo HR)."""
+    service = VacationRolloverService(session)
+    return VacationRolloverResponse.model_validate(await service.get_rollover(year))
+
+
+@router.get(
+    "/rollover/{year}/entries",
+    response_model=VacationRolloverEntryListResponse,
+    summary="[HR] Traza del cierre anual",
+    description="Listar el cálculo aplicado a cada usuario en el cierre anual de un año.",
+    dependencies=[Depends(get_current_hr)],
+)
+async def list_rollover_entries(
+    year: int,
+    skip: int = Query(0, ge=0, description="Registros a saltar (paginación)"),
+    limit: int = Query(100, ge=1, le=1000, description="Máximo de registros a retornar"),
+    session: AsyncSession = Depends(get_read_session),
+) -> VacationRolloverEntryListResponse:
+    """Listar la traza por usuario del cierre anual de un año (solo HR)."""
+    service = VacationRolloverService(session)
+    page = await service.list_entries(year, skip=skip, limit=limit)
+    return VacationRolloverEntryListResponse(
+        entries=[VacationRolloverEntryResponse.model_validate(entry) for entry in page.items],
+        total=page.total,
+        has_more=page.has_more,
+        skip=skip,
+        limit=limit,
+    )
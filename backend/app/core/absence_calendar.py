@@ -0,0 +1,189 @@
+"""
+Caché por mes del calendario de ausencias.
+
+Guarda, por mes, las solicitudes pendientes y aprobadas que lo tocan (filas
+`AbsenceRow`), de modo que un mismo mes consultado por varios responsables
+solo se lee una vez. El calendario de un rango se compone con los meses que
+lo cubren.
+
+Las operaciones que cambian ausencias (crear, modificar, cancelar o revisar
+una solicitud) invalidan los meses de la solicitud en el momento y otra vez
+tras el commit: una lectura que se cuele entre medias no deja en la caché
+los datos previos al cambio. La caché es por proceso; los cambios hechos en
+otro proceso se ven como mucho tras `absence_calendar_cache_ttl_seconds`.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, settings
+from app.repositories.rows import AbsenceRow
+
+# Clave de `session.info` con los meses a invalidar tras el commit
+SESSION_CALENDAR_KEY = "absence_calendar_months"
+
+Month = tuple[int, int]
+
+
+def month_of(day: date) -> Month:
+    """Mes (año, mes) de una fecha."""
+    return day.year, day.month
+
+
+def month_bounds(month: Month) -> tuple[date, date]:
+    """Primer y último día de un mes."""
+    year, number = month
+    first = date(year, number, 1)
+    following = date(year + number // 12, number % 12 + 1, 1)
+    return first, following - timedelta(days=1)
+
+
+def months_between(fecha_desde: date, fecha_hasta: date) -> list[Month]:
+    """Meses que cubren un rango de fechas, en orden."""
+    months: list[Month] = []
+    year, number = month_of(fecha_desde)
+    last = month_of(fecha_hasta)
+    while (year, number) <= last:
+        months.append((year, number))
+        year, number = year + number // 12, number % 12 + 1
+    return months
+
+
+class AbsenceCalendarCache:
+    """
+    Ausencias por mes con caducidad y tamaño máximo (LRU).
+
+    Una instancia por proceso.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_months: int = 120):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            ttl: Segundos que se reutiliza un mes (0 desactiva la caché)
+            max_months: Meses guardados como máximo
+        """
+        self.ttl = ttl
+        self.max_months = max_months
+        self._months: OrderedDict[Month, tuple[tuple[AbsenceRow, ...], float]] = OrderedDict()
+        self._generation = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AbsenceCalendarCache":
+        """
+        Construye la caché a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            AbsenceCalendarCache: Caché configurada
+        """
+        return cls(ttl=settings.absence_calendar_cache_ttl_seconds)
+
+    @property
+    def generation(self) -> int:
+        """Contador de invalidaciones; se pasa a `put` para detectar cambios durante la lectura."""
+        return self._generation
+
+    def get(self, month: Month) -> tuple[AbsenceRow, ...] | None:
+        """
+        Ausencias cacheadas de un mes.
+
+        Args:
+            month: Mes (año, mes)
+
+        Returns:
+            tuple[AbsenceRow, ...] | None: Ausencias del mes, o None si no
+            está en caché o ha caducado
+        """
+        cached = self._months.get(month)
+        if cached is None:
+            return None
+        rows, expires_at = cached
+        if expires_at <= time.monotonic():
+            del self._months[month]
+            return None
+        self._months.move_to_end(month)
+        return rows
+
+    def put(self, month: Month, rows: tuple[AbsenceRow, ...], generation: int) -> None:
+        """
+        Guarda las ausencias de un mes.
+
+        No se guarda nada si hubo alguna invalidación desde que se tomó
+        `generation` (antes de la consulta): los datos podrían ser previos
+        al cambio.
+
+        Args:
+            month: Mes (año, mes)
+            rows: Ausencias que tocan el mes
+            generation: Valor de `generation` antes de la consulta
+        """
+        if self.ttl <= 0 or generation != self._generation:
+            return
+        self._months[month] = (rows, time.monotonic() + self.ttl)
+        self._months.move_to_end(month)
+        if len(self._months) > self.max_months:
+            self._months.popitem(last=False)
+
+    def invalidate(self, session: AsyncSession, fecha_inicio: date, fecha_fin: date) -> None:
+        """
+        Invalida los meses de una solicitud, ahora y tras el commit.
+
+        Args:
+            session: Sesión de la transacción que modifica la solicitud
+            fecha_inicio: Inicio de la solicitud
+            fecha_fin: Fin de la solicitud
+        """
+        months = months_between(fecha_inicio, fecha_fin)
+        self.discard(months)
+        session.info.setdefault(SESSION_CALENDAR_KEY, []).append((self, months))
+
+    def discard(self, months: list[Month]) -> None:
+        """
+        Quita meses de la caché.
+
+        Args:
+            months: Meses a quitar
+        """
+        self._generation += 1
+        for month in months:
+            self._months.pop(month, None)
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        self._generation += 1
+        self._months.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _discard_committed_months(session: Session) -> None:
+    """Invalida los meses modificados por la transacción recién confirmada."""
+    # RELEASE SAVEPOINT también dispara el evento: solo cuenta el commit exterior
+    if session.in_nested_transaction():
+        return
+    for cache, months in session.info.pop(SESSION_CALENDAR_KEY, ()):
+        cache.discard(months)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_months(session: Session) -> None:
+    """Una transacción deshecha no cambió nada (ya se invalidó al modificar)."""
+    if not session.in_nested_transaction():
+        session.info.pop(SESSION_CALENDAR_KEY, None)
+
+
+# Caché del calendario de ausencias del proceso
+absence_calendar_cache = AbsenceCalendarCache.from_settings(settings)
+
+
+def get_absence_calendar_cache() -> AbsenceCalendarCache:
+    """Dependency que devuelve la caché del calendario de ausencias del proceso."""
+    return absence_calendar_cache
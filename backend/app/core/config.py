@@ -8,10 +8,18 @@ de la aplicación siguiendo el patrón de Settings de Pydantic.
 from functools import lru_cache
 from typing import Literal
 
-from pydantic import Field, computed_field
+from pydantic import BaseModel, Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class JWTKeyConfig(BaseModel):
+    """Clave JWT anterior aceptada solo para verificar tokens (rotación)."""
+
+    kid: str = Field(description="Identificador de la clave (cabecera `kid`)")
+    algorithm: str = Field(description="Algoritmo de la clave (HS256, RS256, ES256, EdDSA...)")
+    key: str = Field(description="Secreto HMAC, o ruta a la clave pública PEM")
+
+
 class Settings(BaseSettings):
     """
     Configuración de la aplicación.
@@ -37,6 +45,30 @@ class Settings(BaseSettings):
         default="sqlite+aiosqlite:///./hr_dev.db", description="URL de conexión a la base de datos"
     )
 
+    database_replica_urls: str = Field(
+        default="",
+        description="URLs de réplicas de solo lectura (separadas por coma, vacío = sin réplicas)",
+    )
+    read_your_writes_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Segundos que las lecturas de un usuario van al primario tras escribir",
+    )
+    database_pool_size: int = Field(
+        default=5, ge=1, description="Conexiones permanentes del pool de cada motor"
+    )
+    database_max_overflow: int = Field(
+        default=10,
+        ge=-1,
+        description="Conexiones extra que el pool abre por encima de size (-1 = sin límite)",
+    )
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def replica_urls_list(self) -> list[str]:
+        """Retorna la lista de URLs de réplicas de lectura."""
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
     # Security
     secret_key: str = Field(
         default="dev_secret_key_change_in_production",
@@ -49,6 +81,172 @@ class Settings(BaseSettings):
         default=7, description="Tiempo de expiración del refresh token en días"
     )
     algorithm: str = Field(default="HS256", description="Algoritmo de encriptación JWT")
+    jwt_key_id: str = Field(
+        default="main", description="Identificador (kid) de la clave de firma actual"
+    )
+    jwt_private_key_file: str = Field(
+        default="",
+        description="Ruta a la clave privada PEM para algoritmos asimétricos (RS*/ES*/EdDSA)",
+    )
+    jwt_previous_keys: list[JWTKeyConfig] = Field(
+        default_factory=list,
+        description="Claves anteriores aceptadas para verificar durante una rotación (JSON)",
+    )
+    token_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Segundos que se reutilizan los claims de un token verificado",
+    )
+    token_cache_max_size: int = Field(
+        default=10_000, ge=0, description="Número máximo de tokens verificados en caché"
+    )
+    revocation_sync_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Cada cuántos segundos se sincronizan las revocaciones de otros procesos",
+    )
+    revocation_bloom_capacity: int = Field(
+        default=100_000, gt=0, description="Revocaciones activas previstas (filtro de Bloom)"
+    )
+    revocation_bloom_error_rate: float = Field(
+        default=0.001,
+        gt=0,
+        lt=1,
+        description="Tasa de falsos positivos del filtro de Bloom de revocaciones",
+    )
+    revocation_lru_size: int = Field(
+        default=10_000, ge=0, description="Resultados de revocación cacheados (LRU)"
+    )
+
+    # Hashing de contraseñas (calibrar con scripts/calibrate_password_hash.py)
+    password_hash_scheme: Literal["bcrypt", "argon2"] = Field(
+        default="bcrypt", description="Esquema para hashes nuevos (argon2 = argon2id)"
+    )
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, description="Coste (log2) de bcrypt")
+    argon2_time_cost: int = Field(default=3, ge=1, description="Iteraciones de argon2id")
+    argon2_memory_cost: int = Field(default=65536, ge=8, description="Memoria de argon2id en KiB")
+    argon2_parallelism: int = Field(default=4, ge=1, description="Hilos de argon2id")
+    password_hash_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Hilos que verifican contraseñas a la vez (acota el CPU del login)",
+    )
+
+    # Limitación de intentos de login (token buckets por IP y por email)
+    login_rate_limit_enabled: bool = Field(default=True, description="Activa el limitador")
+    login_rate_limit_ip_burst: int = Field(
+        default=30, ge=1, description="Intentos seguidos permitidos desde una IP"
+    )
+    login_rate_limit_ip_per_minute: float = Field(
+        default=30.0, gt=0, description="Intentos por minuto recuperados por IP"
+    )
+    login_rate_limit_email_burst: int = Field(
+        default=5, ge=1, description="Intentos seguidos permitidos para un email"
+    )
+    login_rate_limit_email_per_minute: float = Field(
+        default=2.0, gt=0, description="Intentos por minuto recuperados por email"
+    )
+    login_rate_limit_max_keys: int = Field(
+        default=100_000, ge=1, description="Buckets máximos en memoria por worker"
+    )
+    login_rate_limit_trust_forwarded_for: bool = Field(
+        default=False,
+        description="Usar la IP de X-Forwarded-For (solo detrás de un proxy de confianza)",
+    )
+
+    # Cierre anual de vacaciones
+    vacation_carryover_max_days: float = Field(
+        default=5.0, ge=0, description="Días no disfrutados que se arrastran como máximo"
+    )
+    vacation_carryover_max_ratio: float | None = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Fracción máxima de los días anuales que se arrastra (vacío = sin tope)",
+    )
+    vacation_rollover_batch_size: int = Field(
+        default=1000, ge=1, description="Usuarios por lote (y por transacción) del cierre"
+    )
+
+    # Calendario de ausencias (caché por mes en cada proceso)
+    absence_calendar_cache_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Segundos que se reutiliza un mes del calendario de ausencias (0 = sin caché)",
+    )
+
+    # Trabajos en segundo plano (tabla job + JobRunner)
+    jobs_worker_enabled: bool = Field(
+        default=True,
+        description="Ejecutar el runner dentro del proceso de la API (o usar scripts/run_jobs.py)",
+    )
+    jobs_concurrency: int = Field(default=2, ge=1, description="Trabajos ejecutados a la vez")
+    jobs_poll_interval_seconds: float = Field(
+        default=1.0, gt=0, description="Segundos entre consultas a la cola vacía"
+    )
+    jobs_heartbeat_seconds: float = Field(
+        default=5.0, gt=0, description="Segundos entre latidos de un trabajo en ejecución"
+    )
+    jobs_stale_after_seconds: float = Field(
+        default=60.0, gt=0, description="Segundos sin latido tras los que se reclama un trabajo"
+    )
+    jobs_max_attempts: int = Field(default=3, ge=1, description="Intentos máximos por defecto")
+    jobs_retry_base_seconds: float = Field(
+        default=10.0, ge=0, description="Espera antes del primer reintento (se duplica)"
+    )
+    jobs_retry_max_seconds: float = Field(
+        default=600.0, ge=0, description="Espera máxima entre reintentos"
+    )
+
+    # Cierre automático de fichajes abiertos (trabajo periódico fichajes.auto_close)
+    fichaje_max_shift_hours: float = Field(
+        default=12.0,
+        gt=0,
+        le=24,
+        description="Horas tras las que un fichaje sin salida se cierra automáticamente",
+    )
+    fichaje_auto_close_interval_seconds: float = Field(
+        default=900.0, ge=0, description="Segundos entre cierres automáticos (0 = desactivado)"
+    )
+
+    # Particiones mensuales de fichaje en PostgreSQL (trabajo periódico fichajes.partitions)
+    fichaje_partition_months_ahead: int = Field(
+        default=3, ge=1, le=24, description="Meses futuros con la partición ya creada"
+    )
+    fichaje_partition_interval_seconds: float = Field(
+        default=86400.0,
+        ge=0,
+        description="Segundos entre comprobaciones de las particiones futuras (0 = desactivado)",
+    )
+
+    # Censo de presencia en memoria (quién tiene un fichaje abierto)
+    presence_resync_seconds: float = Field(
+        default=300.0,
+        ge=0,
+        description="Segundos entre recargas completas del censo de presencia (0 = solo al arrancar)",
+    )
+
+    # Cumplimiento de jornada y descansos (informe y trabajo fichajes.compliance)
+    compliance_max_daily_hours: float = Field(
+        default=9.0, gt=0, le=24, description="Horas de trabajo máximas en un día"
+    )
+    compliance_max_weekly_hours: float = Field(
+        default=40.0, gt=0, le=168, description="Horas de trabajo máximas en una semana (ISO)"
+    )
+    compliance_min_rest_hours: float = Field(
+        default=12.0,
+        ge=0,
+        le=24,
+        description="Descanso mínimo entre el final de una jornada y el inicio de la siguiente",
+    )
+    compliance_batch_users: int = Field(
+        default=1000, ge=1, description="Usuarios por lote del trabajo fichajes.compliance"
+    )
+    compliance_check_interval_seconds: float = Field(
+        default=0.0,
+        ge=0,
+        description="Segundos entre comprobaciones periódicas de la semana anterior (0 = desactivado)",
+    )
 
     # CORS
     allowed_origins: str = Field(
@@ -65,6 +263,14 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = Field(default="INFO", description="Nivel de logging")
 
+    # Health checks
+    health_db_timeout_seconds: float = Field(
+        default=2.0, gt=0, description="Tiempo máximo del ping a la base de datos en readiness"
+    )
+    health_cache_ttl_seconds: float = Field(
+        default=2.0, ge=0, description="Tiempo que se reutiliza el último resultado de readiness"
+    )
+
     @computed_field
     @property
     def is_development(self) -> bool:
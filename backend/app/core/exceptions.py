@@ -47,3 +47,11 @@ class BadRequestException(AppException):
 
 class ForbiddenException(AppException):
     """Excepción para acceso prohibido (sin permisos)."""
+
+
+class RateLimitException(AppException):
+    """Excepción para peticiones que superan un límite de frecuencia."""
+
+    def __init__(self, message: str, retry_after: float, details: dict[str, Any] | None = None):
+        super().__init__(message, details)
+        self.retry_after = retry_after
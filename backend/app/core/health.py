@@ -0,0 +1,161 @@
+"""
+Sondas de salud de la aplicación.
+
+Implementa la comprobación de readiness: ping a la base de datos con tiempo
+acotado, métricas de saturación del pool y caché de corta duración para que
+las propias sondas no añadan carga.
+"""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.schemas.health import DependencyCheck, PoolStatus, ReadinessResponse
+
+
+class ReadinessProbe:
+    """
+    Comprobación de readiness de un worker.
+
+    El resultado se cachea durante `cache_ttl` segundos y las comprobaciones
+    concurrentes se agrupan en una sola, de modo que un orquestador que sondea
+    con frecuencia no multiplica las consultas a la base de datos.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        timeout: float,
+        cache_ttl: float,
+        max_overflow: int | None = None,
+    ):
+        """
+        Inicializa la sonda.
+
+        Args:
+            engine: Motor asíncrono cuya conectividad se comprueba
+            timeout: Tiempo máximo en segundos para el ping a la base de datos
+            cache_ttl: Segundos durante los que se reutiliza el último resultado
+            max_overflow: `max_overflow` con el que se creó el motor (None o -1 =
+                capacidad desconocida o sin límite: no se calcula la saturación)
+        """
+        self.engine = engine
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_overflow = max_overflow
+        self._cached: ReadinessResponse | None = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def pool_status(self) -> PoolStatus | None:
+        """
+        Obtiene el estado del pool de conexiones sin tocar la base de datos.
+
+        Returns:
+            PoolStatus | None: Estado del pool, o None si el pool no expone métricas
+        """
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return None
+
+        size = pool.size()
+        checked_out = pool.checkedout()
+        # La capacidad sale de la configuración del motor, no de atributos internos del pool
+        max_overflow = self.max_overflow
+        capacity = size + max_overflow if max_overflow is not None and max_overflow >= 0 else None
+
+        return PoolStatus(
+            size=size,
+            checked_out=checked_out,
+            overflow=max(pool.overflow(), 0),
+            capacity=capacity,
+            saturation=round(checked_out / capacity, 3) if capacity else None,
+            exhausted=capacity is not None and checked_out >= capacity,
+        )
+
+    async def check(self) -> ReadinessResponse:
+        """
+        Ejecuta la comprobación de readiness o devuelve el resultado cacheado.
+
+        Returns:
+            ReadinessResponse: Estado de la base de datos y del pool
+        """
+        cached = self._get_cached()
+        if cached is not None:
+            return cached
+
+        async with self._lock:
+            # Otra corrutina pudo completar la comprobación mientras esperábamos
+            cached = self._get_cached()
+            if cached is not None:
+                return cached
+
+            result = await self._run_checks()
+            self._cached = result
+            self._cached_at = time.monotonic()
+            return result
+
+    def invalidate(self) -> None:
+        """Descarta el resultado cacheado."""
+        self._cached = None
+        self._cached_at = 0.0
+
+    # ============================================================================
+    # FUNCIONES AUXILIARES PRIVADAS
+    # ============================================================================
+
+    def _get_cached(self) -> ReadinessResponse | None:
+        """Retorna el resultado cacheado si sigue vigente."""
+        if self._cached is None:
+            return None
+        if time.monotonic() - self._cached_at >= self.cache_ttl:
+            return None
+        return self._cached.model_copy(update={"cached": True})
+
+    async def _run_checks(self) -> ReadinessResponse:
+        """Comprueba el pool y, si hay conexiones libres, hace ping a la base de datos."""
+        pool = self.pool_status()
+
+        # Fallar rápido: pedir una conexión a un pool agotado bloquearía hasta pool_timeout
+        if pool is not None and pool.exhausted:
+            database = DependencyCheck(status="down", error="Pool de conexiones agotado")
+        else:
+            database = await self._ping()
+
+        return ReadinessResponse(
+            status="ready" if database.status == "up" else "unavailable",
+            database=database,
+            pool=pool,
+            checked_at=datetime.now(UTC),
+        )
+
+    async def _ping(self) -> DependencyCheck:
+        """Ejecuta `SELECT 1` con un tiempo máximo de `timeout` segundos."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._execute_ping(), timeout=self.timeout)
+        except TimeoutError:
+            return DependencyCheck(
+                status="down",
+                latency_ms=round((time.perf_counter() - start) * 1000, 2),
+                error=f"Timeout tras {self.timeout}s",
+            )
+        except Exception as exc:
+            return DependencyCheck(
+                status="down",
+                latency_ms=round((time.perf_counter() - start) * 1000, 2),
+                error=type(exc).__name__,
+            )
+
+        return DependencyCheck(
+            status="up", latency_ms=round((time.perf_counter() - start) * 1000, 2)
+        )
+
+    async def _execute_ping(self) -> None:
+        """Abre una conexión del pool y ejecuta una consulta trivial."""
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
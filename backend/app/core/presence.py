@@ -0,0 +1,377 @@
+"""
+Censo de presencia: quién tiene ahora mismo un fichaje abierto.
+
+Cada proceso mantiene en memoria el fichaje abierto (sin check-out) de cada
+usuario, así que consultar quién está dentro no hace ninguna consulta:
+
+- Se carga al arrancar con la consulta de fichajes abiertos (índice parcial
+  `ix_fichaje_open_user_id`).
+- El check-in y el check-out registran el cambio en la sesión y se aplica a
+  la memoria tras el commit; un rollback lo descarta.
+- En PostgreSQL el mismo cambio se publica con `pg_notify` dentro de la
+  transacción, de modo que solo llega a los demás procesos si se confirma.
+  Cada proceso lo recibe con `LISTEN` en una conexión dedicada.
+- Los cambios que afectan a varios fichajes (cierre automático, aprobación
+  de correcciones) publican una recarga completa en lugar de cada fila.
+
+Además se recarga todo cada `presence_resync_seconds`. Cubre SQLite, que no
+tiene canal entre procesos (p. ej. el cierre automático en
+`scripts/run_jobs.py`), y las notificaciones perdidas mientras la conexión de
+escucha estaba caída. El nombre o el email de un usuario que cambie mientras
+está dentro se actualizan con la siguiente recarga.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from dataclasses import replace
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, settings
+from app.database import engine as default_engine
+from app.models.fichaje import Fichaje
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.rows import PresenceRow
+
+logger = logging.getLogger(__name__)
+
+# Canal de LISTEN/NOTIFY por el que se propagan los cambios entre procesos
+PRESENCE_CHANNEL = "fichaje_presence"
+
+# Espera antes de reintentar una carga fallida (p. ej. base de datos caída)
+RETRY_SECONDS = 5.0
+
+# Clave de `session.info` con los cambios pendientes del commit
+SESSION_PRESENCE_KEY = "presence_events"
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Los datetime naive (SQLite) se asumen ya en UTC."""
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt
+
+
+class PresenceRoster:
+    """
+    Fichajes abiertos por usuario, en memoria y sincronizados entre procesos.
+
+    Una instancia por proceso. Los cambios se registran con la sesión de la
+    transacción que los produce (`checked_in`, `checked_out`, `invalidate`)
+    y se aplican al confirmarla.
+
+    Example:
+        presence_roster.start()
+        ...
+        presence_roster.entries()
+        ...
+        await presence_roster.stop()
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = default_engine,
+        *,
+        resync_interval: float = 300.0,
+        channel: str = PRESENCE_CHANNEL,
+    ):
+        """
+        Inicializa el censo (vacío hasta la primera carga).
+
+        Args:
+            engine: Motor de la base de datos de la que se carga el censo
+            resync_interval: Segundos entre recargas completas (0 = solo al arrancar)
+            channel: Canal de notificaciones de PostgreSQL
+        """
+        self.engine = engine
+        self.resync_interval = resync_interval
+        self.channel = channel
+        self.synced_at: datetime | None = None
+        self._origin = uuid.uuid4().hex
+        self._session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        self._entries: dict[int, PresenceRow] = {}
+        self._sorted: tuple[PresenceRow, ...] | None = ()
+        self._replay: list[dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._listening = False
+        self._stopping = asyncio.Event()
+        self._reload = asyncio.Event()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "PresenceRoster":
+        """
+        Construye el censo a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            PresenceRoster: Censo configurado
+        """
+        return cls(resync_interval=settings.presence_resync_seconds)
+
+    def entries(self) -> tuple[PresenceRow, ...]:
+        """
+        Fichajes abiertos ordenados por hora de entrada.
+
+        La lista ordenada se reconstruye solo tras un cambio; mientras no
+        cambie, cada lectura devuelve la misma tupla.
+
+        Returns:
+            tuple[PresenceRow, ...]: Un fichaje abierto por usuario
+        """
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self._entries.values(), key=lambda row: row.check_in))
+        return self._sorted
+
+    def get(self, user_id: int) -> PresenceRow | None:
+        """
+        Fichaje abierto de un usuario.
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            PresenceRow | None: Su fichaje abierto, o None si no está dentro
+        """
+        return self._entries.get(user_id)
+
+    def __len__(self) -> int:
+        """Número de usuarios dentro."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Vacía el censo; vuelve a estar sin cargar."""
+        self._entries.clear()
+        self._sorted = ()
+        self.synced_at = None
+
+    async def load(self, session: AsyncSession) -> None:
+        """
+        Reconstruye el censo con los fichajes abiertos de la base de datos.
+
+        Los cambios que se aplican mientras se ejecuta la consulta se vuelven
+        a aplicar sobre el resultado: un commit que la consulta ya no vio no
+        se pierde, y uno que sí vio se aplica dos veces sin efecto.
+
+        Args:
+            session: Sesión de base de datos
+        """
+        async with self._load_lock:
+            started_at = datetime.now(UTC)
+            self._replay = []
+            try:
+                rows = await FichajeRepository(session).get_open_rows()
+            finally:
+                replay, self._replay = self._replay, None
+
+            self._entries = {
+                row.user_id: replace(row, check_in=_as_utc(row.check_in)) for row in rows
+            }
+            self._sorted = None
+            for change in replay:
+                self._apply(change)
+            self.synced_at = started_at
+
+    async def checked_in(self, session: AsyncSession, fichaje: Fichaje, user: User) -> None:
+        """
+        Registra un check-in; se aplica al confirmar la transacción.
+
+        Args:
+            session: Sesión de la transacción del check-in
+            fichaje: Fichaje creado (con ID)
+            user: Usuario que ficha
+        """
+        await self._publish(
+            session,
+            {
+                "op": "in",
+                "fichaje_id": fichaje.id,
+                "user_id": user.id,
+                "user_email": user.email,
+                "user_full_name": user.full_name,
+                "check_in": _as_utc(fichaje.check_in).isoformat(),
+            },
+        )
+
+    async def checked_out(self, session: AsyncSession, fichaje: Fichaje) -> None:
+        """
+        Registra un check-out; se aplica al confirmar la transacción.
+
+        Args:
+            session: Sesión de la transacción del check-out
+            fichaje: Fichaje cerrado
+        """
+        await self._publish(
+            session, {"op": "out", "fichaje_id": fichaje.id, "user_id": fichaje.user_id}
+        )
+
+    async def invalidate(self, session: AsyncSession) -> None:
+        """
+        Pide una recarga completa al confirmar la transacción.
+
+        Para los cambios que afectan a varios fichajes abiertos a la vez.
+
+        Args:
+            session: Sesión de la transacción que los modifica
+        """
+        await self._publish(session, {"op": "reload"})
+
+    def apply(self, change: dict[str, Any]) -> None:
+        """
+        Aplica un cambio confirmado (de este proceso o notificado por otro).
+
+        Args:
+            change: Cambio con su operación (`in`, `out` o `reload`)
+        """
+        if self._replay is not None:
+            self._replay.append(change)
+        self._apply(change)
+
+    def start(self) -> None:
+        """Arranca la tarea que carga el censo y lo mantiene sincronizado."""
+        if self._task is not None:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="presence-roster")
+
+    async def stop(self) -> None:
+        """Para la sincronización y cierra la conexión de escucha."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._reload.set()
+        await self._task
+        self._task = None
+
+    async def _publish(self, session: AsyncSession, change: dict[str, Any]) -> None:
+        """Guarda un cambio para aplicarlo tras el commit y lo notifica en PostgreSQL."""
+        conn = await session.connection()
+        if conn.dialect.name == "postgresql":
+            payload = json.dumps({**change, "origin": self._origin})
+            await session.execute(select(func.pg_notify(self.channel, payload)))
+        session.info.setdefault(SESSION_PRESENCE_KEY, []).append((self, change))
+
+    def _apply(self, change: dict[str, Any]) -> None:
+        """Aplica un cambio al diccionario de fichajes abiertos."""
+        op = change["op"]
+        if op == "reload":
+            self._reload.set()
+            return
+
+        user_id = change["user_id"]
+        if op == "in":
+            self._entries[user_id] = PresenceRow(
+                fichaje_id=change["fichaje_id"],
+                user_id=user_id,
+                user_email=change["user_email"],
+                user_full_name=change["user_full_name"],
+                check_in=datetime.fromisoformat(change["check_in"]),
+            )
+        else:
+            current = self._entries.get(user_id)
+            # Un check-out atrasado no borra un check-in posterior
+            if current is None or current.fichaje_id != change["fichaje_id"]:
+                return
+            del self._entries[user_id]
+        self._sorted = None
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        """Callback de asyncpg para las notificaciones del canal."""
+        try:
+            change = json.loads(payload)
+            # Los cambios propios ya se aplicaron al confirmar la transacción
+            if change.pop("origin", None) != self._origin:
+                self.apply(change)
+        except Exception:
+            logger.exception("Notificación de presencia no válida: %s", payload)
+
+    def _on_listener_lost(self, _connection: Any) -> None:
+        """La conexión de escucha se cerró: reconectar y recargar."""
+        self._listening = False
+        self._reload.set()
+
+    async def _run(self) -> None:
+        """Carga el censo y lo recarga cuando toca hasta que se pare."""
+        listener: AsyncConnection | None = None
+        try:
+            while not self._stopping.is_set():
+                self._reload.clear()
+                timeout = self.resync_interval or None
+                try:
+                    if self.engine.dialect.name == "postgresql" and not self._listening:
+                        if listener is not None:
+                            await self._unlisten(listener)
+                        listener = await self._listen()
+                    # Tras (re)conectar hay que recargar: se han podido perder notificaciones
+                    async with self._session_factory() as session:
+                        await self.load(session)
+                except Exception:
+                    logger.exception("Error al sincronizar el censo de presencia")
+                    timeout = RETRY_SECONDS
+
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._reload.wait(), timeout=timeout)
+        finally:
+            self._listening = False
+            if listener is not None:
+                await self._unlisten(listener)
+
+    async def _listen(self) -> AsyncConnection:
+        """Abre la conexión dedicada con el LISTEN del canal (solo PostgreSQL)."""
+        conn = await self.engine.connect()
+        try:
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.add_listener(self.channel, self._on_notify)
+            raw.driver_connection.add_termination_listener(self._on_listener_lost)
+        except Exception:
+            await conn.close()
+            raise
+        self._listening = True
+        return conn
+
+    async def _unlisten(self, conn: AsyncConnection) -> None:
+        """Quita el LISTEN antes de devolver la conexión al pool."""
+        with contextlib.suppress(Exception):
+            raw = await conn.get_raw_connection()
+            raw.driver_connection.remove_termination_listener(self._on_listener_lost)
+            await raw.driver_connection.remove_listener(self.channel, self._on_notify)
+        with contextlib.suppress(Exception):
+            await conn.close()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session: Session) -> None:
+    """Aplica al censo los cambios de la transacción recién confirmada."""
+    # RELEASE SAVEPOINT también dispara el evento: solo cuenta el commit exterior
+    if session.in_nested_transaction():
+        return
+    for roster, change in session.info.pop(SESSION_PRESENCE_KEY, ()):
+        roster.apply(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session: Session) -> None:
+    """Descarta los cambios de una transacción deshecha."""
+    changes = session.info.pop(SESSION_PRESENCE_KEY, None)
+    if changes and session.in_nested_transaction():
+        # No se sabe qué cambios eran del savepoint: la transacción exterior
+        # sigue y, si se confirma, el censo se recarga entero
+        rosters = {id(roster): roster for roster, _ in changes}.values()
+        session.info[SESSION_PRESENCE_KEY] = [(roster, {"op": "reload"}) for roster in rosters]
+
+
+# Censo de presencia del proceso
+presence_roster = PresenceRoster.from_settings(settings)
+
+
+def get_presence_roster() -> PresenceRoster:
+    """Dependency que devuelve el censo de presencia del proceso."""
+    return presence_roster
@@ -0,0 +1,255 @@
+"""
+Limitación de intentos de login con token buckets.
+
+Cada IP y cada email tienen un bucket con `capacity` intentos que se
+recargan a ritmo constante. El limitador se consulta antes de tocar la base
+de datos o verificar la contraseña, de modo que un ataque de credential
+stuffing solo consume el CPU de los intentos que caben en los buckets.
+
+El almacenamiento de los buckets es intercambiable (`RateLimitBackend`): por
+defecto vive en la memoria del proceso, con límites por worker; un backend
+compartido (p. ej. Redis) aplicaría los límites entre todos los workers.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from hashlib import blake2b
+
+from starlette.requests import Request
+
+from app.core.config import Settings, settings
+from app.core.exceptions import RateLimitException
+
+
+class RateLimitBackend(ABC):
+    """Almacenamiento de token buckets."""
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """
+        Consume un token del bucket de `key`.
+
+        Args:
+            key: Clave del bucket
+            capacity: Tokens máximos (ráfaga permitida)
+            refill_per_second: Tokens que se recargan por segundo
+
+        Returns:
+            float: 0 si se consumió el token; si no, segundos hasta el siguiente
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de buckets almacenados."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Elimina todos los buckets."""
+
+
+class InMemoryTokenBuckets(RateLimitBackend):
+    """
+    Token buckets en un `dict` del proceso.
+
+    Cada bucket ocupa una entrada `hash de 64 bits -> (tokens, instante)`: no
+    se guardan las IPs ni los emails. Al llegar a `max_keys` se descartan los
+    buckets que ya se habrían recargado por completo y, si no basta, los más
+    antiguos.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_keys: Número máximo de buckets en memoria
+        """
+        self.max_keys = max_keys
+        self._buckets: dict[int, tuple[float, float]] = {}
+        self._full_after: dict[int, float] = {}
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Consume un token del bucket de `key` (ver `RateLimitBackend.take`)."""
+        digest = int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little")
+        now = time.monotonic()
+
+        bucket = self._buckets.get(digest)
+        if bucket is None:
+            self._make_room(now)
+            tokens = capacity
+        else:
+            stored, updated_at = bucket
+            tokens = min(capacity, stored + (now - updated_at) * refill_per_second)
+
+        if tokens < 1:
+            self._buckets[digest] = (tokens, now)
+            return (1 - tokens) / refill_per_second
+
+        tokens -= 1
+        self._buckets[digest] = (tokens, now)
+        self._full_after[digest] = now + (capacity - tokens) / refill_per_second
+        return 0.0
+
+    def __len__(self) -> int:
+        """Número de buckets almacenados."""
+        return len(self._buckets)
+
+    def clear(self) -> None:
+        """Elimina todos los buckets."""
+        self._buckets.clear()
+        self._full_after.clear()
+
+    def _make_room(self, now: float) -> None:
+        """Libera espacio para un bucket nuevo si se alcanzó `max_keys`."""
+        if len(self._buckets) < self.max_keys:
+            return
+
+        # Un bucket recargado del todo equivale a no tenerlo
+        for digest in [d for d, full_at in self._full_after.items() if full_at <= now]:
+            self._buckets.pop(digest, None)
+            del self._full_after[digest]
+
+        while len(self._buckets) >= self.max_keys:
+            digest = next(iter(self._buckets))
+            del self._buckets[digest]
+            self._full_after.pop(digest, None)
+
+
+@dataclass(slots=True)
+class RateLimitMetrics:
+    """Contadores del limitador de login."""
+
+    allowed: int = 0
+    rejected_ip: int = 0
+    rejected_email: int = 0
+
+
+class LoginRateLimiter:
+    """Limita los intentos de login por IP y por email."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_capacity: int = 30,
+        ip_per_minute: float = 30.0,
+        email_capacity: int = 5,
+        email_per_minute: float = 2.0,
+        enabled: bool = True,
+    ):
+        """
+        Inicializa el limitador.
+
+        Args:
+            backend: Almacenamiento de los buckets
+            ip_capacity: Intentos seguidos permitidos desde una IP
+            ip_per_minute: Intentos por minuto recuperados por IP
+            email_capacity: Intentos seguidos permitidos para un email
+            email_per_minute: Intentos por minuto recuperados por email
+            enabled: Si es False, `check` no limita nada
+        """
+        self.backend = backend
+        self.ip_capacity = ip_capacity
+        self.ip_refill = ip_per_minute / 60
+        self.email_capacity = email_capacity
+        self.email_refill = email_per_minute / 60
+        self.enabled = enabled
+        self.metrics = RateLimitMetrics()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LoginRateLimiter":
+        """
+        Construye el limitador (con buckets en memoria) a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            LoginRateLimiter: Limitador configurado
+        """
+        return cls(
+            InMemoryTokenBuckets(max_keys=settings.login_rate_limit_max_keys),
+            ip_capacity=settings.login_rate_limit_ip_burst,
+            ip_per_minute=settings.login_rate_limit_ip_per_minute,
+            email_capacity=settings.login_rate_limit_email_burst,
+            email_per_minute=settings.login_rate_limit_email_per_minute,
+            enabled=settings.login_rate_limit_enabled,
+        )
+
+    async def check(self, ip: str, email: str) -> None:
+        """
+        Consume un intento de la IP y del email.
+
+        Si la IP ya está limitada no se consume el intento del email, para que
+        un atacante no pueda bloquear cuentas ajenas desde una IP ya frenada.
+
+        Args:
+            ip: IP del cliente
+            email: Email del intento de login
+
+        Raises:
+            RateLimitException: Si la IP o el email superan su límite
+        """
+        if not self.enabled:
+            return
+
+        retry_after = await self.backend.take(f"ip:{ip}", self.ip_capacity, self.ip_refill)
+        if retry_after:
+            self.metrics.rejected_ip += 1
+            msg = "Demasiados intentos de login desde esta IP"
+            raise RateLimitException(msg, retry_after=retry_after)
+
+        normalized = email.strip().lower()
+        retry_after = await self.backend.take(
+            f"email:{normalized}", self.email_capacity, self.email_refill
+        )
+        if retry_after:
+            self.metrics.rejected_email += 1
+            msg = "Demasiados intentos de login para esta cuenta"
+            raise RateLimitException(msg, retry_after=retry_after)
+
+        self.metrics.allowed += 1
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Devuelve las métricas actuales.
+
+        Returns:
+            dict: Contadores y número de buckets en memoria
+        """
+        return {**asdict(self.metrics), "tracked_keys": len(self.backend)}
+
+    def reset(self) -> None:
+        """Vacía los buckets y pone a cero las métricas."""
+        self.backend.clear()
+        self.metrics = RateLimitMetrics()
+
+
+# Limitador de login del proceso
+login_rate_limiter = LoginRateLimiter.from_settings(settings)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    IP del cliente de una petición.
+
+    Con `login_rate_limit_trust_forwarded_for` se usa la última IP de
+    `X-Forwarded-For` (la que añade el proxy propio; las anteriores las
+    controla el cliente).
+
+    Args:
+        request: Petición HTTP
+
+    Returns:
+        str: IP del cliente ("unknown" si no se conoce)
+    """
+    if settings.login_rate_limit_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def get_login_rate_limiter() -> LoginRateLimiter:
+    """Dependency que devuelve el limitador de login del proceso."""
+    return login_rate_limiter
@@ -0,0 +1,241 @@
+"""
+Almacén de revocación de tokens.
+
+La fuente de verdad es la tabla `revoked_token`; delante hay un filtro de
+Bloom en memoria con todos los `jti` revocados y aún no expirados, de modo
+que comprobar un token no revocado (el caso habitual) no hace ninguna
+consulta. Solo los positivos del filtro (revocados reales o falsos
+positivos) pasan por una LRU y, si no están en ella, por la base de datos.
+
+Cada proceso sincroniza el filtro con la tabla de forma incremental cada
+`revocation_sync_seconds`: una revocación hecha en otro proceso se aplica
+como mucho tras ese intervalo. Las del propio proceso son inmediatas.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from hashlib import blake2b
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, settings
+from app.models.revoked_token import RevokedToken
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+# Solape entre sincronizaciones para no perder filas con `created_at` del
+# pasado (relojes desfasados entre procesos o transacciones largas)
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre un `bytearray` con doble hashing (blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Dimensiona el filtro.
+
+        Args:
+            capacity: Número de elementos previstos
+            error_rate: Tasa de falsos positivos con `capacity` elementos
+        """
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        """Posiciones de bit de un elemento."""
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """Añade un elemento al filtro (`count` no cuenta los ya presentes)."""
+        bits = self._bits
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        self.count += added
+
+    def __contains__(self, item: str) -> bool:
+        """False si el elemento seguro que no está; True si puede estar."""
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationStore:
+    """
+    Comprueba y registra revocaciones de tokens por su `jti`.
+
+    Una instancia por proceso. Los métodos reciben la sesión de la petición
+    en curso para las escrituras y las consultas que no resuelve la memoria.
+    """
+
+    def __init__(
+        self,
+        sync_interval: float = 5.0,
+        bloom_capacity: int = 100_000,
+        bloom_error_rate: float = 0.001,
+        lru_size: int = 10_000,
+    ):
+        """
+        Inicializa el almacén (vacío hasta la primera sincronización).
+
+        Args:
+            sync_interval: Segundos entre sincronizaciones con la base de datos
+            bloom_capacity: Revocaciones activas previstas
+            bloom_error_rate: Tasa de falsos positivos del filtro
+            lru_size: Resultados de consultas cacheados (0 la desactiva)
+        """
+        self.sync_interval = sync_interval
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.lru_size = lru_size
+        self._bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._lru: OrderedDict[str, bool] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._next_sync = 0.0
+        self._watermark: datetime | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RevocationStore":
+        """
+        Construye el almacén a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            RevocationStore: Almacén configurado
+        """
+        return cls(
+            sync_interval=settings.revocation_sync_seconds,
+            bloom_capacity=settings.revocation_bloom_capacity,
+            bloom_error_rate=settings.revocation_bloom_error_rate,
+            lru_size=settings.revocation_lru_size,
+        )
+
+    async def is_revoked(self, session: AsyncSession, jti: str) -> bool:
+        """
+        Comprueba si un token está revocado.
+
+        Args:
+            session: Sesión de base de datos
+            jti: ID del token
+
+        Returns:
+            bool: True si está revocado
+        """
+        await self._maybe_sync(session)
+
+        if jti not in self._bloom:
+            return False
+
+        cached = self._lru.get(jti)
+        if cached is not None:
+            self._lru.move_to_end(jti)
+            return cached
+
+        revoked = await RevokedTokenRepository(session).exists(jti)
+        self._remember(jti, revoked)
+        return revoked
+
+    async def revoke(
+        self,
+        session: AsyncSession,
+        jti: str,
+        user_id: int,
+        token_type: str,
+        expires_at: datetime,
+    ) -> bool:
+        """
+        Revoca un token.
+
+        Args:
+            session: Sesión de base de datos
+            jti: ID del token
+            user_id: ID del usuario del token
+            token_type: Tipo de token (access o refresh)
+            expires_at: Expiración del token
+
+        Returns:
+            bool: True si se revocó, False si ya estaba revocado
+        """
+        revoked = await RevokedTokenRepository(session).add(
+            RevokedToken(jti=jti, user_id=user_id, token_type=token_type, expires_at=expires_at)
+        )
+        self._mark_revoked(jti)
+        return revoked
+
+    def clear(self) -> None:
+        """Vacía la memoria; la siguiente comprobación recarga desde la base de datos."""
+        self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+        self._lru.clear()
+        self._loaded = False
+        self._next_sync = 0.0
+        self._watermark = None
+
+    def _mark_revoked(self, jti: str) -> None:
+        """Registra en memoria un `jti` revocado."""
+        self._bloom.add(jti)
+        self._remember(jti, True)
+
+    def _remember(self, jti: str, revoked: bool) -> None:
+        """Guarda un resultado en la LRU."""
+        if self.lru_size <= 0:
+            return
+        self._lru[jti] = revoked
+        self._lru.move_to_end(jti)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    async def _maybe_sync(self, session: AsyncSession) -> None:
+        """
+        Sincroniza el filtro con la base de datos si toca.
+
+        La primera vez (o si el filtro supera su capacidad) lo reconstruye con
+        todas las revocaciones activas, descartando las ya expiradas; después
+        solo lee las filas nuevas desde la última sincronización.
+        """
+        now = time.monotonic()
+        if self._loaded and (now < self._next_sync or self._lock.locked()):
+            return
+
+        async with self._lock:
+            if self._loaded and time.monotonic() < self._next_sync:
+                return
+
+            rebuild = not self._loaded or self._bloom.count >= self.bloom_capacity
+            since = None if rebuild or self._watermark is None else self._watermark - SYNC_OVERLAP
+            started_at = datetime.now(UTC)
+            jtis = await RevokedTokenRepository(session).get_jtis(since)
+
+            if rebuild:
+                self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+                self._lru.clear()
+            for jti in jtis:
+                self._bloom.add(jti)
+                if jti in self._lru:
+                    self._lru[jti] = True
+
+            self._loaded = True
+            self._watermark = started_at
+            self._next_sync = time.monotonic() + self.sync_interval
+
+
+# Almacén de revocaciones del proceso
+revocation_store = RevocationStore.from_settings(settings)
+
+
+def get_revocation_store() -> RevocationStore:
+    """Dependency que devuelve el almacén de revocaciones del proceso."""
+    return revocation_store
@@ -4,16 +4,78 @@ Módulo de seguridad - Autenticación y autorización.
 Maneja el hashing de contraseñas, generación y validación de JWT tokens.
 """
 
-from datetime import UTC, datetime, timedelta
+import asyncio
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any
 
-import jwt
 from passlib.context import CryptContext
+from passlib.hash import argon2
+
+from app.core.config import Settings, settings
+from app.core.tokens import TokenService
+
+
+def build_password_context(settings: Settings) -> CryptContext:
+    """
+    Construye el contexto de hashing con los parámetros de la configuración.
+
+    Los hashes nuevos usan `password_hash_scheme` con su coste configurado.
+    Los hashes de otro esquema o con otro coste se siguen verificando, pero
+    quedan marcados para rehash (`needs_update`) en el siguiente login.
+
+    Args:
+        settings: Configuración de la aplicación
+
+    Returns:
+        CryptContext: Contexto de passlib
+
+    Raises:
+        RuntimeError: Si se elige argon2 sin backend instalado (`argon2-cffi`)
+    """
+    argon2_available = argon2.has_backend()
+    if settings.password_hash_scheme == "argon2" and not argon2_available:
+        msg = "Hashing argon2 no disponible: instala passlib[argon2]"
+        raise RuntimeError(msg)
+
+    schemes = ["bcrypt", "argon2"] if argon2_available else ["bcrypt"]
+    return CryptContext(
+        schemes=schemes,
+        default=settings.password_hash_scheme,
+        deprecated="auto",
+        # min = max = default: un cambio de coste en cualquier sentido provoca rehash
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+        argon2__type="ID",
+        argon2__default_rounds=settings.argon2_time_cost,
+        argon2__min_rounds=settings.argon2_time_cost,
+        argon2__max_rounds=settings.argon2_time_cost,
+        argon2__memory_cost=settings.argon2_memory_cost,
+        argon2__parallelism=settings.argon2_parallelism,
+    )
 
-from app.core.config import settings
 
 # Contexto de encriptación para passwords
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context(settings)
+
+# Hilos para verificar contraseñas fuera del event loop. bcrypt y argon2
+# liberan el GIL, así que el tamaño del pool acota el CPU que puede consumir
+# el login aunque lleguen muchos intentos a la vez (el resto espera en cola)
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+)
+
+# Hash ficticio para emails desconocidos: (contexto con el que se generó, hash)
+_dummy_hash: tuple[CryptContext, str] | None = None
+
+# Servicio de tokens con las claves ya preparadas (una instancia por proceso)
+token_service = TokenService.from_settings(settings)
+
+# Valores del claim `type`
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -30,6 +92,74 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifica una contraseña y, si su hash está desactualizado, genera uno nuevo.
+
+    Args:
+        plain_password: Contraseña en texto plano
+        hashed_password: Contraseña hasheada
+
+    Returns:
+        tuple: (True si coinciden, hash nuevo con los parámetros actuales o
+            None si el hash guardado ya está al día o no coinciden)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Versión de `verify_and_update_password` que se ejecuta en `password_executor`.
+
+    Args:
+        plain_password: Contraseña en texto plano
+        hashed_password: Contraseña hasheada
+
+    Returns:
+        tuple: (True si coinciden, hash nuevo o None)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, verify_and_update_password, plain_password, hashed_password
+    )
+
+
+def dummy_password_hash() -> str:
+    """
+    Hash de una contraseña aleatoria con los parámetros actuales.
+
+    Se calcula una vez por contexto de hashing (se recalcula si cambia) y se
+    usa para que un login con email desconocido cueste lo mismo que uno con
+    contraseña incorrecta.
+
+    Returns:
+        str: Hash que ninguna contraseña verifica en la práctica
+    """
+    global _dummy_hash  # noqa: PLW0603
+    if _dummy_hash is None or _dummy_hash[0] is not pwd_context:
+        _dummy_hash = (pwd_context, pwd_context.hash(secrets.token_urlsafe(32)))
+    return _dummy_hash[1]
+
+
+async def verify_dummy_password_async(plain_password: str) -> None:
+    """
+    Verifica una contraseña contra el hash ficticio en `password_executor`.
+
+    Iguala el tiempo de respuesta de un login con email desconocido al de
+    uno real, sin revelar si la cuenta existe. El resultado se descarta.
+
+    Args:
+        plain_password: Contraseña en texto plano recibida
+    """
+    hashed = dummy_password_hash()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(password_executor, verify_password, plain_password, hashed)
+
+
 def get_password_hash(password: str) -> str:
     """
     Genera un hash seguro de una contraseña.
@@ -43,6 +173,22 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _create_token(data: dict[str, Any], token_type: str, expires_delta: timedelta) -> str:
+    """
+    Firma un token con un `jti` único (para poder revocarlo) y su tipo.
+
+    Args:
+        data: Datos a incluir en el token
+        token_type: Tipo de token (claim `type`)
+        expires_delta: Tiempo de validez del token
+
+    Returns:
+        str: Token JWT codificado
+    """
+    claims = {**data, "type": token_type, "jti": secrets.token_urlsafe(16)}
+    return token_service.encode(claims, expires_delta)
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """
     Crea un token de acceso JWT.
@@ -54,23 +200,19 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     Returns:
         str: Token JWT codificado
     """
-    to_encode = data.copy()
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
 
-    if expires_delta:
-        expire = datetime.now(UTC) + expires_delta
-    else:
-        expire = datetime.now(UTC) + timedelta(minutes=settings.access_token_expire_minutes)
-
-    to_encode.update({"exp": expire})
-
-    # PyJWT encode devuelve str directamente
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    return _create_token(data, ACCESS_TOKEN_TYPE, expires_delta)
 
 
 def create_refresh_token(data: dict[str, Any]) -> str:
     """
     Crea un token JWT de refresh.
 
+    Solo sirve para obtener un nuevo par de tokens en `/api/auth/refresh`;
+    no se acepta como token de acceso.
+
     Args:
         data: Datos a incluir en el token
 
@@ -78,7 +220,7 @@ def create_refresh_token(data: dict[str, Any]) -> str:
         str: Token JWT codificado
     """
     expires_delta = timedelta(days=settings.refresh_token_expire_days)
-    return create_access_token(data, expires_delta)
+    return _create_token(data, REFRESH_TOKEN_TYPE, expires_delta)
 
 
 def decode_token(token: str) -> dict[str, Any]:
@@ -96,5 +238,4 @@ def decode_token(token: str) -> dict[str, Any]:
         jwt.DecodeError: Si el token no puede ser decodificado
         jwt.InvalidTokenError: Si el token es inválido
     """
-    # PyJWT decode devuelve dict directamente
-    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    return token_service.decode(token)
@@ -0,0 +1,260 @@
+"""
+Servicio de tokens JWT.
+
+Centraliza la firma y verificación de tokens con el material de claves ya
+preparado (sin reconstruir la lista de algoritmos ni volver a parsear claves
+PEM en cada petición), rotación de claves mediante la cabecera `kid` y una
+caché de corta duración de tokens ya verificados.
+
+Los algoritmos asimétricos (RS*, PS*, ES*, EdDSA) requieren `pyjwt[crypto]`.
+Con ellos, otros servicios pueden verificar los tokens con la clave pública
+publicada en el JWKS sin llamar a esta API.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import jwt
+from jwt import PyJWK
+from jwt.utils import base64url_decode
+
+from app.core.config import Settings
+
+
+@dataclass(frozen=True, slots=True)
+class TokenKey:
+    """Clave de firma o verificación identificada por su `kid`."""
+
+    kid: str
+    algorithm: str
+    verification_key: PyJWK
+    signing_key: PyJWK | None = None
+
+    @property
+    def is_symmetric(self) -> bool:
+        """True si es una clave HMAC (secreto compartido, nunca se publica)."""
+        return self.algorithm.startswith("HS")
+
+    @classmethod
+    def load(cls, kid: str, algorithm: str, material: str | bytes, signing: bool) -> "TokenKey":
+        """
+        Prepara una clave a partir de un secreto HMAC o de una clave PEM.
+
+        Args:
+            kid: Identificador de la clave
+            algorithm: Algoritmo JWT
+            material: Secreto HMAC, o clave PEM (privada si `signing`, pública si no)
+            signing: Si la clave se usa también para firmar
+
+        Returns:
+            TokenKey: Clave preparada
+
+        Raises:
+            RuntimeError: Si el algoritmo no está disponible (falta `cryptography`)
+        """
+        try:
+            alg = jwt.get_algorithm_by_name(algorithm)
+        except NotImplementedError as exc:
+            msg = f"Algoritmo JWT {algorithm} no disponible: instala pyjwt[crypto]"
+            raise RuntimeError(msg) from exc
+
+        prepared = alg.prepare_key(material)
+        public = prepared.public_key() if signing and hasattr(prepared, "public_key") else prepared
+
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            verification_key=PyJWK(alg.to_jwk(public, as_dict=True), algorithm),
+            signing_key=PyJWK(alg.to_jwk(prepared, as_dict=True), algorithm) if signing else None,
+        )
+
+
+class TokenService:
+    """
+    Firma y verifica tokens JWT.
+
+    Los tokens se firman con la clave actual e incluyen su `kid`; se aceptan
+    los firmados con cualquiera de las claves de verificación (rotación). Los
+    tokens sin `kid` (emitidos antes de la rotación) se verifican con la clave
+    actual. Los claims verificados se cachean durante `cache_ttl` segundos,
+    nunca más allá de su `exp`.
+    """
+
+    def __init__(
+        self,
+        signing_key: TokenKey,
+        verification_keys: list[TokenKey] | None = None,
+        cache_ttl: float = 30.0,
+        cache_max_size: int = 10_000,
+    ):
+        """
+        Inicializa el servicio.
+
+        Args:
+            signing_key: Clave actual (firma y verificación)
+            verification_keys: Claves anteriores aceptadas solo para verificar
+            cache_ttl: Segundos que se reutilizan los claims de un token verificado
+            cache_max_size: Número máximo de tokens en caché (0 desactiva la caché)
+        """
+        if signing_key.signing_key is None:
+            msg = f"La clave {signing_key.kid} no puede firmar tokens"
+            raise ValueError(msg)
+
+        self.signing_key = signing_key
+        self.keys = {key.kid: key for key in [*(verification_keys or []), signing_key]}
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self._decoder = jwt.PyJWT(options={"require": ["exp"]})
+        self._headers = {"kid": signing_key.kid}
+        self._cache: dict[str, tuple[dict[str, Any], float]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TokenService":
+        """
+        Construye el servicio a partir de la configuración.
+
+        Con un algoritmo HMAC se firma con `secret_key`; con uno asimétrico,
+        con la clave privada de `jwt_private_key_file`.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            TokenService: Servicio configurado
+        """
+        if settings.algorithm.startswith("HS"):
+            material: str | bytes = settings.secret_key
+        else:
+            material = Path(settings.jwt_private_key_file).read_bytes()
+
+        signing_key = TokenKey.load(settings.jwt_key_id, settings.algorithm, material, signing=True)
+        previous = [
+            TokenKey.load(
+                key.kid,
+                key.algorithm,
+                key.key if key.algorithm.startswith("HS") else Path(key.key).read_bytes(),
+                signing=False,
+            )
+            for key in settings.jwt_previous_keys
+        ]
+        return cls(
+            signing_key,
+            previous,
+            cache_ttl=settings.token_cache_ttl_seconds,
+            cache_max_size=settings.token_cache_max_size,
+        )
+
+    def encode(self, claims: dict[str, Any], expires_delta: timedelta) -> str:
+        """
+        Firma un token con la clave actual.
+
+        Args:
+            claims: Claims a incluir en el token
+            expires_delta: Tiempo de validez del token
+
+        Returns:
+            str: Token JWT codificado
+        """
+        payload = {**claims, "exp": datetime.now(UTC) + expires_delta}
+        return jwt.encode(
+            payload,
+            self.signing_key.signing_key,  # type: ignore[arg-type]
+            algorithm=self.signing_key.algorithm,
+            headers=self._headers,
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """
+        Verifica un token y devuelve sus claims.
+
+        Args:
+            token: Token JWT
+
+        Returns:
+            dict: Claims del token (copia, se puede modificar)
+
+        Raises:
+            jwt.ExpiredSignatureError: Si el token ha expirado
+            jwt.InvalidTokenError: Si el token es inválido o su `kid` no es conocido
+        """
+        now = time.time()
+        cached = self._cache.get(token)
+        if cached is not None:
+            claims, expires_at = cached
+            if now < expires_at:
+                return dict(claims)
+            self._cache.pop(token, None)
+
+        key = self._key_for(token)
+
+        # El PyJWK fija el algoritmo aceptado: no hace falta pasar `algorithms`
+        claims = self._decoder.decode(token, key.verification_key)
+        self._remember(token, claims, now)
+        return dict(claims)
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Devuelve las claves públicas en formato JWKS.
+
+        Las claves HMAC no se publican nunca: con ellas el JWKS queda vacío.
+
+        Returns:
+            dict: Documento JWKS con las claves públicas activas
+        """
+        keys = []
+        for key in self.keys.values():
+            if key.is_symmetric:
+                continue
+            alg = jwt.get_algorithm_by_name(key.algorithm)
+            jwk = alg.to_jwk(key.verification_key.key, as_dict=True)
+            keys.append({**jwk, "kid": key.kid, "alg": key.algorithm, "use": "sig"})
+        return {"keys": keys}
+
+    def clear_cache(self) -> None:
+        """Vacía la caché de tokens verificados."""
+        self._cache.clear()
+
+    def _key_for(self, token: str) -> TokenKey:
+        """
+        Elige la clave de verificación según el `kid` de la cabecera.
+
+        Con una sola clave no se lee la cabecera: el algoritmo ya está fijado
+        por la clave y PyJWT la valida al verificar. Con varias, solo se
+        decodifica el segmento de cabecera (sin parsear el resto del token).
+        """
+        if len(self.keys) == 1:
+            return self.signing_key
+
+        msg = "Cabecera del token inválida"
+        try:
+            header = json.loads(base64url_decode(token.split(".", 1)[0]))
+        except ValueError as exc:
+            raise jwt.DecodeError(msg) from exc
+        # Cabecera y kid vienen del cliente: cualquier otro tipo es un token inválido
+        if not isinstance(header, dict):
+            raise jwt.DecodeError(msg)
+        kid = header.get("kid", self.signing_key.kid)
+        if not isinstance(kid, str):
+            raise jwt.DecodeError(msg)
+
+        key = self.keys.get(kid)
+        if key is None:
+            msg = f"Clave de firma desconocida: {kid}"
+            raise jwt.InvalidTokenError(msg)
+        return key
+
+    def _remember(self, token: str, claims: dict[str, Any], now: float) -> None:
+        """Cachea los claims verificados sin superar el `exp` del token."""
+        if self.cache_ttl <= 0 or self.cache_max_size <= 0:
+            return
+
+        if len(self._cache) >= self.cache_max_size:
+            self._cache = {t: entry for t, entry in self._cache.items() if entry[1] > now}
+            if len(self._cache) >= self.cache_max_size:
+                return
+
+        self._cache[token] = (claims, min(now + self.cache_ttl, float(claims["exp"])))
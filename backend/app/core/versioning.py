@@ -0,0 +1,97 @@
+"""
+Control de concurrencia optimista.
+
+`Solicitud` y `Fichaje` tienen una columna `version` (`version_id_col`): el
+ORM la incrementa en cada UPDATE y la añade al WHERE. Los endpoints que los
+modifican aceptan la versión leída por el cliente en la cabecera `If-Match`.
+
+Los conflictos se detectan sin consultas adicionales:
+
+- `ensure_version` compara el `If-Match` con la fila que el servicio ya ha
+  cargado para validarla.
+- `stale_data_as_conflict` traduce el `StaleDataError` del flush (la fila
+  cambió entre la lectura y la escritura) a `ConflictException` (409).
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.exceptions import BadRequestException, ConflictException
+
+
+def parse_if_match(value: str | None) -> int | None:
+    """
+    Interpreta la cabecera `If-Match` como versión esperada.
+
+    Acepta el ETag que devuelve la API (`"3"`), su forma débil (`W/"3"`) o el
+    número sin comillas. `*` equivale a no indicar versión.
+
+    Args:
+        value: Valor de la cabecera (None si no se envió)
+
+    Returns:
+        int | None: Versión esperada o None si no hay precondición
+
+    Raises:
+        BadRequestException: Si el valor no es una versión
+    """
+    if value is None or value.strip() == "*":
+        return None
+
+    tag = value.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        msg = "La cabecera If-Match debe contener la versión del recurso"
+        raise BadRequestException(msg, details={"if_match": value})
+    return int(tag)
+
+
+def etag(version: int) -> str:
+    """
+    Construye el ETag de una versión.
+
+    Args:
+        version: Versión del recurso
+
+    Returns:
+        str: ETag fuerte (`"<version>"`)
+    """
+    return f'"{version}"'
+
+
+def ensure_version(label: str, current: int, expected: int | None) -> None:
+    """
+    Comprueba la precondición `If-Match` contra la versión ya cargada.
+
+    Args:
+        label: Recurso para el mensaje (ej: "La solicitud")
+        current: Versión de la fila leída
+        expected: Versión indicada por el cliente (None = sin precondición)
+
+    Raises:
+        ConflictException: Si el recurso cambió desde que el cliente lo leyó
+    """
+    if expected is not None and expected != current:
+        msg = f"{label} se ha modificado desde que se leyó"
+        raise ConflictException(
+            msg, details={"current_version": current, "expected_version": expected}
+        )
+
+
+@contextmanager
+def stale_data_as_conflict(label: str) -> Iterator[None]:
+    """
+    Traduce una escritura sobre una versión obsoleta a `ConflictException`.
+
+    Args:
+        label: Recurso para el mensaje (ej: "El fichaje")
+
+    Raises:
+        ConflictException: Si el UPDATE versionado no encontró la fila
+    """
+    try:
+        yield
+    except StaleDataError as exc:
+        msg = f"{label} se ha modificado en otra operación simultánea"
+        raise ConflictException(msg) from exc
@@ -5,20 +5,51 @@ Maneja la conexión a la base de datos usando SQLModel (basado en SQLAlchemy).
 Implementa el patrón de AsyncSession para operaciones asíncronas.
 """
 
-from collections.abc import AsyncGenerator
-from typing import Annotated
+import hashlib
+import hmac
+import itertools
+import math
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+from http.cookies import SimpleCookie
+from types import TracebackType
+from typing import Annotated, Any, Self
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    AsyncSessionTransaction,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session
 from sqlmodel import SQLModel
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
+
+def _pool_options(url: str) -> dict[str, int]:
+    """Tamaño del pool configurado (SQLite en memoria usa StaticPool, sin tamaño)."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+    }
+
+
 # Motor de base de datos asíncrono
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
     future=True,
+    **_pool_options(settings.database_url),
 )
 
 # Session maker para crear sesiones asíncronas
@@ -30,6 +61,247 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Réplicas de solo lectura (opcionales)
+replica_engines = [
+    create_async_engine(url, echo=settings.database_echo, future=True, **_pool_options(url))
+    for url in settings.replica_urls_list
+]
+
+# Claves de `session.info` usadas para el enrutado de lecturas
+SESSION_USER_ID_KEY = "user_id"
+SESSION_READ_ROUTER_KEY = "read_router"
+SESSION_WRITES_KEY = "writes"
+SESSION_PENDING_WRITE_KEY = "pending_write"
+
+# Clave del scope ASGI con las escrituras de la petición (ver ReadYourWritesMiddleware)
+SCOPE_WRITES_KEY = "app.writes"
+
+# Clave del scope ASGI con la unidad de trabajo de la petición (ver UnitOfWorkRoute)
+SCOPE_UNIT_OF_WORK_KEY = "app.unit_of_work"
+
+
+class ReadReplicaRouter:
+    """
+    Enruta las sesiones de lectura entre el primario y las réplicas.
+
+    Las réplicas se usan en round-robin. Para garantizar read-your-writes,
+    un usuario que acaba de escribir lee del primario durante
+    `read_your_writes_seconds`, el tiempo que se asume como retraso máximo de
+    replicación. El instante de la escritura viaja en una cookie firmada
+    (`COOKIE_NAME`) que devuelve la petición que escribe, de modo que lo ve
+    cualquier worker que atienda las lecturas siguientes.
+    """
+
+    # Cookie con el usuario y el instante de su última escritura
+    COOKIE_NAME = "last_write"
+
+    def __init__(
+        self,
+        replicas: list[async_sessionmaker[AsyncSession]],
+        read_your_writes_seconds: float,
+        secret_key: str = settings.secret_key,
+    ):
+        """
+        Inicializa el router.
+
+        Args:
+            replicas: Session makers de las réplicas (lista vacía = sin réplicas)
+            read_your_writes_seconds: Ventana tras una escritura en la que se lee del primario
+            secret_key: Clave con la que se firma la cookie (común a todos los workers)
+        """
+        self.replicas = replicas
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._secret_key = secret_key.encode()
+        self._cycle = itertools.cycle(replicas) if replicas else None
+
+    @property
+    def has_replicas(self) -> bool:
+        """Retorna True si hay réplicas configuradas."""
+        return bool(self.replicas)
+
+    def _sign(self, payload: str) -> str:
+        """Firma HMAC-SHA256 de la cookie."""
+        return hmac.new(self._secret_key, payload.encode(), hashlib.sha256).hexdigest()
+
+    def write_token(self, user_id: int, written_at: float | None = None) -> str:
+        """
+        Genera el valor firmado de la cookie de escritura.
+
+        Args:
+            user_id: ID del usuario que escribe
+            written_at: Instante de la escritura (epoch; por defecto, ahora)
+
+        Returns:
+            str: `user_id:milisegundos:firma`
+        """
+        if written_at is None:
+            written_at = time.time()
+        payload = f"{user_id}:{int(written_at * 1000)}"
+        return f"{payload}:{self._sign(payload)}"
+
+    def write_cookie(self, user_id: int) -> str:
+        """
+        Genera la cabecera Set-Cookie que marca una escritura del usuario.
+
+        Args:
+            user_id: ID del usuario que escribe
+
+        Returns:
+            str: Valor de la cabecera Set-Cookie (caduca con la ventana)
+        """
+        cookie = SimpleCookie()
+        cookie[self.COOKIE_NAME] = self.write_token(user_id)
+        morsel = cookie[self.COOKIE_NAME]
+        morsel["max-age"] = math.ceil(self.read_your_writes_seconds)
+        morsel["path"] = "/"
+        morsel["httponly"] = True
+        morsel["samesite"] = "lax"
+        if settings.is_production:
+            morsel["secure"] = True
+        return morsel.OutputString()
+
+    def use_primary(self, user_id: int | None, token: str | None) -> bool:
+        """
+        Indica si las lecturas del usuario deben ir al primario.
+
+        Args:
+            user_id: ID del usuario que lee (None si es anónimo)
+            token: Valor de la cookie de escritura de la petición, si la trae
+
+        Returns:
+            bool: True si no hay réplicas o el usuario escribió hace poco
+        """
+        if not self.replicas:
+            return True
+        if user_id is None or not token:
+            return False
+
+        payload, _, signature = token.rpartition(":")
+        token_user_id, _, written_at = payload.partition(":")
+        # Una cookie manipulada o de otro usuario se ignora
+        if token_user_id != str(user_id) or not hmac.compare_digest(signature, self._sign(payload)):
+            return False
+        try:
+            elapsed = time.time() - int(written_at) / 1000
+        except ValueError:
+            return False
+        return elapsed < self.read_your_writes_seconds
+
+    def replica_session(self) -> AsyncSession:
+        """
+        Abre una sesión en la siguiente réplica.
+
+        Returns:
+            AsyncSession: Sesión sobre una réplica
+
+        Raises:
+            RuntimeError: Si no hay réplicas configuradas
+        """
+        if self._cycle is None:
+            msg = "No hay réplicas de lectura configuradas"
+            raise RuntimeError(msg)
+        return next(self._cycle)()
+
+
+read_router = ReadReplicaRouter(
+    replicas=[
+        async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+        for replica in replica_engines
+    ],
+    read_your_writes_seconds=settings.read_your_writes_seconds,
+)
+
+
+def get_read_router() -> ReadReplicaRouter:
+    """Dependency que retorna el router de lecturas."""
+    return read_router
+
+
+class ReadYourWritesMiddleware:
+    """
+    Añade la cookie de escritura a las respuestas de las peticiones que escriben.
+
+    Deja en el scope una lista donde la sesión de la petición anota el primer
+    usuario cuya escritura se confirma (con su router); al empezar la
+    respuesta se añade la cookie firmada, sea cual sea el tipo de respuesta
+    que devuelva el endpoint. Como `UnitOfWorkRoute` confirma antes de
+    responder, la ventana empieza con la escritura ya en el primario, y una
+    petición que se deshace no lleva cookie.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Inicializa el middleware.
+
+        Args:
+            app: Aplicación ASGI envuelta
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición y marca la respuesta si hubo escrituras."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes: list[tuple[ReadReplicaRouter, int]] = []
+        scope[SCOPE_WRITES_KEY] = writes
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes:
+                router, user_id = writes[0]
+                MutableHeaders(scope=message).append("set-cookie", router.write_cookie(user_id))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _mark_session_write(session: Session) -> None:
+    """Anota que la transacción en curso de la sesión escribe en el primario."""
+    session.info[SESSION_PENDING_WRITE_KEY] = True
+
+
+def _record_session_write(session: Session) -> None:
+    """Anota la escritura del usuario de la sesión para marcar la respuesta con la cookie."""
+    router: ReadReplicaRouter | None = session.info.get(SESSION_READ_ROUTER_KEY)
+    user_id: int | None = session.info.get(SESSION_USER_ID_KEY)
+    writes: list[tuple[ReadReplicaRouter, int]] | None = session.info.get(SESSION_WRITES_KEY)
+    if router is None or not router.has_replicas or user_id is None or writes is None:
+        return
+    if not writes:
+        writes.append((router, user_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, _flush_context: object) -> None:
+    """Las escrituras del ORM cuentan en cuanto se envían al primario."""
+    _mark_session_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Los UPDATE/DELETE/INSERT explícitos también cuentan como escrituras."""
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        _mark_session_write(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    """Solo una escritura confirmada abre la ventana de read-your-writes."""
+    # RELEASE SAVEPOINT también dispara el evento: solo cuenta el commit exterior
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(SESSION_PENDING_WRITE_KEY, False):
+        _record_session_write(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    """Una transacción deshecha no escribió nada."""
+    # Un savepoint deshecho no dice si la transacción exterior ya había escrito
+    if not session.in_nested_transaction():
+        session.info.pop(SESSION_PENDING_WRITE_KEY, None)
+
 
 async def init_db() -> None:
     """
@@ -41,9 +313,108 @@ async def init_db() -> None:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession]:
+class UnitOfWork:
     """
-    Dependency para obtener una sesión de base de datos.
+    Unidad de trabajo: agrupa todas las escrituras en una única transacción.
+
+    Es el único punto donde se hace commit. Los repositorios solo hacen flush,
+    de modo que cada petición (o cada lote de un script) termina con un solo
+    commit, o con un rollback si algo falla. Los servicios que necesiten
+    deshacer solo una parte del trabajo usan `savepoint()`.
+
+    Example:
+        async with UnitOfWork(session) as uow:
+            repo = FichajeRepository(uow.session)
+            await repo.create(fichaje)
+            async with uow.savepoint():
+                ...  # si falla, solo se deshace este bloque
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa la unidad de trabajo.
+
+        Args:
+            session: Sesión asíncrona sobre la que se ejecuta la transacción
+        """
+        self.session = session
+
+    async def __aenter__(self) -> Self:
+        """Abre la unidad de trabajo."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Hace commit si el bloque terminó sin errores y rollback en caso contrario."""
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    async def commit(self) -> None:
+        """
+        Confirma la transacción (un único commit para toda la unidad).
+
+        Si la sesión no tiene transacción abierta (ya se confirmó y no se ha
+        vuelto a usar) no hace nada.
+        """
+        if self.session.in_transaction():
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Deshace la transacción completa."""
+        await self.session.rollback()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[AsyncSessionTransaction]:
+        """
+        Abre un punto de guardado anidado (`SAVEPOINT`).
+
+        Si el bloque lanza una excepción solo se deshacen sus cambios y la
+        excepción se propaga; la transacción exterior sigue abierta.
+
+        Yields:
+            AsyncSessionTransaction: Transacción anidada
+        """
+        async with self.session.begin_nested() as nested:
+            yield nested
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """
+    Abre una sesión nueva con su unidad de trabajo, para uso fuera de peticiones.
+
+    Pensado para scripts y tareas en segundo plano.
+
+    Yields:
+        UnitOfWork: Unidad de trabajo sobre una sesión nueva
+    """
+    async with AsyncSessionLocal() as session, UnitOfWork(session) as uow:
+        yield uow
+
+
+async def get_session(
+    request: Request,
+    router: Annotated[ReadReplicaRouter, Depends(get_read_router)],
+) -> AsyncGenerator[AsyncSession]:
+    """
+    Dependency para obtener una sesión de base de datos (primario).
+
+    Cada petición se ejecuta dentro de una `UnitOfWork`: un único commit al
+    final si no hubo errores, o rollback si se lanzó cualquier excepción.
+    El commit lo hace `UnitOfWorkRoute` antes de enviar la respuesta (la
+    salida de esta dependency se ejecuta después de enviarla).
+    Si la sesión escribe, la respuesta lleva la cookie de escritura del
+    router de lecturas para garantizar read-your-writes.
+
+    Args:
+        request: Petición en curso (su scope recoge la unidad de trabajo y las escrituras)
+        router: Router de lecturas que firma la cookie
 
     Yields:
         AsyncSession: Sesión de base de datos asíncrona
@@ -54,15 +425,39 @@ async def get_session() -> AsyncGenerator[AsyncSession]:
             # usar session aquí
             pass
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    async with AsyncSessionLocal() as session, UnitOfWork(session) as uow:
+        session.info[SESSION_READ_ROUTER_KEY] = router
+        session.info[SESSION_WRITES_KEY] = request.scope.get(SCOPE_WRITES_KEY)
+        request.scope[SCOPE_UNIT_OF_WORK_KEY] = uow
+        yield session
+
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Ruta que confirma la unidad de trabajo de la petición antes de responder.
+
+    FastAPI ejecuta la salida de las dependencies con `yield` después de
+    enviar la respuesta, así que el commit de `get_session` llegaría tarde:
+    un fallo al confirmar ya se habría respondido como éxito, y el cliente
+    podría lanzar su siguiente petición antes de que la escritura sea
+    visible. Esta ruta hace el commit en cuanto el endpoint termina sin
+    errores; si falla, la excepción sigue el camino normal (rollback en
+    `get_session` y respuesta de error). Los routers que escriben la usan
+    como `route_class`.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Envuelve el handler de FastAPI para confirmar antes de devolver la respuesta."""
+        handler = super().get_route_handler()
+
+        async def commit_before_response(request: Request) -> Response:
+            response = await handler(request)
+            uow: UnitOfWork | None = request.scope.get(SCOPE_UNIT_OF_WORK_KEY)
+            if uow is not None:
+                await uow.commit()
+            return response
+
+        return commit_before_response
 
 
 # Type hint para dependency injection
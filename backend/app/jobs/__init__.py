@@ -0,0 +1,23 @@
+"""
+Trabajos en segundo plano.
+
+Operaciones pesadas de RRHH que se encolan en la tabla `job` y ejecuta el
+`JobRunner`, dentro del proceso de la API o con `scripts/run_jobs.py`.
+"""
+
+from app.jobs.context import JobCancelledError, JobContext
+from app.jobs.registry import JobDefinition, JobRegistry, job, job_registry
+from app.jobs.runner import JobRunner
+
+# Importar los handlers registra los trabajos incluidos (al final: usan los servicios)
+from app.jobs import handlers as _handlers  # isort: skip
+
+__all__ = [
+    "JobCancelledError",
+    "JobContext",
+    "JobDefinition",
+    "JobRegistry",
+    "JobRunner",
+    "job",
+    "job_registry",
+]
@@ -0,0 +1,105 @@
+"""
+Contexto de ejecución de un trabajo.
+
+Es lo que recibe cada handler: sus parámetros, una sesión propia y los
+métodos para informar del progreso y atender a la cancelación.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.job_repository import JobRepository
+
+
+class JobCancelledError(Exception):
+    """Se lanza dentro de un handler cuando HR ha cancelado su trabajo."""
+
+
+class JobContext:
+    """
+    Contexto que el runner pasa a un handler.
+
+    `session` es la sesión del handler: el runner hace commit al terminar
+    sin errores y rollback si falla. Los trabajos largos deberían procesar por
+    lotes y hacer commit de cada lote antes de `report_progress`, de modo que
+    un reintento no repita lo ya confirmado (y, en SQLite, para no retener el
+    bloqueo de escritura mientras se actualiza el progreso).
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        kind: str,
+        payload: dict[str, Any],
+        attempt: int,
+        session: AsyncSession,
+        session_factory: Callable[[], AsyncSession],
+    ):
+        """
+        Inicializa el contexto.
+
+        Args:
+            job_id: ID del trabajo
+            kind: Tipo del trabajo
+            payload: Parámetros del trabajo
+            attempt: Número de intento (1 = primera ejecución)
+            session: Sesión del handler
+            session_factory: Factoría de sesiones para actualizar el progreso
+        """
+        self.job_id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.attempt = attempt
+        self.session = session
+        self._session_factory = session_factory
+        self.cancel_requested = False
+
+    async def report_progress(self, progress: float, message: str | None = None) -> None:
+        """
+        Guarda el progreso del trabajo (en una transacción propia).
+
+        Sirve también como punto de cancelación: si HR lo canceló, lanza
+        `JobCancelledError` para que el handler termine ordenadamente.
+
+        Args:
+            progress: Progreso entre 0 y 1
+            message: Descripción del paso actual
+
+        Raises:
+            JobCancelledError: Si se pidió cancelar el trabajo
+        """
+        progress = min(max(progress, 0.0), 1.0)
+        cancel_requested = await asyncio.shield(
+            self._save_progress(progress, message[:500] if message else None)
+        )
+        if cancel_requested:
+            self.cancel_requested = True
+        self.check_cancelled()
+
+    async def _save_progress(self, progress: float, message: str | None) -> bool | None:
+        """Guarda el progreso; protegido para no cortar la transacción a medias."""
+        async with self._session_factory() as session:
+            cancel_requested = await JobRepository(session).update_progress(
+                self.job_id, progress, message
+            )
+            await session.commit()
+        return cancel_requested
+
+    def check_cancelled(self) -> None:
+        """
+        Lanza `JobCancelledError` si se pidió cancelar el trabajo.
+
+        `report_progress` ya lo llama; sirve para comprobar la cancelación
+        entre lotes sin escribir progreso. El runner marca `cancel_requested`
+        al detectarla en un latido y, si el handler no para en el siguiente
+        intervalo, cancela su tarea.
+
+        Raises:
+            JobCancelledError: Si se pidió cancelar el trabajo
+        """
+        if self.cancel_requested:
+            msg = f"Trabajo {self.job_id} cancelado"
+            raise JobCancelledError(msg)
@@ -0,0 +1,153 @@
+"""
+Trabajos incluidos en la aplicación.
+
+Cada handler se registra con `@job("<tipo>")` al importar este módulo.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from app.core.config import settings
+from app.core.exceptions import ConflictException
+from app.jobs.context import JobContext
+from app.jobs.registry import job
+from app.models.vacation_rollover import VacationRollover
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.compliance import ComplianceRule
+from app.services.compliance_service import ComplianceService, compliance_window
+from app.services.fichaje_service import FichajeService
+from app.services.vacation_rollover_service import VacationRolloverService
+
+
+@job("revoked_tokens.purge", max_attempts=5)
+async def purge_revoked_tokens(context: JobContext) -> dict[str, Any]:
+    """Elimina las revocaciones de tokens ya caducados."""
+    deleted = await RevokedTokenRepository(context.session).delete_expired()
+    return {"deleted": deleted}
+
+
+@job("fichajes.auto_close", max_attempts=1)
+async def auto_close_fichajes(context: JobContext) -> dict[str, Any]:
+    """Cierra los fichajes abiertos más allá del turno máximo (payload: max_shift_hours)."""
+    service = FichajeService(FichajeRepository(context.session), UserRepository(context.session))
+    closed = await service.close_forgotten_checkins(context.payload.get("max_shift_hours"))
+    if closed is None:
+        return {"closed": 0, "skipped": "Otro worker está ejecutando el cierre"}
+    return {"closed": closed}
+
+
+@job("fichajes.partitions", max_attempts=3)
+async def create_fichaje_partitions(context: JobContext) -> dict[str, Any]:
+    """Crea las particiones mensuales de los próximos meses (payload: months_ahead)."""
+    service = FichajeService(FichajeRepository(context.session), UserRepository(context.session))
+    created = await service.create_partitions(context.payload.get("months_ahead"))
+    if created is None:
+        return {"created": [], "skipped": "Otro worker está creando las particiones"}
+    return {"created": created}
+
+
+# Incumplimientos que se guardan en el resultado del trabajo (el resto, solo contados)
+COMPLIANCE_JOB_MAX_VIOLATIONS = 1000
+
+
+@job("fichajes.compliance", max_attempts=1)
+async def fichajes_compliance(context: JobContext) -> dict[str, Any]:
+    """Comprueba jornada y descansos por lotes de usuarios.
+
+    Payload: date_from y date_to (ISO, por defecto la semana anterior) y
+    batch_users opcional.
+    """
+    if "date_from" in context.payload:
+        date_from = date.fromisoformat(context.payload["date_from"])
+        date_to = date.fromisoformat(context.payload.get("date_to", context.payload["date_from"]))
+    else:
+        today = datetime.now(UTC).date()
+        date_to = today - timedelta(days=today.weekday() + 1)
+        date_from = date_to - timedelta(days=6)
+    batch_users = context.payload.get("batch_users") or settings.compliance_batch_users
+
+    service = ComplianceService(context.session)
+    user_ids = await service.fichaje_repo.get_user_ids_between(
+        *compliance_window(date_from, date_to)
+    )
+    totals = dict.fromkeys(ComplianceRule, 0)
+    violations: list[dict[str, Any]] = []
+    users_with_violations = 0
+    intervals = 0
+    for offset in range(0, len(user_ids), batch_users):
+        batch = user_ids[offset : offset + batch_users]
+        check = await service.check(date_from, date_to, batch[0], batch[-1])
+        intervals += check.intervals
+        users_with_violations += len({v.user_id for v in check.violations})
+        for violation in check.violations:
+            totals[violation.rule] += 1
+            if len(violations) < COMPLIANCE_JOB_MAX_VIOLATIONS:
+                violations.append(
+                    {
+                        "user_id": violation.user_id,
+                        "rule": violation.rule.value,
+                        "fecha": violation.fecha.isoformat(),
+                        "hours": violation.hours,
+                        "limit_hours": violation.limit_hours,
+                    }
+                )
+        done = offset + len(batch)
+        await context.report_progress(done / len(user_ids), f"{done}/{len(user_ids)} usuarios")
+
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "users_checked": len(user_ids),
+        "intervals": intervals,
+        "users_with_violations": users_with_violations,
+        "totals": {rule.value: count for rule, count in totals.items()},
+        "violations": violations,
+        "truncated": sum(totals.values()) > len(violations),
+    }
+
+
+@job("vacaciones.rollover")
+async def vacation_rollover(context: JobContext) -> dict[str, Any]:
+    """Cierre anual de vacaciones (payload: year y topes opcionales)."""
+    service = VacationRolloverService(context.session)
+    year = context.payload["year"]
+    try:
+        rollover = await service.start(
+            year=year,
+            max_carryover_days=context.payload.get("max_carryover_days"),
+            max_carryover_ratio=context.payload.get("max_carryover_ratio"),
+            executed_by=context.payload.get("executed_by"),
+        )
+    except ConflictException:
+        # Reintento de un trabajo que ya completó el cierre: no hay nada que hacer
+        rollover = await service.get_rollover(year)
+        if not rollover.is_completed:
+            raise
+        return _rollover_summary(rollover)
+    await context.session.commit()
+
+    # Cada lote se confirma antes de informar del progreso: si el trabajo se
+    # cancela o falla, el reintento continúa por el siguiente lote
+    total = rollover.users_processed + await service.pending_users(rollover)
+    batch_size = context.payload.get("batch_size") or settings.vacation_rollover_batch_size
+    while await service.apply_next_batch(rollover, batch_size):
+        await context.session.commit()
+        await context.report_progress(
+            rollover.users_processed / max(total, 1),
+            f"{rollover.users_processed}/{total} usuarios",
+        )
+
+    return _rollover_summary(await service.complete(rollover))
+
+
+def _rollover_summary(rollover: VacationRollover) -> dict[str, Any]:
+    """Resultado del trabajo de cierre anual."""
+    return {
+        "rollover_id": rollover.id,
+        "year": rollover.year,
+        "users_processed": rollover.users_processed,
+        "total_carried": rollover.total_carried,
+        "total_forfeited": rollover.total_forfeited,
+    }
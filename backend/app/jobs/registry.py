@@ -0,0 +1,100 @@
+"""
+Registro de tipos de trabajo.
+
+Cada tipo (`kind`) se asocia a una corrutina que lo ejecuta. Los módulos que
+definen trabajos los registran al importarse con el decorador `job`.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.jobs.context import JobContext
+
+# Un handler recibe el contexto de ejecución y devuelve el resultado (JSON) o None
+JobHandler = Callable[["JobContext"], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass(frozen=True, slots=True)
+class JobDefinition:
+    """Tipo de trabajo registrado."""
+
+    kind: str
+    handler: JobHandler
+    description: str
+    max_attempts: int | None  # None = jobs_max_attempts de la configuración
+
+
+class JobRegistry:
+    """Tipos de trabajo conocidos por la aplicación y sus handlers."""
+
+    def __init__(self):
+        """Inicializa un registro vacío."""
+        self._definitions: dict[str, JobDefinition] = {}
+
+    def register(
+        self, kind: str, *, description: str = "", max_attempts: int | None = None
+    ) -> Callable[[JobHandler], JobHandler]:
+        """
+        Decorador que registra un handler para un tipo de trabajo.
+
+        Args:
+            kind: Tipo de trabajo (único)
+            description: Descripción para el listado de tipos
+            max_attempts: Intentos máximos por defecto de este tipo
+
+        Returns:
+            Callable: Decorador que devuelve el handler sin modificar
+
+        Raises:
+            ValueError: Si el tipo ya estaba registrado
+        """
+
+        def decorator(handler: JobHandler) -> JobHandler:
+            if kind in self._definitions:
+                msg = f"El tipo de trabajo '{kind}' ya está registrado"
+                raise ValueError(msg)
+            self._definitions[kind] = JobDefinition(
+                kind=kind,
+                handler=handler,
+                description=description or (handler.__doc__ or "").strip().split("\n")[0],
+                max_attempts=max_attempts,
+            )
+            return handler
+
+        return decorator
+
+    def unregister(self, kind: str) -> None:
+        """
+        Elimina un tipo de trabajo (si existe).
+
+        Args:
+            kind: Tipo de trabajo
+        """
+        self._definitions.pop(kind, None)
+
+    def get(self, kind: str) -> JobDefinition | None:
+        """
+        Obtiene la definición de un tipo de trabajo.
+
+        Args:
+            kind: Tipo de trabajo
+
+        Returns:
+            JobDefinition | None: Definición registrada o None
+        """
+        return self._definitions.get(kind)
+
+    def definitions(self) -> list[JobDefinition]:
+        """Retorna los tipos registrados ordenados por nombre."""
+        return sorted(self._definitions.values(), key=lambda definition: definition.kind)
+
+    def __contains__(self, kind: object) -> bool:
+        """Indica si un tipo está registrado."""
+        return kind in self._definitions
+
+
+# Registro global de la aplicación
+job_registry = JobRegistry()
+job = job_registry.register
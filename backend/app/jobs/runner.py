@@ -0,0 +1,445 @@
+"""
+Runner de trabajos en segundo plano.
+
+Un pool de corrutinas que reclaman trabajos de la tabla `job` y ejecutan su
+handler. Funciona dentro del proceso de la API (arrancado en el lifespan) o
+como proceso aparte (`scripts/run_jobs.py`); como la cola es la propia base
+de datos, se pueden combinar varios runners sin broker.
+
+Ciclo de vida de un trabajo:
+- PENDING → RUNNING al reclamarlo (UPDATE condicional, suma un intento)
+- RUNNING → SUCCEEDED con el resultado del handler
+- RUNNING → PENDING si falla y le quedan intentos, con `run_after` según un
+  backoff exponencial con jitter
+- RUNNING → FAILED al agotar los intentos
+- RUNNING → CANCELLED si HR lo cancela (se detecta en el latido o al informar
+  del progreso)
+
+Los tipos de `schedules` se encolan periódicamente. Cada runner lo comprueba
+por su cuenta, bajo un bloqueo consultivo por tipo y solo si no hay uno en
+cola o creado en el último intervalo: con varios runners sigue habiendo un
+único trabajo por intervalo.
+
+Mientras el handler se ejecuta, el runner actualiza `heartbeat_at`. Un
+trabajo RUNNING sin latido durante `stale_after` segundos es de un worker
+caído y otro runner lo vuelve a reclamar.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import socket
+import traceback
+import uuid
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any, Self
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings
+from app.database import AsyncSessionLocal
+from app.jobs.context import JobCancelledError, JobContext
+from app.jobs.registry import JobDefinition, JobRegistry, job_registry
+from app.models.job import Job, JobStatus
+from app.repositories.job_repository import JobRepository
+from app.repositories.locks import try_advisory_xact_lock
+
+logger = logging.getLogger(__name__)
+
+# Longitud máxima del error guardado (columna job.error)
+MAX_ERROR_LENGTH = 2000
+
+
+def default_worker_id() -> str:
+    """Identificador único del runner: host, PID y un sufijo aleatorio."""
+    return f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobRunner:
+    """
+    Pool de workers asíncronos que ejecutan los trabajos de la tabla `job`.
+
+    Example:
+        runner = JobRunner.from_settings(settings)
+        runner.start()
+        ...
+        await runner.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        registry: JobRegistry = job_registry,
+        *,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 5.0,
+        stale_after: float = 60.0,
+        retry_base: float = 10.0,
+        retry_max: float = 600.0,
+        worker_id: str | None = None,
+        schedules: Mapping[str, float] | None = None,
+    ):
+        """
+        Inicializa el runner.
+
+        Args:
+            session_factory: Factoría de sesiones (una por operación)
+            registry: Registro de tipos de trabajo
+            concurrency: Trabajos ejecutados a la vez
+            poll_interval: Segundos entre consultas a la cola cuando está vacía
+            heartbeat_interval: Segundos entre latidos de un trabajo en ejecución
+            stale_after: Segundos sin latido tras los que se reclama un trabajo
+            retry_base: Espera antes del primer reintento (se duplica en cada uno)
+            retry_max: Espera máxima entre reintentos
+            worker_id: Identificador del runner (por defecto, host:pid:aleatorio)
+            schedules: Tipos que se encolan periódicamente y segundos entre ejecuciones
+        """
+        self.session_factory = session_factory
+        self.registry = registry
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.worker_id = worker_id or default_worker_id()
+        self.schedules = dict(schedules or {})
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> Self:
+        """
+        Crea el runner a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+            **overrides: Argumentos que sustituyen a los de la configuración
+
+        Returns:
+            JobRunner: Runner configurado
+        """
+        options: dict[str, Any] = {
+            "concurrency": settings.jobs_concurrency,
+            "poll_interval": settings.jobs_poll_interval_seconds,
+            "heartbeat_interval": settings.jobs_heartbeat_seconds,
+            "stale_after": settings.jobs_stale_after_seconds,
+            "retry_base": settings.jobs_retry_base_seconds,
+            "retry_max": settings.jobs_retry_max_seconds,
+            "schedules": {
+                kind: interval
+                for kind, interval in {
+                    "fichajes.auto_close": settings.fichaje_auto_close_interval_seconds,
+                    "fichajes.compliance": settings.compliance_check_interval_seconds,
+                    "fichajes.partitions": settings.fichaje_partition_interval_seconds,
+                }.items()
+                if interval > 0
+            },
+        }
+        return cls(**{**options, **overrides})
+
+    @property
+    def running(self) -> bool:
+        """True si los workers están arrancados."""
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Arranca `concurrency` workers (y el planificador, si hay `schedules`)."""
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{n}")
+            for n in range(self.concurrency)
+        ]
+        if self.schedules:
+            self._tasks.append(asyncio.create_task(self._scheduler(), name="job-scheduler"))
+
+    async def stop(self, grace: float = 10.0) -> None:
+        """
+        Para los workers.
+
+        Dejan de reclamar trabajos y se espera hasta `grace` segundos a que
+        terminen los que están en marcha; los que no terminan se interrumpen
+        y vuelven a la cola sin consumir intento.
+
+        Args:
+            grace: Segundos de espera a los trabajos en ejecución
+        """
+        if not self._tasks:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=grace)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_pending(self) -> int:
+        """
+        Ejecuta trabajos hasta que no quede ninguno ejecutable ahora.
+
+        Usa hasta `concurrency` trabajos a la vez. Pensado para ejecuciones
+        puntuales (`scripts/run_jobs.py --once`) y para tests.
+
+        Returns:
+            int: Número de trabajos ejecutados
+        """
+        executed = 0
+
+        async def drain() -> None:
+            nonlocal executed
+            while (job := await self._claim()) is not None:
+                await self._execute(job)
+                executed += 1
+
+        await asyncio.gather(*(drain() for _ in range(self.concurrency)))
+        return executed
+
+    async def enqueue_scheduled(self, now: datetime | None = None) -> list[str]:
+        """
+        Encola los trabajos periódicos que toca ejecutar.
+
+        Un tipo se encola si no hay ninguno en cola o en ejecución ni se creó
+        otro en su último intervalo. La comprobación y el alta se hacen bajo
+        un bloqueo consultivo por tipo para que dos runners no lo encolen a
+        la vez.
+
+        Args:
+            now: Instante actual (por defecto, ahora)
+
+        Returns:
+            list[str]: Tipos encolados
+        """
+        now = now or datetime.now(UTC)
+        enqueued: list[str] = []
+        for kind, interval in self.schedules.items():
+            definition = self.registry.get(kind)
+            if definition is None:
+                logger.warning("Trabajo periódico no registrado: %s", kind)
+                continue
+
+            async with self.session_factory() as session:
+                if not await try_advisory_xact_lock(session, f"jobs.schedule:{kind}"):
+                    continue
+                repo = JobRepository(session)
+                if await repo.has_recent(kind, now - timedelta(seconds=interval)):
+                    continue
+                await repo.create(
+                    Job(
+                        kind=kind,
+                        # Sin reintentos propios: se repite en el siguiente intervalo
+                        max_attempts=definition.max_attempts or 1,
+                        run_after=now,
+                    )
+                )
+                await session.commit()
+            enqueued.append(kind)
+
+        if enqueued:
+            self._wakeup.set()
+        return enqueued
+
+    # ------------------------------------------------------------------------
+    # Bucle de cada worker
+    # ------------------------------------------------------------------------
+
+    async def _scheduler(self) -> None:
+        """Encola los trabajos periódicos hasta que se pare el runner."""
+        # Varias comprobaciones por intervalo: el retraso máximo es un cuarto de él
+        tick = min(self.schedules.values()) / 4
+        while not self._stopping.is_set():
+            try:
+                await self.enqueue_scheduled()
+            except Exception:
+                logger.exception("Error al encolar trabajos periódicos en %s", self.worker_id)
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), timeout=tick)
+
+    async def _worker(self) -> None:
+        """Reclama y ejecuta trabajos hasta que se pare el runner."""
+        while not self._stopping.is_set():
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._execute(job)
+                    continue
+            except Exception:
+                # Fallo de infraestructura (p. ej. base de datos caída): reintentar tras esperar
+                logger.exception("Error en el worker de trabajos %s", self.worker_id)
+
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+
+    async def _claim(self) -> Job | None:
+        """Reclama el siguiente trabajo ejecutable, si lo hay."""
+        now = datetime.now(UTC)
+        async with self.session_factory() as session:
+            job = await JobRepository(session).claim_next(
+                self.worker_id, now, now - timedelta(seconds=self.stale_after)
+            )
+            await session.commit()
+        return job
+
+    async def _execute(self, job: Job) -> None:
+        """Ejecuta un trabajo reclamado y registra su resultado."""
+        definition = self.registry.get(job.kind)
+        if definition is None:
+            await self._finish(
+                job.id, JobStatus.FAILED, error=f"Tipo de trabajo no registrado: {job.kind}"
+            )
+            return
+        if job.attempts > job.max_attempts:
+            # Reclamado de un worker caído durante su último intento
+            await self._finish(
+                job.id,
+                JobStatus.FAILED,
+                error=job.error or "El worker que lo ejecutaba dejó de responder",
+            )
+            return
+
+        context_ready: asyncio.Future[JobContext] = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._run_handler(definition, job, context_ready))
+        try:
+            outcome = await self._supervise(job.id, task, context_ready)
+        except asyncio.CancelledError:
+            # El runner se está parando: el trabajo vuelve a la cola sin gastar intento
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.shield(
+                self._finish(
+                    job.id,
+                    JobStatus.PENDING,
+                    attempts=Job.attempts - 1,
+                    run_after=datetime.now(UTC),
+                )
+            )
+            raise
+
+        if outcome is None:
+            return  # Otro worker lo reclamó: ya no es nuestro
+        if outcome == JobStatus.CANCELLED:
+            await self._finish(job.id, JobStatus.CANCELLED)
+            return
+
+        try:
+            result = task.result()
+        except Exception as exc:
+            await self._handle_failure(job, exc)
+        else:
+            await self._finish(job.id, JobStatus.SUCCEEDED, result=result, progress=1.0)
+
+    async def _run_handler(
+        self,
+        definition: JobDefinition,
+        job: Job,
+        context_ready: asyncio.Future[JobContext],
+    ) -> dict[str, Any] | None:
+        """Ejecuta el handler con su propia sesión; commit solo si termina sin errores."""
+        async with self.session_factory() as session:
+            context = JobContext(
+                job_id=job.id,
+                kind=job.kind,
+                payload=job.payload,
+                attempt=job.attempts,
+                session=session,
+                session_factory=self.session_factory,
+            )
+            context_ready.set_result(context)
+            result = await definition.handler(context)
+            await session.commit()
+            return result
+
+    async def _supervise(
+        self,
+        job_id: int,
+        task: asyncio.Task[dict[str, Any] | None],
+        context_ready: asyncio.Future[JobContext],
+    ) -> JobStatus | None:
+        """
+        Espera al handler enviando latidos y atendiendo a la cancelación.
+
+        La cancelación es primero cooperativa: se marca el contexto para que
+        el handler pare en su siguiente `report_progress`/`check_cancelled` y
+        cierre su sesión ordenadamente. Si en un intervalo de latido no lo ha
+        hecho, se cancela su tarea.
+
+        Returns:
+            JobStatus | None: CANCELLED si se canceló, None si se perdió la
+            propiedad del trabajo, RUNNING si el handler terminó (bien o mal)
+        """
+        cancelling = False
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=self.heartbeat_interval)
+            if done:
+                if task.cancelled() or isinstance(task.exception(), JobCancelledError):
+                    return JobStatus.CANCELLED
+                return JobStatus.RUNNING
+            if cancelling:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return JobStatus.CANCELLED
+
+            # Protegido: si el runner se para a mitad del latido, la transacción
+            # termina igualmente y no deja bloqueada la fila (ni SQLite entero)
+            cancel_requested = await asyncio.shield(self._heartbeat(job_id))
+            if cancel_requested is None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return None
+            if cancel_requested:
+                cancelling = True
+                if context_ready.done():
+                    context_ready.result().cancel_requested = True
+
+    async def _heartbeat(self, job_id: int) -> bool | None:
+        """Registra un latido en una transacción propia."""
+        async with self.session_factory() as session:
+            cancel_requested = await JobRepository(session).heartbeat(
+                job_id, self.worker_id, datetime.now(UTC)
+            )
+            await session.commit()
+        return cancel_requested
+
+    async def _handle_failure(self, job: Job, exc: Exception) -> None:
+        """Devuelve el trabajo a la cola con backoff o lo marca como fallido."""
+        error = "".join(traceback.format_exception_only(exc)).strip()[:MAX_ERROR_LENGTH]
+        if job.attempts >= job.max_attempts:
+            await self._finish(job.id, JobStatus.FAILED, error=error)
+            return
+
+        run_after = datetime.now(UTC) + timedelta(seconds=self.backoff(job.attempts))
+        await self._finish(job.id, JobStatus.PENDING, error=error, run_after=run_after)
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Espera antes del siguiente reintento.
+
+        Exponencial (`retry_base * 2^(intentos-1)`, con tope `retry_max`) con
+        jitter entre el 50 % y el 100 %, para que los trabajos que fallaron a
+        la vez (p. ej. por una caída de la base de datos) no reintenten a la vez.
+
+        Args:
+            attempts: Intentos realizados
+
+        Returns:
+            float: Segundos de espera
+        """
+        delay = min(self.retry_max, self.retry_base * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _finish(self, job_id: int, status: JobStatus, **values: Any) -> None:
+        """Registra el final de una ejecución en una transacción propia."""
+        async with self.session_factory() as session:
+            await JobRepository(session).finish(
+                job_id, self.worker_id, status, datetime.now(UTC), **values
+            )
+            await session.commit()
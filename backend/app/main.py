@@ -4,6 +4,8 @@ Aplicación principal del sistema de gestión de RRHH.
 Backend desarrollado con FastAPI, SQLModel y arquitectura limpia.
 """
 
+import asyncio
+import math
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -12,6 +14,8 @@ from fastapi.responses import JSONResponse
 
 from app.api.routers import auth_router, users_router
 from app.api.routers.fichajes import router as fichajes_router
+from app.api.routers.health import router as health_router
+from app.api.routers.jobs import router as jobs_router
 from app.api.routers.vacaciones import router as vacaciones_router
 from app.core.config import settings
 from app.core.exceptions import (
@@ -21,8 +25,13 @@ from app.core.exceptions import (
     ConflictException,
     ForbiddenException,
     NotFoundException,
+    RateLimitException,
     ValidationException,
 )
+from app.core.presence import presence_roster
+from app.core.security import dummy_password_hash, password_executor
+from app.database import ReadYourWritesMiddleware
+from app.jobs import JobRunner
 
 
 @asynccontextmanager
@@ -41,10 +50,22 @@ async def lifespan(_app: FastAPI):
     #     # DESHABILITADO: Usar migraciones de Alembic en su lugar
     #     await init_db()
 
+    # Precalcular el hash ficticio del login para no pagarlo en la primera petición
+    await asyncio.get_running_loop().run_in_executor(password_executor, dummy_password_hash)
+
+    # Runner de trabajos en segundo plano (desactivar si se usa scripts/run_jobs.py)
+    job_runner = JobRunner.from_settings(settings)
+    if settings.jobs_worker_enabled:
+        job_runner.start()
+
+    # Censo de presencia en memoria: se carga ahora y se mantiene sincronizado
+    presence_roster.start()
+
     yield
 
     # Shutdown
-    # Aquí se pueden agregar tareas de limpieza
+    await presence_roster.stop()
+    await job_runner.stop()
 
 
 # Crear instancia de FastAPI
@@ -121,6 +142,19 @@ async def validation_exception_handler(request: Request, exc: ValidationExceptio
     )
 
 
+@app.exception_handler(RateLimitException)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitException):
+    """Handler para RateLimitException."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.message, "error_details": exc.details},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+# Cookie de read-your-writes en las respuestas de las peticiones que escriben
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -135,23 +169,8 @@ app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(users_router, prefix="/api/users", tags=["Users"])
 app.include_router(fichajes_router, prefix="/api/fichajes", tags=["Fichajes"])
 app.include_router(vacaciones_router, prefix="/api", tags=["Vacaciones"])
-
-
-# Health check endpoint
-@app.get("/health", tags=["Health"])
-async def health_check():
-    """
-    Verifica el estado de la aplicación.
-
-    Returns:
-        dict: Estado de la aplicación
-    """
-    return {
-        "status": "healthy",
-        "app": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.env,
-    }
+app.include_router(jobs_router, prefix="/api")
+app.include_router(health_router)
 
 
 # Root endpoint
@@ -168,4 +187,5 @@ async def read_root():
         "version": settings.app_version,
         "docs": "/docs",
         "health": "/health",
+        "readiness": "/health/ready",
     }
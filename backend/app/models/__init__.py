@@ -4,17 +4,30 @@ Modelos de base de datos.
 
 from app.models.base import BaseModel, TimestampMixin
 from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.job import Job, JobStatus
+from app.models.revoked_token import RevokedToken
 from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
 from app.models.user import User, UserRole
+from app.models.vacation_rollover import (
+    VacationRollover,
+    VacationRolloverEntry,
+    VacationRolloverStatus,
+)
 
 __all__ = [
     "BaseModel",
     "Fichaje",
     "FichajeStatus",
+    "Job",
+    "JobStatus",
+    "RevokedToken",
     "Solicitud",
     "SolicitudStatus",
     "SolicitudTipo",
     "TimestampMixin",
     "User",
     "UserRole",
+    "VacationRollover",
+    "VacationRolloverEntry",
+    "VacationRolloverStatus",
 ]
@@ -6,10 +6,25 @@ Define campos comunes y funcionalidad compartida.
 
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime
+from sqlalchemy import Column, DateTime, Integer
 from sqlmodel import Field, SQLModel
 
 
+def version_column() -> Column:
+    """
+    Crea la columna `version` para el control de concurrencia optimista.
+
+    Se usa como `version_id_col` del mapper: el ORM la incrementa en cada
+    UPDATE y la añade al WHERE, de modo que una escritura sobre una versión
+    ya modificada por otra transacción no actualiza ninguna fila
+    (`StaleDataError`) sin necesidad de releerla.
+
+    Returns:
+        Column: Columna nueva (cada tabla necesita la suya)
+    """
+    return Column("version", Integer, nullable=False, server_default="1")
+
+
 class TimestampMixin(SQLModel):
     """
     Mixin que agrega campos de timestamp a los modelos.
@@ -2,12 +2,12 @@
 
 from datetime import UTC, datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index, text
 from sqlmodel import Field, Relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -22,6 +22,13 @@ class FichajeStatus(str, Enum):
     REJECTED = "rejected"  # Corrección rechazada por HR
 
 
+_version = version_column()
+
+# Fichajes abiertos (sin salida): como mucho uno por usuario, así que el índice
+# parcial es pequeño y sirve al censo de presencia, al check-in y al cierre automático
+_OPEN = text("check_out IS NULL")
+
+
 class Fichaje(BaseModel, table=True):
     """Modelo de fichaje (entrada/salida).
 
@@ -29,6 +36,14 @@ class Fichaje(BaseModel, table=True):
     Soporta correcciones que deben ser aprobadas por usuarios HR.
     """
 
+    # En PostgreSQL la tabla está particionada por mes de check_in (ver
+    # app/repositories/partitions.py) y su clave primaria es (id, check_in);
+    # para el ORM basta con id, que sigue siendo único (una sola secuencia)
+    __mapper_args__: ClassVar[dict[str, Any]] = {"version_id_col": _version}
+    __table_args__ = (
+        Index("ix_fichaje_open_user_id", "user_id", postgresql_where=_OPEN, sqlite_where=_OPEN),
+    )
+
     # Relación con usuario (propietario del fichaje)
     user_id: int = Field(foreign_key="user.id", index=True, nullable=False)
     user: "User" = Relationship(
@@ -80,6 +95,9 @@ class Fichaje(BaseModel, table=True):
     )
     approval_notes: str | None = Field(default=None, max_length=500)
 
+    # Control de concurrencia optimista (If-Match en los endpoints que modifican)
+    version: int = Field(default=1, sa_column=_version)
+
     @property
     def hours_worked(self) -> float | None:
         """Calcula las horas trabajadas en el fichaje.
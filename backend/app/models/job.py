@@ -0,0 +1,71 @@
+"""
+Modelo de trabajos en segundo plano.
+
+Cada fila es una ejecución de un trabajo registrado (`kind`) con sus
+parámetros, su progreso y su resultado. La tabla hace de cola: los workers
+reclaman los trabajos pendientes con un UPDATE condicional, sin broker.
+"""
+
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index
+from sqlmodel import Field
+
+from app.models.base import BaseModel
+
+
+class JobStatus(str, Enum):
+    """Estados posibles de un trabajo."""
+
+    PENDING = "pending"  # En cola (o esperando su siguiente reintento)
+    RUNNING = "running"  # Reclamado por un worker
+    SUCCEEDED = "succeeded"  # Terminado correctamente
+    FAILED = "failed"  # Agotó sus intentos
+    CANCELLED = "cancelled"  # Cancelado por HR
+
+
+class Job(BaseModel, table=True):
+    """Trabajo en segundo plano."""
+
+    __table_args__ = (Index("ix_job_status_run_after", "status", "run_after"),)
+
+    kind: str = Field(max_length=64, index=True, nullable=False, description="Tipo de trabajo")
+    payload: dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSON, nullable=False, description="Parámetros"
+    )
+    status: JobStatus = Field(default=JobStatus.PENDING, nullable=False)
+
+    # Progreso y resultado
+    progress: float = Field(default=0.0, nullable=False, description="Progreso (0-1)")
+    progress_message: str | None = Field(default=None, max_length=500)
+    result: dict[str, Any] | None = Field(default=None, sa_type=JSON)
+    error: str | None = Field(default=None, max_length=2000, description="Último error")
+
+    # Reintentos
+    attempts: int = Field(default=0, nullable=False, description="Intentos iniciados")
+    max_attempts: int = Field(default=3, nullable=False)
+    run_after: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_type=DateTime(timezone=True),
+        nullable=False,
+        description="No se ejecuta antes de esta fecha (backoff entre reintentos)",
+    )
+
+    # Ejecución
+    cancel_requested: bool = Field(default=False, nullable=False)
+    worker_id: str | None = Field(default=None, max_length=64, description="Worker que lo ejecuta")
+    heartbeat_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        description="Último latido del worker (detecta workers caídos)",
+    )
+    started_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+    finished_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+    created_by: int | None = Field(default=None, foreign_key="user.id", index=True)
+
+    @property
+    def is_finished(self) -> bool:
+        """True si el trabajo ya no se va a ejecutar más."""
+        return self.status in {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
@@ -0,0 +1,33 @@
+"""
+Modelo de tokens revocados.
+
+Lista de revocación de tokens JWT (logout y rotación de refresh tokens).
+Solo es necesario conservar cada fila hasta el `expires_at` del token: a
+partir de ahí el propio token deja de ser válido.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index
+from sqlmodel import Field
+
+from app.models.base import BaseModel
+
+
+class RevokedToken(BaseModel, table=True):
+    """Token JWT revocado, identificado por su `jti`."""
+
+    __tablename__ = "revoked_token"
+    __table_args__ = (Index("ix_revoked_token_created_at", "created_at"),)
+
+    jti: str = Field(
+        max_length=64, unique=True, index=True, nullable=False, description="ID del token"
+    )
+    user_id: int = Field(foreign_key="user.id", index=True, nullable=False)
+    token_type: str = Field(max_length=16, nullable=False, description="access o refresh")
+    expires_at: datetime = Field(
+        sa_type=DateTime(timezone=True),
+        index=True,
+        nullable=False,
+        description="Expiración del token; después la fila se puede purgar",
+    )
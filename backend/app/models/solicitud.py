@@ -2,12 +2,12 @@
 
 from datetime import UTC, date, datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from sqlalchemy import DateTime
 from sqlmodel import Field, Relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -31,9 +31,14 @@ class SolicitudTipo(str, Enum):
     OTHER = "other"  # Otro motivo
 
 
+_version = version_column()
+
+
 class Solicitud(BaseModel, table=True):
     """Modelo de solicitud de vacaciones/ausencias."""
 
+    __mapper_args__: ClassVar[dict[str, Any]] = {"version_id_col": _version}
+
     # Relación con usuario (solicitante)
     user_id: int = Field(foreign_key="user.id", index=True, nullable=False)
     user: "User" = Relationship(
@@ -61,6 +66,9 @@ class Solicitud(BaseModel, table=True):
     )
     comentarios_revision: str | None = Field(default=None, max_length=500)
 
+    # Control de concurrencia optimista (If-Match en los endpoints que modifican)
+    version: int = Field(default=1, sa_column=_version)
+
     # Propiedades calculadas
     @property
     def is_pending(self) -> bool:
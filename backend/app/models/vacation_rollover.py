@@ -0,0 +1,72 @@
+"""
+Modelos del cierre anual de vacaciones.
+
+`VacationRollover` registra cada cierre (uno por año, lo que lo hace
+idempotente) y `VacationRolloverEntry` guarda, por usuario, el cálculo
+aplicado: es la traza de auditoría y, a la vez, la tabla desde la que se
+actualizan los balances en bloque.
+"""
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, UniqueConstraint
+from sqlmodel import Field
+
+from app.models.base import BaseModel
+
+
+class VacationRolloverStatus(str, Enum):
+    """Estados de un cierre anual."""
+
+    RUNNING = "running"  # En curso (o interrumpido: se reanuda al relanzarlo)
+    COMPLETED = "completed"  # Aplicado a todos los usuarios
+
+
+class VacationRollover(BaseModel, table=True):
+    """Cierre anual de vacaciones de un año."""
+
+    __tablename__ = "vacation_rollover"
+
+    year: int = Field(unique=True, index=True, nullable=False, description="Año que se cierra")
+    status: VacationRolloverStatus = Field(default=VacationRolloverStatus.RUNNING, nullable=False)
+
+    # Topes de arrastre aplicados
+    max_carryover_days: float = Field(nullable=False, description="Días máximos arrastrados")
+    max_carryover_ratio: float | None = Field(
+        default=None, description="Fracción máxima de los días anuales que se arrastra"
+    )
+
+    # Progreso (los usuarios se procesan por orden de ID)
+    last_user_id: int = Field(default=0, nullable=False, description="Último usuario procesado")
+    users_processed: int = Field(default=0, nullable=False)
+
+    # Totales (se calculan al completar)
+    total_carried: float = Field(default=0.0, nullable=False)
+    total_forfeited: float = Field(default=0.0, nullable=False)
+
+    executed_by: int | None = Field(default=None, foreign_key="user.id")
+    finished_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+
+    @property
+    def is_completed(self) -> bool:
+        """True si el cierre ya se aplicó a todos los usuarios."""
+        return self.status == VacationRolloverStatus.COMPLETED
+
+
+class VacationRolloverEntry(BaseModel, table=True):
+    """Cálculo del cierre anual aplicado a un usuario."""
+
+    __tablename__ = "vacation_rollover_entry"
+    __table_args__ = (UniqueConstraint("rollover_id", "user_id"),)
+
+    rollover_id: int = Field(foreign_key="vacation_rollover.id", nullable=False)
+    user_id: int = Field(foreign_key="user.id", index=True, nullable=False)
+
+    balance_before: float = Field(nullable=False, description="Balance al cerrar el año")
+    future_days: float = Field(
+        nullable=False, description="Días ya descontados de vacaciones del año siguiente"
+    )
+    carried_over: float = Field(nullable=False, description="Días arrastrados (negativo = deuda)")
+    forfeited: float = Field(nullable=False, description="Días perdidos por el tope")
+    balance_after: float = Field(nullable=False, description="Balance del nuevo año")
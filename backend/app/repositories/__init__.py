@@ -5,7 +5,17 @@ Implementa el patrón Repository para abstraer la persistencia.
 """
 
 from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
 from app.repositories.solicitud_repository import SolicitudRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.vacation_rollover_repository import VacationRolloverRepository
 
-__all__ = ["FichajeRepository", "SolicitudRepository", "UserRepository"]
+__all__ = [
+    "FichajeRepository",
+    "JobRepository",
+    "RevokedTokenRepository",
+    "SolicitudRepository",
+    "UserRepository",
+    "VacationRolloverRepository",
+]
@@ -1,12 +1,42 @@
 """Repository para operaciones de base de datos de fichajes."""
 
-from datetime import date, datetime
+from array import array
+from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, bindparam, case, func, or_, select, update
 from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.exceptions import ConflictException
+from app.core.versioning import stale_data_as_conflict
 from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User
+from app.repositories.pagination import Page, fetch_page
+from app.repositories.partitions import add_months, create_month_partitions, month_start
+from app.repositories.relationships import sync_many_to_one
+from app.repositories.rows import FichajeRow, PresenceRow
+from app.schemas.pagination import CountStrategy
+
+# Longitud máxima de la columna fichaje.notes
+NOTES_MAX_LENGTH = 500
+CORRECTION_REASON_MAX_LENGTH = 1000
+
+# Filas por bloque al recorrer intervalos en streaming
+INTERVAL_CHUNK = 10_000
+
+
+def _epoch(moment: datetime) -> float:
+    """Segundos desde epoch (SQLite devuelve los datetimes sin timezone, en UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.timestamp()
+
+
+def _day_start(day: date) -> datetime:
+    """Medianoche UTC de un día, para filtrar check_in por rango."""
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
 
 
 class FichajeRepository:
@@ -30,8 +60,8 @@ class FichajeRepository:
             Fichaje: Fichaje creado con ID asignado.
         """
         self.session.add(fichaje)
-        await self.session.commit()
-        await self.session.refresh(fichaje)
+        await self.session.flush()
+        await sync_many_to_one(self.session, fichaje)
         return fichaje
 
     async def get_by_id(self, fichaje_id: int) -> Fichaje | None:
@@ -54,6 +84,20 @@ class FichajeRepository:
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_row(self, fichaje_id: int) -> FichajeRow | None:
+        """Obtiene un fichaje por su ID como fila de solo lectura.
+
+        Args:
+            fichaje_id: ID del fichaje.
+
+        Returns:
+            FichajeRow si existe, None en caso contrario.
+        """
+        statement = self._row_statement().where(Fichaje.id == fichaje_id)
+        result = await self.session.execute(statement)
+        row = result.one_or_none()
+        return FichajeRow.from_row(row) if row else None
+
     async def get_active_checkin(self, user_id: int) -> Fichaje | None:
         """Obtiene el fichaje activo (sin check-out) de un usuario.
 
@@ -72,6 +116,125 @@ class FichajeRepository:
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_open_rows(self) -> list[PresenceRow]:
+        """Obtiene todos los fichajes abiertos (sin check-out) con su usuario.
+
+        Usa el índice parcial de fichajes abiertos, así que no depende del
+        tamaño del histórico.
+
+        Returns:
+            Filas del censo de presencia, una por fichaje abierto.
+        """
+        statement = (
+            select(Fichaje.id, Fichaje.user_id, User.email, User.full_name, Fichaje.check_in)
+            .join(User, User.id == Fichaje.user_id)
+            .where(Fichaje.check_out.is_(None))
+        )
+        result = await self.session.execute(statement)
+        return [PresenceRow.from_row(row) for row in result.all()]
+
+    async def get_interval_arrays(
+        self, start: datetime, end: datetime, open_until: datetime
+    ) -> tuple[array, array]:
+        """Obtiene entradas y salidas de los fichajes que se cruzan con [start, end).
+
+        Recorre el resultado en streaming, por bloques, y lo guarda en dos
+        `array('d')` de segundos desde epoch (8 bytes por valor) en lugar de
+        en una lista de filas con objetos datetime. Los fichajes abiertos
+        cuentan hasta `open_until`.
+
+        Args:
+            start: Inicio del rango.
+            end: Fin del rango (excluido).
+            open_until: Salida que se asigna a los fichajes abiertos.
+
+        Returns:
+            Entradas y salidas, en el mismo orden (posición i = fichaje i).
+        """
+        statement = (
+            select(Fichaje.check_in, Fichaje.check_out)
+            .where(
+                Fichaje.check_in < end,
+                or_(Fichaje.check_out.is_(None), Fichaje.check_out > start),
+            )
+            .execution_options(yield_per=INTERVAL_CHUNK)
+        )
+        arrivals = array("d")
+        departures = array("d")
+        open_departure = _epoch(open_until)
+        result = await self.session.stream(statement)
+        async for partition in result.partitions():
+            for check_in, check_out in partition:
+                arrivals.append(_epoch(check_in))
+                departures.append(open_departure if check_out is None else _epoch(check_out))
+        return arrivals, departures
+
+    async def get_user_interval_arrays(
+        self,
+        start: datetime,
+        end: datetime,
+        first_user_id: int | None = None,
+        last_user_id: int | None = None,
+    ) -> tuple[array, array, array]:
+        """Obtiene los fichajes cerrados que empiezan en [start, end) como columnas.
+
+        Ordenados por usuario y entrada, en tres arrays paralelos (usuario,
+        entrada y salida en segundos desde epoch) que se leen en streaming.
+
+        Args:
+            start: Inicio del rango (por la entrada).
+            end: Fin del rango (excluido).
+            first_user_id: Primer usuario incluido (None = desde el primero).
+            last_user_id: Último usuario incluido (None = hasta el último).
+
+        Returns:
+            Usuarios, entradas y salidas (posición i = fichaje i).
+        """
+        statement = (
+            select(Fichaje.user_id, Fichaje.check_in, Fichaje.check_out)
+            .where(
+                Fichaje.check_in >= start,
+                Fichaje.check_in < end,
+                Fichaje.check_out.is_not(None),
+            )
+            .order_by(Fichaje.user_id, Fichaje.check_in)
+            .execution_options(yield_per=INTERVAL_CHUNK)
+        )
+        if first_user_id is not None:
+            statement = statement.where(Fichaje.user_id >= first_user_id)
+        if last_user_id is not None:
+            statement = statement.where(Fichaje.user_id <= last_user_id)
+
+        user_ids = array("q")
+        arrivals = array("d")
+        departures = array("d")
+        result = await self.session.stream(statement)
+        async for partition in result.partitions():
+            for user_id, check_in, check_out in partition:
+                user_ids.append(user_id)
+                arrivals.append(_epoch(check_in))
+                departures.append(_epoch(check_out))
+        return user_ids, arrivals, departures
+
+    async def get_user_ids_between(self, start: datetime, end: datetime) -> list[int]:
+        """Obtiene los usuarios con algún fichaje que empieza en [start, end).
+
+        Args:
+            start: Inicio del rango.
+            end: Fin del rango (excluido).
+
+        Returns:
+            IDs de usuario en orden.
+        """
+        statement = (
+            select(Fichaje.user_id)
+            .where(Fichaje.check_in >= start, Fichaje.check_in < end)
+            .distinct()
+            .order_by(Fichaje.user_id)
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
     async def get_all(
         self,
         skip: int = 0,
@@ -81,9 +244,12 @@ class FichajeRepository:
         date_to: date | None = None,
         status: FichajeStatus | None = None,
         incomplete_only: bool = False,
-    ) -> list[Fichaje]:
+    ) -> list[FichajeRow]:
         """Obtiene fichajes con filtros y paginación.
 
+        Solo selecciona las columnas del listado (con el email y el nombre del
+        usuario) y devuelve filas ligeras en lugar de entidades ORM.
+
         Args:
             skip: Número de registros a saltar.
             limit: Número máximo de registros a devolver.
@@ -96,35 +262,44 @@ class FichajeRepository:
         Returns:
             Lista de fichajes que cumplen los criterios.
         """
-        statement = select(Fichaje).options(
-            selectinload(Fichaje.user),
-            selectinload(Fichaje.approved_by_user),
-        )
-
-        # Aplicar filtros
-        if user_id is not None:
-            statement = statement.where(Fichaje.user_id == user_id)
-
-        if date_from is not None:
-            statement = statement.where(func.date(Fichaje.check_in) >= date_from)
-
-        if date_to is not None:
-            statement = statement.where(func.date(Fichaje.check_in) <= date_to)
-
-        if status is not None:
-            statement = statement.where(Fichaje.status == status)
-
-        if incomplete_only:
-            statement = statement.where(Fichaje.check_out.is_(None))
-
-        # Ordenar por fecha más reciente primero
-        statement = statement.order_by(Fichaje.check_in.desc())
+        statement = self._list_statement(user_id, date_from, date_to, status, incomplete_only)
 
         # Aplicar paginación
         statement = statement.offset(skip).limit(limit)
 
         result = await self.session.execute(statement)
-        return list(result.scalars().all())
+        return [FichajeRow.from_row(row) for row in result]
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        user_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: FichajeStatus | None = None,
+        incomplete_only: bool = False,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[FichajeRow]:
+        """Obtiene una página de fichajes y su total según la estrategia de conteo.
+
+        Args:
+            skip: Número de registros a saltar.
+            limit: Número máximo de registros a devolver.
+            user_id: Filtrar por ID de usuario.
+            date_from: Fecha de inicio (inclusive).
+            date_to: Fecha de fin (inclusive).
+            status: Filtrar por estado.
+            incomplete_only: Solo fichajes sin check-out.
+            count_strategy: Estrategia para calcular el total.
+
+        Returns:
+            Página de fichajes con total y si hay más páginas.
+        """
+        statement = self._list_statement(user_id, date_from, date_to, status, incomplete_only)
+        return await fetch_page(
+            self.session, statement, skip, limit, count_strategy, row_factory=FichajeRow.from_row
+        )
 
     async def count(
         self,
@@ -149,20 +324,9 @@ class FichajeRepository:
         statement = select(func.count(Fichaje.id))
 
         # Aplicar los mismos filtros que en get_all
-        if user_id is not None:
-            statement = statement.where(Fichaje.user_id == user_id)
-
-        if date_from is not None:
-            statement = statement.where(func.date(Fichaje.check_in) >= date_from)
-
-        if date_to is not None:
-            statement = statement.where(func.date(Fichaje.check_in) <= date_to)
-
-        if status is not None:
-            statement = statement.where(Fichaje.status == status)
-
-        if incomplete_only:
-            statement = statement.where(Fichaje.check_out.is_(None))
+        statement = self._apply_filters(
+            statement, user_id, date_from, date_to, status, incomplete_only
+        )
 
         result = await self.session.execute(statement)
         return result.scalar_one()
@@ -175,21 +339,181 @@ class FichajeRepository:
 
         Returns:
             Fichaje actualizado con relaciones cargadas.
+
+        Raises:
+            ConflictException: Si otra transacción lo modificó después de leerlo.
         """
         self.session.add(fichaje)
-        await self.session.flush()
+        with stale_data_as_conflict("El fichaje"):
+            await self.session.flush()
 
-        # Recargar con relaciones para evitar lazy loading
-        stmt = (
-            select(Fichaje)
-            .options(
-                selectinload(Fichaje.user),
-                selectinload(Fichaje.approved_by_user),
+        # El flush emite un único UPDATE; las relaciones se resuelven sin releer la fila
+        await sync_many_to_one(self.session, fichaje)
+        return fichaje
+
+    async def get_many_for_approval(self, fichaje_ids: Sequence[int]) -> list[Row]:
+        """Obtiene varios fichajes para aprobar sus correcciones en lote.
+
+        Una sola consulta de columnas (sin pasar por el identity map), con
+        `FOR UPDATE` en los motores que lo soportan para que nadie los
+        modifique hasta que termine la transacción.
+
+        Args:
+            fichaje_ids: IDs de los fichajes.
+
+        Returns:
+            Filas (id, user_id, check_in, check_out, status, proposed_check_in,
+            proposed_check_out, version); los inexistentes se omiten.
+        """
+        statement = (
+            select(
+                Fichaje.id,
+                Fichaje.user_id,
+                Fichaje.check_in,
+                Fichaje.check_out,
+                Fichaje.status,
+                Fichaje.proposed_check_in,
+                Fichaje.proposed_check_out,
+                Fichaje.version,
             )
-            .where(Fichaje.id == fichaje.id)
+            .where(Fichaje.id.in_(fichaje_ids))
+            .with_for_update()
         )
-        result = await self.session.execute(stmt)
-        return result.scalar_one()
+        result = await self.session.execute(statement)
+        return list(result.all())
+
+    async def get_intervals(
+        self,
+        user_ids: Sequence[int],
+        start: datetime | None,
+        end: datetime | None,
+        exclude_ids: Sequence[int] = (),
+    ) -> list[Row]:
+        """Obtiene los intervalos de varios usuarios que pueden solaparse con un rango.
+
+        Devuelve los fichajes cerrados que se cruzan con [start, end) y todos
+        los fichajes abiertos (sin check_out), que solo se solapan entre sí
+        (mismo criterio que `exists_overlap`).
+
+        Args:
+            user_ids: IDs de los usuarios.
+            start: Inicio del rango (None si no hay intervalos cerrados que comprobar).
+            end: Fin del rango.
+            exclude_ids: IDs de fichajes a excluir.
+
+        Returns:
+            Filas (id, user_id, check_in, check_out).
+        """
+        window = Fichaje.check_out.is_(None)
+        if start is not None and end is not None:
+            window = or_(window, (Fichaje.check_in < end) & (Fichaje.check_out > start))
+
+        statement = select(Fichaje.id, Fichaje.user_id, Fichaje.check_in, Fichaje.check_out).where(
+            Fichaje.user_id.in_(user_ids), window
+        )
+        if exclude_ids:
+            statement = statement.where(Fichaje.id.not_in(exclude_ids))
+
+        result = await self.session.execute(statement)
+        return list(result.all())
+
+    async def apply_approvals(self, changes: Sequence[dict[str, Any]]) -> None:
+        """Aplica varias aprobaciones o rechazos de corrección con un único executemany.
+
+        Cada elemento trae `b_id` y `b_version` (fila y versión leídas) y los
+        valores de las columnas a actualizar. Como el ORM con `version_id_col`,
+        el UPDATE incrementa la versión y solo afecta a filas que siguen en la
+        versión leída.
+
+        Args:
+            changes: Parámetros de cada fila.
+
+        Raises:
+            ConflictException: Si alguna fila se modificó después de leerla.
+        """
+        if not changes:
+            return
+
+        table = Fichaje.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.version == bindparam("b_version"))
+            .values(version=table.c.version + 1)
+        )
+        result = await self.session.execute(statement, list(changes))
+
+        # Solo se puede comprobar si el driver informa filas afectadas en executemany
+        if result.supports_sane_multi_rowcount() and result.rowcount != len(changes):
+            raise ConflictException(
+                message="Algún fichaje del lote se ha modificado en otra operación simultánea",
+                details={"expected": len(changes), "updated": result.rowcount},
+            )
+
+    async def close_stale_open(self, max_shift: timedelta, now: datetime, system_note: str) -> int:
+        """Cierra con un único UPDATE los fichajes abiertos más de `max_shift`.
+
+        La salida queda en `check_in + max_shift` y el fichaje pasa a
+        PENDING_CORRECTION con `system_note` como motivo y añadida a las
+        notas, para que el empleado corrija la hora real. Si el fichaje ya
+        tenía una corrección pendiente (se puede pedir con el fichaje abierto),
+        se conservan su propuesta y su fecha y la nota se añade al motivo del
+        empleado. Incrementa la versión como el ORM (la sesión no se
+        sincroniza).
+
+        Args:
+            max_shift: Duración máxima de un turno.
+            now: Instante actual (se cierran las entradas anteriores a now - max_shift).
+            system_note: Nota del sistema (motivo de la corrección).
+
+        Returns:
+            Número de fichajes cerrados.
+        """
+        conn = await self.session.connection()
+        if conn.dialect.name == "postgresql":
+            check_out = Fichaje.check_in + max_shift
+        else:
+            # SQLite guarda las fechas como texto: se suman con datetime()
+            check_out = func.datetime(
+                Fichaje.check_in, f"+{int(max_shift.total_seconds())} seconds"
+            )
+
+        # La nota del sistema se añade al final; se recortan las notas previas (máx. 500)
+        room = NOTES_MAX_LENGTH - len(system_note) - 2
+        notes = case(
+            (Fichaje.notes.is_(None), system_note),
+            else_=func.substr(Fichaje.notes, 1, room) + "\n\n" + system_note,
+        )
+        # Una corrección ya pedida por el empleado conserva su motivo y su fecha
+        pending = Fichaje.status == FichajeStatus.PENDING_CORRECTION
+        reason_room = CORRECTION_REASON_MAX_LENGTH - len(system_note) - 2
+        correction_reason = case(
+            (
+                pending & Fichaje.correction_reason.is_not(None),
+                func.substr(Fichaje.correction_reason, 1, reason_room) + "\n\n" + system_note,
+            ),
+            else_=system_note,
+        )
+        correction_requested_at = case(
+            (
+                pending & Fichaje.correction_requested_at.is_not(None),
+                Fichaje.correction_requested_at,
+            ),
+            else_=now,
+        )
+        result = await self.session.execute(
+            update(Fichaje)
+            .where(Fichaje.check_out.is_(None), Fichaje.check_in < now - max_shift)
+            .values(
+                check_out=check_out,
+                status=FichajeStatus.PENDING_CORRECTION,
+                correction_reason=correction_reason,
+                correction_requested_at=correction_requested_at,
+                notes=notes,
+                version=Fichaje.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     async def calculate_total_hours(
         self,
@@ -207,28 +531,48 @@ class FichajeRepository:
         Returns:
             Total de horas trabajadas (solo fichajes completos).
         """
-        statement = select(Fichaje).where(Fichaje.check_out.is_not(None))
+        statement = select(Fichaje.check_in, Fichaje.check_out).where(
+            Fichaje.check_out.is_not(None)
+        )
 
         if user_id is not None:
             statement = statement.where(Fichaje.user_id == user_id)
 
+        # Rango sobre la columna (no date(check_in)): usa el índice y, en
+        # PostgreSQL, solo lee las particiones de esos meses
         if date_from is not None:
-            statement = statement.where(func.date(Fichaje.check_in) >= date_from)
+            statement = statement.where(Fichaje.check_in >= _day_start(date_from))
 
         if date_to is not None:
-            statement = statement.where(func.date(Fichaje.check_in) <= date_to)
+            statement = statement.where(Fichaje.check_in < _day_start(date_to + timedelta(days=1)))
 
         result = await self.session.execute(statement)
-        fichajes = result.scalars().all()
 
         total_hours = 0.0
-        for fichaje in fichajes:
-            if fichaje.check_out and fichaje.check_in:
-                delta = fichaje.check_out - fichaje.check_in
+        for check_in, check_out in result:
+            if check_out and check_in:
+                delta = check_out - check_in
                 total_hours += delta.total_seconds() / 3600
 
         return round(total_hours, 2)
 
+    async def create_partitions(self, months_ahead: int, today: date) -> list[str]:
+        """Crea las particiones mensuales que falten hasta `months_ahead` meses después de hoy.
+
+        Solo en PostgreSQL con la tabla particionada; en otro caso no hace nada.
+
+        Args:
+            months_ahead: Meses futuros que deben tener partición.
+            today: Día actual (UTC).
+
+        Returns:
+            Nombres de las particiones creadas.
+        """
+        first = month_start(today)
+        return await create_month_partitions(
+            self.session, Fichaje.__tablename__, "check_in", first, add_months(first, months_ahead)
+        )
+
     async def has_active_checkin(self, user_id: int) -> bool:
         """Verifica si un usuario tiene un fichaje activo (sin check-out).
 
@@ -295,3 +639,71 @@ class FichajeRepository:
         overlapping = result.scalar_one_or_none()
 
         return overlapping is not None
+
+    def _list_statement(
+        self,
+        user_id: int | None,
+        date_from: date | None,
+        date_to: date | None,
+        status: FichajeStatus | None,
+        incomplete_only: bool,
+    ):
+        """Construye la consulta de listado con filtros y orden."""
+        statement = self._apply_filters(
+            self._row_statement(), user_id, date_from, date_to, status, incomplete_only
+        )
+
+        # Ordenar por fecha más reciente primero
+        return statement.order_by(Fichaje.check_in.desc())
+
+    def _row_statement(self):
+        """Construye la consulta de las columnas de `FichajeRow`, con JOIN a `user`."""
+        return select(
+            Fichaje.id,
+            Fichaje.user_id,
+            User.email.label("user_email"),
+            User.full_name.label("user_full_name"),
+            Fichaje.check_in,
+            Fichaje.check_out,
+            Fichaje.status,
+            Fichaje.notes,
+            Fichaje.correction_reason,
+            Fichaje.correction_requested_at,
+            Fichaje.proposed_check_in,
+            Fichaje.proposed_check_out,
+            Fichaje.approved_by,
+            Fichaje.approved_at,
+            Fichaje.approval_notes,
+            Fichaje.created_at,
+            Fichaje.updated_at,
+            Fichaje.version,
+        ).join(User, User.id == Fichaje.user_id)
+
+    def _apply_filters(
+        self,
+        statement,
+        user_id: int | None,
+        date_from: date | None,
+        date_to: date | None,
+        status: FichajeStatus | None,
+        incomplete_only: bool,
+    ):
+        """Aplica los filtros comunes de listado y conteo a una consulta."""
+        if user_id is not None:
+            statement = statement.where(Fichaje.user_id == user_id)
+
+        # Rango sobre la columna (no date(check_in)): usa el índice y, en
+        # PostgreSQL, solo lee las particiones de esos meses
+        if date_from is not None:
+            statement = statement.where(Fichaje.check_in >= _day_start(date_from))
+
+        if date_to is not None:
+            statement = statement.where(Fichaje.check_in < _day_start(date_to + timedelta(days=1)))
+
+        if status is not None:
+            statement = statement.where(Fichaje.status == status)
+
+        if incomplete_only:
+            statement = statement.where(Fichaje.check_out.is_(None))
+
+        return statement
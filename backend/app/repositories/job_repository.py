@@ -0,0 +1,266 @@
+"""
+Repositorio de trabajos en segundo plano.
+
+Capa de acceso a datos para el modelo Job. Las transiciones de estado que
+hace el runner son UPDATE condicionales (por estado y por worker), de modo
+que varios workers pueden compartir la tabla como cola sin pisarse.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job, JobStatus
+from app.repositories.pagination import Page, fetch_page
+
+
+class JobRepository:
+    """
+    Repositorio para operaciones con trabajos.
+
+    Maneja toda la interacción con la base de datos para el modelo Job.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa el repositorio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+        """
+        self.session = session
+
+    async def create(self, job: Job) -> Job:
+        """
+        Encola un trabajo.
+
+        Args:
+            job: Trabajo a crear
+
+        Returns:
+            Job: Trabajo creado con ID asignado
+        """
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def get_by_id(self, job_id: int) -> Job | None:
+        """
+        Obtiene un trabajo por su ID.
+
+        Args:
+            job_id: ID del trabajo
+
+        Returns:
+            Job | None: Trabajo encontrado o None
+        """
+        return await self.session.get(Job, job_id)
+
+    async def get_page(
+        self,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> Page[Job]:
+        """
+        Lista trabajos, los más recientes primero.
+
+        Args:
+            status: Filtrar por estado
+            kind: Filtrar por tipo
+            skip: Registros a saltar
+            limit: Registros máximos
+
+        Returns:
+            Page[Job]: Página de trabajos
+        """
+        statement = select(Job)
+        if status is not None:
+            statement = statement.where(Job.status == status)
+        if kind is not None:
+            statement = statement.where(Job.kind == kind)
+        statement = statement.order_by(Job.created_at.desc(), Job.id.desc())
+
+        return await fetch_page(self.session, statement, skip, limit)
+
+    async def has_recent(self, kind: str, since: datetime) -> bool:
+        """
+        Indica si hay un trabajo de un tipo en cola, en ejecución o creado desde `since`.
+
+        Args:
+            kind: Tipo de trabajo
+            since: Instante a partir del que un trabajo cuenta como reciente
+
+        Returns:
+            bool: True si no hace falta encolar otro
+        """
+        stmt = select(
+            select(Job.id)
+            .where(
+                Job.kind == kind,
+                or_(
+                    Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                    Job.created_at >= since,
+                ),
+            )
+            .exists()
+        )
+        return bool((await self.session.execute(stmt)).scalar())
+
+    async def claim_next(self, worker_id: str, now: datetime, stale_before: datetime) -> Job | None:
+        """
+        Reclama el siguiente trabajo ejecutable para un worker.
+
+        Son ejecutables los pendientes cuyo `run_after` ya pasó y los que
+        siguen en ejecución con un latido anterior a `stale_before` (su
+        worker se cayó). El candidato se elige con `FOR UPDATE SKIP LOCKED`
+        en PostgreSQL, y el UPDATE repite la condición: si otro worker lo
+        reclamó antes, no se actualiza ninguna fila y se devuelve None.
+
+        Args:
+            worker_id: Identificador del worker
+            now: Instante actual
+            stale_before: Latido mínimo de un trabajo en ejecución
+
+        Returns:
+            Job | None: Trabajo reclamado (con `attempts` ya incrementado) o None
+        """
+        claimable = or_(
+            and_(
+                Job.status == JobStatus.PENDING,
+                Job.run_after <= now,
+                Job.cancel_requested.is_(False),
+            ),
+            and_(Job.status == JobStatus.RUNNING, Job.heartbeat_at < stale_before),
+        )
+        candidate = (
+            select(Job.id)
+            .where(claimable)
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job_id = (await self.session.execute(candidate)).scalar_one_or_none()
+        if job_id is None:
+            return None
+
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, claimable)
+            .values(
+                status=JobStatus.RUNNING,
+                worker_id=worker_id,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+                updated_at=now,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalars().first()
+
+    async def heartbeat(self, job_id: int, worker_id: str, now: datetime) -> bool | None:
+        """
+        Registra un latido del worker que ejecuta un trabajo.
+
+        Args:
+            job_id: ID del trabajo
+            worker_id: Worker que lo ejecuta
+            now: Instante actual
+
+        Returns:
+            bool | None: Si se pidió cancelarlo, o None si el worker ya no es su dueño
+        """
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == JobStatus.RUNNING)
+            .values(heartbeat_at=now)
+            .returning(Job.cancel_requested)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_progress(
+        self, job_id: int, progress: float, message: str | None
+    ) -> bool | None:
+        """
+        Actualiza el progreso de un trabajo en ejecución.
+
+        Args:
+            job_id: ID del trabajo
+            progress: Progreso entre 0 y 1
+            message: Descripción del paso actual
+
+        Returns:
+            bool | None: Si se pidió cancelarlo, o None si ya no está en ejecución
+        """
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(progress=progress, progress_message=message)
+            .returning(Job.cancel_requested)
+        )
+        return result.scalar_one_or_none()
+
+    async def finish(
+        self,
+        job_id: int,
+        worker_id: str,
+        status: JobStatus,
+        now: datetime,
+        **values: Any,
+    ) -> bool:
+        """
+        Cierra la ejecución de un trabajo (terminado o devuelto a la cola).
+
+        Args:
+            job_id: ID del trabajo
+            worker_id: Worker que lo ejecuta
+            status: Estado final, o PENDING para reintentarlo
+            now: Instante actual
+            **values: Otras columnas a actualizar (result, error, run_after...)
+
+        Returns:
+            bool: False si el worker ya no era su dueño (otro lo reclamó)
+        """
+        finished_at = None if status == JobStatus.PENDING else now
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == JobStatus.RUNNING)
+            .values(
+                status=status,
+                worker_id=None,
+                heartbeat_at=None,
+                finished_at=finished_at,
+                updated_at=now,
+                **values,
+            )
+        )
+        return result.rowcount == 1
+
+    async def request_cancel(self, job_id: int, now: datetime) -> None:
+        """
+        Cancela un trabajo.
+
+        Los pendientes pasan directamente a CANCELLED; en los que están en
+        ejecución se marca `cancel_requested` y su worker los detiene.
+
+        Args:
+            job_id: ID del trabajo
+            now: Instante actual
+        """
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+            .values(status=JobStatus.CANCELLED, cancel_requested=True, finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(cancel_requested=True)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,51 @@
+"""
+Bloqueos consultivos (advisory locks) de la base de datos.
+
+Permiten que solo uno de varios procesos (workers de la API, runners de
+trabajos) ejecute una tarea a la vez sin tablas de control: el bloqueo lo
+gestiona la propia base de datos y se libera al terminar la transacción,
+también si el proceso se cae.
+"""
+
+import hashlib
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Convierte el nombre de un bloqueo en la clave bigint de PostgreSQL.
+
+    Args:
+        name: Nombre del bloqueo (ej: "fichajes.auto_close")
+
+    Returns:
+        int: Clave estable de 64 bits con signo
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+async def try_advisory_xact_lock(session: AsyncSession, name: str) -> bool:
+    """
+    Intenta tomar un bloqueo consultivo hasta el final de la transacción.
+
+    En PostgreSQL usa `pg_try_advisory_xact_lock`, que no espera: si otro
+    proceso lo tiene, devuelve False. SQLite no tiene bloqueos consultivos
+    (y se usa con un único proceso), así que siempre devuelve True: lo que
+    se proteja con el bloqueo debe ser idempotente.
+
+    Args:
+        session: Sesión con la transacción que mantiene el bloqueo
+        name: Nombre del bloqueo
+
+    Returns:
+        bool: True si se obtuvo el bloqueo
+    """
+    conn = await session.connection()
+    if conn.dialect.name != "postgresql":
+        return True
+
+    result = await session.execute(select(func.pg_try_advisory_xact_lock(advisory_lock_key(name))))
+    return bool(result.scalar())
@@ -0,0 +1,131 @@
+"""
+Utilidades de paginación para los repositorios.
+
+Centraliza la obtención de una página y el cálculo del total según la
+estrategia de conteo solicitada (exacto, estimado o sin total).
+"""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Result, Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.pagination import CountStrategy
+
+
+@dataclass
+class Page[T]:
+    """Página de resultados con información de total."""
+
+    items: list[T]
+    total: int | None
+    has_more: bool
+    total_estimated: bool = False
+
+
+async def fetch_page(
+    session: AsyncSession,
+    stmt: Select,
+    skip: int,
+    limit: int,
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+    row_factory: Callable[[Row], Any] | None = None,
+) -> Page:
+    """
+    Ejecuta una consulta paginada calculando el total según la estrategia.
+
+    Con EXACT se mantiene el comportamiento clásico (COUNT + página). Con
+    ESTIMATED y NONE se pide un registro extra para saber si hay más páginas
+    sin necesidad de contar.
+
+    Args:
+        session: Sesión asíncrona de base de datos
+        stmt: Consulta filtrada y ordenada, sin offset/limit
+        skip: Número de registros a saltar
+        limit: Número máximo de registros a retornar
+        count_strategy: Estrategia de conteo
+        row_factory: Construye cada elemento a partir de la fila completa (para
+            consultas de columnas). Si es None se devuelve la primera columna
+            de cada fila (la entidad ORM)
+
+    Returns:
+        Page: Registros de la página, total y si hay más páginas
+    """
+    if count_strategy == CountStrategy.EXACT:
+        total = await count_exact(session, stmt)
+        result = await session.execute(stmt.offset(skip).limit(limit))
+        items = _items(result, row_factory)
+        return Page(items=items, total=total, has_more=skip + len(items) < total)
+
+    result = await session.execute(stmt.offset(skip).limit(limit + 1))
+    items = _items(result, row_factory)
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if count_strategy == CountStrategy.NONE:
+        return Page(items=items, total=None, has_more=has_more)
+
+    estimate = await count_estimated(session, stmt)
+    if estimate is None:
+        total = await count_exact(session, stmt)
+        return Page(items=items, total=total, has_more=has_more)
+
+    # La estimación nunca puede ser menor que lo que ya hemos visto
+    floor = skip + len(items) + (1 if has_more else 0)
+    return Page(items=items, total=max(estimate, floor), has_more=has_more, total_estimated=True)
+
+
+def _items(result: Result, row_factory: Callable[[Row], Any] | None) -> list:
+    """Convierte el resultado de la página en la lista de elementos."""
+    if row_factory is None:
+        return list(result.scalars().all())
+    return [row_factory(row) for row in result]
+
+
+async def count_exact(session: AsyncSession, stmt: Select) -> int:
+    """
+    Cuenta exactamente las filas de una consulta.
+
+    Args:
+        session: Sesión asíncrona de base de datos
+        stmt: Consulta a contar
+
+    Returns:
+        int: Número de filas
+    """
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    result = await session.execute(count_stmt)
+    return result.scalar() or 0
+
+
+async def count_estimated(session: AsyncSession, stmt: Select) -> int | None:
+    """
+    Estima el número de filas de una consulta usando el planificador de PostgreSQL.
+
+    Ejecuta `EXPLAIN (FORMAT JSON)` sobre la consulta filtrada y devuelve el
+    campo "Plan Rows" del nodo raíz. Para consultas sin filtros equivale a
+    `pg_class.reltuples` de la tabla.
+
+    Args:
+        session: Sesión asíncrona de base de datos
+        stmt: Consulta a estimar
+
+    Returns:
+        int | None: Filas estimadas, o None si el motor no soporta estimaciones
+    """
+    conn = await session.connection()
+    if conn.dialect.name != "postgresql":
+        return None
+
+    compiled = stmt.order_by(None).compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,166 @@
+"""
+Particiones mensuales por rango (PostgreSQL).
+
+En PostgreSQL la tabla `fichaje` está particionada por mes de `check_in`
+(`PARTITION BY RANGE`), con una partición por mes (`fichaje_y2026m03`) y una
+partición por defecto (`fichaje_default`) para las filas fuera de los meses
+creados. Las consultas con un rango de `check_in` solo leen las particiones
+de esos meses.
+
+Las particiones de los meses siguientes se crean por adelantado (trabajo
+periódico `fichajes.partitions`). SQLite no tiene particiones: las funciones
+de este módulo no hacen nada en las tablas que no están particionadas.
+"""
+
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+# Sufijo de la partición que recoge las filas de los meses sin partición propia
+DEFAULT_PARTITION_SUFFIX = "default"
+
+_PARTITION_SUFFIX = re.compile(r"y\d{4}m\d{2}|" + DEFAULT_PARTITION_SUFFIX)
+
+
+def month_start(day: date) -> date:
+    """Primer día del mes de `day`."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Primer día del mes `months` meses después (o antes) del de `month`.
+
+    Args:
+        month: Día de referencia
+        months: Meses a sumar (negativo para restar)
+
+    Returns:
+        date: Primer día del mes resultante
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Nombre de la partición de un mes (ej: `fichaje_y2026m03`)."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partition_name(table: str, name: str) -> bool:
+    """
+    Indica si `name` es una partición de `table` (mensual o por defecto).
+
+    Sirve, por ejemplo, para que el autogenerate de Alembic no las trate
+    como tablas que sobran: no están en los modelos.
+
+    Args:
+        table: Tabla particionada
+        name: Nombre de la tabla a comprobar
+
+    Returns:
+        bool: True si sigue el formato de las particiones de `table`
+    """
+    prefix = f"{table}_"
+    return name.startswith(prefix) and bool(_PARTITION_SUFFIX.fullmatch(name[len(prefix) :]))
+
+
+def _bound(month: date) -> str:
+    """Literal del límite de una partición: medianoche UTC del primer día del mes."""
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def get_partitions(conn: AsyncConnection, table: str) -> set[str] | None:
+    """
+    Particiones de una tabla.
+
+    Args:
+        conn: Conexión a la base de datos
+        table: Tabla particionada
+
+    Returns:
+        set[str] | None: Nombres de sus particiones, o None si la tabla no
+        está particionada (o la base de datos no es PostgreSQL)
+    """
+    if conn.dialect.name != "postgresql":
+        return None
+
+    partitioned = await conn.scalar(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class t ON t.oid = p.partrelid "
+            "WHERE t.relname = :table AND pg_table_is_visible(t.oid))"
+        ),
+        {"table": table},
+    )
+    if not partitioned:
+        return None
+
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class t ON t.oid = i.inhparent "
+            "WHERE t.relname = :table AND pg_table_is_visible(t.oid)"
+        ),
+        {"table": table},
+    )
+    return set(result.scalars())
+
+
+async def create_month_partitions(
+    session: AsyncSession, table: str, column: str, first: date, last: date
+) -> list[str]:
+    """
+    Crea las particiones mensuales que falten entre dos meses (incluidos).
+
+    Cada partición se crea como tabla aparte, recibe las filas de su mes que
+    hubiera en la partición por defecto y se adjunta con `ATTACH PARTITION`
+    (que crea sus índices a partir de los de la tabla). Así también se pueden
+    crear meses que ya tengan filas en la partición por defecto, algo que
+    `CREATE TABLE ... PARTITION OF` no permite.
+
+    Args:
+        session: Sesión con la transacción en la que se crean
+        table: Tabla particionada por rango de `column`
+        column: Columna de partición (timestamptz)
+        first: Día del primer mes
+        last: Día del último mes
+
+    Returns:
+        list[str]: Particiones creadas (vacía si la tabla no está particionada)
+    """
+    conn = await session.connection()
+    existing = await get_partitions(conn, table)
+    if existing is None:
+        return []
+
+    quote = conn.dialect.identifier_preparer.quote
+    default = f"{table}_{DEFAULT_PARTITION_SUFFIX}"
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            lower, upper = _bound(month), _bound(add_months(month, 1))
+            await conn.execute(
+                text(f"CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS)")
+            )
+            if default in existing:
+                await conn.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {quote(default)} "
+                        f"WHERE {quote(column)} >= {lower} AND {quote(column)} < {upper} "
+                        f"RETURNING *) INSERT INTO {quote(name)} SELECT * FROM moved"
+                    )
+                )
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} "
+                    f"FOR VALUES FROM ({lower}) TO ({upper})"
+                )
+            )
+            created.append(name)
+        month = add_months(month, 1)
+    return created
@@ -0,0 +1,54 @@
+"""
+Utilidades para mantener cargadas las relaciones tras una escritura.
+
+Tras un flush, el ORM ya conoce el estado de la fila escrita: las columnas
+modificadas y los valores por defecto generados en Python se aplican a la
+instancia sin expirarla. Lo único que puede quedar desincronizado son las
+relaciones many-to-one cuya clave foránea ha cambiado (p.ej. `reviewed_by`).
+En lugar de volver a leer la fila con `selectinload`, se resuelven desde el
+identity map de la sesión, que normalmente ya contiene al usuario relacionado.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import MANYTOONE
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import SQLModel
+
+
+async def sync_many_to_one(session: AsyncSession, instance: SQLModel) -> None:
+    """
+    Sincroniza las relaciones many-to-one de una instancia con sus claves foráneas.
+
+    Las relaciones ya cargadas y coherentes con su clave foránea no se tocan.
+    El resto se resuelven con `session.get`, que consulta primero el identity
+    map y solo emite un SELECT por clave primaria si el objeto no está en la
+    sesión. El valor se asigna como estado ya persistido, por lo que no genera
+    escrituras adicionales.
+
+    Args:
+        session: Sesión asíncrona de base de datos
+        instance: Instancia persistida (tras el flush)
+    """
+    state = inspect(instance)
+    mapper = state.mapper
+
+    for relationship in mapper.relationships:
+        if relationship.direction is not MANYTOONE:
+            continue
+
+        (column,) = relationship.local_columns
+        fk_value = getattr(instance, mapper.get_property_by_column(column).key)
+
+        if relationship.key in state.dict:
+            loaded = state.dict[relationship.key]
+            loaded_id = inspect(loaded).identity[0] if loaded is not None else None
+            if loaded_id == fk_value:
+                continue
+
+        related = (
+            await session.get(relationship.mapper.class_, fk_value)
+            if fk_value is not None
+            else None
+        )
+        set_committed_value(instance, relationship.key, related)
@@ -0,0 +1,95 @@
+"""
+Repositorio de tokens revocados.
+
+Capa de acceso a datos para la lista de revocación de tokens JWT.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.revoked_token import RevokedToken
+
+
+class RevokedTokenRepository:
+    """
+    Repositorio para la lista de revocación de tokens.
+
+    Las consultas de lectura devuelven solo los `jti`, sin cargar entidades.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa el repositorio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+        """
+        self.session = session
+
+    async def add(self, token: RevokedToken) -> bool:
+        """
+        Registra un token como revocado.
+
+        El insert se hace en un SAVEPOINT: si el `jti` ya estaba revocado
+        (reutilización de un refresh token o dos rotaciones simultáneas) solo
+        se deshace este insert y la transacción de la petición sigue abierta.
+
+        Args:
+            token: Token a revocar
+
+        Returns:
+            bool: True si se revocó, False si ya estaba revocado
+        """
+        try:
+            async with self.session.begin_nested():
+                self.session.add(token)
+        except IntegrityError:
+            return False
+        return True
+
+    async def exists(self, jti: str) -> bool:
+        """
+        Comprueba si un token está revocado (usa el índice único de `jti`).
+
+        Args:
+            jti: ID del token
+
+        Returns:
+            bool: True si está revocado
+        """
+        result = await self.session.execute(
+            select(RevokedToken.id).where(RevokedToken.jti == jti).limit(1)
+        )
+        return result.first() is not None
+
+    async def get_jtis(self, since: datetime | None = None) -> list[str]:
+        """
+        Obtiene los `jti` revocados que aún no han expirado.
+
+        Args:
+            since: Si se indica, solo los revocados a partir de esta fecha
+
+        Returns:
+            list[str]: IDs de los tokens revocados
+        """
+        statement = select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.now(UTC))
+        if since is not None:
+            statement = statement.where(RevokedToken.created_at >= since)
+
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def delete_expired(self) -> int:
+        """
+        Elimina las revocaciones de tokens ya expirados.
+
+        Returns:
+            int: Número de filas eliminadas
+        """
+        result = await self.session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(UTC))
+        )
+        return result.rowcount
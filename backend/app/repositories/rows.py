@@ -0,0 +1,164 @@
+"""
+Filas ligeras de solo lectura.
+
+Los flujos de solo lectura (listados, detalle, balance) seleccionan solo las
+columnas que usan (con un JOIN a `user` para el email y el nombre) y
+construyen estas dataclasses a partir de las filas de SQLAlchemy Core, sin
+pasar por el identity map ni cargar relaciones. Son inmutables y usan
+`__slots__`, por lo que ocupan mucho menos que una entidad SQLModel con su
+estado de instrumentación.
+
+Los nombres de los campos coinciden con los de los schemas de respuesta, de
+modo que se pueden validar con `from_attributes`. `from_row` construye la
+fila por posición: las consultas deben seleccionar las columnas en el mismo
+orden que los campos.
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Row
+
+from app.models.fichaje import FichajeStatus
+from app.models.solicitud import SolicitudStatus, SolicitudTipo
+from app.models.user import UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class FichajeRow:
+    """Fichaje de solo lectura con el email y el nombre de su usuario."""
+
+    id: int
+    user_id: int
+    user_email: str
+    user_full_name: str
+    check_in: datetime
+    check_out: datetime | None
+    status: FichajeStatus
+    notes: str | None
+    correction_reason: str | None
+    correction_requested_at: datetime | None
+    proposed_check_in: datetime | None
+    proposed_check_out: datetime | None
+    approved_by: int | None
+    approved_at: datetime | None
+    approval_notes: str | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    @classmethod
+    def from_row(cls, row: Row) -> "FichajeRow":
+        """Construye la fila a partir de un resultado con las columnas en orden."""
+        return cls(*row)
+
+    @property
+    def hours_worked(self) -> float | None:
+        """Horas trabajadas redondeadas a 2 decimales, o None si no hay check_out."""
+        if self.check_out is None:
+            return None
+
+        check_in = self.check_in
+        check_out = self.check_out
+        if check_in.tzinfo is None and check_out.tzinfo is not None:
+            check_in = check_in.replace(tzinfo=UTC)
+        elif check_out.tzinfo is None and check_in.tzinfo is not None:
+            check_out = check_out.replace(tzinfo=UTC)
+
+        return round((check_out - check_in).total_seconds() / 3600, 2)
+
+
+@dataclass(frozen=True, slots=True)
+class PresenceRow:
+    """Fichaje abierto (sin check-out) del censo de presencia."""
+
+    fichaje_id: int
+    user_id: int
+    user_email: str
+    user_full_name: str
+    check_in: datetime
+
+    @classmethod
+    def from_row(cls, row: Row) -> "PresenceRow":
+        """Construye la fila a partir de un resultado con las columnas en orden."""
+        return cls(*row)
+
+
+@dataclass(frozen=True, slots=True)
+class AbsenceRow:
+    """Ausencia del calendario: solicitud pendiente o aprobada con el nombre del usuario."""
+
+    solicitud_id: int
+    user_id: int
+    user_full_name: str
+    tipo: SolicitudTipo
+    status: SolicitudStatus
+    fecha_inicio: date
+    fecha_fin: date
+
+    @classmethod
+    def from_row(cls, row: Row) -> "AbsenceRow":
+        """Construye la fila a partir de un resultado con las columnas en orden."""
+        return cls(*row)
+
+
+@dataclass(frozen=True, slots=True)
+class SolicitudRow:
+    """Solicitud de solo lectura con los nombres del solicitante y del revisor."""
+
+    id: int
+    user_id: int
+    user_email: str
+    user_full_name: str
+    tipo: SolicitudTipo
+    fecha_inicio: date
+    fecha_fin: date
+    dias_solicitados: int
+    motivo: str
+    status: SolicitudStatus
+    reviewed_by: int | None
+    reviewed_by_name: str | None
+    reviewed_at: datetime | None
+    comentarios_revision: str | None
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    @classmethod
+    def from_row(cls, row: Row) -> "SolicitudRow":
+        """Construye la fila a partir de un resultado con las columnas en orden."""
+        return cls(*row)
+
+    @property
+    def is_pending(self) -> bool:
+        """Verifica si está pendiente de revisión."""
+        return self.status == SolicitudStatus.PENDING
+
+    @property
+    def is_approved(self) -> bool:
+        """Verifica si fue aprobada."""
+        return self.status == SolicitudStatus.APPROVED
+
+    @property
+    def is_active(self) -> bool:
+        """Verifica si la solicitud está en periodo activo."""
+        today = datetime.now(tz=UTC).date()
+        return self.is_approved and self.fecha_inicio <= today <= self.fecha_fin
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Datos de un usuario sin credenciales, para flujos de solo lectura."""
+
+    id: int
+    email: str
+    full_name: str
+    role: UserRole
+    is_active: bool
+    dias_vacaciones_anuales: int
+    dias_vacaciones_disponibles: float
+
+    @classmethod
+    def from_row(cls, row: Row) -> "UserSnapshot":
+        """Construye el snapshot a partir de un resultado con las columnas en orden."""
+        return cls(*row)
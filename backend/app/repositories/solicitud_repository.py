@@ -5,14 +5,20 @@ Capa de acceso a datos para el modelo Solicitud.
 Implementa el patrón Repository para abstraer la lógica de persistencia.
 """
 
+from collections.abc import Sequence
 from datetime import UTC, date, datetime
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, case, func, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
+from app.core.versioning import stale_data_as_conflict
 from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
 from app.models.user import User
+from app.repositories.pagination import Page, fetch_page
+from app.repositories.relationships import sync_many_to_one
+from app.repositories.rows import AbsenceRow, SolicitudRow, UserSnapshot
+from app.schemas.pagination import CountStrategy
 from app.schemas.solicitud import SolicitudFilters
 
 
@@ -44,11 +50,11 @@ class SolicitudRepository:
             solicitud: Instancia de Solicitud a crear
 
         Returns:
-            Solicitud: Solicitud creada con ID asignado
+            Solicitud: Solicitud creada con ID asignado y relaciones cargadas
         """
         self.session.add(solicitud)
         await self.session.flush()
-        await self.session.refresh(solicitud)
+        await sync_many_to_one(self.session, solicitud)
         return solicitud
 
     async def get_by_id(self, solicitud_id: int) -> Solicitud | None:
@@ -81,21 +87,139 @@ class SolicitudRepository:
 
         Returns:
             Solicitud: Solicitud actualizada con relaciones cargadas
+
+        Raises:
+            ConflictException: Si otra transacción la modificó después de leerla
         """
         self.session.add(solicitud)
-        await self.session.flush()
+        with stale_data_as_conflict("La solicitud"):
+            await self.session.flush()
+
+        # El flush emite un único UPDATE; las relaciones se resuelven sin releer la fila
+        await sync_many_to_one(self.session, solicitud)
+        return solicitud
+
+    async def mark_reviewed(
+        self,
+        solicitud_id: int,
+        version: int,
+        new_status: SolicitudStatus,
+        reviewed_by: int,
+        comentarios_revision: str | None = None,
+    ) -> Solicitud | None:
+        """
+        Registra la revisión de una solicitud solo si sigue pendiente y sin cambios.
+
+        Un único `UPDATE ... WHERE status = 'PENDING' AND version = :version
+        RETURNING`: si otro revisor se adelantó o el solicitante la modificó,
+        no actualiza nada. Incrementa la versión igual que el ORM, y la
+        solicitud de la sesión, si está cargada, se refresca con la fila devuelta.
+
+        Args:
+            solicitud_id: ID de la solicitud
+            version: Versión leída al validar la revisión
+            new_status: Estado resultante (APPROVED o REJECTED)
+            reviewed_by: ID del revisor
+            comentarios_revision: Comentarios de la revisión
+
+        Returns:
+            Solicitud | None: Solicitud revisada o None si ya no estaba pendiente o cambió
+        """
+        result = await self.session.execute(
+            update(Solicitud)
+            .where(
+                Solicitud.id == solicitud_id,  # type: ignore[arg-type]
+                Solicitud.status == SolicitudStatus.PENDING,  # type: ignore[arg-type]
+                Solicitud.version == version,  # type: ignore[arg-type]
+            )
+            .values(
+                version=Solicitud.version + 1,
+                status=new_status,
+                reviewed_by=reviewed_by,
+                reviewed_at=datetime.now(UTC),
+                comentarios_revision=comentarios_revision,
+            )
+            .returning(Solicitud)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        solicitud = result.scalar_one_or_none()
+        if solicitud is not None:
+            await sync_many_to_one(self.session, solicitud)
+        return solicitud
 
-        # Recargar con relaciones para evitar lazy loading
+    async def get_many_for_review(self, solicitud_ids: Sequence[int]) -> list[Solicitud]:
+        """
+        Obtiene varias solicitudes con su solicitante para revisarlas en lote.
+
+        Dos consultas en total, sea cual sea el número de ids: las solicitudes
+        y, con `selectinload`, sus solicitantes.
+
+        Args:
+            solicitud_ids: IDs de las solicitudes
+
+        Returns:
+            list[Solicitud]: Solicitudes encontradas (las inexistentes se omiten)
+        """
         stmt = (
             select(Solicitud)
-            .options(
-                selectinload(Solicitud.user),
-                selectinload(Solicitud.reviewed_by_user),
-            )
-            .where(Solicitud.id == solicitud.id)
+            .options(selectinload(Solicitud.user))
+            .where(Solicitud.id.in_(solicitud_ids))  # type: ignore[union-attr]
         )
         result = await self.session.execute(stmt)
-        return result.scalar_one()
+        return list(result.scalars().all())
+
+    async def mark_many_reviewed(
+        self,
+        decisions: Sequence[tuple[Solicitud, SolicitudStatus, str | None]],
+        reviewed_by: int,
+    ) -> list[Solicitud]:
+        """
+        Registra la revisión de varias solicitudes con un único UPDATE.
+
+        Equivale a `mark_reviewed` para todo el lote: el estado, los
+        comentarios y la versión esperada de cada fila van en expresiones
+        `CASE id WHEN ...`, y solo se actualizan las que siguen PENDING y en la
+        versión con la que se cargaron. Las solicitudes de la sesión se
+        refrescan con las filas devueltas.
+
+        Args:
+            decisions: (solicitud cargada, estado resultante, comentarios)
+            reviewed_by: ID del revisor
+
+        Returns:
+            list[Solicitud]: Solicitudes revisadas; las que faltan cambiaron entre
+            la lectura y la escritura
+        """
+        if not decisions:
+            return []
+
+        # El literal necesita el tipo de la columna para guardar el enum por nombre
+        status_type = Solicitud.__table__.c.status.type  # type: ignore[attr-defined]
+        result = await self.session.execute(
+            update(Solicitud)
+            .where(
+                Solicitud.id.in_([s.id for s, _, _ in decisions]),  # type: ignore[union-attr]
+                Solicitud.status == SolicitudStatus.PENDING,  # type: ignore[arg-type]
+                Solicitud.version  # type: ignore[arg-type]
+                == case({s.id: s.version for s, _, _ in decisions}, value=Solicitud.id),
+            )
+            .values(
+                version=Solicitud.version + 1,
+                status=case(
+                    {s.id: literal(new_status, status_type) for s, new_status, _ in decisions},
+                    value=Solicitud.id,
+                ),
+                reviewed_by=reviewed_by,
+                reviewed_at=datetime.now(UTC),
+                comentarios_revision=case(
+                    {s.id: comentarios for s, _, comentarios in decisions},
+                    value=Solicitud.id,
+                ),
+            )
+            .returning(Solicitud)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return list(result.scalars().all())
 
     async def delete(self, solicitud_id: int) -> bool:
         """
@@ -125,7 +249,8 @@ class SolicitudRepository:
         filters: SolicitudFilters,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Solicitud], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[SolicitudRow]:
         """
         Obtiene solicitudes de un usuario específico con filtros opcionales.
 
@@ -134,15 +259,13 @@ class SolicitudRepository:
             filters: Filtros a aplicar
             skip: Número de registros a saltar (paginación)
             limit: Número máximo de registros a retornar
+            count_strategy: Estrategia para calcular el total
 
         Returns:
-            tuple[list[Solicitud], int]: Lista de solicitudes y total
+            Page[SolicitudRow]: Solicitudes de la página, total y si hay más páginas
         """
         # Query base
-        stmt = select(Solicitud).options(
-            selectinload(Solicitud.user),
-            selectinload(Solicitud.reviewed_by_user),
-        )
+        stmt = self._list_statement()
 
         # Filtro obligatorio: usuario
         stmt = stmt.where(Solicitud.user_id == user_id)
@@ -150,29 +273,20 @@ class SolicitudRepository:
         # Aplicar filtros opcionales
         stmt = self._apply_filters(stmt, filters)
 
-        # Contar total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
         # Ordenar por fecha de creación descendente
         stmt = stmt.order_by(Solicitud.created_at.desc())
 
-        # Aplicar paginación
-        stmt = stmt.offset(skip).limit(limit)
-
-        # Ejecutar query
-        result = await self.session.execute(stmt)
-        solicitudes = list(result.scalars().all())
-
-        return solicitudes, total
+        return await fetch_page(
+            self.session, stmt, skip, limit, count_strategy, row_factory=SolicitudRow.from_row
+        )
 
     async def get_all(
         self,
         filters: SolicitudFilters,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Solicitud], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[SolicitudRow]:
         """
         Obtiene todas las solicitudes con filtros opcionales (HR).
 
@@ -180,74 +294,50 @@ class SolicitudRepository:
             filters: Filtros a aplicar
             skip: Número de registros a saltar (paginación)
             limit: Número máximo de registros a retornar
+            count_strategy: Estrategia para calcular el total
 
         Returns:
-            tuple[list[Solicitud], int]: Lista de solicitudes y total
+            Page[SolicitudRow]: Solicitudes de la página, total y si hay más páginas
         """
         # Query base
-        stmt = select(Solicitud).options(
-            selectinload(Solicitud.user),
-            selectinload(Solicitud.reviewed_by_user),
-        )
+        stmt = self._list_statement()
 
         # Aplicar filtros
         stmt = self._apply_filters(stmt, filters)
 
-        # Contar total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
         # Ordenar por fecha de creación descendente
         stmt = stmt.order_by(Solicitud.created_at.desc())
 
-        # Aplicar paginación
-        stmt = stmt.offset(skip).limit(limit)
-
-        # Ejecutar query
-        result = await self.session.execute(stmt)
-        solicitudes = list(result.scalars().all())
-
-        return solicitudes, total
+        return await fetch_page(
+            self.session, stmt, skip, limit, count_strategy, row_factory=SolicitudRow.from_row
+        )
 
     async def get_pending(
         self,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Solicitud], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[SolicitudRow]:
         """
         Obtiene solicitudes pendientes de revisión.
 
         Args:
             skip: Número de registros a saltar (paginación)
             limit: Número máximo de registros a retornar
+            count_strategy: Estrategia para calcular el total
 
         Returns:
-            tuple[list[Solicitud], int]: Lista de solicitudes y total
+            Page[SolicitudRow]: Solicitudes de la página, total y si hay más páginas
         """
         stmt = (
-            select(Solicitud)
-            .options(
-                selectinload(Solicitud.user),
-                selectinload(Solicitud.reviewed_by_user),
-            )
+            self._list_statement()
             .where(Solicitud.status == SolicitudStatus.PENDING)
             .order_by(Solicitud.created_at.asc())
         )
 
-        # Contar total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_result = await self.session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        # Aplicar paginación
-        stmt = stmt.offset(skip).limit(limit)
-
-        # Ejecutar query
-        result = await self.session.execute(stmt)
-        solicitudes = list(result.scalars().all())
-
-        return solicitudes, total
+        return await fetch_page(
+            self.session, stmt, skip, limit, count_strategy, row_factory=SolicitudRow.from_row
+        )
 
     async def check_date_conflict(
         self,
@@ -400,30 +490,62 @@ class SolicitudRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_absences_between(
+        self,
+        fecha_desde: date,
+        fecha_hasta: date,
+        statuses: Sequence[SolicitudStatus],
+    ) -> list[AbsenceRow]:
+        """
+        Obtiene las solicitudes que se solapan con un rango de fechas.
+
+        Una única consulta por rango (no por día): solo las columnas del
+        calendario y el nombre del usuario.
+
+        Args:
+            fecha_desde: Primer día del rango
+            fecha_hasta: Último día del rango (incluido)
+            statuses: Estados a incluir
+
+        Returns:
+            list[AbsenceRow]: Ausencias ordenadas por fecha de inicio
+        """
+        stmt = (
+            select(
+                Solicitud.id,
+                Solicitud.user_id,
+                User.full_name,
+                Solicitud.tipo,
+                Solicitud.status,
+                Solicitud.fecha_inicio,
+                Solicitud.fecha_fin,
+            )
+            .join(User, User.id == Solicitud.user_id)
+            .where(
+                Solicitud.fecha_inicio <= fecha_hasta,
+                Solicitud.fecha_fin >= fecha_desde,
+                Solicitud.status.in_(statuses),
+            )
+            .order_by(Solicitud.fecha_inicio, Solicitud.id)
+        )
+
+        result = await self.session.execute(stmt)
+        return [AbsenceRow.from_row(row) for row in result.all()]
+
     async def get_vacation_balance(
         self,
-        user_id: int,
+        user: UserSnapshot,
     ) -> dict:
         """
         Obtiene balance completo de vacaciones de un usuario.
 
         Args:
-            user_id: ID del usuario
+            user: Snapshot del usuario con sus días anuales y disponibles
 
         Returns:
             dict: Diccionario con información de balance
-
-        Raises:
-            ValueError: Si el usuario no existe
         """
-        # Obtener usuario con información de balance
-        user_stmt = select(User).where(User.id == user_id)
-        user_result = await self.session.execute(user_stmt)
-        user = user_result.scalar_one_or_none()
-
-        if not user:
-            msg = f"Usuario con id {user_id} no encontrado"
-            raise ValueError(msg)
+        user_id = user.id
 
         # Días tomados este año (solo VACATION aprobadas)
         year = datetime.now(tz=UTC).year
@@ -482,6 +604,41 @@ class SolicitudRepository:
     # FUNCIONES AUXILIARES PRIVADAS
     # ============================================================================
 
+    def _list_statement(self):
+        """
+        Construye la consulta base de los listados con las columnas de `SolicitudRow`.
+
+        Une `user` para el solicitante y, con LEFT JOIN, el revisor; solo se
+        seleccionan email y nombre, no la fila completa de usuario.
+
+        Returns:
+            Statement de columnas sin filtros ni orden
+        """
+        reviewer = aliased(User)
+        return (
+            select(
+                Solicitud.id,
+                Solicitud.user_id,
+                User.email.label("user_email"),
+                User.full_name.label("user_full_name"),
+                Solicitud.tipo,
+                Solicitud.fecha_inicio,
+                Solicitud.fecha_fin,
+                Solicitud.dias_solicitados,
+                Solicitud.motivo,
+                Solicitud.status,
+                Solicitud.reviewed_by,
+                reviewer.full_name.label("reviewed_by_name"),
+                Solicitud.reviewed_at,
+                Solicitud.comentarios_revision,
+                Solicitud.created_at,
+                Solicitud.updated_at,
+                Solicitud.version,
+            )
+            .join(User, User.id == Solicitud.user_id)
+            .outerjoin(reviewer, reviewer.id == Solicitud.reviewed_by)
+        )
+
     def _apply_filters(self, stmt, filters: SolicitudFilters):
         """
         Aplica filtros opcionales a una query de solicitudes.
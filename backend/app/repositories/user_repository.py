@@ -5,11 +5,12 @@ Capa de acceso a datos para el modelo User.
 Implementa el patrón Repository para abstraer la lógica de persistencia.
 """
 
-from sqlalchemy import select
+from sqlalchemy import case, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ConflictException
 from app.models.user import User, UserRole
+from app.repositories.rows import UserSnapshot
 
 
 class UserRepository:
@@ -50,7 +51,6 @@ class UserRepository:
 
         self.session.add(user)
         await self.session.flush()
-        await self.session.refresh(user)
         return user
 
     async def get_by_id(self, user_id: int) -> User | None:
@@ -66,6 +66,47 @@ class UserRepository:
         result = await self.session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_snapshot(self, user_id: int) -> UserSnapshot | None:
+        """
+        Obtiene los datos de solo lectura de un usuario (sin credenciales).
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            UserSnapshot | None: Snapshot del usuario o None
+        """
+        result = await self.session.execute(
+            select(
+                User.id,
+                User.email,
+                User.full_name,
+                User.role,
+                User.is_active,
+                User.dias_vacaciones_anuales,
+                User.dias_vacaciones_disponibles,
+            ).where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        return UserSnapshot.from_row(row) if row else None
+
+    async def get_full_names(self, user_ids: set[int]) -> dict[int, str]:
+        """
+        Obtiene el nombre de varios usuarios en una sola consulta.
+
+        Args:
+            user_ids: IDs de los usuarios
+
+        Returns:
+            dict[int, str]: Nombre por ID (los que no existen no aparecen)
+        """
+        if not user_ids:
+            return {}
+        result = await self.session.execute(
+            select(User.id, User.full_name).where(User.id.in_(user_ids))
+        )
+        return dict(result.tuples().all())
+
     async def get_by_email(self, email: str) -> User | None:
         """
         Obtiene un usuario por su email.
@@ -145,9 +186,62 @@ class UserRepository:
         """
         self.session.add(user)
         await self.session.flush()
-        await self.session.refresh(user)
         return user
 
+    async def decrement_vacation_days(self, user_id: int, days: float) -> User | None:
+        """
+        Descuenta días del balance de vacaciones de forma atómica.
+
+        Un único `UPDATE ... SET dias = dias - :n ... RETURNING`: el cálculo se
+        hace en la base de datos, así que dos descuentos concurrentes no se
+        pisan (no hay lectura previa del balance). El usuario de la sesión, si
+        está cargado, se refresca con la fila devuelta.
+
+        Args:
+            user_id: ID del usuario
+            days: Días a descontar
+
+        Returns:
+            User | None: Usuario con el balance actualizado o None si no existe
+        """
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id)  # type: ignore[arg-type]
+            .values(dias_vacaciones_disponibles=User.dias_vacaciones_disponibles - days)
+            .returning(User)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def decrement_vacation_days_many(self, days_by_user: dict[int, float]) -> list[User]:
+        """
+        Descuenta días del balance de varios usuarios con un único UPDATE.
+
+        Versión en lote de `decrement_vacation_days`: `SET dias = dias - CASE id
+        WHEN ... END`, con los días ya agrupados por usuario. Los usuarios de la
+        sesión, si están cargados, se refrescan con las filas devueltas.
+
+        Args:
+            days_by_user: Días a descontar por ID de usuario
+
+        Returns:
+            list[User]: Usuarios con el balance actualizado (los inexistentes se omiten)
+        """
+        if not days_by_user:
+            return []
+
+        result = await self.session.execute(
+            update(User)
+            .where(User.id.in_(days_by_user))  # type: ignore[union-attr]
+            .values(
+                dias_vacaciones_disponibles=User.dias_vacaciones_disponibles
+                - case(days_by_user, value=User.id)
+            )
+            .returning(User)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return list(result.scalars().all())
+
     async def delete(self, user_id: int) -> bool:
         """
         Elimina un usuario de la base de datos.
@@ -0,0 +1,317 @@
+"""
+Repositorio del cierre anual de vacaciones.
+
+El cálculo del nuevo balance se hace entero en SQL, por lotes de usuarios:
+un `INSERT ... SELECT` con el agregado de cada usuario rellena la tabla de
+auditoría y un `UPDATE user ... FROM vacation_rollover_entry` aplica los
+balances, sin cargar ningún usuario en Python.
+"""
+
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, DateTime, case, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User
+from app.models.vacation_rollover import VacationRollover, VacationRolloverEntry
+from app.repositories.pagination import Page, fetch_page
+
+
+def _least(a: ColumnElement[Any], b: ColumnElement[Any]) -> ColumnElement[Any]:
+    """Mínimo de dos expresiones (LEAST no existe en SQLite)."""
+    return case((a < b, a), else_=b)
+
+
+class VacationRolloverRepository:
+    """
+    Repositorio para el cierre anual de vacaciones.
+
+    Maneja toda la interacción con la base de datos para VacationRollover y
+    su traza por usuario.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa el repositorio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+        """
+        self.session = session
+
+    async def get_by_year(self, year: int) -> VacationRollover | None:
+        """
+        Obtiene el cierre de un año.
+
+        Args:
+            year: Año cerrado
+
+        Returns:
+            VacationRollover | None: Cierre encontrado o None
+        """
+        result = await self.session.execute(
+            select(VacationRollover).where(VacationRollover.year == year)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_latest_year(self) -> int | None:
+        """Retorna el último año cerrado (o en curso), o None si no hay ninguno."""
+        result = await self.session.execute(select(func.max(VacationRollover.year)))
+        return result.scalar_one_or_none()
+
+    async def create(self, rollover: VacationRollover) -> VacationRollover:
+        """
+        Registra un cierre anual.
+
+        Args:
+            rollover: Cierre a crear
+
+        Returns:
+            VacationRollover: Cierre creado con ID asignado
+        """
+        self.session.add(rollover)
+        await self.session.flush()
+        return rollover
+
+    async def count_pending_users(self, rollover: VacationRollover) -> int:
+        """
+        Cuenta los usuarios que faltan por procesar en un cierre.
+
+        Args:
+            rollover: Cierre en curso
+
+        Returns:
+            int: Usuarios con ID mayor que el último procesado
+        """
+        result = await self.session.execute(
+            select(func.count()).select_from(User).where(User.id > rollover.last_user_id)
+        )
+        return result.scalar_one()
+
+    def _computation(
+        self,
+        year: int,
+        max_carryover_days: float,
+        max_carryover_ratio: float | None,
+        first_user_id: int | None = None,
+        last_user_id: int | None = None,
+    ) -> Any:
+        """
+        Consulta con el cálculo del cierre por usuario.
+
+        Los días de vacaciones aprobadas que empiezan el año siguiente ya se
+        descontaron del balance actual: se suman a lo no disfrutado antes de
+        aplicar el tope y se vuelven a restar del balance nuevo. Un balance
+        negativo (días adelantados) se arrastra entero como deuda.
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados
+            max_carryover_ratio: Fracción máxima de los días anuales (None = sin tope)
+            first_user_id: Restringir a IDs mayores que este
+            last_user_id: Restringir a IDs menores o iguales que este
+
+        Returns:
+            Select: Columnas user_id, balance_before, future_days, carried_over,
+            forfeited y balance_after
+        """
+        future_filter = [
+            Solicitud.status == SolicitudStatus.APPROVED,
+            Solicitud.tipo == SolicitudTipo.VACATION,
+            Solicitud.fecha_inicio >= date(year + 1, 1, 1),
+        ]
+        user_filter = []
+        if first_user_id is not None:
+            future_filter.append(Solicitud.user_id > first_user_id)
+            user_filter.append(User.id > first_user_id)
+        if last_user_id is not None:
+            future_filter.append(Solicitud.user_id <= last_user_id)
+            user_filter.append(User.id <= last_user_id)
+
+        future = (
+            select(
+                Solicitud.user_id,
+                func.sum(Solicitud.dias_solicitados).label("future_days"),
+            )
+            .where(*future_filter)
+            .group_by(Solicitud.user_id)
+            .subquery()
+        )
+
+        future_days = func.coalesce(future.c.future_days, 0)
+        unused = User.dias_vacaciones_disponibles + future_days
+        cap: ColumnElement[Any] = literal(max_carryover_days)
+        if max_carryover_ratio is not None:
+            cap = _least(cap, User.dias_vacaciones_anuales * max_carryover_ratio)
+        carried = case((unused < 0, unused), (unused > cap, cap), else_=unused)
+        forfeited = case((unused > cap, unused - cap), else_=0)
+
+        return (
+            select(
+                User.id.label("user_id"),
+                User.dias_vacaciones_disponibles.label("balance_before"),
+                future_days.label("future_days"),
+                carried.label("carried_over"),
+                forfeited.label("forfeited"),
+                (User.dias_vacaciones_anuales + carried - future_days).label("balance_after"),
+            )
+            .select_from(User)
+            .outerjoin(future, future.c.user_id == User.id)
+            .where(*user_filter)
+        )
+
+    async def preview(
+        self, year: int, max_carryover_days: float, max_carryover_ratio: float | None
+    ) -> dict[str, Any]:
+        """
+        Calcula los totales de un cierre sin escribir nada (una sola consulta).
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados
+            max_carryover_ratio: Fracción máxima de los días anuales
+
+        Returns:
+            dict: users, users_capped, users_with_debt, total_carried,
+            total_forfeited y total_future_days
+        """
+        computation = self._computation(year, max_carryover_days, max_carryover_ratio).subquery()
+        result = await self.session.execute(
+            select(
+                func.count().label("users"),
+                func.count().filter(computation.c.forfeited > 0).label("users_capped"),
+                func.count().filter(computation.c.carried_over < 0).label("users_with_debt"),
+                func.coalesce(func.sum(computation.c.carried_over), 0).label("total_carried"),
+                func.coalesce(func.sum(computation.c.forfeited), 0).label("total_forfeited"),
+                func.coalesce(func.sum(computation.c.future_days), 0).label("total_future_days"),
+            )
+        )
+        return dict(result.one()._mapping)
+
+    async def apply_batch(self, rollover: VacationRollover, batch_size: int) -> int:
+        """
+        Aplica el cierre al siguiente lote de usuarios (por orden de ID).
+
+        En la misma transacción: inserta la traza del lote con el agregado,
+        actualiza los balances desde ella y avanza `last_user_id`, de modo que
+        un cierre interrumpido se reanuda donde lo dejó el último lote
+        confirmado. El balance se actualiza sumando la diferencia calculada,
+        así no se pisa un descuento concurrente hecho entre ambas sentencias.
+
+        Args:
+            rollover: Cierre en curso
+            batch_size: Usuarios por lote
+
+        Returns:
+            int: Usuarios procesados (0 = no quedaba ninguno)
+        """
+        first_user_id = rollover.last_user_id
+        batch = (
+            select(User.id)
+            .where(User.id > first_user_id)
+            .order_by(User.id)
+            .limit(batch_size)
+            .subquery()
+        )
+        last_user_id = (await self.session.execute(select(func.max(batch.c.id)))).scalar()
+        if last_user_id is None:
+            return 0
+
+        computation = self._computation(
+            rollover.year,
+            rollover.max_carryover_days,
+            rollover.max_carryover_ratio,
+            first_user_id=first_user_id,
+            last_user_id=last_user_id,
+        ).subquery()
+        now = datetime.now(UTC)
+        inserted = await self.session.execute(
+            insert(VacationRolloverEntry).from_select(
+                [
+                    "rollover_id",
+                    "user_id",
+                    "balance_before",
+                    "future_days",
+                    "carried_over",
+                    "forfeited",
+                    "balance_after",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    literal(rollover.id),
+                    computation.c.user_id,
+                    computation.c.balance_before,
+                    computation.c.future_days,
+                    computation.c.carried_over,
+                    computation.c.forfeited,
+                    computation.c.balance_after,
+                    literal(now, DateTime(timezone=True)),
+                    literal(now, DateTime(timezone=True)),
+                ),
+            )
+        )
+
+        entry = VacationRolloverEntry
+        await self.session.execute(
+            update(User)
+            .where(
+                User.id == entry.user_id,
+                entry.rollover_id == rollover.id,
+                entry.user_id > first_user_id,
+                entry.user_id <= last_user_id,
+            )
+            .values(
+                dias_vacaciones_disponibles=User.dias_vacaciones_disponibles
+                + entry.balance_after
+                - entry.balance_before
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        rollover.last_user_id = last_user_id
+        rollover.users_processed += inserted.rowcount
+        await self.session.flush()
+        return inserted.rowcount
+
+    async def get_totals(self, rollover_id: int) -> tuple[float, float]:
+        """
+        Suma lo arrastrado y lo perdido en un cierre.
+
+        Args:
+            rollover_id: ID del cierre
+
+        Returns:
+            tuple[float, float]: Días arrastrados y días perdidos
+        """
+        result = await self.session.execute(
+            select(
+                func.coalesce(func.sum(VacationRolloverEntry.carried_over), 0),
+                func.coalesce(func.sum(VacationRolloverEntry.forfeited), 0),
+            ).where(VacationRolloverEntry.rollover_id == rollover_id)
+        )
+        carried, forfeited = result.one()
+        return float(carried), float(forfeited)
+
+    async def get_entries_page(
+        self, rollover_id: int, skip: int = 0, limit: int = 100
+    ) -> Page[VacationRolloverEntry]:
+        """
+        Lista la traza de un cierre, por usuario.
+
+        Args:
+            rollover_id: ID del cierre
+            skip: Registros a saltar
+            limit: Registros máximos
+
+        Returns:
+            Page[VacationRolloverEntry]: Página de la traza
+        """
+        statement = (
+            select(VacationRolloverEntry)
+            .where(VacationRolloverEntry.rollover_id == rollover_id)
+            .order_by(VacationRolloverEntry.user_id)
+        )
+        return await fetch_page(self.session, statement, skip, limit)
@@ -4,6 +4,7 @@ Schemas Pydantic para la API.
 Modelos de entrada/salida separados de los modelos de base de datos.
 """
 
+from app.schemas.auth import LoginRateLimitMetrics, RefreshTokenRequest
 from app.schemas.fichaje import (
     FichajeApproval,
     FichajeCheckIn,
@@ -11,6 +12,14 @@ from app.schemas.fichaje import (
     FichajeCorrection,
     FichajeResponse,
 )
+from app.schemas.health import (
+    DependencyCheck,
+    LivenessResponse,
+    PoolStatus,
+    ReadinessResponse,
+)
+from app.schemas.job import JobCreate, JobKindResponse, JobListResponse, JobResponse
+from app.schemas.pagination import CountStrategy
 from app.schemas.solicitud import (
     SolicitudCreate,
     SolicitudFilters,
@@ -32,13 +41,31 @@ from app.schemas.user import (
     UserUpdate,
     UserUpdateSelf,
 )
+from app.schemas.vacation_rollover import (
+    VacationRolloverEntryListResponse,
+    VacationRolloverEntryResponse,
+    VacationRolloverReport,
+    VacationRolloverRequest,
+    VacationRolloverResponse,
+)
 
 __all__ = [
+    "CountStrategy",
+    "DependencyCheck",
     "FichajeApproval",
     "FichajeCheckIn",
     "FichajeCheckOut",
     "FichajeCorrection",
     "FichajeResponse",
+    "JobCreate",
+    "JobKindResponse",
+    "JobListResponse",
+    "JobResponse",
+    "LivenessResponse",
+    "LoginRateLimitMetrics",
+    "PoolStatus",
+    "ReadinessResponse",
+    "RefreshTokenRequest",
     "SolicitudCreate",
     "SolicitudFilters",
     "SolicitudListResponse",
@@ -56,4 +83,9 @@ __all__ = [
     "UserUpdate",
     "UserUpdateSelf",
     "VacationBalance",
+    "VacationRolloverEntryListResponse",
+    "VacationRolloverEntryResponse",
+    "VacationRolloverReport",
+    "VacationRolloverRequest",
+    "VacationRolloverResponse",
 ]
@@ -0,0 +1,24 @@
+"""
+Schemas Pydantic para autenticación.
+
+Define los modelos de entrada/salida de los endpoints de tokens y las
+métricas del limitador de login.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema con el refresh token de la sesión."""
+
+    refresh_token: str = Field(min_length=1, description="Refresh token JWT")
+
+
+class LoginRateLimitMetrics(BaseModel):
+    """Métricas del limitador de intentos de login del worker."""
+
+    enabled: bool = Field(description="True si el limitador está activo")
+    allowed: int = Field(description="Intentos que han pasado el limitador")
+    rejected_ip: int = Field(description="Intentos rechazados por límite de IP")
+    rejected_email: int = Field(description="Intentos rechazados por límite de email")
+    tracked_keys: int = Field(description="Buckets (IPs y emails) en memoria")
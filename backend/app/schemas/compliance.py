@@ -0,0 +1,46 @@
+"""Schemas Pydantic para el cumplimiento de jornada y descansos."""
+
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ComplianceRule(str, Enum):
+    """Reglas de jornada y descanso comprobadas."""
+
+    DAILY_HOURS = "daily_hours"  # Jornada diaria por encima del máximo
+    WEEKLY_HOURS = "weekly_hours"  # Semana (ISO) por encima del máximo
+    MIN_REST = "min_rest"  # Descanso entre jornadas por debajo del mínimo
+
+
+# ============================================================================
+# RESPONSE SCHEMAS
+# ============================================================================
+
+
+class ComplianceViolationEntry(BaseModel):
+    """Incumplimiento de un usuario en un día o semana."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: int
+    user_full_name: str
+    rule: ComplianceRule
+    fecha: date = Field(description="Día del incumplimiento (lunes de la semana en weekly_hours)")
+    hours: float = Field(description="Horas trabajadas, o de descanso en min_rest")
+    limit_hours: float = Field(description="Límite de la regla")
+
+
+class ComplianceReport(BaseModel):
+    """Incumplimientos de jornada y descanso de un rango de días."""
+
+    date_from: date
+    date_to: date
+    max_daily_hours: float
+    max_weekly_hours: float
+    min_rest_hours: float
+    intervals: int = Field(description="Fichajes cerrados analizados (semanas completas)")
+    users_checked: int = Field(description="Usuarios con fichajes en las semanas del rango")
+    totals: dict[ComplianceRule, int] = Field(description="Incumplimientos por regla")
+    violations: list[ComplianceViolationEntry] = Field(description="Por usuario y fecha")
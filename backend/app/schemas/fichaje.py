@@ -1,10 +1,12 @@
 """Schemas Pydantic para fichajes (entradas/salidas)."""
 
 from datetime import date, datetime
+from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field
 
 from app.models.fichaje import FichajeStatus
+from app.schemas.types import UTCDateTime
 
 # ============================================================================
 # Schemas de Request (Entrada)
@@ -71,6 +73,23 @@ class FichajeApproval(BaseModel):
     )
 
 
+class FichajeBulkApprovalItem(FichajeApproval):
+    """Decisión sobre una corrección dentro de una aprobación masiva."""
+
+    fichaje_id: int = Field(description="ID del fichaje con la corrección")
+    version: int | None = Field(
+        default=None, description="Versión leída por el cliente (equivale a If-Match)"
+    )
+
+
+class FichajeBulkApproval(BaseModel):
+    """Request para aprobar o rechazar varias correcciones a la vez."""
+
+    items: list[FichajeBulkApprovalItem] = Field(
+        min_length=1, max_length=500, description="Decisiones a aplicar"
+    )
+
+
 class FichajeFilters(BaseModel):
     """Filtros para consulta de fichajes."""
 
@@ -87,17 +106,24 @@ class FichajeFilters(BaseModel):
 
 
 class FichajeResponse(BaseModel):
-    """Respuesta con datos completos de un fichaje."""
+    """
+    Respuesta con datos completos de un fichaje.
+
+    Se puede validar directamente desde un `Fichaje` con su relación `user`
+    cargada (`from_attributes`): el email y el nombre se leen de `user`.
+    """
 
     # Identificación
     id: int
     user_id: int
-    user_email: str
-    user_full_name: str
+    user_email: str = Field(validation_alias=AliasChoices(AliasPath("user", "email"), "user_email"))
+    user_full_name: str = Field(
+        validation_alias=AliasChoices(AliasPath("user", "full_name"), "user_full_name")
+    )
 
     # Datos del fichaje
-    check_in: datetime
-    check_out: datetime | None
+    check_in: UTCDateTime
+    check_out: UTCDateTime | None
     hours_worked: float | None
 
     # Metadatos
@@ -106,49 +132,70 @@ class FichajeResponse(BaseModel):
 
     # Información de corrección
     correction_reason: str | None
-    correction_requested_at: datetime | None
+    correction_requested_at: UTCDateTime | None
 
     # Valores propuestos en la corrección
-    proposed_check_in: datetime | None
-    proposed_check_out: datetime | None
+    proposed_check_in: UTCDateTime | None
+    proposed_check_out: UTCDateTime | None
 
     # Información de aprobación
     approved_by: int | None
-    approved_at: datetime | None
+    approved_at: UTCDateTime | None
     approval_notes: str | None
 
     # Timestamps
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
+
+    # Versión para If-Match (control de concurrencia optimista)
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
 
-    @field_serializer(
-        "check_in",
-        "check_out",
-        "correction_requested_at",
-        "proposed_check_in",
-        "proposed_check_out",
-        "approved_at",
-        "created_at",
-        "updated_at",
-    )
-    def serialize_datetime(self, dt: datetime | None, _info) -> str | None:
-        """Serializa datetime a ISO 8601 con sufijo Z (UTC)."""
-        if dt is None:
-            return None
-        # Convertir a UTC si tiene timezone y formatear con Z
-        if dt.tzinfo is not None:
-            return dt.isoformat().replace("+00:00", "Z")
-        # Si no tiene timezone, asumir UTC y agregar Z
-        return f"{dt.isoformat()}Z"
+
+class FichajeBulkApprovalError(str, Enum):
+    """Motivo por el que no se aplicó una decisión de una aprobación masiva."""
+
+    NOT_FOUND = "not_found"
+    DUPLICATE = "duplicate"  # El fichaje aparece más de una vez en el lote
+    NOT_PENDING = "not_pending"  # No tiene una corrección pendiente
+    VERSION_CONFLICT = "version_conflict"  # No coincide con la versión indicada
+    OVERLAP = "overlap"  # Los valores propuestos se solapan con otro fichaje
+
+
+class FichajeBulkApprovalOutcome(BaseModel):
+    """Resultado de una decisión de una aprobación masiva."""
+
+    fichaje_id: int
+    ok: bool
+    status: FichajeStatus | None = Field(
+        default=None, description="Estado tras la decisión (o actual si falló)"
+    )
+    version: int | None = None
+    error: FichajeBulkApprovalError | None = None
+    detail: str | None = None
+
+
+class FichajeBulkApprovalResponse(BaseModel):
+    """Respuesta de una aprobación masiva, con un resultado por decisión."""
+
+    results: list[FichajeBulkApprovalOutcome]
+    approved: int = Field(description="Correcciones aprobadas")
+    rejected: int = Field(description="Correcciones rechazadas")
+    failed: int = Field(description="Decisiones no aplicadas")
 
 
 class FichajeListResponse(BaseModel):
     """Respuesta paginada de fichajes con estadísticas."""
 
     fichajes: list[FichajeResponse]
-    total: int = Field(description="Total de fichajes que cumplen los filtros")
+    total: int | None = Field(
+        description="Total de fichajes que cumplen los filtros (None si count_strategy=none)"
+    )
+    has_more: bool = Field(default=False, description="True si existen más páginas")
+    total_estimated: bool = Field(
+        default=False, description="True si el total es una estimación del planificador"
+    )
     page: int = Field(description="Página actual")
     page_size: int = Field(description="Tamaño de página")
     total_hours: float = Field(description="Suma total de horas trabajadas en el periodo")
@@ -158,6 +205,8 @@ class FichajeListResponse(BaseModel):
             "example": {
                 "fichajes": [],
                 "total": 42,
+                "has_more": True,
+                "total_estimated": False,
                 "page": 1,
                 "page_size": 10,
                 "total_hours": 168.5,
@@ -166,6 +215,41 @@ class FichajeListResponse(BaseModel):
     )
 
 
+class PresenceEntry(BaseModel):
+    """Usuario dentro: su fichaje abierto."""
+
+    fichaje_id: int
+    user_id: int
+    user_email: str
+    user_full_name: str
+    check_in: UTCDateTime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PresenceResponse(BaseModel):
+    """Quién tiene ahora mismo un fichaje abierto."""
+
+    present: list[PresenceEntry] = Field(description="Usuarios dentro, por hora de entrada")
+    total: int = Field(description="Número de usuarios dentro")
+    synced_at: UTCDateTime | None = Field(
+        description="Última recarga completa del censo (None si aún no se ha cargado)"
+    )
+
+
+class OccupancyHeatmap(BaseModel):
+    """Ocupación por hora (UTC) de cada día de un rango: matrices día x 24 horas."""
+
+    date_from: date
+    date_to: date
+    days: list[date] = Field(description="Día de cada fila de las matrices")
+    peak: list[list[int]] = Field(description="Máximo de personas dentro a la vez en cada hora")
+    average: list[list[float]] = Field(
+        description="Personas dentro de media en cada hora (horas-persona por hora)"
+    )
+    intervals: int = Field(description="Fichajes que se cruzan con el rango")
+
+
 class FichajeStats(BaseModel):
     """Estadísticas de fichajes de un usuario o periodo."""
 
@@ -0,0 +1,46 @@
+"""Schemas Pydantic para las sondas de salud (liveness/readiness)."""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LivenessResponse(BaseModel):
+    """Respuesta de la sonda de liveness (el proceso responde)."""
+
+    status: Literal["healthy"] = "healthy"
+    app: str
+    version: str
+    environment: str
+
+
+class PoolStatus(BaseModel):
+    """Estado del pool de conexiones a la base de datos."""
+
+    size: int = Field(description="Conexiones permanentes configuradas en el pool")
+    checked_out: int = Field(description="Conexiones actualmente en uso")
+    overflow: int = Field(description="Conexiones abiertas por encima de size")
+    capacity: int | None = Field(description="Máximo de conexiones simultáneas (None = sin límite)")
+    saturation: float | None = Field(description="Fracción de la capacidad en uso (0-1)")
+    exhausted: bool = Field(description="True si no quedan conexiones disponibles")
+
+
+class DependencyCheck(BaseModel):
+    """Resultado de la comprobación de una dependencia externa."""
+
+    status: Literal["up", "down"]
+    latency_ms: float | None = Field(default=None, description="Latencia de la comprobación")
+    error: str | None = Field(default=None, description="Motivo del fallo, si lo hay")
+
+
+class ReadinessResponse(BaseModel):
+    """Respuesta de la sonda de readiness (el worker puede atender tráfico)."""
+
+    status: Literal["ready", "unavailable"]
+    database: DependencyCheck
+    pool: PoolStatus | None = Field(
+        default=None, description="Estado del pool (None si el pool no expone métricas)"
+    )
+    checked_at: datetime = Field(description="Momento en que se ejecutó la comprobación")
+    cached: bool = Field(default=False, description="True si el resultado proviene de la caché")
@@ -0,0 +1,69 @@
+"""Schemas Pydantic para trabajos en segundo plano."""
+
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.job import JobStatus
+from app.schemas.types import UTCDateTime
+
+# ============================================================================
+# REQUEST SCHEMAS
+# ============================================================================
+
+
+class JobCreate(BaseModel):
+    """Request para encolar un trabajo."""
+
+    kind: str = Field(min_length=1, max_length=64, examples=["revoked_tokens.purge"])
+    payload: dict[str, Any] = Field(default_factory=dict, description="Parámetros del trabajo")
+    max_attempts: int | None = Field(default=None, ge=1, le=20)
+    run_after: UTCDateTime | None = Field(default=None, description="No ejecutar antes de")
+
+
+# ============================================================================
+# RESPONSE SCHEMAS
+# ============================================================================
+
+
+class JobResponse(BaseModel):
+    """Respuesta con el estado y el progreso de un trabajo."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    status: JobStatus
+    progress: float
+    progress_message: str | None
+    result: dict[str, Any] | None
+    error: str | None
+    attempts: int
+    max_attempts: int
+    run_after: UTCDateTime
+    cancel_requested: bool
+    started_at: UTCDateTime | None
+    finished_at: UTCDateTime | None
+    created_by: int | None
+    created_at: UTCDateTime
+
+
+class JobListResponse(BaseModel):
+    """Respuesta con lista paginada de trabajos."""
+
+    jobs: list[JobResponse]
+    total: int | None
+    has_more: bool = False
+    skip: int
+    limit: int
+
+
+class JobKindResponse(BaseModel):
+    """Tipo de trabajo que se puede encolar."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: str
+    description: str
+    max_attempts: int | None
@@ -0,0 +1,17 @@
+"""Schemas Pydantic compartidos para paginación de listados."""
+
+from enum import Enum
+
+
+class CountStrategy(str, Enum):
+    """
+    Estrategia para calcular el total de un listado paginado.
+
+    - EXACT: `COUNT(*)` sobre la consulta filtrada (coste proporcional a la tabla)
+    - ESTIMATED: Estimación del planificador de PostgreSQL (exacto en otros motores)
+    - NONE: Sin total, solo se indica si hay más páginas (`has_more`)
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
@@ -1,10 +1,12 @@
 """Schemas Pydantic para solicitudes de vacaciones y ausencias."""
 
-from datetime import date, datetime
+from datetime import date
+from enum import Enum
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer, model_validator
+from pydantic import AliasChoices, AliasPath, BaseModel, ConfigDict, Field, model_validator
 
 from app.models.solicitud import SolicitudStatus, SolicitudTipo
+from app.schemas.types import UTCDateTime
 
 # ============================================================================
 # REQUEST SCHEMAS
@@ -51,6 +53,19 @@ class SolicitudReview(BaseModel):
     comentarios_revision: str | None = Field(default=None, max_length=500)
 
 
+class SolicitudBulkReviewItem(SolicitudReview):
+    """Decisión sobre una solicitud dentro de una revisión masiva."""
+
+    solicitud_id: int
+    version: int | None = None  # Versión leída por el cliente (como If-Match)
+
+
+class SolicitudBulkReview(BaseModel):
+    """Request para revisar varias solicitudes a la vez (solo HR)."""
+
+    items: list[SolicitudBulkReviewItem] = Field(min_length=1, max_length=500)
+
+
 class SolicitudFilters(BaseModel):
     """Filtros para consulta de solicitudes."""
 
@@ -68,12 +83,19 @@ class SolicitudFilters(BaseModel):
 
 
 class SolicitudResponse(BaseModel):
-    """Respuesta con datos de solicitud."""
+    """
+    Respuesta con datos de solicitud.
+
+    Se puede validar directamente desde una `Solicitud` con sus relaciones
+    `user` y `reviewed_by_user` cargadas (`from_attributes`).
+    """
 
     id: int
     user_id: int
-    user_email: str
-    user_full_name: str
+    user_email: str = Field(validation_alias=AliasChoices(AliasPath("user", "email"), "user_email"))
+    user_full_name: str = Field(
+        validation_alias=AliasChoices(AliasPath("user", "full_name"), "user_full_name")
+    )
     tipo: SolicitudTipo
     fecha_inicio: date
     fecha_fin: date
@@ -81,38 +103,96 @@ class SolicitudResponse(BaseModel):
     motivo: str
     status: SolicitudStatus
     reviewed_by: int | None
-    reviewed_by_name: str | None
-    reviewed_at: datetime | None
+    reviewed_by_name: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices(
+            "reviewed_by_name", AliasPath("reviewed_by_user", "full_name")
+        ),
+    )
+    reviewed_at: UTCDateTime | None
     comentarios_revision: str | None
     is_pending: bool
     is_approved: bool
     is_active: bool
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTCDateTime
+    updated_at: UTCDateTime
+    version: int  # Para If-Match (control de concurrencia optimista)
 
     model_config = ConfigDict(from_attributes=True)
 
-    @field_serializer("reviewed_at", "created_at", "updated_at")
-    def serialize_datetime(self, dt: datetime | None, _info) -> str | None:
-        """Serializa datetime a ISO 8601 con sufijo Z (UTC)."""
-        if dt is None:
-            return None
-        # Convertir a UTC si tiene timezone y formatear con Z
-        if dt.tzinfo is not None:
-            return dt.isoformat().replace("+00:00", "Z")
-        # Si no tiene timezone, asumir UTC y agregar Z
-        return f"{dt.isoformat()}Z"
-
 
 class SolicitudListResponse(BaseModel):
     """Respuesta con lista paginada de solicitudes."""
 
     solicitudes: list[SolicitudResponse]
-    total: int
+    total: int | None  # None si count_strategy=none
+    has_more: bool = False
+    total_estimated: bool = False  # True si el total es una estimación del planificador
     skip: int
     limit: int
 
 
+class SolicitudBulkReviewError(str, Enum):
+    """Motivo por el que no se aplicó una decisión de una revisión masiva."""
+
+    NOT_FOUND = "not_found"
+    DUPLICATE = "duplicate"  # La solicitud aparece más de una vez en el lote
+    NOT_PENDING = "not_pending"  # RN-V09
+    OWN_REQUEST = "own_request"  # RN-V14
+    VERSION_CONFLICT = "version_conflict"  # No coincide con la versión indicada
+    CONFLICT = "conflict"  # Revisada o modificada durante la operación
+
+
+class SolicitudBulkReviewOutcome(BaseModel):
+    """Resultado de una decisión de una revisión masiva."""
+
+    solicitud_id: int
+    ok: bool
+    status: SolicitudStatus | None = None  # Estado tras la revisión (o actual si falló)
+    version: int | None = None
+    error: SolicitudBulkReviewError | None = None
+    detail: str | None = None
+
+
+class SolicitudBulkReviewResponse(BaseModel):
+    """Respuesta de una revisión masiva, con un resultado por decisión."""
+
+    results: list[SolicitudBulkReviewOutcome]
+    approved: int
+    rejected: int
+    failed: int
+
+
+class AbsenceCalendarEntry(BaseModel):
+    """Ausencia del calendario."""
+
+    solicitud_id: int
+    user_id: int
+    user_full_name: str
+    tipo: SolicitudTipo
+    status: SolicitudStatus
+    fecha_inicio: date
+    fecha_fin: date
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AbsenceCalendarDay(BaseModel):
+    """Ausencias de un día del calendario."""
+
+    fecha: date
+    solicitud_ids: list[int]  # IDs de `absences` que incluyen el día
+
+
+class AbsenceCalendarResponse(BaseModel):
+    """Calendario de ausencias de un rango de fechas, día a día."""
+
+    fecha_desde: date
+    fecha_hasta: date
+    absences: list[AbsenceCalendarEntry]  # Cada solicitud una vez
+    days: list[AbsenceCalendarDay]  # Todos los días del rango, en orden
+
+
 class VacationBalance(BaseModel):
     """Balance de vacaciones de un empleado."""
 
@@ -0,0 +1,20 @@
+"""Tipos Pydantic compartidos por los schemas de respuesta."""
+
+from datetime import UTC, datetime
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Normaliza un datetime a UTC (los naive se asumen ya en UTC)."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    if dt.utcoffset():
+        return dt.astimezone(UTC)
+    return dt
+
+
+# Datetime normalizado a UTC al validar. El serializador nativo de Pydantic
+# lo emite en ISO 8601 con sufijo "Z" sin pasar por código Python.
+UTCDateTime = Annotated[datetime, AfterValidator(_as_utc)]
@@ -0,0 +1,86 @@
+"""Schemas Pydantic para el cierre anual de vacaciones."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.vacation_rollover import VacationRolloverStatus
+from app.schemas.types import UTCDateTime
+
+# ============================================================================
+# REQUEST SCHEMAS
+# ============================================================================
+
+
+class VacationRolloverRequest(BaseModel):
+    """Request para cerrar (o simular el cierre de) un año."""
+
+    year: int = Field(ge=2000, le=2100, description="Año que se cierra")
+    max_carryover_days: float | None = Field(
+        default=None, ge=0, description="Días máximos arrastrados (por defecto, configuración)"
+    )
+    max_carryover_ratio: float | None = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Fracción máxima de los días anuales arrastrada (por defecto, configuración)",
+    )
+
+
+# ============================================================================
+# RESPONSE SCHEMAS
+# ============================================================================
+
+
+class VacationRolloverReport(BaseModel):
+    """Resultado calculado de un cierre (dry-run)."""
+
+    year: int
+    dry_run: bool
+    max_carryover_days: float
+    max_carryover_ratio: float | None
+    users: int
+    users_capped: int  # Usuarios que pierden días por el tope
+    users_with_debt: int  # Usuarios con balance negativo (se arrastra como deuda)
+    total_carried: float
+    total_forfeited: float
+    total_future_days: float  # Días ya aprobados para el año siguiente
+
+
+class VacationRolloverResponse(BaseModel):
+    """Estado y totales del cierre de un año."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    year: int
+    status: VacationRolloverStatus
+    max_carryover_days: float
+    max_carryover_ratio: float | None
+    users_processed: int
+    total_carried: float
+    total_forfeited: float
+    executed_by: int | None
+    created_at: UTCDateTime
+    finished_at: UTCDateTime | None
+
+
+class VacationRolloverEntryResponse(BaseModel):
+    """Cálculo del cierre aplicado a un usuario."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: int
+    balance_before: float
+    future_days: float
+    carried_over: float
+    forfeited: float
+    balance_after: float
+
+
+class VacationRolloverEntryListResponse(BaseModel):
+    """Traza paginada de un cierre."""
+
+    entries: list[VacationRolloverEntryResponse]
+    total: int | None
+    has_more: bool = False
+    skip: int
+    limit: int
@@ -4,6 +4,9 @@ Servicios - Lógica de negocio de la aplicación.
 Coordinan entre repositorios y aplican reglas de negocio.
 """
 
+from app.services.auth_service import AuthService
+from app.services.job_service import JobService
 from app.services.user_service import UserService
+from app.services.vacation_rollover_service import VacationRolloverService
 
-__all__ = ["UserService"]
+__all__ = ["AuthService", "JobService", "UserService", "VacationRolloverService"]
@@ -0,0 +1,144 @@
+"""
+Servicio de Autenticación.
+
+Emisión, rotación y revocación de tokens JWT.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import AuthenticationException
+from app.core.revocation import RevocationStore
+from app.core.security import (
+    ACCESS_TOKEN_TYPE,
+    REFRESH_TOKEN_TYPE,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+)
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+
+class AuthService:
+    """
+    Servicio de tokens de sesión.
+
+    Los refresh tokens rotan: cada uso revoca el token presentado y emite un
+    par nuevo, de modo que un refresh token robado solo sirve una vez.
+    """
+
+    def __init__(self, session: AsyncSession, store: RevocationStore):
+        """
+        Inicializa el servicio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+            store: Almacén de revocaciones del proceso
+        """
+        self.session = session
+        self.store = store
+        self.user_repo = UserRepository(session)
+
+    def issue_tokens(self, user: User) -> dict[str, str]:
+        """
+        Emite un par de tokens (acceso y refresh) para un usuario.
+
+        Args:
+            user: Usuario autenticado
+
+        Returns:
+            dict: access_token, refresh_token y token_type
+        """
+        data = {"sub": str(user.id)}
+        return {
+            "access_token": create_access_token(data),
+            "refresh_token": create_refresh_token(data),
+            "token_type": "bearer",
+        }
+
+    async def refresh(self, refresh_token: str) -> tuple[User, dict[str, str]]:
+        """
+        Rota un refresh token: lo revoca y emite un par nuevo.
+
+        Args:
+            refresh_token: Refresh token presentado por el cliente
+
+        Returns:
+            tuple: Usuario y nuevo par de tokens
+
+        Raises:
+            AuthenticationException: Si el token es inválido, ha expirado, ya
+                se usó o el usuario no existe o está inactivo
+        """
+        claims = self._decode(refresh_token, REFRESH_TOKEN_TYPE)
+
+        user = await self.user_repo.get_by_id(int(claims["sub"]))
+        if user is None or not user.is_active:
+            msg = "Usuario no encontrado o inactivo"
+            raise AuthenticationException(msg)
+
+        # El índice único de `jti` decide entre dos rotaciones simultáneas
+        already_used = await self.store.is_revoked(self.session, claims["jti"])
+        if already_used or not await self._revoke(claims):
+            msg = "Refresh token ya utilizado"
+            raise AuthenticationException(msg)
+
+        return user, self.issue_tokens(user)
+
+    async def logout(self, access_claims: dict[str, Any], refresh_token: str | None) -> None:
+        """
+        Revoca en el servidor el token de acceso y, si se envía, el refresh token.
+
+        Args:
+            access_claims: Claims del token de acceso de la petición
+            refresh_token: Refresh token de la sesión (opcional)
+
+        Raises:
+            AuthenticationException: Si el refresh token es inválido o de otro usuario
+        """
+        if "jti" in access_claims:
+            await self._revoke(access_claims)
+
+        if refresh_token is not None:
+            refresh_claims = self._decode(refresh_token, REFRESH_TOKEN_TYPE)
+            if refresh_claims["sub"] != access_claims.get("sub"):
+                msg = "El refresh token no pertenece al usuario"
+                raise AuthenticationException(msg)
+            await self._revoke(refresh_claims)
+
+    async def _revoke(self, claims: dict[str, Any]) -> bool:
+        """Revoca el token de unos claims verificados."""
+        return await self.store.revoke(
+            self.session,
+            jti=claims["jti"],
+            user_id=int(claims["sub"]),
+            token_type=claims.get("type", ACCESS_TOKEN_TYPE),
+            expires_at=datetime.fromtimestamp(claims["exp"], UTC),
+        )
+
+    @staticmethod
+    def _decode(token: str, token_type: str) -> dict[str, Any]:
+        """
+        Verifica un token y comprueba su tipo.
+
+        Raises:
+            AuthenticationException: Si el token es inválido, ha expirado o
+                no es del tipo esperado
+        """
+        try:
+            claims = decode_token(token)
+        except jwt.ExpiredSignatureError as exc:
+            msg = "Token expirado"
+            raise AuthenticationException(msg) from exc
+        except jwt.InvalidTokenError as exc:
+            msg = "Token inválido"
+            raise AuthenticationException(msg) from exc
+
+        if claims.get("type") != token_type or "jti" not in claims or "sub" not in claims:
+            msg = "Token inválido"
+            raise AuthenticationException(msg)
+        return claims
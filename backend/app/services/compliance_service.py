@@ -0,0 +1,320 @@
+"""
+Servicio de cumplimiento de jornada y descansos.
+
+Comprueba sobre los fichajes cerrados la jornada diaria y semanal máximas y
+el descanso mínimo entre jornadas. Los fichajes se leen por columnas (arrays
+paralelos de usuario, entrada y salida, ordenados por usuario y entrada) y
+se recorren una sola vez, sin objetos ni consultas por fichaje o usuario.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from itertools import chain
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import Settings, settings
+from app.core.exceptions import BadRequestException
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.compliance import ComplianceReport, ComplianceRule
+
+# ============================================================================
+# REGLAS DE NEGOCIO
+# ============================================================================
+# RN-C01: Un fichaje cuenta en el día (UTC) de su entrada, aunque acabe al día siguiente
+# RN-C02: La jornada de un día (suma de sus fichajes) no supera max_daily_hours
+# RN-C03: La semana ISO (de lunes a domingo) no supera max_weekly_hours
+# RN-C04: Entre la última salida de un día trabajado y la primera entrada del
+#         siguiente hay al menos min_rest_hours
+# RN-C05: Solo cuentan los fichajes cerrados
+
+DAY_SECONDS = 86_400
+HOUR_SECONDS = 3600
+EPOCH = date(1970, 1, 1)
+# El 1970-01-01 fue jueves: (día + 3) // 7 numera las semanas de lunes a domingo
+WEEK_OFFSET = 3
+
+# Días como máximo del informe (el trabajo por lotes no tiene límite)
+MAX_REPORT_DAYS = 366
+
+
+@dataclass(frozen=True, slots=True)
+class ComplianceLimits:
+    """Límites de jornada y descanso, en horas."""
+
+    max_daily_hours: float
+    max_weekly_hours: float
+    min_rest_hours: float
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ComplianceLimits":
+        """
+        Construye los límites a partir de la configuración.
+
+        Args:
+            settings: Configuración de la aplicación
+
+        Returns:
+            ComplianceLimits: Límites configurados
+        """
+        return cls(
+            max_daily_hours=settings.compliance_max_daily_hours,
+            max_weekly_hours=settings.compliance_max_weekly_hours,
+            min_rest_hours=settings.compliance_min_rest_hours,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ComplianceViolation:
+    """Incumplimiento de un usuario en un día (o en la semana que empieza en `fecha`)."""
+
+    user_id: int
+    rule: ComplianceRule
+    fecha: date
+    hours: float
+    limit_hours: float
+
+
+@dataclass(slots=True)
+class ComplianceCheck:
+    """Resultado de comprobar un conjunto de fichajes."""
+
+    violations: list[ComplianceViolation] = field(default_factory=list)
+    intervals: int = 0
+    users: int = 0
+
+
+def compliance_window(date_from: date, date_to: date) -> tuple[datetime, datetime]:
+    """
+    Rango de entradas que hay que leer para comprobar unos días.
+
+    Semanas completas (para los totales semanales) y el día anterior al
+    primer lunes (para el descanso antes de la primera jornada).
+
+    Args:
+        date_from: Primer día comprobado
+        date_to: Último día comprobado (incluido)
+
+    Returns:
+        tuple[datetime, datetime]: Inicio y fin (excluido) en UTC
+    """
+    first = date_from - timedelta(days=date_from.weekday() + 1)
+    last = date_to + timedelta(days=7 - date_to.weekday())
+    return (
+        datetime(first.year, first.month, first.day, tzinfo=UTC),
+        datetime(last.year, last.month, last.day, tzinfo=UTC),
+    )
+
+
+def _violation(
+    user_id: int, rule: ComplianceRule, day: float, seconds: float, limit_hours: float
+) -> ComplianceViolation:
+    """Crea un incumplimiento a partir del número de día y de los segundos medidos."""
+    return ComplianceViolation(
+        user_id=user_id,
+        rule=rule,
+        fecha=EPOCH + timedelta(days=int(day)),
+        hours=round(seconds / HOUR_SECONDS, 2),
+        limit_hours=limit_hours,
+    )
+
+
+def check_compliance(
+    user_ids: Sequence[int],
+    check_ins: Sequence[float],
+    check_outs: Sequence[float],
+    limits: ComplianceLimits,
+    date_from: date,
+    date_to: date,
+) -> ComplianceCheck:
+    """
+    Busca incumplimientos en fichajes ordenados por usuario y entrada.
+
+    Una sola pasada sobre las columnas: los fichajes de un mismo día se
+    acumulan y, al cambiar de día, semana o usuario, se comprueban el día y
+    la semana que terminan y el descanso hasta la nueva jornada. Los días se
+    numeran desde epoch con divisiones enteras, sin crear fechas salvo para
+    los incumplimientos.
+
+    Args:
+        user_ids: Usuario de cada fichaje
+        check_ins: Entrada de cada fichaje (segundos desde epoch)
+        check_outs: Salida de cada fichaje (segundos desde epoch)
+        limits: Límites a comprobar
+        date_from: Primer día del que se informan incumplimientos
+        date_to: Último día (incluido); las semanas se informan si lo tocan
+
+    Returns:
+        ComplianceCheck: Incumplimientos por usuario y en orden de fecha de
+        detección, fichajes y usuarios recorridos
+    """
+    first_day = (date_from - EPOCH).days
+    last_day = (date_to - EPOCH).days
+    first_week = (first_day + WEEK_OFFSET) // 7
+    last_week = (last_day + WEEK_OFFSET) // 7
+    max_day = limits.max_daily_hours * HOUR_SECONDS
+    max_week = limits.max_weekly_hours * HOUR_SECONDS
+    min_rest = limits.min_rest_hours * HOUR_SECONDS
+
+    violations: list[ComplianceViolation] = []
+    append = violations.append
+    users = 0
+    user: int | None = None
+    day = week = 0.0
+    day_seconds = week_seconds = last_out = 0.0
+
+    # El centinela final (usuario None) cierra el último día y la última semana
+    for user_id, start, end in chain(
+        zip(user_ids, check_ins, check_outs, strict=True), ((None, 0.0, 0.0),)
+    ):
+        today = start // DAY_SECONDS
+        if today == day and user_id == user:
+            day_seconds += end - start
+            if end > last_out:  # noqa: PLR1730 - evita la llamada a max() por fichaje
+                last_out = end
+            continue
+
+        this_week = (today + WEEK_OFFSET) // 7
+        if user is not None:
+            if day_seconds > max_day and first_day <= day <= last_day:
+                append(
+                    _violation(
+                        user, ComplianceRule.DAILY_HOURS, day, day_seconds, limits.max_daily_hours
+                    )
+                )
+            week_seconds += day_seconds
+            if this_week != week or user_id != user:
+                if week_seconds > max_week and first_week <= week <= last_week:
+                    append(
+                        _violation(
+                            user,
+                            ComplianceRule.WEEKLY_HOURS,
+                            week * 7 - WEEK_OFFSET,
+                            week_seconds,
+                            limits.max_weekly_hours,
+                        )
+                    )
+                week_seconds = 0.0
+            if user_id == user and start - last_out < min_rest and first_day <= today <= last_day:
+                append(
+                    _violation(
+                        user,
+                        ComplianceRule.MIN_REST,
+                        today,
+                        start - last_out,
+                        limits.min_rest_hours,
+                    )
+                )
+            elif user_id is None:
+                break
+
+        if user_id != user:
+            users += 1
+        user, day, week = user_id, today, this_week
+        day_seconds = end - start
+        last_out = end
+
+    return ComplianceCheck(violations=violations, intervals=len(user_ids), users=users)
+
+
+class ComplianceService:
+    """Servicio para comprobar la jornada y los descansos de los fichajes."""
+
+    def __init__(self, session: AsyncSession, limits: ComplianceLimits | None = None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+            limits: Límites a comprobar (por defecto, los de la configuración)
+        """
+        self.session = session
+        self.fichaje_repo = FichajeRepository(session)
+        self.user_repo = UserRepository(session)
+        self.limits = limits if limits is not None else ComplianceLimits.from_settings(settings)
+
+    async def check(
+        self,
+        date_from: date,
+        date_to: date,
+        first_user_id: int | None = None,
+        last_user_id: int | None = None,
+    ) -> ComplianceCheck:
+        """
+        Comprueba los fichajes de un rango de días y de usuarios.
+
+        Args:
+            date_from: Primer día
+            date_to: Último día (incluido)
+            first_user_id: Primer usuario (None = desde el primero)
+            last_user_id: Último usuario (None = hasta el último)
+
+        Returns:
+            ComplianceCheck: Incumplimientos, fichajes y usuarios recorridos
+        """
+        start, end = compliance_window(date_from, date_to)
+        user_ids, check_ins, check_outs = await self.fichaje_repo.get_user_interval_arrays(
+            start, end, first_user_id, last_user_id
+        )
+        return check_compliance(user_ids, check_ins, check_outs, self.limits, date_from, date_to)
+
+    async def get_report(
+        self, date_from: date, date_to: date, user_id: int | None = None
+    ) -> ComplianceReport:
+        """
+        Informe de incumplimientos de un rango de días (todos o un usuario).
+
+        Args:
+            date_from: Primer día
+            date_to: Último día (incluido)
+            user_id: Usuario a comprobar (None = todos)
+
+        Returns:
+            ComplianceReport: Incumplimientos con el nombre de cada usuario
+
+        Raises:
+            BadRequestException: Si el rango no es válido o supera MAX_REPORT_DAYS
+        """
+        days = (date_to - date_from).days + 1
+        if days < 1:
+            raise BadRequestException(
+                message="date_to debe ser igual o posterior a date_from",
+                details={"date_from": date_from.isoformat(), "date_to": date_to.isoformat()},
+            )
+        if days > MAX_REPORT_DAYS:
+            raise BadRequestException(
+                message=f"El informe admite como máximo {MAX_REPORT_DAYS} días",
+                details={"days": days},
+            )
+
+        check = await self.check(date_from, date_to, user_id, user_id)
+        violations = sorted(check.violations, key=lambda v: (v.user_id, v.fecha))
+        names = await self.user_repo.get_full_names({v.user_id for v in violations})
+
+        return ComplianceReport.model_validate(
+            {
+                "date_from": date_from,
+                "date_to": date_to,
+                "max_daily_hours": self.limits.max_daily_hours,
+                "max_weekly_hours": self.limits.max_weekly_hours,
+                "min_rest_hours": self.limits.min_rest_hours,
+                "intervals": check.intervals,
+                "users_checked": check.users,
+                "totals": {
+                    rule: sum(v.rule == rule for v in violations) for rule in ComplianceRule
+                },
+                "violations": [
+                    {
+                        "user_id": v.user_id,
+                        "user_full_name": names.get(v.user_id, ""),
+                        "rule": v.rule,
+                        "fecha": v.fecha,
+                        "hours": v.hours,
+                        "limit_hours": v.limit_hours,
+                    }
+                    for v in violations
+                ],
+            }
+        )
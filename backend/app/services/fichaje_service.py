@@ -1,18 +1,38 @@
 """Service para lógica de negocio de fichajes."""
 
-from datetime import UTC, datetime
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from itertools import accumulate
+from typing import Any
 
+from sqlalchemy import Row
+
+from app.core.config import settings
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.core.presence import PresenceRoster, presence_roster
+from app.core.versioning import ensure_version
 from app.models.fichaje import Fichaje, FichajeStatus
 from app.models.user import User, UserRole
 from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.locks import try_advisory_xact_lock
+from app.repositories.pagination import Page
+from app.repositories.rows import FichajeRow
 from app.repositories.user_repository import UserRepository
 from app.schemas.fichaje import (
     FichajeApproval,
+    FichajeBulkApproval,
+    FichajeBulkApprovalError,
+    FichajeBulkApprovalItem,
+    FichajeBulkApprovalOutcome,
+    FichajeBulkApprovalResponse,
     FichajeCorrection,
     FichajeFilters,
     FichajeStats,
+    OccupancyHeatmap,
 )
+from app.schemas.pagination import CountStrategy
 
 
 def ensure_timezone_aware(dt: datetime) -> datetime:
@@ -22,18 +42,147 @@ def ensure_timezone_aware(dt: datetime) -> datetime:
     return dt
 
 
+Interval = tuple[datetime, datetime | None]
+
+# Bloqueo consultivo del cierre automático (un único worker a la vez)
+AUTO_CLOSE_LOCK = "fichajes.auto_close"
+PARTITIONS_LOCK = "fichajes.partitions"
+
+# Días como máximo del mapa de ocupación
+MAX_OCCUPANCY_DAYS = 366
+HOUR_SECONDS = 3600
+
+
+def find_overlaps(candidates: dict[int, Interval], fixed: Sequence[Interval]) -> set[int]:
+    """Detecta en memoria qué intervalos candidatos de un usuario se solapan.
+
+    Un candidato se solapa si se cruza con un intervalo fijo o con otro
+    candidato que empieza antes. Mismo criterio que `exists_overlap`: los
+    intervalos cerrados se solapan si se cruzan y los abiertos (sin salida)
+    solo con otro abierto.
+
+    Los intervalos fijos se ordenan por entrada con el máximo acumulado de
+    las salidas, así que cada candidato se comprueba con una búsqueda binaria
+    en lugar de con una consulta.
+
+    Args:
+        candidates: Intervalos a validar por ID de fichaje (con timezone).
+        fixed: Intervalos que no cambian (con timezone).
+
+    Returns:
+        IDs de los candidatos que se solapan.
+    """
+    closed = sorted((start, end) for start, end in fixed if end is not None)
+    starts = [start for start, _ in closed]
+    max_ends = list(accumulate((end for _, end in closed), max))
+    open_taken = any(end is None for _, end in fixed)
+
+    overlapping: set[int] = set()
+    last_end: datetime | None = None
+    for fichaje_id, (start, end) in sorted(candidates.items(), key=lambda item: item[1][0]):
+        if end is None:
+            if open_taken:
+                overlapping.add(fichaje_id)
+            open_taken = True
+            continue
+
+        # Fijos que empiezan antes de que acabe el candidato: basta con la mayor salida
+        k = bisect_left(starts, end)
+        if (k and max_ends[k - 1] > start) or (last_end is not None and start < last_end):
+            overlapping.add(fichaje_id)
+            continue
+        last_end = end if last_end is None else max(last_end, end)
+
+    return overlapping
+
+
+def occupancy_by_hour(
+    arrivals: Sequence[float], departures: Sequence[float], origin: float, hours: int
+) -> tuple[list[int], list[float]]:
+    """Calcula la ocupación de cada hora a partir de intervalos de presencia.
+
+    Barrido sobre los eventos ordenados: entradas y salidas se ordenan por
+    separado (para contar solo importa cuántas hubo antes de cada instante)
+    y se recorren a la vez que las horas, en O(n log n + horas) sin mirar
+    todos los intervalos en cada hora. A igual instante la salida va antes
+    que la entrada: quien sale a las 10:00 no coincide con quien entra.
+
+    Args:
+        arrivals: Entradas en segundos desde epoch.
+        departures: Salidas en segundos desde epoch (misma posición que su entrada).
+        origin: Inicio de la primera hora, en segundos desde epoch.
+        hours: Número de horas a calcular.
+
+    Returns:
+        Máximo de personas dentro a la vez y media de personas dentro
+        (horas-persona) de cada hora, en orden.
+    """
+    horizon = origin + hours * HOUR_SECONDS
+    kept = [
+        (max(start, origin), min(end, horizon))
+        for start, end in zip(arrivals, departures, strict=True)
+        if start < horizon and end > origin and end > start
+    ]
+    starts = sorted(start for start, _ in kept)
+    ends = sorted(end for _, end in kept)
+    total = len(kept)
+    never = float("inf")
+
+    peak = [0] * hours
+    average = [0.0] * hours
+    present = 0
+    i = j = 0
+    clock = origin
+    for hour in range(hours):
+        hour_end = origin + (hour + 1) * HOUR_SECONDS
+        # Quien sale justo al empezar la hora no cuenta en ella
+        while j < total and ends[j] <= clock:
+            present -= 1
+            j += 1
+        top = present
+        person_seconds = 0.0
+        while True:
+            arrival = starts[i] if i < total else never
+            departure = ends[j] if j < total else never
+            moment = min(arrival, departure)
+            if moment >= hour_end:
+                break
+            person_seconds += present * (moment - clock)
+            clock = moment
+            if departure <= arrival:
+                present -= 1
+                j += 1
+            else:
+                present += 1
+                i += 1
+                top = max(top, present)
+        person_seconds += present * (hour_end - clock)
+        clock = hour_end
+        peak[hour] = top
+        average[hour] = round(person_seconds / HOUR_SECONDS, 2)
+
+    return peak, average
+
+
 class FichajeService:
     """Service para gestionar lógica de negocio de fichajes."""
 
-    def __init__(self, fichaje_repo: FichajeRepository, user_repo: UserRepository):
+    def __init__(
+        self,
+        fichaje_repo: FichajeRepository,
+        user_repo: UserRepository,
+        presence: PresenceRoster | None = None,
+    ):
         """Inicializa el service con los repositories necesarios.
 
         Args:
             fichaje_repo: Repository de fichajes.
             user_repo: Repository de usuarios.
+            presence: Censo de presencia a actualizar (por defecto, el del proceso).
         """
         self.fichaje_repo = fichaje_repo
         self.user_repo = user_repo
+        self.presence = presence if presence is not None else presence_roster
 
     async def check_in(self, user_id: int, notes: str | None) -> Fichaje:
         """Registra entrada (check-in) de un usuario.
@@ -79,7 +228,9 @@ class FichajeService:
             status=FichajeStatus.VALID,
         )
 
-        return await self.fichaje_repo.create(fichaje)
+        fichaje = await self.fichaje_repo.create(fichaje)
+        await self.presence.checked_in(self.fichaje_repo.session, fichaje, user)
+        return fichaje
 
     async def check_out(self, user_id: int, notes: str | None) -> Fichaje:
         """Registra salida (check-out) de un usuario.
@@ -134,13 +285,76 @@ class FichajeService:
             else:
                 fichaje.notes = notes
 
-        return await self.fichaje_repo.update(fichaje)
+        fichaje = await self.fichaje_repo.update(fichaje)
+        await self.presence.checked_out(self.fichaje_repo.session, fichaje)
+        return fichaje
+
+    async def close_forgotten_checkins(
+        self, max_shift_hours: float | None = None, now: datetime | None = None
+    ) -> int | None:
+        """Cierra los fichajes que siguen abiertos más allá del turno máximo.
+
+        Un único UPDATE sobre todos los fichajes abiertos (sin check_out) con
+        una entrada anterior a `now - max_shift_hours`: la salida queda al
+        final del turno máximo y el fichaje pasa a PENDING_CORRECTION con una
+        nota del sistema. Así dejan de bloquear el siguiente check-in y de
+        contar como incompletos.
+
+        Se ejecuta bajo un bloqueo consultivo de la transacción: si otro
+        worker lo está ejecutando, no hace nada.
+
+        Args:
+            max_shift_hours: Duración máxima de un turno (por defecto, la configuración).
+            now: Instante actual (por defecto, ahora).
+
+        Returns:
+            Número de fichajes cerrados, o None si otro worker tiene el bloqueo.
+        """
+        if not await try_advisory_xact_lock(self.fichaje_repo.session, AUTO_CLOSE_LOCK):
+            return None
+
+        hours = max_shift_hours or settings.fichaje_max_shift_hours
+        note = (
+            f"[Sistema] Salida registrada automáticamente tras {hours:g} h sin fichar la "
+            "salida. Solicita una corrección con la hora real."
+        )
+        closed = await self.fichaje_repo.close_stale_open(
+            max_shift=timedelta(hours=hours), now=now or datetime.now(UTC), system_note=note
+        )
+        if closed:
+            await self.presence.invalidate(self.fichaje_repo.session)
+        return closed
+
+    async def create_partitions(
+        self, months_ahead: int | None = None, today: date | None = None
+    ) -> list[str] | None:
+        """Crea por adelantado las particiones mensuales de fichaje (PostgreSQL).
+
+        Deja creadas las particiones desde el mes actual hasta `months_ahead`
+        meses después, para que los fichajes nuevos no caigan en la partición
+        por defecto. Sin particionado (SQLite) no hace nada.
+
+        Args:
+            months_ahead: Meses futuros con partición (por defecto, la configuración).
+            today: Día actual (por defecto, hoy en UTC).
+
+        Returns:
+            Nombres de las particiones creadas, o None si otro worker tiene el bloqueo.
+        """
+        if not await try_advisory_xact_lock(self.fichaje_repo.session, PARTITIONS_LOCK):
+            return None
+
+        return await self.fichaje_repo.create_partitions(
+            months_ahead if months_ahead is not None else settings.fichaje_partition_months_ahead,
+            today or datetime.now(UTC).date(),
+        )
 
     async def request_correction(
         self,
         fichaje_id: int,
         correction_data: FichajeCorrection,
         user: User,
+        expected_version: int | None = None,
     ) -> Fichaje:
         """Solicita corrección de un fichaje.
 
@@ -148,6 +362,7 @@ class FichajeService:
             fichaje_id: ID del fichaje a corregir.
             correction_data: Datos de la corrección.
             user: Usuario que solicita la corrección.
+            expected_version: Versión leída por el cliente (If-Match).
 
         Returns:
             Fichaje actualizado con estado PENDING_CORRECTION.
@@ -155,6 +370,7 @@ class FichajeService:
         Raises:
             NotFoundException: Si el fichaje no existe.
             ForbiddenException: Si el usuario no es propietario del fichaje.
+            ConflictException: Si el fichaje cambió desde que el cliente lo leyó.
             BadRequestException: Si hay errores de validación.
         """
         # Obtener fichaje
@@ -172,6 +388,8 @@ class FichajeService:
                 details={"fichaje_id": fichaje_id, "user_id": user.id},
             )
 
+        ensure_version("El fichaje", fichaje.version, expected_version)
+
         # Validar que check_out > check_in si se proporciona (asegurar timezone-aware)
         if correction_data.check_out:
             check_in_aware = ensure_timezone_aware(correction_data.check_in)
@@ -234,6 +452,7 @@ class FichajeService:
         fichaje_id: int,
         approval: FichajeApproval,
         hr_user: User,
+        expected_version: int | None = None,
     ) -> Fichaje:
         """Aprueba o rechaza una corrección de fichaje.
 
@@ -241,6 +460,7 @@ class FichajeService:
             fichaje_id: ID del fichaje.
             approval: Datos de la aprobación.
             hr_user: Usuario HR que aprueba/rechaza.
+            expected_version: Versión leída por el cliente (If-Match).
 
         Returns:
             Fichaje actualizado.
@@ -248,6 +468,7 @@ class FichajeService:
         Raises:
             NotFoundException: Si el fichaje no existe.
             ForbiddenException: Si el usuario no es HR.
+            ConflictException: Si el fichaje cambió desde que el cliente lo leyó.
             BadRequestException: Si el fichaje no está pendiente.
         """
         # Verificar que el usuario es HR
@@ -265,6 +486,8 @@ class FichajeService:
                 details={"fichaje_id": fichaje_id},
             )
 
+        ensure_version("El fichaje", fichaje.version, expected_version)
+
         # Verificar que está pendiente de aprobación
         if fichaje.status != FichajeStatus.PENDING_CORRECTION:
             raise BadRequestException(
@@ -273,6 +496,7 @@ class FichajeService:
             )
 
         # Registrar aprobación
+        was_open = fichaje.check_out is None
         fichaje.approved_by = hr_user.id
         fichaje.approved_at = datetime.now(UTC)
         fichaje.approval_notes = approval.approval_notes
@@ -295,9 +519,236 @@ class FichajeService:
             fichaje.proposed_check_in = None
             fichaje.proposed_check_out = None
 
-        return await self.fichaje_repo.update(fichaje)
+        fichaje = await self.fichaje_repo.update(fichaje)
+        if was_open and approval.approved:
+            # La corrección puede cerrar el fichaje abierto o mover su entrada
+            await self.presence.invalidate(self.fichaje_repo.session)
+        return fichaje
+
+    async def approve_corrections(
+        self,
+        approval: FichajeBulkApproval,
+        hr_user: User,
+    ) -> FichajeBulkApprovalResponse:
+        """Aprueba o rechaza varias correcciones de fichaje a la vez.
+
+        Mismo efecto que `approve_correction` para cada decisión, con un
+        número fijo de consultas sea cual sea el tamaño del lote:
+
+        1. Carga todos los fichajes del lote en una consulta.
+        2. Valida estado y versión en memoria.
+        3. Comprueba en memoria que los valores propuestos no se solapen con
+           otros fichajes del usuario ni entre sí (una consulta para los
+           intervalos de los usuarios afectados).
+        4. Aplica todas las decisiones válidas con un único executemany.
+
+        Las decisiones inválidas se devuelven como fallidas sin impedir el resto.
+
+        Args:
+            approval: Decisiones a aplicar.
+            hr_user: Usuario HR que aprueba/rechaza.
+
+        Returns:
+            Resultado de cada decisión, en el orden recibido.
+
+        Raises:
+            ForbiddenException: Si el usuario no es HR.
+            ConflictException: Si algún fichaje cambió durante la operación.
+        """
+        if hr_user.role != UserRole.HR:
+            raise ForbiddenException(
+                message="Solo usuarios HR pueden aprobar correcciones",
+                details={"user_id": hr_user.id, "role": hr_user.role},
+            )
+
+        # Un mismo fichaje solo se revisa una vez: se aplica la primera decisión
+        items: dict[int, FichajeBulkApprovalItem] = {}
+        for item in approval.items:
+            items.setdefault(item.fichaje_id, item)
+
+        rows = {row.id: row for row in await self.fichaje_repo.get_many_for_approval(list(items))}
+
+        outcomes: dict[int, FichajeBulkApprovalOutcome] = {}
+        valid: dict[int, FichajeBulkApprovalItem] = {}
+        for fichaje_id, item in items.items():
+            row = rows.get(fichaje_id)
+            error = self._bulk_approval_error(row, item.version)
+            if error is None:
+                valid[fichaje_id] = item
+                continue
+            outcomes[fichaje_id] = FichajeBulkApprovalOutcome(
+                fichaje_id=fichaje_id,
+                ok=False,
+                status=row.status if row else None,
+                version=row.version if row else None,
+                error=error[0],
+                detail=error[1],
+            )
+
+        overlapping = await self._find_overlapping_approvals(rows, valid)
+
+        approved_at = datetime.now(UTC)
+        changes: list[dict[str, Any]] = []
+        for fichaje_id, item in valid.items():
+            row = rows[fichaje_id]
+            if fichaje_id in overlapping:
+                outcomes[fichaje_id] = FichajeBulkApprovalOutcome(
+                    fichaje_id=fichaje_id,
+                    ok=False,
+                    status=row.status,
+                    version=row.version,
+                    error=FichajeBulkApprovalError.OVERLAP,
+                    detail="La corrección se solapa con otro fichaje existente",
+                )
+                continue
+
+            check_in, check_out = row.check_in, row.check_out
+            if item.approved:
+                check_in, check_out = self._corrected_interval(row)
+            new_status = FichajeStatus.CORRECTED if item.approved else FichajeStatus.REJECTED
+            changes.append(
+                {
+                    "b_id": fichaje_id,
+                    "b_version": row.version,
+                    "check_in": check_in,
+                    "check_out": check_out,
+                    "status": new_status,
+                    "proposed_check_in": None,
+                    "proposed_check_out": None,
+                    "approved_by": hr_user.id,
+                    "approved_at": approved_at,
+                    "approval_notes": item.approval_notes,
+                }
+            )
+            outcomes[fichaje_id] = FichajeBulkApprovalOutcome(
+                fichaje_id=fichaje_id, ok=True, status=new_status, version=row.version + 1
+            )
+
+        await self.fichaje_repo.apply_approvals(changes)
+        if any(
+            change["status"] == FichajeStatus.CORRECTED and rows[change["b_id"]].check_out is None
+            for change in changes
+        ):
+            await self.presence.invalidate(self.fichaje_repo.session)
+
+        results: list[FichajeBulkApprovalOutcome] = []
+        for item in approval.items:
+            outcome = outcomes.pop(item.fichaje_id, None)
+            if outcome is None:
+                outcome = FichajeBulkApprovalOutcome(
+                    fichaje_id=item.fichaje_id,
+                    ok=False,
+                    error=FichajeBulkApprovalError.DUPLICATE,
+                    detail="El fichaje aparece más de una vez en el lote",
+                )
+            results.append(outcome)
+
+        return FichajeBulkApprovalResponse(
+            results=results,
+            approved=sum(r.ok and r.status == FichajeStatus.CORRECTED for r in results),
+            rejected=sum(r.ok and r.status == FichajeStatus.REJECTED for r in results),
+            failed=sum(not r.ok for r in results),
+        )
+
+    @staticmethod
+    def _bulk_approval_error(
+        row: Row | None, expected_version: int | None
+    ) -> tuple[FichajeBulkApprovalError, str] | None:
+        """Valida en memoria una decisión de una aprobación masiva.
+
+        Args:
+            row: Fichaje cargado (None si no existe).
+            expected_version: Versión indicada por el cliente.
+
+        Returns:
+            (error, detalle) o None si la decisión es válida.
+        """
+        if row is None:
+            return FichajeBulkApprovalError.NOT_FOUND, "Fichaje no encontrado"
+
+        if expected_version is not None and expected_version != row.version:
+            return (
+                FichajeBulkApprovalError.VERSION_CONFLICT,
+                "El fichaje se ha modificado desde que se leyó",
+            )
+
+        if row.status != FichajeStatus.PENDING_CORRECTION:
+            return (
+                FichajeBulkApprovalError.NOT_PENDING,
+                "El fichaje no está pendiente de aprobación",
+            )
+
+        return None
+
+    @staticmethod
+    def _corrected_interval(row: Row) -> tuple[datetime, datetime | None]:
+        """Entrada y salida que quedan al aprobar la corrección de un fichaje."""
+        return row.proposed_check_in or row.check_in, row.proposed_check_out or row.check_out
+
+    async def _find_overlapping_approvals(
+        self, rows: dict[int, Row], valid: dict[int, FichajeBulkApprovalItem]
+    ) -> set[int]:
+        """Aprobaciones del lote cuyos valores propuestos se solaparían.
+
+        Carga en una consulta los fichajes de los usuarios afectados que
+        pueden cruzarse con los valores propuestos y valida cada usuario en
+        memoria con `find_overlaps`. Una aprobación que falla conserva sus
+        valores actuales, que pasan a ser fijos para las demás, así que se
+        repite hasta que no aparecen nuevos solapamientos.
+
+        Args:
+            rows: Fichajes del lote por ID.
+            valid: Decisiones válidas por ID de fichaje.
+
+        Returns:
+            IDs de los fichajes cuya aprobación se solaparía.
+        """
+
+        def aware(interval: tuple[datetime, datetime | None]) -> Interval:
+            start, end = interval
+            return ensure_timezone_aware(start), ensure_timezone_aware(end) if end else None
+
+        candidates: dict[int, dict[int, Interval]] = defaultdict(dict)
+        for fichaje_id, item in valid.items():
+            if item.approved:
+                row = rows[fichaje_id]
+                candidates[row.user_id][fichaje_id] = aware(self._corrected_interval(row))
+        if not candidates:
+            return set()
+
+        closed = [
+            interval
+            for user_candidates in candidates.values()
+            for interval in user_candidates.values()
+            if interval[1] is not None
+        ]
+        others = await self.fichaje_repo.get_intervals(
+            user_ids=list(candidates),
+            start=min(start for start, _ in closed) if closed else None,
+            end=max(end for _, end in closed) if closed else None,  # type: ignore[type-var]
+            exclude_ids=list(rows),
+        )
 
-    async def get_by_id(self, fichaje_id: int, current_user: User) -> Fichaje:
+        # Fijos: el resto de fichajes del usuario y los del lote que no se aprueban
+        fixed: dict[int, list[Interval]] = defaultdict(list)
+        for other in others:
+            fixed[other.user_id].append(aware((other.check_in, other.check_out)))
+        for fichaje_id, row in rows.items():
+            if row.user_id in candidates and fichaje_id not in candidates[row.user_id]:
+                fixed[row.user_id].append(aware((row.check_in, row.check_out)))
+
+        overlapping: set[int] = set()
+        for user_id, user_candidates in candidates.items():
+            while found := find_overlaps(user_candidates, fixed[user_id]):
+                overlapping |= found
+                for fichaje_id in found:
+                    del user_candidates[fichaje_id]
+                    row = rows[fichaje_id]
+                    fixed[user_id].append(aware((row.check_in, row.check_out)))
+
+        return overlapping
+
+    async def get_by_id(self, fichaje_id: int, current_user: User) -> FichajeRow:
         """Obtiene un fichaje por ID con control de autorización.
 
         Args:
@@ -305,13 +756,13 @@ class FichajeService:
             current_user: Usuario actual.
 
         Returns:
-            Fichaje encontrado.
+            Fila de solo lectura del fichaje encontrado.
 
         Raises:
             NotFoundException: Si el fichaje no existe.
             ForbiddenException: Si no tiene permisos para verlo.
         """
-        fichaje = await self.fichaje_repo.get_by_id(fichaje_id)
+        fichaje = await self.fichaje_repo.get_row(fichaje_id)
         if not fichaje:
             raise NotFoundException(
                 message=f"Fichaje con ID {fichaje_id} no encontrado",
@@ -333,7 +784,8 @@ class FichajeService:
         skip: int,
         limit: int,
         current_user: User,
-    ) -> tuple[list[Fichaje], int, float]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[Page[FichajeRow], float]:
         """Lista fichajes con filtros y autorización.
 
         Args:
@@ -341,9 +793,10 @@ class FichajeService:
             skip: Registros a saltar (paginación).
             limit: Límite de registros.
             current_user: Usuario actual.
+            count_strategy: Estrategia para calcular el total.
 
         Returns:
-            Tupla con (fichajes, total, total_hours).
+            Tupla con (página de fichajes, total_hours).
 
         Raises:
             ForbiddenException: Si empleado intenta ver fichajes ajenos.
@@ -360,8 +813,8 @@ class FichajeService:
                 )
             filters.user_id = current_user.id
 
-        # Obtener fichajes
-        fichajes = await self.fichaje_repo.get_all(
+        # Obtener fichajes y total según la estrategia de conteo
+        page = await self.fichaje_repo.get_page(
             skip=skip,
             limit=limit,
             user_id=filters.user_id,
@@ -369,15 +822,7 @@ class FichajeService:
             date_to=filters.date_to,
             status=filters.status,
             incomplete_only=filters.incomplete_only,
-        )
-
-        # Contar total
-        total = await self.fichaje_repo.count(
-            user_id=filters.user_id,
-            date_from=filters.date_from,
-            date_to=filters.date_to,
-            status=filters.status,
-            incomplete_only=filters.incomplete_only,
+            count_strategy=count_strategy,
         )
 
         # Calcular horas totales
@@ -387,7 +832,7 @@ class FichajeService:
             date_to=filters.date_to,
         )
 
-        return fichajes, total, total_hours
+        return page, total_hours
 
     async def get_my_fichajes(
         self,
@@ -396,7 +841,8 @@ class FichajeService:
         date_to: datetime | None,
         skip: int,
         limit: int,
-    ) -> tuple[list[Fichaje], int, float]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[Page[FichajeRow], float]:
         """Obtiene fichajes del usuario actual.
 
         Args:
@@ -405,27 +851,72 @@ class FichajeService:
             date_to: Fecha de fin.
             skip: Registros a saltar.
             limit: Límite de registros.
+            count_strategy: Estrategia para calcular el total.
 
         Returns:
-            Tupla con (fichajes, total, total_hours).
+            Tupla con (página de fichajes, total_hours).
         """
-        fichajes = await self.fichaje_repo.get_all(
+        page = await self.fichaje_repo.get_page(
             skip=skip,
             limit=limit,
             user_id=user_id,
             date_from=date_from,
             date_to=date_to,
+            count_strategy=count_strategy,
         )
 
-        total = await self.fichaje_repo.count(user_id=user_id, date_from=date_from, date_to=date_to)
-
         total_hours = await self.fichaje_repo.calculate_total_hours(
             user_id=user_id,
             date_from=date_from,
             date_to=date_to,
         )
 
-        return fichajes, total, total_hours
+        return page, total_hours
+
+    async def get_occupancy(self, date_from: date, date_to: date) -> OccupancyHeatmap:
+        """Calcula el mapa de ocupación por hora (UTC) de un rango de días.
+
+        Carga entradas y salidas del rango como arrays compactos y calcula
+        cada hora con `occupancy_by_hour`. Los fichajes abiertos cuentan
+        hasta ahora.
+
+        Args:
+            date_from: Primer día.
+            date_to: Último día (incluido).
+
+        Returns:
+            Matrices día x hora del máximo y la media de personas dentro.
+
+        Raises:
+            BadRequestException: Si el rango no es válido o supera MAX_OCCUPANCY_DAYS.
+        """
+        days = (date_to - date_from).days + 1
+        if days < 1:
+            raise BadRequestException(
+                message="date_to debe ser igual o posterior a date_from",
+                details={"date_from": date_from.isoformat(), "date_to": date_to.isoformat()},
+            )
+        if days > MAX_OCCUPANCY_DAYS:
+            raise BadRequestException(
+                message=f"El mapa de ocupación admite como máximo {MAX_OCCUPANCY_DAYS} días",
+                details={"days": days},
+            )
+
+        start = datetime(date_from.year, date_from.month, date_from.day, tzinfo=UTC)
+        end = start + timedelta(days=days)
+        arrivals, departures = await self.fichaje_repo.get_interval_arrays(
+            start, end, open_until=datetime.now(UTC)
+        )
+        peak, average = occupancy_by_hour(arrivals, departures, start.timestamp(), days * 24)
+
+        return OccupancyHeatmap(
+            date_from=date_from,
+            date_to=date_to,
+            days=[date_from + timedelta(days=n) for n in range(days)],
+            peak=[peak[n : n + 24] for n in range(0, days * 24, 24)],
+            average=[average[n : n + 24] for n in range(0, days * 24, 24)],
+            intervals=len(arrivals),
+        )
 
     async def get_stats(
         self,
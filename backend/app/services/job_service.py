@@ -0,0 +1,144 @@
+"""
+Servicio de trabajos en segundo plano.
+
+Encola trabajos de tipos registrados, consulta su progreso y los cancela.
+La ejecución es cosa del `JobRunner`.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException, ConflictException, NotFoundException
+from app.jobs import JobDefinition, JobRegistry, job_registry
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.repositories.job_repository import JobRepository
+from app.repositories.pagination import Page
+
+
+class JobService:
+    """Servicio para encolar y seguir trabajos en segundo plano."""
+
+    def __init__(self, session: AsyncSession, registry: JobRegistry = job_registry):
+        """
+        Inicializa el servicio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+            registry: Registro de tipos de trabajo
+        """
+        self.session = session
+        self.registry = registry
+        self.job_repo = JobRepository(session)
+
+    def list_kinds(self) -> list[JobDefinition]:
+        """Retorna los tipos de trabajo que se pueden encolar."""
+        return self.registry.definitions()
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any] | None = None,
+        created_by: User | None = None,
+        max_attempts: int | None = None,
+        run_after: datetime | None = None,
+    ) -> Job:
+        """
+        Encola un trabajo.
+
+        Args:
+            kind: Tipo de trabajo (debe estar registrado)
+            payload: Parámetros del trabajo
+            created_by: Usuario que lo encola (None si lo encola el sistema)
+            max_attempts: Intentos máximos (por defecto, los del tipo o de la configuración)
+            run_after: No ejecutar antes de esta fecha (por defecto, ya)
+
+        Returns:
+            Job: Trabajo encolado
+
+        Raises:
+            BadRequestException: Si el tipo no está registrado
+        """
+        definition = self.registry.get(kind)
+        if definition is None:
+            msg = f"Tipo de trabajo desconocido: {kind}"
+            raise BadRequestException(msg)
+
+        job = Job(
+            kind=kind,
+            payload=payload or {},
+            max_attempts=max_attempts or definition.max_attempts or settings.jobs_max_attempts,
+            run_after=run_after or datetime.now(UTC),
+            created_by=created_by.id if created_by else None,
+        )
+        return await self.job_repo.create(job)
+
+    async def get_job(self, job_id: int) -> Job:
+        """
+        Obtiene un trabajo.
+
+        Args:
+            job_id: ID del trabajo
+
+        Returns:
+            Job: Trabajo encontrado
+
+        Raises:
+            NotFoundException: Si no existe
+        """
+        job = await self.job_repo.get_by_id(job_id)
+        if job is None:
+            msg = "Trabajo no encontrado"
+            raise NotFoundException(msg)
+        return job
+
+    async def list_jobs(
+        self,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> Page[Job]:
+        """
+        Lista trabajos, los más recientes primero.
+
+        Args:
+            status: Filtrar por estado
+            kind: Filtrar por tipo
+            skip: Registros a saltar
+            limit: Registros máximos
+
+        Returns:
+            Page[Job]: Página de trabajos
+        """
+        return await self.job_repo.get_page(status=status, kind=kind, skip=skip, limit=limit)
+
+    async def cancel_job(self, job_id: int) -> Job:
+        """
+        Cancela un trabajo.
+
+        Un trabajo pendiente se cancela al momento; uno en ejecución queda
+        marcado y su worker lo detiene en el siguiente latido o al informar
+        de su progreso.
+
+        Args:
+            job_id: ID del trabajo
+
+        Returns:
+            Job: Trabajo actualizado
+
+        Raises:
+            NotFoundException: Si no existe
+            ConflictException: Si ya había terminado
+        """
+        job = await self.get_job(job_id)
+        if job.is_finished:
+            msg = f"El trabajo ya ha terminado ({job.status.value})"
+            raise ConflictException(msg)
+
+        await self.job_repo.request_cancel(job_id, datetime.now(UTC))
+        await self.session.refresh(job)
+        return job
@@ -5,16 +5,36 @@ Contiene la lógica de negocio para operaciones con solicitudes.
 Actúa como capa intermedia entre los routers y los repositorios.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
 from datetime import UTC, date, datetime, timedelta
+from heapq import heappop, heappush
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.absence_calendar import (
+    AbsenceCalendarCache,
+    absence_calendar_cache,
+    month_bounds,
+    months_between,
+)
+from app.core.exceptions import ConflictException
+from app.core.versioning import ensure_version
 from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
 from app.models.user import User
+from app.repositories.pagination import Page
+from app.repositories.rows import AbsenceRow, SolicitudRow
 from app.repositories.solicitud_repository import SolicitudRepository
 from app.repositories.user_repository import UserRepository
+from app.schemas.pagination import CountStrategy
 from app.schemas.solicitud import (
+    AbsenceCalendarResponse,
+    SolicitudBulkReview,
+    SolicitudBulkReviewError,
+    SolicitudBulkReviewItem,
+    SolicitudBulkReviewOutcome,
+    SolicitudBulkReviewResponse,
     SolicitudCreate,
     SolicitudFilters,
     SolicitudReview,
@@ -41,6 +61,13 @@ from app.schemas.solicitud import (
 # RN-V14: Un usuario HR no puede aprobar sus propias solicitudes
 
 
+# Días máximos de una consulta del calendario de ausencias
+MAX_CALENDAR_DAYS = 366
+
+# Estados que ocupan el calendario de ausencias
+CALENDAR_STATUSES = (SolicitudStatus.APPROVED, SolicitudStatus.PENDING)
+
+
 # ============================================================================
 # FUNCIONES AUXILIARES
 # ============================================================================
@@ -75,6 +102,57 @@ def calculate_business_days(fecha_inicio: date, fecha_fin: date) -> int:
     return days
 
 
+def absences_by_day(
+    absences: Iterable[AbsenceRow], fecha_desde: date, fecha_hasta: date
+) -> list[tuple[date, tuple[int, ...]]]:
+    """
+    Expande ausencias a las que incluyen cada día de un rango.
+
+    Barrido (sweep line) sobre los días: cada ausencia entra el día en que
+    empieza (o el primero del rango) y sale al terminar, con un montículo
+    por fecha de fin. El coste es O(n log n + días) más el tamaño del
+    resultado, sin recorrer todas las ausencias cada día; la tupla de un día
+    solo se reconstruye si cambió respecto al anterior.
+
+    Args:
+        absences: Ausencias que se solapan con el rango (sin repetir)
+        fecha_desde: Primer día del rango
+        fecha_hasta: Último día del rango (incluido)
+
+    Returns:
+        list[tuple[date, tuple[int, ...]]]: Un elemento por día con los IDs
+        de las solicitudes que lo incluyen, por orden de inicio
+    """
+    starting = sorted(
+        (a for a in absences if a.fecha_fin >= fecha_desde and a.fecha_inicio <= fecha_hasta),
+        key=lambda a: (max(a.fecha_inicio, fecha_desde), a.solicitud_id),
+    )
+    ending: list[tuple[date, int]] = []
+    active: dict[int, None] = {}
+    ids: tuple[int, ...] = ()
+    days: list[tuple[date, tuple[int, ...]]] = []
+
+    next_start = 0
+    day = fecha_desde
+    while day <= fecha_hasta:
+        changed = False
+        while ending and ending[0][0] < day:
+            del active[heappop(ending)[1]]
+            changed = True
+        while next_start < len(starting) and starting[next_start].fecha_inicio <= day:
+            absence = starting[next_start]
+            next_start += 1
+            active[absence.solicitud_id] = None
+            heappush(ending, (absence.fecha_fin, absence.solicitud_id))
+            changed = True
+        if changed:
+            ids = tuple(active)
+        days.append((day, ids))
+        day += timedelta(days=1)
+
+    return days
+
+
 # ============================================================================
 # SERVICIO PRINCIPAL
 # ============================================================================
@@ -87,16 +165,20 @@ class SolicitudService:
     Implementa las reglas de negocio y coordina entre repositorios.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, calendar_cache: AbsenceCalendarCache | None = None):
         """
         Inicializa el servicio.
 
         Args:
             session: Sesión asíncrona de base de datos
+            calendar_cache: Caché del calendario de ausencias (por defecto, la del proceso)
         """
         self.session = session
         self.solicitud_repo = SolicitudRepository(session)
         self.user_repo = UserRepository(session)
+        self.calendar_cache = (
+            calendar_cache if calendar_cache is not None else absence_calendar_cache
+        )
 
     async def create_solicitud(
         self,
@@ -188,7 +270,9 @@ class SolicitudService:
             status=SolicitudStatus.PENDING,
         )
 
-        return await self.solicitud_repo.create(solicitud)
+        solicitud = await self.solicitud_repo.create(solicitud)
+        self.calendar_cache.invalidate(self.session, solicitud.fecha_inicio, solicitud.fecha_fin)
+        return solicitud
 
     async def get_my_solicitudes(
         self,
@@ -196,7 +280,8 @@ class SolicitudService:
         filters: SolicitudFilters,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Solicitud], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[SolicitudRow]:
         """
         Obtiene las solicitudes del usuario actual con filtros opcionales.
 
@@ -207,15 +292,17 @@ class SolicitudService:
             filters: Filtros a aplicar
             skip: Número de registros a saltar
             limit: Número máximo de registros
+            count_strategy: Estrategia para calcular el total
 
         Returns:
-            tuple[list[Solicitud], int]: Lista de solicitudes y total
+            Page[SolicitudRow]: Solicitudes de la página y total
         """
         return await self.solicitud_repo.get_by_user(
             user_id=user.id,  # type: ignore
             filters=filters,
             skip=skip,
             limit=limit,
+            count_strategy=count_strategy,
         )
 
     async def get_all_solicitudes(
@@ -223,7 +310,8 @@ class SolicitudService:
         filters: SolicitudFilters,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Solicitud], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[SolicitudRow]:
         """
         Obtiene todas las solicitudes con filtros (solo HR).
 
@@ -233,14 +321,16 @@ class SolicitudService:
             filters: Filtros a aplicar
             skip: Número de registros a saltar
             limit: Número máximo de registros
+            count_strategy: Estrategia para calcular el total
 
         Returns:
-            tuple[list[Solicitud], int]: Lista de solicitudes y total
+            Page[SolicitudRow]: Solicitudes de la página y total
         """
         return await self.solicitud_repo.get_all(
             filters=filters,
             skip=skip,
             limit=limit,
+            count_strategy=count_strategy,
         )
 
     async def get_solicitud_by_id(
@@ -286,6 +376,7 @@ class SolicitudService:
         solicitud_id: int,
         user: User,
         data: SolicitudUpdate,
+        expected_version: int | None = None,
     ) -> Solicitud:
         """
         Actualiza una solicitud existente.
@@ -301,12 +392,14 @@ class SolicitudService:
             solicitud_id: ID de la solicitud
             user: Usuario actual
             data: Datos a actualizar
+            expected_version: Versión leída por el cliente (If-Match)
 
         Returns:
             Solicitud: Solicitud actualizada
 
         Raises:
             HTTPException: Si falla alguna validación
+            ConflictException: Si la solicitud cambió desde que el cliente la leyó
         """
         # Obtener solicitud y validar permisos
         solicitud = await self.get_solicitud_by_id(solicitud_id, user)
@@ -318,6 +411,8 @@ class SolicitudService:
                 detail="Solo puede actualizar sus propias solicitudes",
             )
 
+        ensure_version("La solicitud", solicitud.version, expected_version)
+
         # RN-V09: Solo solicitudes PENDING
         if solicitud.status != SolicitudStatus.PENDING:
             raise HTTPException(
@@ -378,6 +473,13 @@ class SolicitudService:
 
             update_data["dias_solicitados"] = nuevos_dias
 
+        # Las fechas anteriores también dejan de estar en el calendario
+        if data.fecha_inicio or data.fecha_fin:
+            self.calendar_cache.invalidate(
+                self.session, solicitud.fecha_inicio, solicitud.fecha_fin
+            )
+            self.calendar_cache.invalidate(self.session, nueva_fecha_inicio, nueva_fecha_fin)
+
         # Aplicar actualización a solicitud
         for key, value in update_data.items():
             setattr(solicitud, key, value)
@@ -396,6 +498,7 @@ class SolicitudService:
         self,
         solicitud_id: int,
         user: User,
+        expected_version: int | None = None,
     ) -> Solicitud:
         """
         Cancela una solicitud (cambia estado a CANCELLED).
@@ -408,12 +511,14 @@ class SolicitudService:
         Args:
             solicitud_id: ID de la solicitud
             user: Usuario actual
+            expected_version: Versión leída por el cliente (If-Match)
 
         Returns:
             Solicitud: Solicitud cancelada
 
         Raises:
             HTTPException: Si falla alguna validación
+            ConflictException: Si la solicitud cambió desde que el cliente la leyó
         """
         # Obtener solicitud y validar permisos
         solicitud = await self.get_solicitud_by_id(solicitud_id, user)
@@ -425,6 +530,8 @@ class SolicitudService:
                 detail="Solo puede cancelar sus propias solicitudes",
             )
 
+        ensure_version("La solicitud", solicitud.version, expected_version)
+
         # RN-V09 y RN-V13: Solo solicitudes PENDING
         if solicitud.status != SolicitudStatus.PENDING:
             raise HTTPException(
@@ -434,6 +541,7 @@ class SolicitudService:
 
         # Cambiar estado a CANCELLED
         solicitud.status = SolicitudStatus.CANCELLED
+        self.calendar_cache.invalidate(self.session, solicitud.fecha_inicio, solicitud.fecha_fin)
         updated_solicitud = await self.solicitud_repo.update(solicitud)
 
         if not updated_solicitud:
@@ -449,6 +557,7 @@ class SolicitudService:
         solicitud_id: int,
         reviewer: User,
         data: SolicitudReview,
+        expected_version: int | None = None,
     ) -> Solicitud:
         """
         Aprueba o rechaza una solicitud (solo HR).
@@ -464,12 +573,14 @@ class SolicitudService:
             solicitud_id: ID de la solicitud
             reviewer: Usuario HR que revisa
             data: Datos de la revisión
+            expected_version: Versión leída por el cliente (If-Match)
 
         Returns:
             Solicitud: Solicitud revisada
 
         Raises:
             HTTPException: Si falla alguna validación
+            ConflictException: Si la solicitud cambió desde que se leyó o se revisó a la vez
         """
         # Obtener solicitud
         solicitud = await self.solicitud_repo.get_by_id(solicitud_id)
@@ -480,6 +591,8 @@ class SolicitudService:
                 detail="Solicitud no encontrada",
             )
 
+        ensure_version("La solicitud", solicitud.version, expected_version)
+
         # RN-V09: Solo solicitudes PENDING
         if solicitud.status != SolicitudStatus.PENDING:
             raise HTTPException(
@@ -497,10 +610,28 @@ class SolicitudService:
         # Determinar nuevo estado
         new_status = SolicitudStatus.APPROVED if data.approved else SolicitudStatus.REJECTED
 
-        # RN-V11: Si se aprueba una VACATION, descontar del balance
-        if data.approved and solicitud.tipo == SolicitudTipo.VACATION:
-            # Obtener usuario solicitante
-            solicitante = await self.user_repo.get_by_id(solicitud.user_id)
+        # Registrar la revisión solo si sigue PENDING y en la versión validada:
+        # si otro revisor se adelantó o el solicitante la modificó entre la
+        # lectura y aquí, no se toca nada (ni el balance)
+        reviewed = await self.solicitud_repo.mark_reviewed(
+            solicitud_id,
+            solicitud.version,
+            new_status,
+            reviewed_by=reviewer.id,  # type: ignore
+            comentarios_revision=data.comentarios_revision,
+        )
+        if reviewed is None:
+            msg = "La solicitud se ha revisado o modificado en otra operación simultánea"
+            raise ConflictException(msg, details={"solicitud_id": solicitud_id})
+        self.calendar_cache.invalidate(self.session, reviewed.fecha_inicio, reviewed.fecha_fin)
+
+        # RN-V11: Si se aprueba una VACATION, descontar del balance. El descuento
+        # se calcula en la base de datos, en la misma transacción que el cambio
+        # de estado, para que aprobaciones concurrentes no pierdan días
+        if data.approved and reviewed.tipo == SolicitudTipo.VACATION:
+            solicitante = await self.user_repo.decrement_vacation_days(
+                reviewed.user_id, reviewed.dias_solicitados
+            )
 
             if not solicitante:
                 raise HTTPException(
@@ -508,26 +639,239 @@ class SolicitudService:
                     detail="Usuario solicitante no encontrado",
                 )
 
-            # Descontar días del balance
-            nuevo_balance = solicitante.dias_vacaciones_disponibles - solicitud.dias_solicitados
-            solicitante.dias_vacaciones_disponibles = nuevo_balance
-            await self.user_repo.update(solicitante)
+        return reviewed
 
-        # Actualizar solicitud con revisión
-        solicitud.status = new_status
-        solicitud.reviewed_by = reviewer.id  # type: ignore
-        solicitud.reviewed_at = datetime.now(tz=UTC)
-        solicitud.comentarios_revision = data.comentarios_revision
+    async def review_many(
+        self,
+        reviewer: User,
+        data: SolicitudBulkReview,
+    ) -> SolicitudBulkReviewResponse:
+        """
+        Aprueba o rechaza varias solicitudes a la vez (solo HR).
 
-        updated_solicitud = await self.solicitud_repo.update(solicitud)
+        Mismas reglas que `review_solicitud`, con un número fijo de consultas
+        sea cual sea el tamaño del lote:
 
-        if not updated_solicitud:
+        1. Carga las solicitudes y sus solicitantes (dos SELECT).
+        2. Valida RN-V09, RN-V14 y la versión indicada en memoria.
+        3. Registra todas las revisiones válidas con un único UPDATE
+           condicionado a que sigan PENDING y sin cambios.
+        4. RN-V11: descuenta los días aprobados agrupados por solicitante con
+           un único UPDATE.
+
+        Todo ocurre en la transacción de la petición. Las decisiones que no
+        pasan la validación, o cuya solicitud cambió entre la lectura y la
+        escritura, se devuelven como fallidas sin impedir el resto.
+
+        Args:
+            reviewer: Usuario HR que revisa
+            data: Decisiones a aplicar
+
+        Returns:
+            SolicitudBulkReviewResponse: Resultado de cada decisión, en el orden recibido
+        """
+        # Una misma solicitud solo se revisa una vez: se aplica la primera decisión
+        first: dict[int, SolicitudBulkReviewItem] = {}
+        for item in data.items:
+            first.setdefault(item.solicitud_id, item)
+        items = list(first.values())
+
+        loaded = {
+            s.id: s
+            for s in await self.solicitud_repo.get_many_for_review([i.solicitud_id for i in items])
+        }
+
+        outcomes: dict[int, SolicitudBulkReviewOutcome] = {}
+        decisions: list[tuple[Solicitud, SolicitudStatus, str | None]] = []
+        for item in items:
+            solicitud = loaded.get(item.solicitud_id)
+            error = self._bulk_review_error(solicitud, item.version, reviewer)
+            if error is not None:
+                outcomes[item.solicitud_id] = SolicitudBulkReviewOutcome(
+                    solicitud_id=item.solicitud_id,
+                    ok=False,
+                    status=solicitud.status if solicitud else None,
+                    version=solicitud.version if solicitud else None,
+                    error=error[0],
+                    detail=error[1],
+                )
+                continue
+
+            new_status = SolicitudStatus.APPROVED if item.approved else SolicitudStatus.REJECTED
+            decisions.append((solicitud, new_status, item.comentarios_revision))  # type: ignore[arg-type]
+
+        reviewed = {
+            s.id: s
+            for s in await self.solicitud_repo.mark_many_reviewed(
+                decisions,
+                reviewed_by=reviewer.id,  # type: ignore[arg-type]
+            )
+        }
+
+        # RN-V11: un único descuento por solicitante con la suma de sus aprobaciones
+        days_by_user: dict[int, float] = defaultdict(float)
+        for solicitud, new_status, _ in decisions:
+            if solicitud.id not in reviewed:
+                outcomes[solicitud.id] = SolicitudBulkReviewOutcome(  # type: ignore[index]
+                    solicitud_id=solicitud.id,  # type: ignore[arg-type]
+                    ok=False,
+                    error=SolicitudBulkReviewError.CONFLICT,
+                    detail="La solicitud se ha revisado o modificado en otra operación simultánea",
+                )
+                continue
+
+            self.calendar_cache.invalidate(
+                self.session, solicitud.fecha_inicio, solicitud.fecha_fin
+            )
+            if new_status == SolicitudStatus.APPROVED and solicitud.tipo == SolicitudTipo.VACATION:
+                days_by_user[solicitud.user_id] += solicitud.dias_solicitados
+            outcomes[solicitud.id] = SolicitudBulkReviewOutcome(  # type: ignore[index]
+                solicitud_id=solicitud.id,  # type: ignore[arg-type]
+                ok=True,
+                status=new_status,
+                version=solicitud.version,
+            )
+
+        await self.user_repo.decrement_vacation_days_many(days_by_user)
+
+        results: list[SolicitudBulkReviewOutcome] = []
+        for item in data.items:
+            outcome = outcomes.pop(item.solicitud_id, None)
+            if outcome is None:
+                outcome = SolicitudBulkReviewOutcome(
+                    solicitud_id=item.solicitud_id,
+                    ok=False,
+                    error=SolicitudBulkReviewError.DUPLICATE,
+                    detail="La solicitud aparece más de una vez en el lote",
+                )
+            results.append(outcome)
+
+        return SolicitudBulkReviewResponse(
+            results=results,
+            approved=sum(r.ok and r.status == SolicitudStatus.APPROVED for r in results),
+            rejected=sum(r.ok and r.status == SolicitudStatus.REJECTED for r in results),
+            failed=sum(not r.ok for r in results),
+        )
+
+    @staticmethod
+    def _bulk_review_error(
+        solicitud: Solicitud | None,
+        expected_version: int | None,
+        reviewer: User,
+    ) -> tuple[SolicitudBulkReviewError, str] | None:
+        """
+        Valida en memoria una decisión de una revisión masiva.
+
+        Args:
+            solicitud: Solicitud cargada (None si no existe)
+            expected_version: Versión indicada por el cliente
+            reviewer: Usuario HR que revisa
+
+        Returns:
+            tuple | None: (error, detalle) o None si la decisión es válida
+        """
+        if solicitud is None:
+            return SolicitudBulkReviewError.NOT_FOUND, "Solicitud no encontrada"
+
+        if expected_version is not None and expected_version != solicitud.version:
+            return (
+                SolicitudBulkReviewError.VERSION_CONFLICT,
+                "La solicitud se ha modificado desde que se leyó",
+            )
+
+        # RN-V09: Solo solicitudes PENDING
+        if solicitud.status != SolicitudStatus.PENDING:
+            return (
+                SolicitudBulkReviewError.NOT_PENDING,
+                f"No se puede revisar una solicitud con estado {solicitud.status}",
+            )
+
+        # RN-V14: Un usuario HR no puede aprobar sus propias solicitudes
+        if solicitud.user_id == reviewer.id:
+            return (
+                SolicitudBulkReviewError.OWN_REQUEST,
+                "No puede aprobar o rechazar sus propias solicitudes",
+            )
+
+        return None
+
+    async def get_absence_calendar(
+        self,
+        fecha_desde: date,
+        fecha_hasta: date,
+        include_pending: bool = True,
+    ) -> AbsenceCalendarResponse:
+        """
+        Calendario de ausencias (aprobadas y, opcionalmente, pendientes) día a día.
+
+        Las ausencias se guardan por mes en la caché del proceso. Los meses
+        del rango que no están en ella se leen con una única consulta por
+        rango (del primero al último que faltan) y se reparten por mes; luego
+        se expanden a días con `absences_by_day`.
+
+        Args:
+            fecha_desde: Primer día del calendario
+            fecha_hasta: Último día del calendario (incluido)
+            include_pending: Incluir las solicitudes pendientes de revisión
+
+        Returns:
+            AbsenceCalendarResponse: Ausencias del rango y sus IDs por día
+
+        Raises:
+            HTTPException: Si el rango no es válido o supera MAX_CALENDAR_DAYS
+        """
+        if fecha_hasta < fecha_desde:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al revisar la solicitud",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="fecha_hasta debe ser igual o posterior a fecha_desde",
+            )
+        if (fecha_hasta - fecha_desde).days >= MAX_CALENDAR_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El calendario admite como máximo {MAX_CALENDAR_DAYS} días",
             )
 
-        return updated_solicitud
+        months = months_between(fecha_desde, fecha_hasta)
+        by_month = {month: self.calendar_cache.get(month) for month in months}
+        missing = [month for month, rows in by_month.items() if rows is None]
+        if missing:
+            generation = self.calendar_cache.generation
+            first, _ = month_bounds(missing[0])
+            _, last = month_bounds(missing[-1])
+            fetched: dict[tuple[int, int], list[AbsenceRow]] = {month: [] for month in missing}
+            for row in await self.solicitud_repo.get_absences_between(
+                first, last, CALENDAR_STATUSES
+            ):
+                for month in months_between(max(row.fecha_inicio, first), min(row.fecha_fin, last)):
+                    if month in fetched:
+                        fetched[month].append(row)
+            for month, rows in fetched.items():
+                by_month[month] = tuple(rows)
+                self.calendar_cache.put(month, by_month[month], generation)
+
+        statuses = CALENDAR_STATUSES if include_pending else (SolicitudStatus.APPROVED,)
+        absences = {
+            row.solicitud_id: row
+            for rows in by_month.values()
+            for row in rows or ()
+            if row.status in statuses
+            and row.fecha_inicio <= fecha_hasta
+            and row.fecha_fin >= fecha_desde
+        }
+        ordered = sorted(absences.values(), key=lambda a: (a.fecha_inicio, a.solicitud_id))
+
+        return AbsenceCalendarResponse.model_validate(
+            {
+                "fecha_desde": fecha_desde,
+                "fecha_hasta": fecha_hasta,
+                "absences": ordered,
+                "days": [
+                    {"fecha": day, "solicitud_ids": ids}
+                    for day, ids in absences_by_day(ordered, fecha_desde, fecha_hasta)
+                ],
+            },
+            from_attributes=True,
+        )
 
     async def get_my_balance(
         self,
@@ -542,14 +886,7 @@ class SolicitudService:
         Returns:
             VacationBalance: Balance de vacaciones
         """
-        balance_data = await self.solicitud_repo.get_vacation_balance(user_id=user.id)  # type: ignore
-
-        return VacationBalance(
-            user_id=user.id,  # type: ignore
-            user_email=user.email,
-            user_full_name=user.full_name,
-            **balance_data,
-        )
+        return await self.get_user_balance(user.id)  # type: ignore
 
     async def get_user_balance(
         self,
@@ -558,7 +895,8 @@ class SolicitudService:
         """
         Obtiene el balance de vacaciones de un usuario (solo HR).
 
-        RN-V10 verificada en router.
+        RN-V10 verificada en router. Lee solo los datos del usuario que
+        necesita (`UserSnapshot`), sin cargar la entidad completa.
 
         Args:
             user_id: ID del usuario
@@ -570,7 +908,7 @@ class SolicitudService:
             HTTPException: Si el usuario no existe
         """
         # Obtener usuario
-        user = await self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_snapshot(user_id)
 
         if not user:
             raise HTTPException(
@@ -578,10 +916,10 @@ class SolicitudService:
                 detail="Usuario no encontrado",
             )
 
-        balance_data = await self.solicitud_repo.get_vacation_balance(user_id=user_id)
+        balance_data = await self.solicitud_repo.get_vacation_balance(user)
 
         return VacationBalance(
-            user_id=user.id,  # type: ignore
+            user_id=user.id,
             user_email=user.email,
             user_full_name=user.full_name,
             **balance_data,
@@ -14,7 +14,12 @@ from app.core.exceptions import (
     NotFoundException,
     ValidationException,
 )
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password_async,
+    verify_dummy_password_async,
+    verify_password,
+)
 from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserCreateByHR, UserUpdate, UserUpdateSelf
@@ -296,6 +301,11 @@ class UserService:
         """
         Autentica un usuario por email y contraseña.
 
+        Si el hash guardado usa otro esquema o coste que la configuración
+        actual, se sustituye por uno nuevo aprovechando la contraseña en claro.
+        Con un email desconocido se verifica contra un hash ficticio para que
+        la latencia sea la misma que con una contraseña incorrecta.
+
         Args:
             email: Email del usuario
             password: Contraseña en texto plano
@@ -309,11 +319,15 @@ class UserService:
         user = await self.user_repo.get_by_email(email)
 
         if not user:
+            # Misma verificación que con un usuario real: el tiempo de
+            # respuesta no revela si el email existe
+            await verify_dummy_password_async(password)
             raise AuthenticationException(
                 message="Credenciales inválidas", details={"field": "email"}
             )
 
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not verified:
             raise AuthenticationException(
                 message="Credenciales inválidas", details={"field": "password"}
             )
@@ -321,4 +335,8 @@ class UserService:
         if not user.is_active:
             raise AuthenticationException(message="Usuario inactivo", details={"email": email})
 
+        if new_hash is not None:
+            user.hashed_password = new_hash
+            await self.user_repo.update(user)
+
         return user
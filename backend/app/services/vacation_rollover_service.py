@@ -0,0 +1,329 @@
+"""
+Servicio de cierre anual de vacaciones.
+
+Al cerrar un año, cada usuario empieza el siguiente con sus días anuales
+más lo que le quedó sin disfrutar, hasta un tope configurable. El cierre es
+idempotente por año: se registra en `vacation_rollover` y, si se interrumpe,
+relanzarlo continúa por el último lote confirmado.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BadRequestException, ConflictException, NotFoundException
+from app.models.vacation_rollover import (
+    VacationRollover,
+    VacationRolloverEntry,
+    VacationRolloverStatus,
+)
+from app.repositories.pagination import Page
+from app.repositories.vacation_rollover_repository import VacationRolloverRepository
+from app.schemas.vacation_rollover import VacationRolloverReport
+
+# ============================================================================
+# REGLAS DE NEGOCIO
+# ============================================================================
+# RN-R01: Un año solo se cierra una vez (el cierre de un año es idempotente)
+# RN-R02: No se puede cerrar un año que no ha terminado ni uno anterior al último cerrado
+# RN-R03: Se arrastra lo no disfrutado hasta el tope (días y/o fracción de los anuales)
+# RN-R04: Un balance negativo se arrastra entero como deuda
+# RN-R05: Las vacaciones aprobadas que empiezan el año siguiente cuentan contra su año
+
+
+class VacationRolloverService:
+    """Servicio para el cierre anual de los balances de vacaciones."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        Inicializa el servicio.
+
+        Args:
+            session: Sesión asíncrona de base de datos
+        """
+        self.session = session
+        self.rollover_repo = VacationRolloverRepository(session)
+
+    @staticmethod
+    def resolve_caps(
+        max_carryover_days: float | None, max_carryover_ratio: float | None
+    ) -> tuple[float, float | None]:
+        """
+        Completa los topes no indicados con los de la configuración.
+
+        Args:
+            max_carryover_days: Días máximos arrastrados
+            max_carryover_ratio: Fracción máxima de los días anuales
+
+        Returns:
+            tuple: Tope en días y tope en fracción (None = sin tope)
+        """
+        if max_carryover_days is None:
+            max_carryover_days = settings.vacation_carryover_max_days
+        if max_carryover_ratio is None:
+            max_carryover_ratio = settings.vacation_carryover_max_ratio
+        return max_carryover_days, max_carryover_ratio
+
+    async def check_can_run(self, year: int) -> VacationRollover | None:
+        """
+        Comprueba que se puede cerrar un año.
+
+        Args:
+            year: Año que se cierra
+
+        Returns:
+            VacationRollover | None: Cierre interrumpido del año, si lo hay
+
+        Raises:
+            BadRequestException: Si el año aún no ha terminado (el actual o uno futuro)
+            ConflictException: Si ya se cerró, o ya se cerró un año posterior
+        """
+        # RN-R02: Ni el año en curso, ni futuros, ni anteriores al último cerrado
+        if year >= datetime.now(UTC).year:
+            msg = f"No se puede cerrar el año {year} antes de que termine"
+            raise BadRequestException(msg)
+
+        # RN-R01: Un año solo se cierra una vez
+        existing = await self.rollover_repo.get_by_year(year)
+        if existing is not None and existing.is_completed:
+            msg = f"El año {year} ya está cerrado"
+            raise ConflictException(msg, details={"rollover_id": existing.id})
+
+        latest = await self.rollover_repo.get_latest_year()
+        if latest is not None and latest > year:
+            msg = f"Ya se cerró el año {latest}, posterior a {year}"
+            raise ConflictException(msg)
+
+        return existing
+
+    async def preview(
+        self,
+        year: int,
+        max_carryover_days: float | None = None,
+        max_carryover_ratio: float | None = None,
+    ) -> VacationRolloverReport:
+        """
+        Calcula el resultado de un cierre sin aplicarlo (dry-run).
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados (por defecto, configuración)
+            max_carryover_ratio: Fracción máxima de los días anuales (por defecto, configuración)
+
+        Returns:
+            VacationRolloverReport: Totales del cierre
+
+        Raises:
+            BadRequestException: Si el año aún no ha terminado (el actual o uno futuro)
+            ConflictException: Si el año no se puede cerrar
+        """
+        await self.check_can_run(year)
+        days, ratio = self.resolve_caps(max_carryover_days, max_carryover_ratio)
+        totals = await self.rollover_repo.preview(year, days, ratio)
+
+        return VacationRolloverReport(
+            year=year,
+            dry_run=True,
+            max_carryover_days=days,
+            max_carryover_ratio=ratio,
+            **totals,
+        )
+
+    async def validate_start(
+        self,
+        year: int,
+        max_carryover_days: float | None = None,
+        max_carryover_ratio: float | None = None,
+    ) -> tuple[VacationRollover | None, float, float | None]:
+        """
+        Comprueba que se puede lanzar (o retomar) el cierre de un año.
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados (por defecto, configuración)
+            max_carryover_ratio: Fracción máxima de los días anuales (por defecto, configuración)
+
+        Returns:
+            tuple: Cierre interrumpido (o None) y topes resueltos (días, fracción)
+
+        Raises:
+            BadRequestException: Si el año aún no ha terminado (el actual o uno futuro)
+            ConflictException: Si el año no se puede cerrar o se retoma con otros topes
+        """
+        existing = await self.check_can_run(year)
+        days, ratio = self.resolve_caps(max_carryover_days, max_carryover_ratio)
+
+        if existing is not None and (
+            existing.max_carryover_days != days or existing.max_carryover_ratio != ratio
+        ):
+            msg = f"El cierre de {year} está a medias con otros topes de arrastre"
+            raise ConflictException(
+                msg,
+                details={
+                    "max_carryover_days": existing.max_carryover_days,
+                    "max_carryover_ratio": existing.max_carryover_ratio,
+                },
+            )
+        return existing, days, ratio
+
+    async def start(
+        self,
+        year: int,
+        max_carryover_days: float | None = None,
+        max_carryover_ratio: float | None = None,
+        executed_by: int | None = None,
+    ) -> VacationRollover:
+        """
+        Inicia el cierre de un año, o retoma uno interrumpido.
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados (por defecto, configuración)
+            max_carryover_ratio: Fracción máxima de los días anuales (por defecto, configuración)
+            executed_by: ID del usuario que lo lanza
+
+        Returns:
+            VacationRollover: Cierre en curso
+
+        Raises:
+            BadRequestException: Si el año aún no ha terminado (el actual o uno futuro)
+            ConflictException: Si el año no se puede cerrar o se retoma con otros topes
+        """
+        existing, days, ratio = await self.validate_start(
+            year, max_carryover_days, max_carryover_ratio
+        )
+        if existing is not None:
+            return existing
+
+        return await self.rollover_repo.create(
+            VacationRollover(
+                year=year,
+                max_carryover_days=days,
+                max_carryover_ratio=ratio,
+                executed_by=executed_by,
+            )
+        )
+
+    async def pending_users(self, rollover: VacationRollover) -> int:
+        """
+        Cuenta los usuarios que faltan por procesar.
+
+        Args:
+            rollover: Cierre en curso
+
+        Returns:
+            int: Usuarios pendientes
+        """
+        return await self.rollover_repo.count_pending_users(rollover)
+
+    async def apply_next_batch(self, rollover: VacationRollover, batch_size: int) -> int:
+        """
+        Aplica el cierre al siguiente lote de usuarios.
+
+        El llamante confirma la transacción después de cada lote.
+
+        Args:
+            rollover: Cierre en curso
+            batch_size: Usuarios por lote
+
+        Returns:
+            int: Usuarios procesados (0 = terminado)
+        """
+        return await self.rollover_repo.apply_batch(rollover, batch_size)
+
+    async def complete(self, rollover: VacationRollover) -> VacationRollover:
+        """
+        Marca el cierre como completado y guarda sus totales.
+
+        Args:
+            rollover: Cierre con todos los lotes aplicados
+
+        Returns:
+            VacationRollover: Cierre completado
+        """
+        rollover.total_carried, rollover.total_forfeited = await self.rollover_repo.get_totals(
+            rollover.id  # type: ignore
+        )
+        rollover.status = VacationRolloverStatus.COMPLETED
+        rollover.finished_at = datetime.now(UTC)
+        await self.session.flush()
+        return rollover
+
+    async def run(
+        self,
+        year: int,
+        max_carryover_days: float | None = None,
+        max_carryover_ratio: float | None = None,
+        executed_by: int | None = None,
+        batch_size: int | None = None,
+    ) -> VacationRollover:
+        """
+        Ejecuta un cierre completo confirmando cada lote.
+
+        Pensado para scripts; la API lo ejecuta como trabajo en segundo plano
+        (`vacaciones.rollover`), que además informa del progreso.
+
+        Args:
+            year: Año que se cierra
+            max_carryover_days: Días máximos arrastrados
+            max_carryover_ratio: Fracción máxima de los días anuales
+            executed_by: ID del usuario que lo lanza
+            batch_size: Usuarios por lote (por defecto, configuración)
+
+        Returns:
+            VacationRollover: Cierre completado
+        """
+        batch_size = batch_size or settings.vacation_rollover_batch_size
+        rollover = await self.start(year, max_carryover_days, max_carryover_ratio, executed_by)
+        await self.session.commit()
+
+        while await self.apply_next_batch(rollover, batch_size):
+            await self.session.commit()
+
+        rollover = await self.complete(rollover)
+        await self.session.commit()
+        return rollover
+
+    async def get_rollover(self, year: int) -> VacationRollover:
+        """
+        Obtiene el cierre de un año.
+
+        Args:
+            year: Año cerrado
+
+        Returns:
+            VacationRollover: Cierre del año
+
+        Raises:
+            NotFoundException: Si el año no se ha cerrado
+        """
+        rollover = await self.rollover_repo.get_by_year(year)
+        if rollover is None:
+            msg = f"No hay cierre de vacaciones del año {year}"
+            raise NotFoundException(msg)
+        return rollover
+
+    async def list_entries(
+        self, year: int, skip: int = 0, limit: int = 100
+    ) -> Page[VacationRolloverEntry]:
+        """
+        Lista la traza por usuario del cierre de un año.
+
+        Args:
+            year: Año cerrado
+            skip: Registros a saltar
+            limit: Registros máximos
+
+        Returns:
+            Page[VacationRolloverEntry]: Página de la traza
+
+        Raises:
+            NotFoundException: Si el año no se ha cerrado
+        """
+        rollover = await self.get_rollover(year)
+        return await self.rollover_repo.get_entries_page(
+            rollover.id,  # type: ignore
+            skip=skip,
+            limit=limit,
+        )
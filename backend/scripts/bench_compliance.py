@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las comprobaciones de jornada y descanso: columnas vs por fichaje.
+
+Ejecutar con: uv run python scripts/bench_compliance.py --intervals 10000000
+
+Genera en memoria `--intervals` fichajes (jornada partida de lunes a viernes
+durante `--days` días, con algunas jornadas largas y algunos descansos
+cortos) repartidos entre los usuarios necesarios y mide, sin base de datos:
+
+- naive: por fichaje, con objetos datetime y diccionarios por (usuario, día)
+  y (usuario, semana), sobre los primeros `--naive-intervals` fichajes y
+  extrapolado al total (y se comprueba que ambos cuentan los mismos
+  incumplimientos sobre esa muestra)
+- columnar: `check_compliance`, una sola pasada sobre arrays paralelos de
+  usuario, entrada y salida (lo que devuelve
+  `FichajeRepository.get_user_interval_arrays`)
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, date, datetime, timedelta
+
+from app.services.compliance_service import ComplianceLimits, check_compliance
+
+FIRST_DAY = date(datetime.now(UTC).year - 1, 1, 1)
+LIMITS = ComplianceLimits(max_daily_hours=9.0, max_weekly_hours=40.0, min_rest_hours=12.0)
+HOUR = 3600.0
+
+
+def generate(intervals: int, days: int) -> tuple[array, array, array]:
+    """Fichajes ordenados por usuario y entrada, como arrays paralelos."""
+    rng = random.Random(42)
+    origin = datetime(FIRST_DAY.year, FIRST_DAY.month, FIRST_DAY.day, tzinfo=UTC).timestamp()
+    workdays = [
+        origin + n * 24 * HOUR
+        for n in range(days)
+        if (FIRST_DAY + timedelta(days=n)).weekday() < 5  # noqa: PLR2004
+    ]
+    user_ids = array("q")
+    check_ins = array("d")
+    check_outs = array("d")
+    user_id = 0
+    while len(user_ids) < intervals:
+        user_id += 1
+        for midnight in workdays:
+            # Jornadas de 8 h; 1 de cada 20 empieza a las 5:00 (descanso corto)
+            # y 1 de cada 20 se alarga 2 h (jornada y semana por encima del máximo)
+            early = rng.random() < 0.05  # noqa: PLR2004
+            arrival = midnight + ((5 if early else 8) + rng.random()) * HOUR
+            lunch = arrival + 4.5 * HOUR
+            back = lunch + 0.75 * HOUR
+            leave = back + (5.5 if rng.random() < 0.05 else 3.5) * HOUR  # noqa: PLR2004
+            user_ids.extend((user_id, user_id))
+            check_ins.extend((arrival, back))
+            check_outs.extend((lunch, leave))
+    del user_ids[intervals:], check_ins[intervals:], check_outs[intervals:]
+    return user_ids, check_ins, check_outs
+
+
+def naive(user_ids, check_ins, check_outs, date_from: date, date_to: date) -> int:
+    """Por fichaje: datetimes y diccionarios por día y semana; devuelve incumplimientos."""
+    day_hours: dict[tuple[int, date], float] = defaultdict(float)
+    week_hours: dict[tuple[int, int, int], float] = defaultdict(float)
+    first_in: dict[tuple[int, date], datetime] = {}
+    last_out: dict[tuple[int, date], datetime] = {}
+    for user_id, start_ts, end_ts in zip(user_ids, check_ins, check_outs, strict=True):
+        start = datetime.fromtimestamp(start_ts, UTC)
+        end = datetime.fromtimestamp(end_ts, UTC)
+        day = start.date()
+        hours = (end - start).total_seconds() / 3600
+        day_hours[user_id, day] += hours
+        year, week, _ = day.isocalendar()
+        week_hours[user_id, year, week] += hours
+        first_in.setdefault((user_id, day), start)
+        last_out[user_id, day] = max(last_out.get((user_id, day), end), end)
+
+    violations = sum(
+        1
+        for (_, day), hours in day_hours.items()
+        if hours > LIMITS.max_daily_hours and date_from <= day <= date_to
+    )
+    violations += sum(1 for hours in week_hours.values() if hours > LIMITS.max_weekly_hours)
+    previous: tuple[int, date] | None = None
+    for key in sorted(first_in):
+        if previous is not None and previous[0] == key[0] and date_from <= key[1] <= date_to:
+            rest = (first_in[key] - last_out[previous]).total_seconds() / 3600
+            violations += rest < LIMITS.min_rest_hours
+        previous = key
+    return violations
+
+
+def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de jornada y descansos")
+    parser.add_argument("--intervals", type=int, default=10_000_000, help="Fichajes a generar")
+    parser.add_argument("--days", type=int, default=365, help="Días del periodo")
+    parser.add_argument(
+        "--naive-intervals", type=int, default=1_000_000, help="Fichajes medidos por fichaje"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    user_ids, check_ins, check_outs = generate(args.intervals, args.days)
+    size = sum(column.itemsize * len(column) for column in (user_ids, check_ins, check_outs))
+    print(
+        f"🌱 {len(user_ids)} fichajes de {user_ids[-1]} usuarios generados en "
+        f"{time.perf_counter() - start:.1f} s ({size / 1e6:.0f} MB en arrays)"
+    )
+    date_to = FIRST_DAY + timedelta(days=args.days - 1)
+
+    sample = min(args.naive_intervals, args.intervals)
+    start = time.perf_counter()
+    expected = naive(user_ids[:sample], check_ins[:sample], check_outs[:sample], FIRST_DAY, date_to)
+    elapsed = time.perf_counter() - start
+    print(
+        f"naive     {sample:>10} fichajes  {elapsed:>7.2f} s  "
+        f"(~{elapsed / sample * args.intervals:.0f} s para {args.intervals})"
+    )
+
+    sample_check = check_compliance(
+        user_ids[:sample], check_ins[:sample], check_outs[:sample], LIMITS, FIRST_DAY, date_to
+    )
+    if len(sample_check.violations) != expected:
+        sys.exit(f"❌ naive: {expected} incumplimientos, columnar: {len(sample_check.violations)}")
+
+    start = time.perf_counter()
+    check = check_compliance(user_ids, check_ins, check_outs, LIMITS, FIRST_DAY, date_to)
+    elapsed = time.perf_counter() - start
+    print(
+        f"columnar  {check.intervals:>10} fichajes  {elapsed:>7.2f} s  "
+        f"{check.intervals / elapsed:>10.0f} fichajes/s"
+    )
+    print(f"⚠️  {len(check.violations)} incumplimientos de {check.users} usuarios")
+
+
+if __name__ == "__main__":
+    main()
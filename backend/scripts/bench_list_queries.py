@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark de consultas de listado: entidades ORM vs proyección de columnas.
+
+Ejecutar con: uv run python scripts/bench_list_queries.py --rows 5000 --page-size 100
+
+Crea un usuario con `--rows` fichajes en la base de datos de `DATABASE_URL` y
+mide, por página, la latencia y el pico de memoria (tracemalloc) de:
+
+- orm: `select(Fichaje)` con `selectinload` de `user` y `approved_by_user`
+  (comportamiento anterior de `FichajeRepository.get_page`)
+- projection: `FichajeRepository.get_page`, que selecciona solo las columnas
+  del listado con un JOIN a `user` y devuelve `FichajeRow`
+
+En ambos casos se incluye la validación de la página con `FichajeListResponse`.
+Los fichajes y el usuario creados se eliminan al terminar.
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import selectinload
+
+from app.database import AsyncSessionLocal, UnitOfWork, engine
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User, UserRole
+from app.repositories.fichaje_repository import FichajeRepository
+from app.schemas.fichaje import FichajeListResponse
+
+BENCH_EMAIL = "bench-lists@stopcardio.com"
+
+
+async def seed(rows: int) -> int:
+    """Crea el usuario del benchmark y sus fichajes."""
+    async with AsyncSessionLocal() as session, UnitOfWork(session):
+        user = User(
+            email=BENCH_EMAIL,
+            full_name="Benchmark Lists",
+            hashed_password="!",
+            role=UserRole.EMPLOYEE,
+        )
+        session.add(user)
+        await session.flush()
+
+        now = datetime.now(UTC)
+        await session.execute(
+            insert(Fichaje),
+            [
+                {
+                    "user_id": user.id,
+                    "check_in": now - timedelta(days=i, hours=8),
+                    "check_out": now - timedelta(days=i),
+                    "status": FichajeStatus.VALID,
+                    "notes": "Jornada completa",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(rows)
+            ],
+        )
+        return user.id  # type: ignore
+
+
+async def cleanup(user_id: int) -> None:
+    """Elimina los fichajes y el usuario del benchmark."""
+    async with AsyncSessionLocal() as session, UnitOfWork(session):
+        await session.execute(delete(Fichaje).where(Fichaje.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+
+
+async def page_orm(user_id: int, skip: int, limit: int) -> FichajeListResponse:
+    """Página con entidades ORM y relaciones cargadas con selectinload."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Fichaje)
+            .options(selectinload(Fichaje.user), selectinload(Fichaje.approved_by_user))
+            .where(Fichaje.user_id == user_id)
+            .order_by(Fichaje.check_in.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return _validate(list(result.scalars().all()), limit)
+
+
+async def page_projection(user_id: int, skip: int, limit: int) -> FichajeListResponse:
+    """Página con la proyección de columnas del repositorio."""
+    async with AsyncSessionLocal() as session:
+        items = await FichajeRepository(session).get_all(skip=skip, limit=limit, user_id=user_id)
+        return _validate(items, limit)
+
+
+def _validate(items: list, limit: int) -> FichajeListResponse:
+    """Valida la página igual que el router."""
+    return FichajeListResponse.model_validate(
+        {
+            "fichajes": items,
+            "total": None,
+            "has_more": False,
+            "page": 1,
+            "page_size": limit,
+            "total_hours": 0.0,
+        },
+        from_attributes=True,
+    )
+
+
+MODES = {
+    "orm": page_orm,
+    "projection": page_projection,
+}
+
+
+async def run_mode(mode: str, user_id: int, rows: int, page_size: int) -> None:
+    """Recorre todas las páginas en un modo e imprime latencia y memoria por página."""
+    handler = MODES[mode]
+    pages = range(0, rows, page_size)
+
+    # Calentamiento (conexiones del pool, caché de sentencias compiladas)
+    await handler(user_id, 0, page_size)
+
+    start = time.perf_counter()
+    for skip in pages:
+        await handler(user_id, skip, page_size)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await handler(user_id, 0, page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{mode:<11} {len(pages):>5} páginas  {elapsed / len(pages) * 1000:>8.2f} ms/página  "
+        f"{peak / 1024:>9.1f} KiB pico/página"
+    )
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de consultas de listado")
+    parser.add_argument("--rows", type=int, default=2000, help="Fichajes a crear")
+    parser.add_argument("--page-size", type=int, default=100, help="Fichajes por página")
+    parser.add_argument(
+        "--mode", choices=[*MODES, "all"], default="all", help="Modo a medir (default: all)"
+    )
+    args = parser.parse_args()
+
+    print(f"🗄️  Base de datos: {engine.url.render_as_string(hide_password=True)}")
+    user_id = await seed(args.rows)
+    try:
+        modes = list(MODES) if args.mode == "all" else [args.mode]
+        for mode in modes:
+            await run_mode(mode, user_id, args.rows, args.page_size)
+    finally:
+        await cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark del mapa de ocupación por hora: barrido vs una consulta por hora.
+
+Ejecutar con: uv run python scripts/bench_occupancy.py --users 1000 --days 365
+
+Crea `--users` usuarios con un año de fichajes (jornada partida de lunes a
+viernes, con entradas y salidas repartidas) en una base de datos SQLite
+temporal (no toca `DATABASE_URL`; con `--database-url` se usa otra base de
+datos vacía) y mide:
+
+- naive: un COUNT por hora de los fichajes que se cruzan con ella, sobre los
+  primeros `--naive-days` días y extrapolado al rango completo
+- sweep: `FichajeService.get_occupancy`, que carga entradas y salidas del
+  rango como arrays compactos y calcula todas las horas con un barrido
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.fichaje import OccupancyHeatmap
+from app.services.fichaje_service import FichajeService
+
+FIRST_DAY = date(datetime.now(UTC).year - 1, 1, 1)
+CHUNK = 10_000
+
+
+def shifts(rng: random.Random, day: date) -> list[tuple[datetime, datetime]]:
+    """Jornada partida de un día laborable con horas aleatorias."""
+    base = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    arrival = base + timedelta(hours=7, minutes=rng.randrange(150))
+    lunch = base + timedelta(hours=13, minutes=rng.randrange(60))
+    back = lunch + timedelta(minutes=30 + rng.randrange(60))
+    leave = back + timedelta(hours=3, minutes=rng.randrange(150))
+    return [(arrival, lunch), (back, leave)]
+
+
+async def seed(maker: async_sessionmaker[AsyncSession], users: int, days: int) -> int:
+    """Crea las tablas, los usuarios y sus fichajes del periodo."""
+    rng = random.Random(42)
+    now = datetime.now(UTC)
+    workdays = [
+        day
+        for day in (FIRST_DAY + timedelta(days=n) for n in range(days))
+        if day.weekday() < 5  # noqa: PLR2004
+    ]
+    async with maker() as session:
+        conn = await session.connection()
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"occupancy{i}@stopcardio.com",
+                    "full_name": f"Occupancy {i}",
+                    "hashed_password": "!",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(users)
+            ],
+        )
+        ids = (await session.execute(select(User.id))).scalars().all()
+
+        rows = []
+        total = 0
+        for day in workdays:
+            for user_id in ids:
+                for check_in, check_out in shifts(rng, day):
+                    rows.append(
+                        {
+                            "user_id": user_id,
+                            "check_in": check_in,
+                            "check_out": check_out,
+                            "status": FichajeStatus.VALID,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                    )
+            if len(rows) >= CHUNK:
+                await session.execute(insert(Fichaje), rows)
+                total += len(rows)
+                rows = []
+        if rows:
+            await session.execute(insert(Fichaje), rows)
+            total += len(rows)
+        await session.commit()
+        return total
+
+
+async def naive(maker: async_sessionmaker[AsyncSession], days: int) -> list[int]:
+    """Un COUNT por hora de los fichajes que se cruzan con ella."""
+    origin = datetime(FIRST_DAY.year, FIRST_DAY.month, FIRST_DAY.day, tzinfo=UTC)
+    counts = []
+    async with maker() as session:
+        for hour in range(days * 24):
+            start = origin + timedelta(hours=hour)
+            end = start + timedelta(hours=1)
+            counts.append(
+                (
+                    await session.execute(
+                        select(func.count(Fichaje.id)).where(
+                            Fichaje.check_in < end,
+                            or_(Fichaje.check_out.is_(None), Fichaje.check_out > start),
+                        )
+                    )
+                ).scalar_one()
+            )
+    return counts
+
+
+async def sweep(maker: async_sessionmaker[AsyncSession], days: int) -> OccupancyHeatmap:
+    """Mapa completo con el servicio (arrays compactos y barrido)."""
+    async with maker() as session:
+        service = FichajeService(FichajeRepository(session), UserRepository(session))
+        return await service.get_occupancy(FIRST_DAY, FIRST_DAY + timedelta(days=days - 1))
+
+
+async def load_arrays(maker: async_sessionmaker[AsyncSession], days: int) -> tuple[int, int]:
+    """Solo la carga de los arrays: intervalos y bytes que ocupan."""
+    origin = datetime(FIRST_DAY.year, FIRST_DAY.month, FIRST_DAY.day, tzinfo=UTC)
+    async with maker() as session:
+        arrivals, departures = await FichajeRepository(session).get_interval_arrays(
+            origin, origin + timedelta(days=days), open_until=datetime.now(UTC)
+        )
+    size = arrivals.itemsize * len(arrivals) + departures.itemsize * len(departures)
+    return len(arrivals), size
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark del mapa de ocupación por hora")
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios a crear")
+    parser.add_argument("--days", type=int, default=365, help="Días de fichajes (máx. 366)")
+    parser.add_argument(
+        "--naive-days", type=int, default=14, help="Días medidos con una consulta por hora"
+    )
+    parser.add_argument("--database-url", help="Base de datos vacía (default: SQLite temporal)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'occupancy.db'}"
+        engine = create_async_engine(url)
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            print(f"🗄️  Base de datos: {engine.url.render_as_string(hide_password=True)}")
+            start = time.perf_counter()
+            rows = await seed(maker, args.users, args.days)
+            print(f"🌱 {rows} fichajes creados en {time.perf_counter() - start:.1f} s")
+
+            naive_days = min(args.naive_days, args.days)
+            start = time.perf_counter()
+            await naive(maker, naive_days)
+            elapsed = time.perf_counter() - start
+            print(
+                f"naive  {naive_days * 24:>6} horas  {elapsed:>7.2f} s  "
+                f"(~{elapsed / naive_days * args.days:.0f} s para {args.days} días)"
+            )
+
+            start = time.perf_counter()
+            intervals, size = await load_arrays(maker, args.days)
+            load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            heatmap = await sweep(maker, args.days)
+            elapsed = time.perf_counter() - start
+            print(
+                f"sweep  {args.days * 24:>6} horas  {elapsed:>7.2f} s  "
+                f"(carga {load:.2f} s, {intervals} intervalos en {size / 1e6:.1f} MB)"
+            )
+            print(f"👥 Pico de ocupación: {max(map(max, heatmap.peak))} personas")
+        finally:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark del particionado mensual de fichaje: antes y después de la migración.
+
+Ejecutar con: uv run python scripts/bench_partitioning.py --database-url postgresql+asyncpg://...
+
+Necesita una base de datos PostgreSQL vacía y desechable (`--database-url`;
+no toca `DATABASE_URL`). Aplica las migraciones hasta la anterior al
+particionado, crea `--users` usuarios con `--years` años de fichajes (uno por
+día laborable, unos 250 por empleado y año) y mide las consultas de
+`FichajeRepository`:
+
+- antes: tabla sin particionar
+- después: tras `alembic upgrade head` (se mide también lo que tarda la
+  conversión), con una partición por mes
+
+Para cada consulta muestra la mediana de `--repeat` ejecuciones, y para un mes
+cuántas particiones lee el plan (las demás se descartan al planificar).
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.schemas.pagination import CountStrategy
+
+BACKEND = Path(__file__).parent.parent
+BEFORE_PARTITIONING = "9a4c7e2f5b18"
+CHUNK = 10_000
+
+Query = Callable[[FichajeRepository], Awaitable[object]]
+
+
+def alembic(url: str, *args: str) -> float:
+    """Ejecuta Alembic sobre `url` y devuelve los segundos que tarda."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND,
+        env={**os.environ, "DATABASE_URL": url},
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+async def seed(maker: async_sessionmaker[AsyncSession], users: int, years: int) -> int:
+    """Crea los usuarios y sus fichajes de los últimos `years` años."""
+    rng = random.Random(42)
+    now = datetime.now(UTC)
+    today = now.date()
+    first = today.replace(year=today.year - years)
+    workdays = [
+        day
+        for day in (first + timedelta(days=n) for n in range((today - first).days))
+        if day.weekday() < 5  # noqa: PLR2004
+    ]
+    async with maker() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "email": f"partition{i}@stopcardio.com",
+                    "full_name": f"Partition {i}",
+                    "hashed_password": "!",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(users)
+            ],
+        )
+        ids = (await session.execute(select(User.id))).scalars().all()
+
+        rows = []
+        total = 0
+        for day in workdays:
+            base = datetime(day.year, day.month, day.day, tzinfo=UTC)
+            for user_id in ids:
+                check_in = base + timedelta(hours=7, minutes=rng.randrange(120))
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "check_in": check_in,
+                        "check_out": check_in + timedelta(hours=8, minutes=rng.randrange(60)),
+                        "status": FichajeStatus.VALID,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+            if len(rows) >= CHUNK:
+                await session.execute(insert(Fichaje), rows)
+                total += len(rows)
+                rows = []
+        if rows:
+            await session.execute(insert(Fichaje), rows)
+            total += len(rows)
+        await session.commit()
+        return total
+
+
+def queries(user_ids: list[int], max_id: int) -> dict[str, Query]:
+    """Consultas del repositorio a medir (mismos parámetros antes y después)."""
+    rng = random.Random(7)
+    today = datetime.now(UTC).date()
+    month = today.replace(day=1) - timedelta(days=1)
+    month_from, month_to = month.replace(day=1), month
+    year_from, year_to = date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+    now = datetime.now(UTC)
+
+    return {
+        "listado de un mes (pág. 50 + total)": lambda repo: repo.get_page(
+            limit=50, date_from=month_from, date_to=month_to, count_strategy=CountStrategy.EXACT
+        ),
+        "fichajes de un usuario en un mes": lambda repo: repo.get_all(
+            user_id=rng.choice(user_ids), date_from=month_from, date_to=month_to
+        ),
+        "horas de un usuario en un mes": lambda repo: repo.calculate_total_hours(
+            user_id=rng.choice(user_ids), date_from=month_from, date_to=month_to
+        ),
+        "conteo de un año": lambda repo: repo.count(date_from=year_from, date_to=year_to),
+        "últimos 50 sin filtros": lambda repo: repo.get_all(limit=50),
+        "fichaje por id": lambda repo: repo.get_by_id(rng.randint(1, max_id)),
+        "fichaje abierto de un usuario": lambda repo: repo.get_active_checkin(rng.choice(user_ids)),
+        "solapamiento de un usuario": lambda repo: repo.exists_overlap(
+            rng.choice(user_ids), now - timedelta(hours=2), now - timedelta(hours=1)
+        ),
+    }
+
+
+def _relations(plan: dict) -> set[str]:
+    """Tablas que lee un plan de EXPLAIN (FORMAT JSON)."""
+    found = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= _relations(child)
+    return found
+
+
+async def measure(
+    maker: async_sessionmaker[AsyncSession], named: dict[str, Query], repeat: int
+) -> tuple[dict[str, float], int]:
+    """Mediana en ms de cada consulta y particiones que lee el plan de un mes."""
+    medians = {}
+    async with maker() as session:
+        await session.execute(text("ANALYZE"))
+        repo = FichajeRepository(session)
+        for name, query in named.items():
+            await query(repo)  # calentamiento
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await query(repo)
+                times.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+            medians[name] = statistics.median(times)
+
+        month = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        previous = (month - timedelta(days=1)).replace(day=1)
+        statement = select(func.count(Fichaje.id)).where(
+            Fichaje.check_in >= previous, Fichaje.check_in < month
+        )
+        conn = await session.connection()
+        compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+    return medians, len(_relations(plan[0]["Plan"]))
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark del particionado de fichaje")
+    parser.add_argument(
+        "--database-url", required=True, help="PostgreSQL vacía y desechable (asyncpg)"
+    )
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios a crear")
+    parser.add_argument("--years", type=int, default=5, help="Años de fichajes")
+    parser.add_argument("--repeat", type=int, default=20, help="Ejecuciones por consulta")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    if engine.dialect.name != "postgresql":
+        sys.exit("❌ El particionado solo existe en PostgreSQL")
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        print(f"🗄️  Base de datos: {engine.url.render_as_string(hide_password=True)}")
+        alembic(args.database_url, "upgrade", BEFORE_PARTITIONING)
+
+        start = time.perf_counter()
+        rows = await seed(maker, args.users, args.years)
+        print(f"🌱 {rows} fichajes creados en {time.perf_counter() - start:.1f} s")
+
+        async with maker() as session:
+            user_ids = list((await session.execute(select(User.id))).scalars())
+            max_id = (await session.execute(select(func.max(Fichaje.id)))).scalar_one()
+        named = queries(user_ids, max_id)
+
+        before, before_relations = await measure(maker, named, args.repeat)
+        elapsed = alembic(args.database_url, "upgrade", "head")
+        print(f"🧩 Conversión a particiones mensuales: {elapsed:.1f} s")
+        # Mismos parámetros aleatorios en las dos mediciones
+        named = queries(user_ids, max_id)
+        after, after_relations = await measure(maker, named, args.repeat)
+
+        print(f"\n{'consulta (mediana, ms)':<40} {'antes':>9} {'después':>9}")
+        for name in named:
+            print(f"{name:<40} {before[name]:>9.2f} {after[name]:>9.2f}")
+        print(f"{'tablas leídas para un mes':<40} {before_relations:>9} {after_relations:>9}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
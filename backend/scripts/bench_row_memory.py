@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria por fila: entidades SQLModel vs filas ligeras.
+
+Ejecutar con: uv run python scripts/bench_row_memory.py --rows 10000
+
+Carga `--rows` fichajes de una base de datos SQLite en memoria (no necesita
+`DATABASE_URL`) y compara, con tracemalloc, la memoria retenida por fila y el
+tiempo de construcción de:
+
+- orm: entidades `Fichaje` con su `user` cargado (identity map e
+  instrumentación de SQLAlchemy)
+- row: `FichajeRow` (dataclass congelada con `__slots__`) construida desde las
+  filas de Core por `FichajeRepository.get_all`
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401 - registra todas las tablas en el metadata
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+
+
+async def seed(maker: async_sessionmaker[AsyncSession], rows: int) -> None:
+    """Crea las tablas, un usuario y sus fichajes."""
+    async with maker() as session:
+        conn = await session.connection()
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+        user = User(email="bench-rows@stopcardio.com", full_name="Bench Rows", hashed_password="!")
+        session.add(user)
+        await session.flush()
+
+        now = datetime.now(UTC)
+        await session.execute(
+            insert(Fichaje),
+            [
+                {
+                    "user_id": user.id,
+                    "check_in": now - timedelta(days=i, hours=8),
+                    "check_out": now - timedelta(days=i),
+                    "status": FichajeStatus.VALID,
+                    "notes": "Jornada completa",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+
+
+async def load_orm(session: AsyncSession, rows: int) -> list:
+    """Carga entidades ORM con su usuario."""
+    result = await session.execute(select(Fichaje).options(selectinload(Fichaje.user)).limit(rows))
+    return list(result.scalars().all())
+
+
+async def load_rows(session: AsyncSession, rows: int) -> list:
+    """Carga filas ligeras con la proyección del repositorio."""
+    return await FichajeRepository(session).get_all(limit=rows)
+
+
+MODES = {
+    "orm": load_orm,
+    "row": load_rows,
+}
+
+
+async def run_mode(mode: str, maker: async_sessionmaker[AsyncSession], rows: int) -> None:
+    """Mide memoria retenida y tiempo de construcción de un modo."""
+    loader = MODES[mode]
+
+    timings = []
+    for _ in range(5):
+        async with maker() as session:
+            start = time.perf_counter()
+            await loader(session, rows)
+            timings.append(time.perf_counter() - start)
+
+    async with maker() as session:
+        tracemalloc.start()
+        items = await loader(session, rows)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{mode:<4} {len(items):>7} filas  {min(timings) * 1000:>8.1f} ms  "
+        f"{retained / len(items):>7.0f} B/fila retenidos  {peak / 1024 / 1024:>6.1f} MiB pico"
+    )
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de memoria por fila")
+    parser.add_argument("--rows", type=int, default=10000, help="Fichajes a cargar")
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    try:
+        await seed(maker, args.rows)
+        for mode in MODES:
+            await run_mode(mode, maker, args.rows)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
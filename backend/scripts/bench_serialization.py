@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de listados de fichajes.
+
+Ejecutar con: uv run python scripts/bench_serialization.py --rows 100
+
+Compara, sobre páginas de fichajes construidas en memoria (sin base de datos):
+
+- legacy: `FichajeResponse` construido campo a campo, `field_serializer`
+  Python para cada datetime y `json.dumps` tras convertir a dict (camino por
+  defecto de FastAPI con `JSONResponse`)
+- fast: validación de la página completa desde los objetos ORM
+  (`from_attributes`) y serialización con pydantic-core
+  (`PydanticJSONResponse`)
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, datetime, timedelta
+
+from pydantic import BaseModel, ConfigDict, field_serializer
+
+from app.api.responses import PydanticJSONResponse
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.user import User
+from app.schemas.fichaje import FichajeListResponse
+
+
+class LegacyFichajeResponse(BaseModel):
+    """Copia del schema anterior, con `field_serializer` para los datetimes."""
+
+    id: int
+    user_id: int
+    user_email: str
+    user_full_name: str
+    check_in: datetime
+    check_out: datetime | None
+    hours_worked: float | None
+    status: FichajeStatus
+    notes: str | None
+    correction_reason: str | None
+    correction_requested_at: datetime | None
+    proposed_check_in: datetime | None
+    proposed_check_out: datetime | None
+    approved_by: int | None
+    approved_at: datetime | None
+    approval_notes: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_serializer(
+        "check_in",
+        "check_out",
+        "correction_requested_at",
+        "proposed_check_in",
+        "proposed_check_out",
+        "approved_at",
+        "created_at",
+        "updated_at",
+    )
+    def serialize_datetime(self, dt: datetime | None, _info) -> str | None:
+        """Serializa datetime a ISO 8601 con sufijo Z (UTC)."""
+        if dt is None:
+            return None
+        if dt.tzinfo is not None:
+            return dt.isoformat().replace("+00:00", "Z")
+        return f"{dt.isoformat()}Z"
+
+
+class LegacyFichajeListResponse(BaseModel):
+    """Copia del schema de listado anterior."""
+
+    fichajes: list[LegacyFichajeResponse]
+    total: int | None
+    has_more: bool
+    total_estimated: bool
+    page: int
+    page_size: int
+    total_hours: float
+
+
+def build_page(rows: int) -> list[Fichaje]:
+    """Construye una página de fichajes con todos los datetimes informados."""
+    user = User(id=1, email="bench@stopcardio.com", full_name="Bench User", hashed_password="!")
+    now = datetime.now(UTC).replace(tzinfo=None)
+    page = []
+    for i in range(rows):
+        check_in = now - timedelta(days=i, hours=8)
+        fichaje = Fichaje(
+            id=i + 1,
+            user_id=1,
+            check_in=check_in,
+            check_out=check_in + timedelta(hours=8),
+            status=FichajeStatus.VALID,
+            notes="Jornada completa",
+            correction_reason="Corrección de prueba para el benchmark",
+            correction_requested_at=check_in,
+            proposed_check_in=check_in,
+            proposed_check_out=check_in + timedelta(hours=8),
+            approved_by=1,
+            approved_at=check_in,
+            approval_notes="Aprobado",
+            created_at=check_in,
+            updated_at=check_in,
+        )
+        fichaje.user = user
+        page.append(fichaje)
+    return page
+
+
+def legacy_path(page: list[Fichaje]) -> bytes:
+    """Construcción manual + serializadores Python + json.dumps."""
+    items = [
+        LegacyFichajeResponse(
+            id=f.id,  # type: ignore
+            user_id=f.user_id,
+            user_email=f.user.email,
+            user_full_name=f.user.full_name,
+            check_in=f.check_in,
+            check_out=f.check_out,
+            hours_worked=f.hours_worked,
+            status=f.status,
+            notes=f.notes,
+            correction_reason=f.correction_reason,
+            correction_requested_at=f.correction_requested_at,
+            proposed_check_in=f.proposed_check_in,
+            proposed_check_out=f.proposed_check_out,
+            approved_by=f.approved_by,
+            approved_at=f.approved_at,
+            approval_notes=f.approval_notes,
+            created_at=f.created_at,  # type: ignore
+            updated_at=f.updated_at,  # type: ignore
+        )
+        for f in page
+    ]
+    response = LegacyFichajeListResponse(
+        fichajes=items,
+        total=len(page),
+        has_more=False,
+        total_estimated=False,
+        page=1,
+        page_size=len(page),
+        total_hours=0.0,
+    )
+    content = response.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(page: list[Fichaje]) -> bytes:
+    """Validación de la página desde atributos + serialización con pydantic-core."""
+    response = FichajeListResponse.model_validate(
+        {
+            "fichajes": page,
+            "total": len(page),
+            "has_more": False,
+            "total_estimated": False,
+            "page": 1,
+            "page_size": len(page),
+            "total_hours": 0.0,
+        },
+        from_attributes=True,
+    )
+    return PydanticJSONResponse(response).body
+
+
+def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--rows", type=int, default=100, help="Fichajes por página")
+    parser.add_argument("--repeat", type=int, default=200, help="Páginas serializadas por modo")
+    args = parser.parse_args()
+
+    page = build_page(args.rows)
+
+    # Ambos caminos deben producir el mismo JSON
+    assert json.loads(legacy_path(page)) == json.loads(fast_path(page))
+
+    print(f"📄 {args.rows} fichajes por página, {args.repeat} repeticiones")
+    results = {}
+    for name, fn in (("legacy", legacy_path), ("fast", fast_path)):
+        best = min(timeit.repeat(lambda fn=fn: fn(page), number=args.repeat, repeat=5))
+        results[name] = best / args.repeat * 1000
+        print(f"{name:<8} {results[name]:>8.3f} ms/página")
+
+    print(f"speedup  {results['legacy'] / results['fast']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de verificación de tokens JWT.
+
+Ejecutar con: uv run python scripts/bench_token_verification.py --tokens 1000
+
+Mide verificaciones por segundo con la configuración JWT actual
+(`ALGORITHM`, `SECRET_KEY` o `JWT_PRIVATE_KEY_FILE`) en tres modos:
+
+- legacy: `jwt.decode` con el secreto y la lista de algoritmos en cada llamada
+  (comportamiento anterior de `decode_token`; solo con algoritmos HMAC)
+- service: `TokenService.decode` sin caché (claves ya preparadas)
+- cached: `TokenService.decode` con la caché de tokens verificados, como
+  ocurre con las peticiones repetidas de un mismo cliente
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import timedelta
+
+import jwt
+
+from app.core.config import settings
+from app.core.tokens import TokenService
+
+
+def run(name: str, verify, tokens: list[str], rounds: int) -> None:
+    """Verifica `rounds` veces todos los tokens e imprime el throughput."""
+    for token in tokens:
+        verify(token)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            verify(token)
+    elapsed = time.perf_counter() - start
+
+    total = rounds * len(tokens)
+    print(f"{name:<8} {total / elapsed:>12,.0f} verif/s  {elapsed / total * 1e6:>8.2f} µs/verif")
+
+
+def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Micro-benchmark de verificación JWT")
+    parser.add_argument("--tokens", type=int, default=1000, help="Tokens distintos (usuarios)")
+    parser.add_argument("--rounds", type=int, default=20, help="Pasadas sobre todos los tokens")
+    args = parser.parse_args()
+
+    service = TokenService.from_settings(settings)
+    uncached = TokenService(service.signing_key, cache_ttl=0)
+    tokens = [
+        service.encode({"sub": str(user_id)}, timedelta(minutes=15))
+        for user_id in range(args.tokens)
+    ]
+
+    print(f"🔑 Algoritmo: {settings.algorithm}, {args.tokens} tokens x {args.rounds} pasadas")
+    if settings.algorithm.startswith("HS"):
+        run(
+            "legacy",
+            lambda t: jwt.decode(t, settings.secret_key, algorithms=[settings.algorithm]),
+            tokens,
+            args.rounds,
+        )
+    run("service", uncached.decode, tokens, args.rounds)
+    run("cached", service.decode, tokens, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
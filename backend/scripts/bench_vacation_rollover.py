@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark del cierre anual de vacaciones: lotes en bloque vs bucle por usuario.
+
+Ejecutar con: uv run python scripts/bench_vacation_rollover.py --users 100000
+
+Crea `--users` usuarios (con vacaciones aprobadas para enero del año
+siguiente en uno de cada diez) en una base de datos SQLite temporal (no toca
+`DATABASE_URL`; con `--database-url` se usa otra base de datos vacía) y mide:
+
+- naive: bucle ORM por usuario (cargar usuario, sumar sus solicitudes del año
+  siguiente, calcular, actualizar y escribir la traza), sobre los primeros
+  `--naive-users` usuarios y extrapolado al total
+- set-based: `VacationRolloverService.run`, que aplica cada lote con un
+  INSERT ... SELECT de la traza y un UPDATE ... FROM de los balances
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User
+from app.models.vacation_rollover import VacationRollover, VacationRolloverEntry
+from app.services.vacation_rollover_service import VacationRolloverService
+
+YEAR = datetime.now(UTC).year - 1
+MAX_CARRYOVER_DAYS = 5.0
+CHUNK = 10_000
+
+
+async def seed(maker: async_sessionmaker[AsyncSession], users: int) -> None:
+    """Crea las tablas, los usuarios y sus vacaciones del año siguiente."""
+    now = datetime.now(UTC)
+    async with maker() as session:
+        conn = await session.connection()
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+        for start in range(0, users, CHUNK):
+            await session.execute(
+                insert(User),
+                [
+                    {
+                        "email": f"rollover{i}@stopcardio.com",
+                        "full_name": f"Rollover {i}",
+                        "hashed_password": "!",
+                        "dias_vacaciones_anuales": 22,
+                        "dias_vacaciones_disponibles": float(i % 15 - 2),
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(start, min(start + CHUNK, users))
+                ],
+            )
+        ids = (await session.execute(select(User.id).order_by(User.id))).scalars().all()
+        for start in range(0, len(ids), CHUNK * 10):
+            await session.execute(
+                insert(Solicitud),
+                [
+                    {
+                        "user_id": user_id,
+                        "tipo": SolicitudTipo.VACATION,
+                        "fecha_inicio": date(YEAR + 1, 1, 10),
+                        "fecha_fin": date(YEAR + 1, 1, 12),
+                        "dias_solicitados": 3,
+                        "motivo": "Vacaciones de enero",
+                        "status": SolicitudStatus.APPROVED,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for user_id in ids[start : start + CHUNK * 10 : 10]
+                ],
+            )
+        await session.commit()
+
+
+async def naive(maker: async_sessionmaker[AsyncSession], users: int) -> None:
+    """Cierre usuario a usuario con el ORM."""
+    async with maker() as session:
+        rollover = VacationRollover(year=YEAR, max_carryover_days=MAX_CARRYOVER_DAYS)
+        session.add(rollover)
+        await session.flush()
+
+        result = await session.execute(select(User).order_by(User.id).limit(users))
+        for user in result.scalars().all():
+            future = (
+                await session.execute(
+                    select(func.coalesce(func.sum(Solicitud.dias_solicitados), 0)).where(
+                        Solicitud.user_id == user.id,
+                        Solicitud.tipo == SolicitudTipo.VACATION,
+                        Solicitud.status == SolicitudStatus.APPROVED,
+                        Solicitud.fecha_inicio >= date(YEAR + 1, 1, 1),
+                    )
+                )
+            ).scalar_one()
+            before = user.dias_vacaciones_disponibles
+            unused = before + future
+            carried = unused if unused < 0 else min(unused, MAX_CARRYOVER_DAYS)
+            after = user.dias_vacaciones_anuales + carried - future
+            session.add(
+                VacationRolloverEntry(
+                    rollover_id=rollover.id,  # type: ignore
+                    user_id=user.id,  # type: ignore
+                    balance_before=before,
+                    future_days=future,
+                    carried_over=carried,
+                    forfeited=unused - carried,
+                    balance_after=after,
+                )
+            )
+            user.dias_vacaciones_disponibles = after
+            await session.flush()
+        # Se descarta: el set-based se mide después sobre los mismos datos
+        await session.rollback()
+
+
+async def set_based(maker: async_sessionmaker[AsyncSession], batch_size: int) -> int:
+    """Cierre completo con el servicio (lotes en bloque)."""
+    async with maker() as session:
+        rollover = await VacationRolloverService(session).run(
+            YEAR, max_carryover_days=MAX_CARRYOVER_DAYS, batch_size=batch_size
+        )
+        return rollover.users_processed
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark del cierre anual de vacaciones")
+    parser.add_argument("--users", type=int, default=100_000, help="Usuarios a crear")
+    parser.add_argument(
+        "--naive-users", type=int, default=2000, help="Usuarios medidos en el bucle por usuario"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Usuarios por lote")
+    parser.add_argument("--database-url", help="Base de datos vacía (default: SQLite temporal)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'rollover.db'}"
+        engine = create_async_engine(url)
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            print(f"🗄️  Base de datos: {engine.url.render_as_string(hide_password=True)}")
+            start = time.perf_counter()
+            await seed(maker, args.users)
+            print(f"🌱 {args.users} usuarios creados en {time.perf_counter() - start:.1f} s")
+
+            naive_users = min(args.naive_users, args.users)
+            start = time.perf_counter()
+            await naive(maker, naive_users)
+            elapsed = time.perf_counter() - start
+            print(
+                f"naive      {naive_users:>8} usuarios  {elapsed:>7.2f} s  "
+                f"{naive_users / elapsed:>9.0f} usuarios/s  "
+                f"(~{elapsed / naive_users * args.users:.0f} s para {args.users})"
+            )
+
+            start = time.perf_counter()
+            processed = await set_based(maker, args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(
+                f"set-based  {processed:>8} usuarios  {elapsed:>7.2f} s  "
+                f"{processed / elapsed:>9.0f} usuarios/s"
+            )
+        finally:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput de escritura: commit por escritura vs unidad de trabajo.
+
+Ejecutar con: uv run python scripts/bench_write_throughput.py --requests 2000
+
+Simula peticiones de escritura (check-in + check-out de un fichaje) contra la
+base de datos configurada en `DATABASE_URL` (pensado para PostgreSQL) en dos
+modos:
+
+- per-write: commit tras cada escritura y otro al final de la petición
+  (comportamiento anterior de `FichajeRepository.create` + `get_session`)
+- unit-of-work: un único commit por petición (`UnitOfWork`)
+
+Los fichajes y el usuario creados se eliminan al terminar.
+
+⚠️ SOLO PARA DESARROLLO - NO EJECUTAR EN PRODUCCIÓN
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, event
+
+from app.database import AsyncSessionLocal, UnitOfWork, engine
+from app.models.fichaje import Fichaje
+from app.models.user import User, UserRole
+from app.repositories.fichaje_repository import FichajeRepository
+
+BENCH_EMAIL = "bench-writes@stopcardio.com"
+
+
+async def create_bench_user() -> int:
+    """Crea el usuario sobre el que se registran los fichajes."""
+    async with AsyncSessionLocal() as session, UnitOfWork(session):
+        user = User(
+            email=BENCH_EMAIL,
+            full_name="Benchmark Writes",
+            hashed_password="!",
+            role=UserRole.EMPLOYEE,
+        )
+        session.add(user)
+        await session.flush()
+        return user.id  # type: ignore
+
+
+async def cleanup(user_id: int) -> None:
+    """Elimina los fichajes y el usuario del benchmark."""
+    async with AsyncSessionLocal() as session, UnitOfWork(session):
+        await session.execute(delete(Fichaje).where(Fichaje.user_id == user_id))
+        await session.execute(delete(User).where(User.id == user_id))
+
+
+async def request_per_write(user_id: int) -> None:
+    """Petición con commit tras cada escritura y commit final."""
+    async with AsyncSessionLocal() as session:
+        repo = FichajeRepository(session)
+        fichaje = await repo.create(Fichaje(user_id=user_id, check_in=datetime.now(UTC)))
+        await session.commit()
+        fichaje.check_out = datetime.now(UTC)
+        await repo.update(fichaje)
+        await session.commit()
+        await session.commit()
+
+
+async def request_unit_of_work(user_id: int) -> None:
+    """Petición con un único commit gestionado por la unidad de trabajo."""
+    async with AsyncSessionLocal() as session, UnitOfWork(session):
+        repo = FichajeRepository(session)
+        fichaje = await repo.create(Fichaje(user_id=user_id, check_in=datetime.now(UTC)))
+        fichaje.check_out = datetime.now(UTC)
+        await repo.update(fichaje)
+
+
+MODES = {
+    "per-write": request_per_write,
+    "unit-of-work": request_unit_of_work,
+}
+
+
+async def run_mode(mode: str, user_id: int, requests: int, concurrency: int) -> None:
+    """Ejecuta `requests` peticiones con `concurrency` workers e imprime resultados."""
+    handler = MODES[mode]
+    commits = 0
+
+    def count_commit(_conn) -> None:
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine.sync_engine, "commit", count_commit)
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            await handler(user_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    event.remove(engine.sync_engine, "commit", count_commit)
+
+    print(
+        f"{mode:<14} {requests:>7} req  {elapsed:>8.2f}s  "
+        f"{requests / elapsed:>9.1f} req/s  {commits / requests:>5.2f} commits/req"
+    )
+
+
+async def main() -> None:
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de throughput de escritura")
+    parser.add_argument("--requests", type=int, default=1000, help="Peticiones por modo")
+    parser.add_argument("--concurrency", type=int, default=10, help="Peticiones concurrentes")
+    parser.add_argument(
+        "--mode", choices=[*MODES, "all"], default="all", help="Modo a medir (default: all)"
+    )
+    args = parser.parse_args()
+
+    print(f"🗄️  Base de datos: {engine.url.render_as_string(hide_password=True)}")
+    user_id = await create_bench_user()
+    try:
+        modes = list(MODES) if args.mode == "all" else [args.mode]
+        for mode in modes:
+            await run_mode(mode, user_id, args.requests, args.concurrency)
+    finally:
+        await cleanup(user_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
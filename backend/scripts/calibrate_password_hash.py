@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Calibración del coste de hashing de contraseñas.
+
+Ejecutar con: uv run python scripts/calibrate_password_hash.py --target-ms 250
+
+Mide en la máquina actual el tiempo de un hash con cada coste y propone el
+mayor que no supera `--target-ms` (la latencia que añade cada login):
+
+- bcrypt: prueba `BCRYPT_ROUNDS` desde 4 (cada ronda duplica el tiempo)
+- argon2: con `--memory-kib` y `--parallelism` fijos, prueba
+  `ARGON2_TIME_COST` desde 1 (requiere passlib[argon2])
+
+Imprime las variables de entorno a configurar. Los usuarios existentes se
+rehashean con el nuevo coste en su siguiente login.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from passlib.hash import argon2, bcrypt
+
+SAMPLE_PASSWORD = "calibration-password-123"
+
+
+def measure(hasher, samples: int) -> float:
+    """Mediana en milisegundos de `samples` hashes."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(make_hasher, costs: range, target_ms: float, samples: int) -> int | None:
+    """
+    Prueba costes crecientes hasta superar el objetivo.
+
+    Returns:
+        int | None: Mayor coste dentro del objetivo (None si ni el mínimo lo cumple)
+    """
+    best = None
+    for cost in costs:
+        elapsed = measure(make_hasher(cost), samples)
+        within = elapsed <= target_ms
+        print(f"  coste {cost:>2}: {elapsed:>8.1f} ms {'✅' if within else '❌'}")
+        if not within:
+            break
+        best = cost
+    return best
+
+
+def main() -> None:
+    """Función principal de la calibración."""
+    parser = argparse.ArgumentParser(description="Calibración del coste de hashing")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Latencia objetivo")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes por coste (mediana)")
+    parser.add_argument("--memory-kib", type=int, default=65536, help="Memoria de argon2id")
+    parser.add_argument("--parallelism", type=int, default=4, help="Hilos de argon2id")
+    args = parser.parse_args()
+
+    print(f"⏱️  Calibrando {args.scheme} para {args.target_ms:.0f} ms por hash")
+
+    if args.scheme == "bcrypt":
+        best = calibrate(
+            lambda cost: bcrypt.using(rounds=cost),
+            range(4, 32),
+            args.target_ms,
+            args.samples,
+        )
+        env = {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": best}
+    else:
+        if not argon2.has_backend():
+            print("❌ argon2 no disponible: instala passlib[argon2]")
+            sys.exit(1)
+        best = calibrate(
+            lambda cost: argon2.using(
+                type="ID",
+                rounds=cost,
+                memory_cost=args.memory_kib,
+                parallelism=args.parallelism,
+            ),
+            range(1, 64),
+            args.target_ms,
+            args.samples,
+        )
+        env = {
+            "PASSWORD_HASH_SCHEME": "argon2",
+            "ARGON2_TIME_COST": best,
+            "ARGON2_MEMORY_COST": args.memory_kib,
+            "ARGON2_PARALLELISM": args.parallelism,
+        }
+
+    if best is None:
+        print("❌ Ni el coste mínimo cumple el objetivo: sube --target-ms o baja la memoria")
+        sys.exit(1)
+
+    print("\n📝 Configuración recomendada:")
+    for name, value in env.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de login: credential stuffing con y sin limitador.
+
+Ejecutar con: uv run python scripts/load_test_login.py --attempts 2000 --ips 5 --rounds 8
+
+Levanta la aplicación en el propio proceso (ASGI, sin red) sobre una base de
+datos SQLite en memoria (no necesita `DATABASE_URL`) con `--users` usuarios y
+lanza `--attempts` logins con contraseñas incorrectas repartidos entre
+`--ips` IPs atacantes. Repite el ataque sin limitador y con él, e imprime:
+
+- respuestas por código HTTP
+- verificaciones de contraseña realizadas (bcrypt/argon2)
+- CPU del proceso y núcleos usados de media (CPU / tiempo real)
+
+Con el limitador, las verificaciones quedan acotadas por las ráfagas de los
+buckets (más lo recargado mientras dura el ataque) y el CPU deja de crecer
+con el número de intentos. `--rounds` baja el coste de bcrypt para que el
+ataque dure segundos y la recarga de los buckets no enmascare el efecto.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from app.core import security
+from app.core.config import settings
+from app.core.rate_limit import login_rate_limiter
+from app.core.security import build_password_context, get_password_hash
+from app.database import get_session
+from app.main import app
+from app.models.user import User
+from app.services import user_service
+
+
+async def seed(maker: async_sessionmaker[AsyncSession], users: int) -> list[str]:
+    """Crea las tablas y los usuarios atacados."""
+    hashed = get_password_hash("real-password-123")
+    async with maker() as session:
+        conn = await session.connection()
+        await conn.run_sync(SQLModel.metadata.create_all)
+        emails = [f"victim{i}@stopcardio.com" for i in range(users)]
+        session.add_all(
+            User(email=email, full_name=f"Victim {i}", hashed_password=hashed)
+            for i, email in enumerate(emails)
+        )
+        await session.commit()
+    return emails
+
+
+async def attack(emails: list[str], attempts: int, ips: int, concurrency: int) -> Counter:
+    """Lanza los intentos de login y cuenta las respuestas por código."""
+    clients = [
+        AsyncClient(
+            transport=ASGITransport(app=app, client=(f"203.0.113.{i + 1}", 40000)),
+            base_url="http://load-test",
+        )
+        for i in range(ips)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: Counter = Counter()
+
+    async def attempt(n: int) -> None:
+        async with semaphore:
+            response = await clients[n % ips].post(
+                "/api/auth/login",
+                json={"email": emails[n % len(emails)], "password": f"guess-{n}"},
+            )
+            statuses[response.status_code] += 1
+
+    try:
+        await asyncio.gather(*(attempt(n) for n in range(attempts)))
+    finally:
+        for client in clients:
+            await client.aclose()
+    return statuses
+
+
+async def run(name: str, emails: list[str], args: argparse.Namespace, verifications: list) -> None:
+    """Ejecuta un ataque y muestra sus métricas."""
+    login_rate_limiter.reset()
+    verifications.clear()
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    statuses = await attack(emails, args.attempts, args.ips, args.concurrency)
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+    codes = "  ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+    print(
+        f"{name:<14} {codes:<22} verificaciones: {len(verifications):>5}  "
+        f"CPU: {cpu:>6.2f} s  real: {wall:>6.2f} s  núcleos: {cpu / wall:>4.2f}"
+    )
+
+
+async def main() -> None:
+    """Función principal de la prueba de carga."""
+    parser = argparse.ArgumentParser(description="Prueba de carga de login")
+    parser.add_argument("--attempts", type=int, default=2000, help="Intentos de login")
+    parser.add_argument("--ips", type=int, default=5, help="IPs atacantes")
+    parser.add_argument("--users", type=int, default=50, help="Cuentas atacadas")
+    parser.add_argument("--concurrency", type=int, default=100, help="Peticiones simultáneas")
+    parser.add_argument(
+        "--rounds", type=int, default=settings.bcrypt_rounds, help="Coste de bcrypt"
+    )
+    args = parser.parse_args()
+
+    security.pwd_context = build_password_context(
+        settings.model_copy(update={"bcrypt_rounds": args.rounds})
+    )
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def override_get_session():
+        async with maker() as session:
+            yield session
+
+    verifications: list = []
+    original_verify = user_service.verify_and_update_password_async
+
+    async def counting_verify(plain_password: str, hashed_password: str):
+        verifications.append(None)
+        return await original_verify(plain_password, hashed_password)
+
+    app.dependency_overrides[get_session] = override_get_session
+    user_service.verify_and_update_password_async = counting_verify
+    try:
+        emails = await seed(maker, args.users)
+        print(
+            f"🔐 {args.attempts} intentos desde {args.ips} IPs contra {args.users} cuentas "
+            f"(concurrencia {args.concurrency}, bcrypt coste {args.rounds})"
+        )
+
+        login_rate_limiter.enabled = False
+        await run("sin limitador", emails, args, verifications)
+        login_rate_limiter.enabled = True
+        await run("con limitador", emails, args, verifications)
+    finally:
+        user_service.verify_and_update_password_async = original_verify
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Runner de trabajos en segundo plano como proceso independiente.
+
+Ejecutar con: uv run python scripts/run_jobs.py --concurrency 4
+
+Reclama y ejecuta los trabajos de la tabla `job` de `DATABASE_URL` hasta
+recibir Ctrl+C o SIGTERM; al pararse espera a los trabajos en marcha y
+devuelve a la cola los que no terminan a tiempo. Con `--once` ejecuta los
+trabajos pendientes que ya se pueden ejecutar y termina (útil desde cron).
+
+Se pueden lanzar varios procesos a la vez, también junto al runner de la
+API: cada trabajo lo reclama un único worker.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar módulos de la app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.database import engine
+from app.jobs import JobRunner, job_registry
+
+
+async def main() -> None:
+    """Función principal del runner."""
+    parser = argparse.ArgumentParser(description="Runner de trabajos en segundo plano")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.jobs_concurrency, help="Trabajos a la vez"
+    )
+    parser.add_argument("--once", action="store_true", help="Ejecutar lo pendiente y terminar")
+    args = parser.parse_args()
+
+    runner = JobRunner.from_settings(settings, concurrency=args.concurrency)
+    kinds = ", ".join(definition.kind for definition in job_registry.definitions())
+    print(f"⚙️  Runner {runner.worker_id} (concurrencia {args.concurrency})")
+    print(f"   Tipos registrados: {kinds}")
+
+    try:
+        if args.once:
+            executed = await runner.run_pending()
+            print(f"✅ {executed} trabajos ejecutados")
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        runner.start()
+        await stop.wait()
+        print("🛑 Parando el runner...")
+        await runner.stop()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,12 +1,19 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+import os
 from collections.abc import AsyncGenerator
+from pathlib import Path
 from typing import Any
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlmodel import SQLModel
 
 from app.api.dependencies.auth import (
@@ -14,6 +21,7 @@ from app.api.dependencies.auth import (
     get_current_hr,
     get_current_user,
 )
+from app.core.rate_limit import login_rate_limiter
 from app.core.security import create_access_token, get_password_hash
 from app.database import get_session
 from app.main import app
@@ -58,6 +66,63 @@ async def setup_database():
         await conn.run_sync(SQLModel.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def reset_login_rate_limiter():
+    """Start every test with empty login rate-limit buckets."""
+    login_rate_limiter.reset()
+    yield
+    login_rate_limiter.reset()
+
+
+@pytest.fixture
+def db_engine() -> AsyncEngine:
+    """Provide the test database engine."""
+    return test_engine
+
+
+@pytest.fixture
+async def file_session_maker(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession]]:
+    """
+    Session factory over a file database.
+
+    For code that opens several sessions at once (e.g. the job runner), which
+    the shared in-memory connection cannot isolate.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+async def concurrent_session_maker(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> AsyncGenerator[async_sessionmaker[AsyncSession]]:
+    """
+    Session factory for concurrency tests, over SQLite and PostgreSQL.
+
+    The PostgreSQL run needs TEST_POSTGRES_URL pointing to a disposable
+    database (its tables are dropped); without it, it is skipped.
+    """
+    if request.param == "postgresql":
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+        pytest.importorskip("asyncpg")
+    else:
+        url = f"sqlite+aiosqlite:///{tmp_path / 'concurrency.db'}"
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+
 @pytest.fixture
 async def session() -> AsyncGenerator[AsyncSession]:
     """Provide a test database session."""
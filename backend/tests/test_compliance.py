@@ -0,0 +1,280 @@
+"""Tests for the working-time and rest compliance checks."""
+
+from datetime import UTC, date, datetime, timedelta
+
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings
+from app.jobs import JobRunner, job_registry
+from app.models.fichaje import Fichaje
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.schemas.compliance import ComplianceRule
+from app.services.compliance_service import (
+    ComplianceLimits,
+    check_compliance,
+    compliance_window,
+)
+from app.services.job_service import JobService
+
+LIMITS = ComplianceLimits(max_daily_hours=9, max_weekly_hours=40, min_rest_hours=12)
+
+# Semana de lunes 2 a domingo 8 de marzo de 2026
+MONDAY = date(2026, 3, 2)
+
+
+def _at(day: int, hour: float) -> float:
+    """Epoch seconds for a day of the test week (0 = Monday) and hour (UTC)."""
+    moment = datetime(MONDAY.year, MONDAY.month, MONDAY.day, tzinfo=UTC)
+    return (moment + timedelta(days=day, hours=hour)).timestamp()
+
+
+def _check(shifts: list[tuple[int, int, float, float]], date_from=MONDAY, date_to=MONDAY):
+    """Run the engine on (user, day, start hour, end hour) shifts."""
+    shifts = sorted(shifts, key=lambda s: (s[0], _at(s[1], s[2])))
+    return check_compliance(
+        [user for user, *_ in shifts],
+        [_at(day, start) for _, day, start, _ in shifts],
+        [_at(day, end) for _, day, _, end in shifts],
+        LIMITS,
+        date_from,
+        date_to,
+    )
+
+
+def _fichaje(user: User, day: int, start: float, end: float) -> Fichaje:
+    return Fichaje(
+        user_id=user.id,
+        check_in=datetime.fromtimestamp(_at(day, start), UTC),
+        check_out=datetime.fromtimestamp(_at(day, end), UTC),
+    )
+
+
+async def _seed(session: AsyncSession, employee: User, hr: User) -> None:
+    """Employee: a 10-hour Monday and a short rest; HR: a clean week."""
+    session.add_all(
+        [
+            _fichaje(employee, 0, 8, 13),
+            _fichaje(employee, 0, 14, 19),  # 10 h el lunes
+            _fichaje(employee, 1, 5, 15),  # 10 h de descanso desde el lunes y 10 h el martes
+            _fichaje(hr, 0, 9, 17),
+            _fichaje(hr, 1, 9, 17),
+        ]
+    )
+    await session.commit()
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+
+class TestCheckCompliance:
+    """Tests for the single-pass engine over columnar intervals."""
+
+    def test_daily_hours_add_up_split_shifts(self):
+        """Split shifts on the same day are summed against the daily limit."""
+        check = _check([(1, 0, 8, 13), (1, 0, 14, 18.5)])
+
+        assert [(v.rule, v.fecha, v.hours) for v in check.violations] == [
+            (ComplianceRule.DAILY_HOURS, MONDAY, 9.5)
+        ]
+        assert check.intervals == 2  # noqa: PLR2004
+        assert check.users == 1
+
+    def test_shift_counts_on_check_in_day(self):
+        """A night shift crossing midnight counts on the day it started."""
+        check = _check([(1, 0, 20, 30)], date_to=MONDAY + timedelta(days=1))
+
+        assert [(v.rule, v.fecha) for v in check.violations] == [
+            (ComplianceRule.DAILY_HOURS, MONDAY)
+        ]
+
+    def test_weekly_total(self):
+        """Five 8.5-hour days exceed 40 hours; reported on the week's Monday."""
+        shifts = [(1, day, 8, 16.5) for day in range(5)]
+
+        check = _check(
+            shifts, date_from=MONDAY + timedelta(days=4), date_to=MONDAY + timedelta(days=4)
+        )
+
+        assert [(v.rule, v.fecha, v.hours) for v in check.violations] == [
+            (ComplianceRule.WEEKLY_HOURS, MONDAY, 42.5)
+        ]
+
+    def test_min_rest_between_days(self):
+        """Rest is measured from the last check-out to the next day's first check-in."""
+        check = _check(
+            [(1, 0, 8, 12), (1, 0, 15, 20), (1, 1, 7, 12), (2, 0, 8, 16), (2, 1, 8, 16)],
+            date_to=MONDAY + timedelta(days=1),
+        )
+
+        assert [(v.user_id, v.rule, v.fecha, v.hours) for v in check.violations] == [
+            (1, ComplianceRule.MIN_REST, MONDAY + timedelta(days=1), 11.0)
+        ]
+        assert check.users == 2  # noqa: PLR2004
+
+    def test_violations_outside_range_are_not_reported(self):
+        """Days outside the range only feed the weekly total and the first rest."""
+        tuesday = MONDAY + timedelta(days=1)
+        check = _check([(1, 0, 8, 20), (1, 1, 6, 10)], date_from=tuesday, date_to=tuesday)
+
+        assert [(v.rule, v.fecha) for v in check.violations] == [(ComplianceRule.MIN_REST, tuesday)]
+
+    def test_empty(self):
+        """No intervals, no violations."""
+        check = check_compliance([], [], [], LIMITS, MONDAY, MONDAY)
+
+        assert check.violations == []
+        assert check.users == 0
+
+    def test_window_covers_full_weeks(self):
+        """The window starts the Sunday before the first Monday and ends on a Monday."""
+        start, end = compliance_window(MONDAY + timedelta(days=2), MONDAY + timedelta(days=9))
+
+        assert start == datetime(2026, 3, 1, tzinfo=UTC)
+        assert end == datetime(2026, 3, 16, tzinfo=UTC)
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+
+class TestComplianceReport:
+    """Tests for GET /api/fichajes/compliance."""
+
+    async def test_report(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        hr_user: User,
+    ):
+        """HR gets the violations with user names and totals per rule."""
+        await _seed(session, employee_user, hr_user)
+
+        response = await hr_authenticated_client.get(
+            "/api/fichajes/compliance",
+            params={"date_from": "2026-03-02", "date_to": "2026-03-08"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["intervals"] == 5  # noqa: PLR2004
+        assert data["users_checked"] == 2  # noqa: PLR2004
+        assert data["totals"] == {"daily_hours": 2, "weekly_hours": 0, "min_rest": 1}
+        assert [(v["rule"], v["fecha"], v["hours"]) for v in data["violations"]] == [
+            ("daily_hours", "2026-03-02", 10.0),
+            ("min_rest", "2026-03-03", 10.0),
+            ("daily_hours", "2026-03-03", 10.0),
+        ]
+        assert {v["user_full_name"] for v in data["violations"]} == {employee_user.full_name}
+        assert data["max_daily_hours"] == LIMITS.max_daily_hours
+
+    async def test_report_single_user(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        hr_user: User,
+    ):
+        """The user filter only reads that user's fichajes."""
+        await _seed(session, employee_user, hr_user)
+
+        response = await hr_authenticated_client.get(
+            "/api/fichajes/compliance",
+            params={"date_from": "2026-03-02", "date_to": "2026-03-08", "user_id": hr_user.id},
+        )
+
+        data = response.json()
+        assert data["intervals"] == 2  # noqa: PLR2004
+        assert data["violations"] == []
+
+    async def test_invalid_range(self, hr_authenticated_client: AsyncClient):
+        """Reversed ranges and ranges over 366 days are rejected."""
+        reversed_range = await hr_authenticated_client.get(
+            "/api/fichajes/compliance", params={"date_from": "2026-03-02", "date_to": "2026-03-01"}
+        )
+        too_long = await hr_authenticated_client.get(
+            "/api/fichajes/compliance", params={"date_from": "2026-01-01", "date_to": "2027-01-02"}
+        )
+
+        assert reversed_range.status_code == status.HTTP_400_BAD_REQUEST
+        assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_employee_forbidden(self, authenticated_client: AsyncClient):
+        """Employees cannot see the compliance report."""
+        response = await authenticated_client.get(
+            "/api/fichajes/compliance", params={"date_from": "2026-03-02", "date_to": "2026-03-08"}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+# ============================================================================
+# JOB
+# ============================================================================
+
+
+class TestComplianceJob:
+    """Tests for the fichajes.compliance background job."""
+
+    async def test_job_checks_users_in_batches(
+        self, file_session_maker: async_sessionmaker[AsyncSession]
+    ):
+        """The job walks the users in batches and stores totals and violations."""
+        async with file_session_maker() as session:
+            employee = User(email="night@test.com", full_name="Night", hashed_password="x")
+            hr = User(email="day@test.com", full_name="Day", hashed_password="x")
+            session.add_all([employee, hr])
+            await session.flush()
+            await _seed(session, employee, hr)
+            await JobService(session).enqueue(
+                "fichajes.compliance",
+                payload={"date_from": "2026-03-02", "date_to": "2026-03-08", "batch_users": 1},
+            )
+            await session.commit()
+
+        await JobRunner(file_session_maker, job_registry, concurrency=1).run_pending()
+
+        async with file_session_maker() as session:
+            job = (await session.execute(select(Job))).scalar_one()
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.progress == 1.0
+        assert job.result is not None
+        assert job.result["users_checked"] == 2  # noqa: PLR2004
+        assert job.result["users_with_violations"] == 1
+        assert job.result["totals"] == {"daily_hours": 2, "weekly_hours": 0, "min_rest": 1}
+        assert len(job.result["violations"]) == 3  # noqa: PLR2004
+        assert job.result["truncated"] is False
+
+    async def test_job_defaults_to_previous_week(
+        self, file_session_maker: async_sessionmaker[AsyncSession]
+    ):
+        """Without dates (periodic runs) the job checks the previous ISO week."""
+        async with file_session_maker() as session:
+            await JobService(session).enqueue("fichajes.compliance")
+            await session.commit()
+
+        await JobRunner(file_session_maker, job_registry, concurrency=1).run_pending()
+
+        async with file_session_maker() as session:
+            job = (await session.execute(select(Job))).scalar_one()
+        today = datetime.now(UTC).date()
+        last_sunday = today - timedelta(days=today.weekday() + 1)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result is not None
+        assert job.result["date_from"] == (last_sunday - timedelta(days=6)).isoformat()
+        assert job.result["date_to"] == last_sunday.isoformat()
+        assert job.result["users_checked"] == 0
+
+    def test_schedule_from_settings(self):
+        """A positive interval schedules the job; 0 (default) leaves it off."""
+        runner = JobRunner.from_settings(Settings(compliance_check_interval_seconds=604800))
+        assert runner.schedules["fichajes.compliance"] == 604800  # noqa: PLR2004
+
+        assert "fichajes.compliance" not in JobRunner.from_settings(Settings()).schedules
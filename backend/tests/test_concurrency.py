@@ -0,0 +1,501 @@
+"""Concurrency tests for write flows, against SQLite and (optionally) PostgreSQL."""
+
+import asyncio
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import AppException, ConflictException
+from app.jobs import JobRunner, job_registry
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.job import Job
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User, UserRole
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.fichaje import FichajeApproval
+from app.schemas.solicitud import (
+    SolicitudBulkReview,
+    SolicitudBulkReviewItem,
+    SolicitudReview,
+    SolicitudUpdate,
+)
+from app.services.fichaje_service import FichajeService
+from app.services.solicitud_service import SolicitudService
+
+Maker = async_sessionmaker[AsyncSession]
+
+
+async def _create_users(maker: Maker, reviewers: int) -> tuple[int, list[User]]:
+    """Create an employee with 22 days and `reviewers` HR users."""
+    async with maker() as session:
+        employee = User(
+            email="employee@test.com",
+            full_name="Employee",
+            hashed_password="!",
+            dias_vacaciones_disponibles=22,
+        )
+        hrs = [
+            User(
+                email=f"hr{i}@test.com",
+                full_name=f"HR {i}",
+                hashed_password="!",
+                role=UserRole.HR,
+            )
+            for i in range(reviewers)
+        ]
+        session.add_all([employee, *hrs])
+        await session.commit()
+        return employee.id, hrs  # type: ignore
+
+
+async def _create_solicitudes(maker: Maker, user_id: int, count: int, dias: int) -> list[int]:
+    """Create `count` pending vacation requests of `dias` days each."""
+    start = datetime.now(UTC).date() + timedelta(days=30)
+    async with maker() as session:
+        solicitudes = [
+            Solicitud(
+                user_id=user_id,
+                tipo=SolicitudTipo.VACATION,
+                fecha_inicio=start + timedelta(days=7 * i),
+                fecha_fin=start + timedelta(days=7 * i + dias - 1),
+                dias_solicitados=dias,
+                motivo="Vacaciones planificadas",
+            )
+            for i in range(count)
+        ]
+        session.add_all(solicitudes)
+        await session.commit()
+        return [s.id for s in solicitudes]  # type: ignore
+
+
+async def _approve(maker: Maker, solicitud_id: int, reviewer: User, approved: bool = True) -> bool:
+    """Review a request in its own transaction; False if the review was rejected."""
+    async with maker() as session:
+        try:
+            await SolicitudService(session).review_solicitud(
+                solicitud_id, reviewer, SolicitudReview(approved=approved)
+            )
+            await session.commit()
+        except (AppException, HTTPException):
+            await session.rollback()
+            return False
+        return True
+
+
+async def _balance(maker: Maker, user_id: int) -> float:
+    """Current vacation balance of a user."""
+    async with maker() as session:
+        user = await session.get(User, user_id)
+        return user.dias_vacaciones_disponibles  # type: ignore
+
+
+# ============================================================================
+# APROBACIÓN DE SOLICITUDES
+# ============================================================================
+
+
+class TestConcurrentApprovals:
+    """Parallel approvals must neither lose nor duplicate balance decrements."""
+
+    async def test_parallel_approvals_keep_every_decrement(self, concurrent_session_maker: Maker):
+        """Approving several requests of one user at once subtracts all of them."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=8)
+        solicitudes = await _create_solicitudes(maker, user_id, count=8, dias=2)
+
+        results = await asyncio.gather(
+            *(
+                _approve(maker, solicitud_id, reviewer)
+                for solicitud_id, reviewer in zip(solicitudes, reviewers, strict=True)
+            )
+        )
+
+        assert all(results)
+        assert await _balance(maker, user_id) == 22 - 8 * 2
+
+    async def test_parallel_reviews_of_same_request_apply_once(
+        self, concurrent_session_maker: Maker
+    ):
+        """Only one of several reviewers racing on the same request succeeds."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=6)
+        (solicitud_id,) = await _create_solicitudes(maker, user_id, count=1, dias=5)
+
+        results = await asyncio.gather(
+            *(_approve(maker, solicitud_id, reviewer) for reviewer in reviewers)
+        )
+
+        assert results.count(True) == 1
+        assert await _balance(maker, user_id) == 22 - 5
+        async with maker() as session:
+            solicitud = await session.get(Solicitud, solicitud_id)
+            assert solicitud is not None
+            assert solicitud.status == SolicitudStatus.APPROVED
+
+    async def test_overlapping_bulk_reviews_apply_each_request_once(
+        self, concurrent_session_maker: Maker
+    ):
+        """Bulk reviews racing over the same requests approve and decrement each once."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=4)
+        solicitudes = await _create_solicitudes(maker, user_id, count=6, dias=2)
+
+        async def bulk(reviewer: User) -> int:
+            async with maker() as session:
+                data = SolicitudBulkReview(
+                    items=[
+                        SolicitudBulkReviewItem(solicitud_id=solicitud_id, approved=True)
+                        for solicitud_id in random.sample(solicitudes, len(solicitudes))
+                    ]
+                )
+                result = await SolicitudService(session).review_many(reviewer, data)
+                await session.commit()
+                return result.approved
+
+        approved = await asyncio.gather(*(bulk(reviewer) for reviewer in reviewers))
+
+        assert sum(approved) == len(solicitudes)
+        assert await _balance(maker, user_id) == 22 - 6 * 2
+
+
+# ============================================================================
+# CONTROL DE CONCURRENCIA OPTIMISTA (VERSIONES)
+# ============================================================================
+
+
+@pytest.fixture
+async def pending_solicitud(session: AsyncSession, employee_user: User) -> Solicitud:
+    """A pending vacation request of the employee."""
+    start = datetime.now(UTC).date() + timedelta(days=30)
+    solicitud = Solicitud(
+        user_id=employee_user.id,  # type: ignore
+        tipo=SolicitudTipo.VACATION,
+        fecha_inicio=start,
+        fecha_fin=start + timedelta(days=2),
+        dias_solicitados=3,
+        motivo="Vacaciones planificadas",
+    )
+    session.add(solicitud)
+    await session.commit()
+    return solicitud
+
+
+@pytest.fixture
+async def pending_correction(session: AsyncSession, employee_user: User) -> Fichaje:
+    """A fichaje of the employee with a pending correction."""
+    check_in = datetime.now(UTC) - timedelta(days=1, hours=8)
+    fichaje = Fichaje(
+        user_id=employee_user.id,  # type: ignore
+        check_in=check_in,
+        check_out=check_in + timedelta(hours=8),
+        status=FichajeStatus.PENDING_CORRECTION,
+        correction_reason="Olvidé fichar a la hora correcta",
+        proposed_check_in=check_in - timedelta(minutes=30),
+    )
+    session.add(fichaje)
+    await session.commit()
+    return fichaje
+
+
+class TestVersionPreconditions:
+    """Tests for the version column and the If-Match precondition."""
+
+    async def test_get_exposes_version_as_etag(
+        self, authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """Reads return the version in the body and as ETag."""
+        response = await authenticated_client.get(f"/api/vacaciones/{pending_solicitud.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["version"] == 1
+        assert response.headers["ETag"] == '"1"'
+
+    async def test_update_with_current_version(
+        self, authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """A matching If-Match applies the change and bumps the version."""
+        response = await authenticated_client.put(
+            f"/api/vacaciones/{pending_solicitud.id}",
+            json={"motivo": "Vacaciones familiares en la costa"},
+            headers={"If-Match": '"1"'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["version"] == 2  # noqa: PLR2004
+        assert response.headers["ETag"] == '"2"'
+
+    async def test_update_with_stale_version(
+        self, authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """A stale If-Match returns 409 and changes nothing."""
+        response = await authenticated_client.put(
+            f"/api/vacaciones/{pending_solicitud.id}",
+            json={"motivo": "Vacaciones familiares en la costa"},
+            headers={"If-Match": 'W/"7"'},
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json()["error_details"] == {"current_version": 1, "expected_version": 7}
+
+    async def test_cancel_with_stale_version(
+        self, authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """Cancelling also honours If-Match."""
+        response = await authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/cancel", headers={"If-Match": "2"}
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    async def test_invalid_if_match(
+        self, authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """An If-Match that is not a version is rejected with 400."""
+        response = await authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/cancel", headers={"If-Match": '"abc"'}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_review_with_stale_version(
+        self,
+        hr_authenticated_client: AsyncClient,
+        pending_solicitud: Solicitud,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """A review against a stale version returns 409 and leaves the balance intact."""
+        before = employee_user.dias_vacaciones_disponibles
+
+        response = await hr_authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/review",
+            json={"approved": True},
+            headers={"If-Match": '"2"'},
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        await session.refresh(employee_user)
+        assert employee_user.dias_vacaciones_disponibles == before
+
+    async def test_review_bumps_version(
+        self, hr_authenticated_client: AsyncClient, pending_solicitud: Solicitud
+    ):
+        """The conditional review UPDATE increments the version like the ORM."""
+        response = await hr_authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/review",
+            json={"approved": True},
+            headers={"If-Match": '"1"'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["version"] == 2  # noqa: PLR2004
+        assert response.headers["ETag"] == '"2"'
+
+    async def test_approve_correction_with_stale_version(
+        self, hr_authenticated_client: AsyncClient, pending_correction: Fichaje
+    ):
+        """Fichaje corrections honour If-Match too."""
+        url = f"/api/fichajes/{pending_correction.id}/approve"
+
+        response = await hr_authenticated_client.post(
+            url, json={"approved": True}, headers={"If-Match": '"3"'}
+        )
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        response = await hr_authenticated_client.post(
+            url, json={"approved": True}, headers={"If-Match": '"1"'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["version"] == 2  # noqa: PLR2004
+
+    async def test_stale_write_conflicts(self, concurrent_session_maker: Maker):
+        """A write over a row changed by another transaction raises ConflictException."""
+        maker = concurrent_session_maker
+        user_id, _ = await _create_users(maker, reviewers=1)
+        async with maker() as session:
+            fichaje = Fichaje(
+                user_id=user_id,
+                check_in=datetime.now(UTC) - timedelta(hours=8),
+                status=FichajeStatus.PENDING_CORRECTION,
+            )
+            session.add(fichaje)
+            await session.commit()
+
+        async with maker() as first, maker() as second:
+            mine = await first.get(Fichaje, fichaje.id)
+            theirs = await second.get(Fichaje, fichaje.id)
+            assert mine is not None
+            assert theirs is not None
+
+            theirs.notes = "Revisado"
+            await second.commit()
+
+            mine.notes = "Revisado también"
+            with pytest.raises(ConflictException):
+                await FichajeRepository(first).update(mine)
+
+
+class TestConcurrentReviewersStress:
+    """Many reviewers racing on the same rows: every row changes exactly once."""
+
+    async def test_many_reviewers_on_many_requests(self, concurrent_session_maker: Maker):
+        """Each request is reviewed once and the balance matches the approved days."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=10)
+        solicitudes = await _create_solicitudes(maker, user_id, count=5, dias=2)
+        rng = random.Random(42)
+
+        attempts = [
+            _approve(maker, solicitud_id, reviewer, approved=rng.random() < 0.7)  # noqa: PLR2004
+            for solicitud_id in solicitudes
+            for reviewer in reviewers
+        ]
+        rng.shuffle(attempts)
+        results = await asyncio.gather(*attempts)
+
+        assert results.count(True) == len(solicitudes)
+        async with maker() as session:
+            rows = (
+                (await session.execute(select(Solicitud).where(Solicitud.user_id == user_id)))
+                .scalars()
+                .all()
+            )
+            assert all(s.version == 2 for s in rows)  # noqa: PLR2004
+            approved = sum(s.dias_solicitados for s in rows if s.is_approved)
+        assert await _balance(maker, user_id) == 22 - approved
+
+    async def test_reviewers_racing_with_requester_edits(self, concurrent_session_maker: Maker):
+        """Edits and reviews interleave, but the balance matches the final approved days."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=6)
+        (solicitud_id,) = await _create_solicitudes(maker, user_id, count=1, dias=2)
+        async with maker() as session:
+            employee = await UserRepository(session).get_by_id(user_id)
+        assert employee is not None
+
+        async def edit(extra_days: int) -> bool:
+            async with maker() as session:
+                try:
+                    current = await session.get(Solicitud, solicitud_id)
+                    assert current is not None
+                    await SolicitudService(session).update_solicitud(
+                        solicitud_id,
+                        employee,
+                        SolicitudUpdate(fecha_fin=current.fecha_inicio + timedelta(extra_days)),
+                        expected_version=current.version,
+                    )
+                    await session.commit()
+                except (AppException, HTTPException):
+                    await session.rollback()
+                    return False
+                return True
+
+        await asyncio.gather(
+            *(edit(days) for days in range(1, 5)),
+            *(_approve(maker, solicitud_id, reviewer) for reviewer in reviewers),
+        )
+
+        async with maker() as session:
+            solicitud = await session.get(Solicitud, solicitud_id)
+            assert solicitud is not None
+            assert solicitud.status == SolicitudStatus.APPROVED
+        assert await _balance(maker, user_id) == 22 - solicitud.dias_solicitados
+
+    async def test_many_hr_approving_one_correction(self, concurrent_session_maker: Maker):
+        """Only one of many HR users approving the same correction succeeds."""
+        maker = concurrent_session_maker
+        user_id, reviewers = await _create_users(maker, reviewers=10)
+        check_in = datetime.now(UTC) - timedelta(days=1, hours=8)
+        async with maker() as session:
+            fichaje = Fichaje(
+                user_id=user_id,
+                check_in=check_in,
+                check_out=check_in + timedelta(hours=8),
+                status=FichajeStatus.PENDING_CORRECTION,
+                proposed_check_in=check_in - timedelta(minutes=15),
+            )
+            session.add(fichaje)
+            await session.commit()
+
+        async def approve(reviewer: User) -> bool:
+            async with maker() as session:
+                service = FichajeService(FichajeRepository(session), UserRepository(session))
+                try:
+                    await service.approve_correction(
+                        fichaje.id,  # type: ignore
+                        FichajeApproval(approved=True),
+                        reviewer,
+                        expected_version=1,
+                    )
+                    await session.commit()
+                except AppException:
+                    await session.rollback()
+                    return False
+                return True
+
+        results = await asyncio.gather(*(approve(reviewer) for reviewer in reviewers))
+
+        assert results.count(True) == 1
+        async with maker() as session:
+            stored = await session.get(Fichaje, fichaje.id)
+            assert stored is not None
+            assert stored.status == FichajeStatus.CORRECTED
+            assert stored.version == 2  # noqa: PLR2004
+
+
+# ============================================================================
+# TAREAS PERIÓDICAS (BLOQUEOS CONSULTIVOS)
+# ============================================================================
+
+
+class TestAdvisoryLocks:
+    """Periodic work guarded by advisory locks runs once across workers (PostgreSQL)."""
+
+    @pytest.fixture(autouse=True)
+    def _postgresql_only(self, concurrent_session_maker: Maker):
+        """SQLite has no advisory locks (it is used with a single process)."""
+        if concurrent_session_maker.kw["bind"].dialect.name != "postgresql":
+            pytest.skip("Advisory locks need PostgreSQL")
+
+    async def test_runners_enqueue_periodic_job_once(self, concurrent_session_maker: Maker):
+        """Several runners ticking at once enqueue a single periodic job."""
+        maker = concurrent_session_maker
+        runners = [
+            JobRunner(maker, job_registry, schedules={"fichajes.auto_close": 60}) for _ in range(4)
+        ]
+
+        await asyncio.gather(*(runner.enqueue_scheduled() for runner in runners))
+
+        async with maker() as session:
+            jobs = (await session.execute(select(Job))).scalars().all()
+        assert len(jobs) == 1
+
+    async def test_auto_close_runs_in_one_worker(self, concurrent_session_maker: Maker):
+        """Concurrent auto-closes close each fichaje once; the others skip."""
+        maker = concurrent_session_maker
+        user_id, _ = await _create_users(maker, reviewers=0)
+        async with maker() as session:
+            session.add_all(
+                Fichaje(user_id=user_id, check_in=datetime.now(UTC) - timedelta(days=d))
+                for d in range(1, 6)
+            )
+            await session.commit()
+
+        async def close() -> int | None:
+            async with maker() as session:
+                service = FichajeService(FichajeRepository(session), UserRepository(session))
+                closed = await service.close_forgotten_checkins(max_shift_hours=12)
+                await asyncio.sleep(0.05)  # Mantener el bloqueo mientras llegan los demás
+                await session.commit()
+                return closed
+
+        results = await asyncio.gather(*(close() for _ in range(4)))
+
+        assert sum(r or 0 for r in results) == 5  # noqa: PLR2004
+        assert results.count(None) >= 1
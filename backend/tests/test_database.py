@@ -0,0 +1,211 @@
+"""Tests for transaction handling (unit of work)."""
+
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.types import Message, Receive, Scope, Send
+
+from app import database
+from app.core.security import create_access_token
+from app.database import UnitOfWork
+from app.main import app
+from app.models.fichaje import Fichaje
+from app.models.user import User, UserRole
+from app.repositories.fichaje_repository import FichajeRepository
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+async def fresh_session(db_engine: AsyncEngine) -> AsyncGenerator[AsyncSession]:
+    """Session independent from the shared test session."""
+    maker = async_sessionmaker(db_engine, expire_on_commit=False, autoflush=False)
+    async with maker() as session:
+        yield session
+
+
+@pytest.fixture
+def commits(fresh_session: AsyncSession) -> list[None]:
+    """Record each commit performed by the fresh session."""
+    recorded: list[None] = []
+    event.listen(fresh_session.sync_session, "after_commit", lambda _s: recorded.append(None))
+    return recorded
+
+
+@pytest.fixture
+async def request_events(
+    file_session_maker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[list[str]]:
+    """Serve requests with the real get_session and record commits and response starts."""
+    monkeypatch.setattr(database, "AsyncSessionLocal", file_session_maker)
+    recorded: list[str] = []
+
+    def on_commit(_session: Session) -> None:
+        recorded.append("COMMIT")
+
+    event.listen(Session, "after_commit", on_commit)
+    yield recorded
+    event.remove(Session, "after_commit", on_commit)
+
+
+async def _recording_app(events: list[str], scope: Scope, receive: Receive, send: Send) -> None:
+    """Run the app recording when the response starts."""
+
+    async def recording_send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            events.append(f"RESPONSE_START {message['status']}")
+        await send(message)
+
+    await app(scope, receive, recording_send)
+
+
+async def _seed_user(maker: async_sessionmaker[AsyncSession]) -> int:
+    """Create the employee that checks in."""
+    async with maker() as session:
+        user = User(
+            email="uow@test.com", full_name="UoW", hashed_password="!", role=UserRole.EMPLOYEE
+        )
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+async def _check_in(user_id: int, events: list[str]) -> int:
+    """POST a check-in through the whole stack and return the status code."""
+    events.clear()
+
+    async def asgi(scope: Scope, receive: Receive, send: Send) -> None:
+        await _recording_app(events, scope, receive, send)
+
+    token = create_access_token(data={"sub": str(user_id)})
+    async with AsyncClient(
+        transport=ASGITransport(app=asgi, raise_app_exceptions=False), base_url="http://test"
+    ) as api:
+        response = await api.post(
+            "/api/fichajes/check-in", json={}, headers={"Authorization": f"Bearer {token}"}
+        )
+    return response.status_code
+
+
+async def _count_fichajes(session: AsyncSession) -> int:
+    """Count fichajes visible to the session."""
+    result = await session.execute(select(func.count()).select_from(Fichaje))
+    return result.scalar_one()
+
+
+async def _create_and_fail(repo: FichajeRepository, user_id: int) -> None:
+    """Create a fichaje and then fail."""
+    await repo.create(Fichaje(user_id=user_id, check_in=datetime.now(UTC)))
+    raise RuntimeError
+
+
+# ============================================================================
+# TEST CLASSES
+# ============================================================================
+
+
+class TestUnitOfWork:
+    """Tests for UnitOfWork commit/rollback/savepoint semantics."""
+
+    async def test_single_commit_for_several_writes(
+        self, fresh_session: AsyncSession, employee_user: User, commits: list[None]
+    ):
+        """Several repository writes end up in exactly one commit."""
+        async with UnitOfWork(fresh_session) as uow:
+            repo = FichajeRepository(uow.session)
+            for _ in range(3):
+                await repo.create(Fichaje(user_id=employee_user.id, check_in=datetime.now(UTC)))
+
+        assert len(commits) == 1
+        assert await _count_fichajes(fresh_session) == 3  # noqa: PLR2004
+
+    async def test_repository_does_not_commit(
+        self, fresh_session: AsyncSession, employee_user: User, commits: list[None]
+    ):
+        """Repositories only flush; committing is left to the unit of work."""
+        repo = FichajeRepository(fresh_session)
+        await repo.create(Fichaje(user_id=employee_user.id, check_in=datetime.now(UTC)))
+
+        assert commits == []
+        assert fresh_session.in_transaction()
+        await fresh_session.rollback()
+
+    async def test_rollback_on_error(
+        self, fresh_session: AsyncSession, employee_user: User, commits: list[None]
+    ):
+        """An exception inside the unit of work discards every write."""
+
+        async def failing_request() -> None:
+            async with UnitOfWork(fresh_session) as uow:
+                await _create_and_fail(FichajeRepository(uow.session), employee_user.id)
+
+        with pytest.raises(RuntimeError):
+            await failing_request()
+
+        assert commits == []
+        assert await _count_fichajes(fresh_session) == 0
+
+    async def test_savepoint_partial_rollback(
+        self, fresh_session: AsyncSession, employee_user: User, commits: list[None]
+    ):
+        """A failing savepoint only discards its own writes."""
+        async with UnitOfWork(fresh_session) as uow:
+            repo = FichajeRepository(uow.session)
+            await repo.create(Fichaje(user_id=employee_user.id, check_in=datetime.now(UTC)))
+
+            async def failing_step() -> None:
+                async with uow.savepoint():
+                    await _create_and_fail(repo, employee_user.id)
+
+            with pytest.raises(RuntimeError):
+                await failing_step()
+
+        assert len(commits) == 1
+        assert await _count_fichajes(fresh_session) == 1
+
+
+class TestRequestCommit:
+    """The request's unit of work commits before the response is sent."""
+
+    async def test_commit_before_response_start(
+        self, file_session_maker: async_sessionmaker[AsyncSession], request_events: list[str]
+    ):
+        """The single commit of a write request happens before http.response.start."""
+        user_id = await _seed_user(file_session_maker)
+
+        status_code = await _check_in(user_id, request_events)
+
+        assert status_code == status.HTTP_201_CREATED
+        assert request_events == ["COMMIT", "RESPONSE_START 201"]
+        async with file_session_maker() as session:
+            assert await _count_fichajes(session) == 1
+
+    async def test_failed_commit_is_not_acknowledged(
+        self,
+        file_session_maker: async_sessionmaker[AsyncSession],
+        request_events: list[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """If the commit fails the client gets an error, not a 201."""
+        user_id = await _seed_user(file_session_maker)
+
+        async def failing_commit(_self: AsyncSession) -> None:
+            raise RuntimeError
+
+        monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+
+        status_code = await _check_in(user_id, request_events)
+
+        assert status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert request_events == ["RESPONSE_START 500"]
+        monkeypatch.undo()
+        async with file_session_maker() as session:
+            assert await _count_fichajes(session) == 0
@@ -1,14 +1,29 @@
 """Tests for fichajes (time tracking) endpoints."""
 
+import asyncio
+from collections.abc import Callable, Generator
 from datetime import UTC, datetime, timedelta
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.exceptions import ConflictException
+from app.core.presence import PresenceRoster, presence_roster
 from app.models.fichaje import Fichaje, FichajeStatus
 from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.user_repository import UserRepository
+from app.services.fichaje_service import FichajeService, find_overlaps, occupancy_by_hour
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Wait until a condition set by a background task holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
 
 # ============================================================================
 # FIXTURES
@@ -148,6 +163,23 @@ class TestListFichajes:
         assert len(data["fichajes"]) >= 1
         assert data["fichajes"][0]["user_id"] == employee_fichaje.user_id
 
+    async def test_list_my_fichajes_serialization(
+        self, authenticated_client: AsyncClient, employee_fichaje: Fichaje, employee_user: User
+    ):
+        """List items carry user data and UTC datetimes with Z suffix."""
+        response = await authenticated_client.get("/api/fichajes/me")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        item = response.json()["fichajes"][0]
+        assert item["user_email"] == employee_user.email
+        assert item["user_full_name"] == employee_user.full_name
+        check_in = employee_fichaje.check_in.replace(tzinfo=None)
+        assert item["check_in"] == f"{check_in.isoformat()}Z"
+        assert item["created_at"].endswith("Z")
+        assert item["approved_at"] is None
+        assert item["hours_worked"] == pytest.approx(8, abs=0.01)
+
     async def test_list_my_fichajes_with_filters(
         self, authenticated_client: AsyncClient, employee_fichaje: Fichaje
     ):
@@ -174,6 +206,37 @@ class TestListFichajes:
         assert "fichajes" in data
         assert "total" in data
 
+    async def test_hr_list_fichajes_without_count(
+        self,
+        hr_authenticated_client: AsyncClient,
+        employee_fichaje: Fichaje,
+        pending_fichaje: Fichaje,
+    ):
+        """HR lists fichajes with count_strategy=none: no total, only has_more."""
+        response = await hr_authenticated_client.get(
+            "/api/fichajes/", params={"limit": 1, "count_strategy": "none"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] is None
+        assert data["has_more"] is True
+        assert len(data["fichajes"]) == 1
+
+    async def test_list_my_fichajes_estimated_count(
+        self, authenticated_client: AsyncClient, employee_fichaje: Fichaje
+    ):
+        """Estimated count falls back to the exact total outside PostgreSQL."""
+        response = await authenticated_client.get(
+            "/api/fichajes/me", params={"count_strategy": "estimated"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 1
+        assert data["total_estimated"] is False
+        assert data["has_more"] is False
+
     async def test_employee_cannot_list_all(self, authenticated_client: AsyncClient):
         """TC-F18: Employee cannot list all fichajes."""
         response = await authenticated_client.get("/api/fichajes/")
@@ -334,6 +397,545 @@ class TestApproveCorrection:
         assert "pendiente" in data["detail"].lower()
 
 
+class TestBulkApproveCorrections:
+    """Tests for POST /api/fichajes/bulk-approve endpoint."""
+
+    @staticmethod
+    async def _pending(
+        session: AsyncSession,
+        user: User,
+        day: int,
+        proposed: tuple[int, int] | None = (9, 17),
+    ) -> Fichaje:
+        """Create a fichaje pending correction `day` days ago, proposing 9-17 by default."""
+        base = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        base -= timedelta(days=day)
+        fichaje = Fichaje(
+            user_id=user.id,
+            check_in=base + timedelta(hours=9),
+            status=FichajeStatus.PENDING_CORRECTION,
+            correction_reason="Fallo del lector de tarjetas",
+            correction_requested_at=datetime.now(UTC),
+        )
+        if proposed is not None:
+            fichaje.proposed_check_in = base + timedelta(hours=proposed[0])
+            fichaje.proposed_check_out = base + timedelta(hours=proposed[1])
+        session.add(fichaje)
+        await session.commit()
+        await session.refresh(fichaje)
+        return fichaje
+
+    async def test_bulk_approve_applies_proposed_values(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-F20: HR approves and rejects several corrections in one request."""
+        first = await self._pending(session, employee_user, day=3)
+        second = await self._pending(session, employee_user, day=2)
+        rejected = await self._pending(session, employee_user, day=1)
+
+        response = await hr_authenticated_client.post(
+            "/api/fichajes/bulk-approve",
+            json={
+                "items": [
+                    {"fichaje_id": first.id, "approved": True},
+                    {"fichaje_id": second.id, "approved": True, "approval_notes": "OK"},
+                    {"fichaje_id": rejected.id, "approved": False},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert (data["approved"], data["rejected"], data["failed"]) == (2, 1, 0)
+        assert [r["status"] for r in data["results"]] == ["corrected", "corrected", "rejected"]
+        assert all(r["version"] == 2 for r in data["results"])  # noqa: PLR2004
+
+        detail = await hr_authenticated_client.get(f"/api/fichajes/{second.id}")
+        fichaje = detail.json()
+        assert fichaje["check_out"] is not None
+        assert fichaje["proposed_check_in"] is None
+        assert fichaje["approval_notes"] == "OK"
+        assert detail.headers["ETag"] == '"2"'
+
+        detail = await hr_authenticated_client.get(f"/api/fichajes/{rejected.id}")
+        assert detail.json()["check_out"] is None
+
+    async def test_bulk_approve_partial_failures(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        employee_fichaje: Fichaje,
+    ):
+        """TC-F21: Invalid decisions and overlapping corrections are reported per item."""
+        ok = await self._pending(session, employee_user, day=3)
+        overlaps_ok = await self._pending(session, employee_user, day=3, proposed=(16, 20))
+        stale = await self._pending(session, employee_user, day=2)
+        # Se solapa con `employee_fichaje` (las últimas 8 horas)
+        now = datetime.now(UTC)
+        overlaps_existing = Fichaje(
+            user_id=employee_user.id,
+            check_in=now - timedelta(days=5),
+            status=FichajeStatus.PENDING_CORRECTION,
+            proposed_check_in=now - timedelta(hours=4),
+            proposed_check_out=now - timedelta(hours=3),
+        )
+        session.add(overlaps_existing)
+        await session.commit()
+
+        response = await hr_authenticated_client.post(
+            "/api/fichajes/bulk-approve",
+            json={
+                "items": [
+                    {"fichaje_id": ok.id, "approved": True},
+                    {"fichaje_id": overlaps_ok.id, "approved": True},
+                    {"fichaje_id": overlaps_existing.id, "approved": True},
+                    {"fichaje_id": stale.id, "approved": True, "version": 5},
+                    {"fichaje_id": employee_fichaje.id, "approved": True},
+                    {"fichaje_id": 999999, "approved": True},
+                    {"fichaje_id": ok.id, "approved": False},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [(r["fichaje_id"], r["ok"], r["error"]) for r in data["results"]] == [
+            (ok.id, True, None),
+            (overlaps_ok.id, False, "overlap"),
+            (overlaps_existing.id, False, "overlap"),
+            (stale.id, False, "version_conflict"),
+            (employee_fichaje.id, False, "not_pending"),
+            (999999, False, "not_found"),
+            (ok.id, False, "duplicate"),
+        ]
+
+        for fichaje in (overlaps_ok, overlaps_existing, stale):
+            await session.refresh(fichaje)
+            assert fichaje.status == FichajeStatus.PENDING_CORRECTION
+            assert fichaje.version == 1
+
+    async def test_rejecting_keeps_original_interval_for_overlaps(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-F22: A correction overlapping a rejected one's original times is not applied."""
+        rejected = await self._pending(session, employee_user, day=1, proposed=(9, 17))
+        await session.refresh(rejected)
+        rejected.check_out = rejected.check_in + timedelta(hours=8)
+        await session.commit()
+        overlapping = await self._pending(session, employee_user, day=1, proposed=(12, 14))
+
+        response = await hr_authenticated_client.post(
+            "/api/fichajes/bulk-approve",
+            json={
+                "items": [
+                    {"fichaje_id": rejected.id, "approved": False},
+                    {"fichaje_id": overlapping.id, "approved": True},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r["error"] for r in response.json()["results"]] == [None, "overlap"]
+
+    async def test_employee_cannot_bulk_approve(
+        self, authenticated_client: AsyncClient, pending_fichaje: Fichaje
+    ):
+        """TC-F23: Employee cannot approve corrections in bulk."""
+        response = await authenticated_client.post(
+            "/api/fichajes/bulk-approve",
+            json={"items": [{"fichaje_id": pending_fichaje.id, "approved": True}]},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_apply_approvals_detects_stale_rows(
+        self, session: AsyncSession, pending_fichaje: Fichaje, hr_user: User
+    ):
+        """The executemany update conflicts if a row changed after it was read."""
+        repo = FichajeRepository(session)
+
+        with pytest.raises(ConflictException):
+            await repo.apply_approvals(
+                [
+                    {
+                        "b_id": pending_fichaje.id,
+                        "b_version": pending_fichaje.version + 1,
+                        "status": FichajeStatus.CORRECTED,
+                        "approved_by": hr_user.id,
+                    }
+                ]
+            )
+
+
+class TestAutoCloseFichajes:
+    """Tests for the periodic auto-close of forgotten check-ins."""
+
+    @staticmethod
+    def _service(session: AsyncSession) -> FichajeService:
+        return FichajeService(FichajeRepository(session), UserRepository(session))
+
+    async def test_closes_only_stale_open_fichajes(
+        self,
+        session: AsyncSession,
+        employee_user: User,
+        active_fichaje: Fichaje,
+        employee_fichaje: Fichaje,
+    ):
+        """Open fichajes older than the max shift are closed and left pending correction."""
+        check_in = datetime.now(UTC).replace(microsecond=0) - timedelta(hours=30)
+        stale = Fichaje(user_id=employee_user.id, check_in=check_in, notes="Entrada por la tarde")
+        session.add(stale)
+        await session.commit()
+
+        closed = await self._service(session).close_forgotten_checkins(max_shift_hours=12)
+        await session.commit()
+
+        assert closed == 1
+        await session.refresh(stale)
+        assert stale.check_out is not None
+        assert stale.check_out.replace(tzinfo=UTC) == check_in + timedelta(hours=12)
+        assert stale.status == FichajeStatus.PENDING_CORRECTION
+        assert stale.correction_reason is not None
+        assert stale.correction_reason.startswith("[Sistema]")
+        assert stale.notes is not None
+        assert stale.notes.startswith("Entrada por la tarde\n\n[Sistema]")
+        assert stale.version == 2  # noqa: PLR2004
+
+        for fichaje in (active_fichaje, employee_fichaje):
+            await session.refresh(fichaje)
+            assert fichaje.status == FichajeStatus.VALID
+            assert fichaje.version == 1
+        assert active_fichaje.check_out is None
+
+    async def test_long_notes_keep_system_note(self, session: AsyncSession, employee_user: User):
+        """Previous notes are trimmed so the system note fits in the column."""
+        stale = Fichaje(
+            user_id=employee_user.id,
+            check_in=datetime.now(UTC) - timedelta(days=2),
+            notes="x" * 500,
+        )
+        session.add(stale)
+        await session.commit()
+
+        await self._service(session).close_forgotten_checkins(max_shift_hours=12)
+        await session.commit()
+
+        await session.refresh(stale)
+        assert stale.notes is not None
+        assert len(stale.notes) <= 500  # noqa: PLR2004
+        assert stale.notes.endswith(stale.correction_reason or "")
+
+    async def test_keeps_pending_correction_of_open_fichaje(
+        self, session: AsyncSession, employee_user: User
+    ):
+        """An employee's pending correction keeps its reason, date and proposal."""
+        requested_at = datetime.now(UTC).replace(microsecond=0) - timedelta(hours=20)
+        proposed_check_out = requested_at + timedelta(hours=1)
+        stale = Fichaje(
+            user_id=employee_user.id,
+            check_in=datetime.now(UTC) - timedelta(days=1),
+            status=FichajeStatus.PENDING_CORRECTION,
+            correction_reason="Olvidé fichar la salida",
+            correction_requested_at=requested_at,
+            proposed_check_out=proposed_check_out,
+        )
+        session.add(stale)
+        await session.commit()
+
+        closed = await self._service(session).close_forgotten_checkins(max_shift_hours=12)
+        await session.commit()
+
+        assert closed == 1
+        await session.refresh(stale)
+        assert stale.check_out is not None
+        assert stale.status == FichajeStatus.PENDING_CORRECTION
+        assert stale.correction_reason is not None
+        assert stale.correction_reason.startswith("Olvidé fichar la salida\n\n[Sistema]")
+        assert stale.correction_requested_at is not None
+        assert stale.correction_requested_at.replace(tzinfo=UTC) == requested_at
+        assert stale.proposed_check_out is not None
+        assert stale.proposed_check_out.replace(tzinfo=UTC) == proposed_check_out
+
+    async def test_closed_fichaje_no_longer_blocks_check_in(
+        self, authenticated_client: AsyncClient, session: AsyncSession, employee_user: User
+    ):
+        """After the auto-close the employee can check in again."""
+        session.add(
+            Fichaje(user_id=employee_user.id, check_in=datetime.now(UTC) - timedelta(days=1))
+        )
+        await session.commit()
+
+        response = await authenticated_client.post("/api/fichajes/check-in", json={})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        await self._service(session).close_forgotten_checkins(max_shift_hours=12)
+        await session.commit()
+
+        response = await authenticated_client.post("/api/fichajes/check-in", json={})
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+class TestPresence:
+    """Tests for the in-memory presence roster and GET /api/fichajes/presence."""
+
+    @pytest.fixture(autouse=True)
+    def clear_presence_roster(self) -> Generator[None]:
+        """Start every test with an empty process roster."""
+        presence_roster.clear()
+        yield
+        presence_roster.clear()
+
+    async def test_roster_follows_committed_check_in_and_out(
+        self, hr_authenticated_client: AsyncClient, session: AsyncSession, hr_user: User
+    ):
+        """Check-in and check-out reach the roster when the transaction commits."""
+        response = await hr_authenticated_client.post("/api/fichajes/check-in", json={})
+        assert response.status_code == status.HTTP_201_CREATED
+        fichaje_id = response.json()["id"]
+        assert presence_roster.get(hr_user.id) is None
+
+        await session.commit()
+
+        response = await hr_authenticated_client.get("/api/fichajes/presence")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 1
+        assert data["present"][0]["fichaje_id"] == fichaje_id
+        assert data["present"][0]["user_email"] == hr_user.email
+
+        await hr_authenticated_client.post("/api/fichajes/check-out", json={})
+        await session.commit()
+
+        response = await hr_authenticated_client.get("/api/fichajes/presence")
+        assert response.json()["total"] == 0
+
+    async def test_rolled_back_check_in_is_discarded(
+        self, session: AsyncSession, employee_user: User
+    ):
+        """A check-in that is rolled back never reaches the roster."""
+        roster = PresenceRoster()
+        service = FichajeService(FichajeRepository(session), UserRepository(session), roster)
+
+        await service.check_in(employee_user.id, notes=None)  # type: ignore[arg-type]
+        await session.rollback()
+
+        assert len(roster) == 0
+
+    async def test_load_keeps_only_open_fichajes(
+        self,
+        session: AsyncSession,
+        employee_user: User,
+        active_fichaje: Fichaje,
+        employee_fichaje: Fichaje,
+    ):
+        """The startup load lists one open fichaje per user with tz-aware check-in."""
+        roster = PresenceRoster()
+        await roster.load(session)
+
+        entries = roster.entries()
+        assert [entry.fichaje_id for entry in entries] == [active_fichaje.id]
+        assert entries[0].user_full_name == employee_user.full_name
+        assert entries[0].check_in.tzinfo is not None
+        assert roster.synced_at is not None
+
+    def test_late_check_out_keeps_newer_check_in(self):
+        """A check-out for an older fichaje does not remove the current one."""
+        roster = PresenceRoster()
+        roster.apply(
+            {
+                "op": "in",
+                "fichaje_id": 2,
+                "user_id": 1,
+                "user_email": "a@test.com",
+                "user_full_name": "A",
+                "check_in": datetime.now(UTC).isoformat(),
+            }
+        )
+        roster.apply({"op": "out", "fichaje_id": 1, "user_id": 1})
+
+        assert roster.get(1) is not None
+        roster.apply({"op": "out", "fichaje_id": 2, "user_id": 1})
+        assert roster.get(1) is None
+
+    async def test_auto_close_reloads_roster(
+        self, file_session_maker: async_sessionmaker[AsyncSession]
+    ):
+        """Bulk changes (auto-close) trigger a full reload in the background task."""
+        roster = PresenceRoster(file_session_maker.kw["bind"], resync_interval=0)
+        async with file_session_maker() as session:
+            user = User(email="night@test.com", full_name="Night Shift", hashed_password="x")
+            session.add(user)
+            await session.flush()
+            session.add(Fichaje(user_id=user.id, check_in=datetime.now(UTC) - timedelta(days=1)))
+            await session.commit()
+
+        roster.start()
+        try:
+            await _wait_for(lambda: roster.synced_at is not None)
+            assert len(roster) == 1
+
+            async with file_session_maker() as session:
+                service = FichajeService(
+                    FichajeRepository(session), UserRepository(session), roster
+                )
+                assert await service.close_forgotten_checkins(max_shift_hours=12) == 1
+                await session.commit()
+
+            await _wait_for(lambda: len(roster) == 0)
+        finally:
+            await roster.stop()
+
+    async def test_presence_requires_hr(self, authenticated_client: AsyncClient):
+        """Employees cannot list who is in."""
+        response = await authenticated_client.get("/api/fichajes/presence")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestFindOverlaps:
+    """Tests for the in-memory interval overlap check used by bulk approvals."""
+
+    @staticmethod
+    def _at(hour: int) -> datetime:
+        return datetime(2026, 3, 2, tzinfo=UTC) + timedelta(hours=hour)
+
+    def test_no_overlap_back_to_back(self):
+        """Intervals that only touch do not overlap."""
+        fixed = [(self._at(0), self._at(8)), (self._at(17), self._at(20))]
+
+        assert find_overlaps({1: (self._at(8), self._at(17))}, fixed) == set()
+
+    def test_overlap_with_earlier_long_interval(self):
+        """A long fixed interval is found even if shorter ones start after it."""
+        fixed = [
+            (self._at(0), self._at(12)),
+            (self._at(1), self._at(2)),
+            (self._at(3), self._at(4)),
+        ]
+
+        assert find_overlaps({1: (self._at(10), self._at(14))}, fixed) == {1}
+
+    def test_candidates_overlapping_each_other(self):
+        """The later of two overlapping candidates is reported."""
+        candidates = {
+            1: (self._at(9), self._at(17)),
+            2: (self._at(16), self._at(18)),
+            3: (self._at(18), self._at(19)),
+        }
+
+        assert find_overlaps(candidates, []) == {2}
+
+    def test_open_intervals_only_overlap_each_other(self):
+        """Open intervals (no check-out) only clash with other open intervals."""
+        fixed = [(self._at(0), None)]
+
+        assert find_overlaps({1: (self._at(9), self._at(17))}, fixed) == set()
+        assert find_overlaps({1: (self._at(9), None)}, fixed) == {1}
+
+
+class TestOccupancy:
+    """Tests for the hourly occupancy heatmap (GET /api/fichajes/occupancy)."""
+
+    @staticmethod
+    def _at(day: int, hour: int, minute: int = 0) -> datetime:
+        return datetime(2026, 3, day, hour, minute, tzinfo=UTC)
+
+    def test_sweep_peak_and_average(self):
+        """Back-to-back intervals do not coincide; partial hours count pro rata."""
+        origin = self._at(2, 9).timestamp()
+        arrivals = [self._at(2, 9), self._at(2, 10), self._at(2, 9, 30)]
+        departures = [self._at(2, 10), self._at(2, 11), self._at(2, 10, 30)]
+
+        peak, average = occupancy_by_hour(
+            [a.timestamp() for a in arrivals], [d.timestamp() for d in departures], origin, 3
+        )
+
+        assert peak == [2, 2, 0]
+        assert average == [1.5, 1.5, 0.0]
+
+    def test_sweep_clips_to_range(self):
+        """Intervals are clipped to the range and empty ones are ignored."""
+        origin = self._at(2, 0).timestamp()
+        arrivals = [self._at(1, 22).timestamp(), self._at(2, 1).timestamp()]
+        departures = [self._at(2, 1, 30).timestamp(), self._at(2, 1).timestamp()]
+
+        peak, average = occupancy_by_hour(arrivals, departures, origin, 2)
+
+        assert peak == [1, 1]
+        assert average == [1.0, 0.5]
+
+    async def test_heatmap_day_by_hour(
+        self, hr_authenticated_client: AsyncClient, session: AsyncSession, employee_user: User
+    ):
+        """The endpoint returns a day x 24 matrix, splitting shifts across midnight."""
+        for check_in, check_out in [
+            (self._at(2, 8), self._at(2, 16, 30)),
+            (self._at(2, 22), self._at(3, 2)),
+            (self._at(4, 9), self._at(4, 10)),
+        ]:
+            session.add(Fichaje(user_id=employee_user.id, check_in=check_in, check_out=check_out))
+        await session.commit()
+
+        response = await hr_authenticated_client.get(
+            "/api/fichajes/occupancy", params={"date_from": "2026-03-02", "date_to": "2026-03-03"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["days"] == ["2026-03-02", "2026-03-03"]
+        assert data["intervals"] == 2  # noqa: PLR2004
+        assert [len(row) for row in data["peak"]] == [24, 24]
+        assert data["peak"][0][7:9] == [0, 1]
+        assert data["average"][0][16] == 0.5  # noqa: PLR2004
+        assert data["peak"][0][22:] == [1, 1]
+        assert data["peak"][1][:3] == [1, 1, 0]
+        assert sum(map(sum, data["average"])) == 12.5  # noqa: PLR2004
+
+    async def test_open_fichaje_counts_until_now(
+        self, hr_authenticated_client: AsyncClient, session: AsyncSession, employee_user: User
+    ):
+        """An open fichaje counts as present up to now."""
+        check_in = datetime.now(UTC) - timedelta(seconds=1)
+        session.add(Fichaje(user_id=employee_user.id, check_in=check_in))
+        await session.commit()
+
+        first_day = check_in.date() - timedelta(days=1)
+        response = await hr_authenticated_client.get(
+            "/api/fichajes/occupancy",
+            params={"date_from": first_day.isoformat(), "date_to": check_in.date().isoformat()},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["peak"][1][check_in.hour] == 1
+
+    async def test_invalid_range(self, hr_authenticated_client: AsyncClient):
+        """Reversed ranges and ranges over 366 days are rejected."""
+        reversed_range = await hr_authenticated_client.get(
+            "/api/fichajes/occupancy", params={"date_from": "2026-03-02", "date_to": "2026-03-01"}
+        )
+        too_long = await hr_authenticated_client.get(
+            "/api/fichajes/occupancy", params={"date_from": "2026-01-01", "date_to": "2027-01-02"}
+        )
+
+        assert reversed_range.status_code == status.HTTP_400_BAD_REQUEST
+        assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_employee_forbidden(self, authenticated_client: AsyncClient):
+        """Employees cannot see the occupancy heatmap."""
+        response = await authenticated_client.get(
+            "/api/fichajes/occupancy", params={"date_from": "2026-03-02", "date_to": "2026-03-02"}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 class TestGetFichaje:
     """Tests for GET /api/fichajes/{id} and related endpoints."""
 
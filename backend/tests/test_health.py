@@ -0,0 +1,158 @@
+"""Tests for health check endpoints (liveness/readiness)."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.api.routers.health import get_readiness_probe
+from app.core.health import ReadinessProbe
+from app.main import app
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+async def pooled_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine]:
+    """Engine over a SQLite file with a single-connection pool."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'health.db'}",
+        pool_size=1,
+        max_overflow=0,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def _override_probe(probe: ReadinessProbe) -> None:
+    """Use the given probe in the readiness endpoint."""
+    app.dependency_overrides[get_readiness_probe] = lambda: probe
+
+
+# ============================================================================
+# TEST CLASSES
+# ============================================================================
+
+
+class TestLiveness:
+    """Tests for GET /health and /health/live."""
+
+    async def test_health_legacy_endpoint(self, client: AsyncClient):
+        """Legacy /health keeps returning the static liveness payload."""
+        response = await client.get("/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "healthy"
+
+    async def test_liveness(self, client: AsyncClient):
+        """Liveness answers without touching the database."""
+        response = await client.get("/health/live")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert "version" in data
+
+
+class TestReadiness:
+    """Tests for GET /health/ready."""
+
+    async def test_ready_when_database_up(self, client: AsyncClient, db_engine: AsyncEngine):
+        """Readiness reports the database as up with its latency."""
+        _override_probe(ReadinessProbe(db_engine, timeout=1.0, cache_ttl=0))
+
+        response = await client.get("/health/ready")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["database"]["status"] == "up"
+        assert data["database"]["latency_ms"] is not None
+        assert data["cached"] is False
+
+    async def test_ready_reports_pool_saturation(
+        self, client: AsyncClient, pooled_engine: AsyncEngine
+    ):
+        """Readiness includes pool metrics when the pool exposes them."""
+        _override_probe(ReadinessProbe(pooled_engine, timeout=1.0, cache_ttl=0, max_overflow=0))
+
+        response = await client.get("/health/ready")
+
+        assert response.status_code == status.HTTP_200_OK
+        pool = response.json()["pool"]
+        assert pool["size"] == 1
+        assert pool["capacity"] == 1
+        assert pool["exhausted"] is False
+
+    async def test_pool_capacity_unknown_without_max_overflow(self, pooled_engine: AsyncEngine):
+        """Without the configured max_overflow only the pool counters are reported."""
+        pool = ReadinessProbe(pooled_engine, timeout=1.0, cache_ttl=0).pool_status()
+
+        assert pool is not None
+        assert pool.size == 1
+        assert pool.capacity is None
+        assert pool.saturation is None
+        assert pool.exhausted is False
+
+    async def test_ready_fails_fast_when_pool_exhausted(
+        self, client: AsyncClient, pooled_engine: AsyncEngine
+    ):
+        """With every connection checked out, readiness fails without waiting for the pool."""
+        probe = ReadinessProbe(pooled_engine, timeout=5.0, cache_ttl=0, max_overflow=0)
+        _override_probe(probe)
+
+        async with pooled_engine.connect():
+            response = await client.get("/health/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        data = response.json()
+        assert data["status"] == "unavailable"
+        assert data["pool"]["exhausted"] is True
+        assert data["database"]["latency_ms"] is None
+
+    async def test_ready_times_out(
+        self, client: AsyncClient, db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A ping slower than the timeout marks the worker as unavailable."""
+        probe = ReadinessProbe(db_engine, timeout=0.05, cache_ttl=0)
+
+        async def slow_ping() -> None:
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(probe, "_execute_ping", slow_ping)
+        _override_probe(probe)
+
+        response = await client.get("/health/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "Timeout" in response.json()["database"]["error"]
+
+    async def test_ready_result_is_cached(
+        self, client: AsyncClient, db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Within the TTL, repeated probes reuse the last result instead of pinging."""
+        probe = ReadinessProbe(db_engine, timeout=1.0, cache_ttl=60)
+        calls = 0
+        original = probe._execute_ping
+
+        async def counting_ping() -> None:
+            nonlocal calls
+            calls += 1
+            await original()
+
+        monkeypatch.setattr(probe, "_execute_ping", counting_ping)
+        _override_probe(probe)
+
+        first = await client.get("/health/ready")
+        second = await client.get("/health/ready")
+
+        assert calls == 1
+        assert first.json()["cached"] is False
+        assert second.json()["cached"] is True
+        assert first.json()["checked_at"] == second.json()["checked_at"]
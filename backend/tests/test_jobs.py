@@ -0,0 +1,466 @@
+"""Tests for the DB-backed background job runner and the jobs API."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings
+from app.core.exceptions import ConflictException
+from app.jobs import JobContext, JobRegistry, JobRunner, job_registry
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.job import Job, JobStatus
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from app.services.job_service import JobService
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def maker(file_session_maker: async_sessionmaker[AsyncSession]) -> async_sessionmaker[AsyncSession]:
+    """The runner opens several connections at once: use a file database."""
+    return file_session_maker
+
+
+@pytest.fixture
+def registry() -> JobRegistry:
+    """Registry with test handlers."""
+    registry = JobRegistry()
+
+    @registry.register("test.sum")
+    async def sum_job(context: JobContext):
+        """Adds numbers in two steps."""
+        numbers = context.payload["numbers"]
+        await context.report_progress(0.5, "mitad")
+        return {"sum": sum(numbers)}
+
+    @registry.register("test.flaky")
+    async def flaky_job(context: JobContext):
+        """Fails on the first attempt."""
+        if context.attempt == 1:
+            msg = "fallo transitorio"
+            raise RuntimeError(msg)
+        return {"attempt": context.attempt}
+
+    @registry.register("test.broken")
+    async def broken_job(context: JobContext):
+        """Always fails."""
+        msg = "siempre falla"
+        raise ValueError(msg)
+
+    @registry.register("test.sleep")
+    async def sleep_job(context: JobContext):
+        """Runs until cancelled, without reporting progress."""
+        while True:
+            await asyncio.sleep(0.01)
+
+    @registry.register("test.steps")
+    async def steps_job(context: JobContext):
+        """Runs until cancelled, reporting progress on each step."""
+        step = 0
+        while True:
+            step += 1
+            await context.report_progress(min(step / 1000, 0.99), f"paso {step}")
+            await asyncio.sleep(0.01)
+
+    return registry
+
+
+@pytest.fixture
+def runner(maker: async_sessionmaker[AsyncSession], registry: JobRegistry) -> JobRunner:
+    """Runner with fast heartbeats and a long retry backoff."""
+    return JobRunner(
+        maker,
+        registry,
+        concurrency=1,
+        poll_interval=0.01,
+        heartbeat_interval=0.05,
+        stale_after=60,
+        retry_base=60,
+        retry_max=600,
+    )
+
+
+async def _enqueue(
+    maker: async_sessionmaker[AsyncSession], registry: JobRegistry, kind: str, **kwargs
+) -> int:
+    """Enqueue a job and return its ID."""
+    async with maker() as session:
+        job = await JobService(session, registry).enqueue(kind, **kwargs)
+        await session.commit()
+        assert job.id is not None
+        return job.id
+
+
+async def _get(maker: async_sessionmaker[AsyncSession], job_id: int) -> Job:
+    """Read a job in a fresh session."""
+    async with maker() as session:
+        job = await session.get(Job, job_id)
+        assert job is not None
+        return job
+
+
+async def _wait_for(
+    maker: async_sessionmaker[AsyncSession], job_id: int, job_status: JobStatus
+) -> Job:
+    """Poll until the job reaches a status (fails after 5 seconds)."""
+    async with asyncio.timeout(5):
+        while (job := await _get(maker, job_id)).status != job_status:
+            await asyncio.sleep(0.01)
+    return job
+
+
+def _utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes (stored in UTC)."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+
+class TestJobRunner:
+    """Tests for JobRunner execution, retries and recovery."""
+
+    async def test_runs_job_and_stores_result(self, maker, registry, runner: JobRunner):
+        """A successful job stores its result, progress and attempt count."""
+        job_id = await _enqueue(maker, registry, "test.sum", payload={"numbers": [1, 2, 3]})
+
+        assert await runner.run_pending() == 1
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"sum": 6}
+        assert job.progress == 1.0
+        assert job.progress_message == "mitad"
+        assert job.attempts == 1
+        assert job.worker_id is None
+        assert job.finished_at is not None
+
+    async def test_failed_job_is_retried_with_backoff(self, maker, registry, runner: JobRunner):
+        """A failure requeues the job for later; it succeeds on the next attempt."""
+        job_id = await _enqueue(maker, registry, "test.flaky")
+
+        await runner.run_pending()
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.PENDING
+        assert job.attempts == 1
+        assert "fallo transitorio" in (job.error or "")
+        # retry_base=60 con jitter del 50-100 %
+        assert _utc(job.run_after) > datetime.now(UTC) + timedelta(seconds=25)
+        assert await runner.run_pending() == 0
+
+        async with maker() as session:
+            await session.execute(
+                update(Job).where(Job.id == job_id).values(run_after=datetime.now(UTC))
+            )
+            await session.commit()
+        await runner.run_pending()
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"attempt": 2}
+
+    async def test_job_fails_after_max_attempts(self, maker, registry, runner: JobRunner):
+        """A job that keeps failing ends as FAILED after max_attempts."""
+        runner.retry_base = 0
+        job_id = await _enqueue(maker, registry, "test.broken", max_attempts=3)
+
+        assert await runner.run_pending() == 3  # noqa: PLR2004
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 3  # noqa: PLR2004
+        assert "ValueError: siempre falla" in (job.error or "")
+
+    def test_backoff_grows_exponentially_with_cap(self, runner: JobRunner):
+        """Each retry waits twice as long (with jitter) up to retry_max."""
+        for attempts, base in [(1, 60), (2, 120), (3, 240), (5, 600), (10, 600)]:
+            assert base * 0.5 <= runner.backoff(attempts) <= base
+
+    async def test_stale_job_is_reclaimed(self, maker, registry, runner: JobRunner):
+        """A RUNNING job without heartbeats (crashed worker) is picked up again."""
+        job_id = await _enqueue(maker, registry, "test.sum", payload={"numbers": [2, 2]})
+        async with maker() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status=JobStatus.RUNNING,
+                    worker_id="dead-worker",
+                    attempts=1,
+                    heartbeat_at=datetime.now(UTC) - timedelta(minutes=10),
+                )
+            )
+            await session.commit()
+
+        assert await runner.run_pending() == 1
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.attempts == 2  # noqa: PLR2004
+
+    async def test_live_running_job_is_not_reclaimed(self, maker, registry, runner: JobRunner):
+        """A RUNNING job with a recent heartbeat belongs to its worker."""
+        job_id = await _enqueue(maker, registry, "test.sum", payload={"numbers": [1]})
+        async with maker() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status=JobStatus.RUNNING,
+                    worker_id="live-worker",
+                    heartbeat_at=datetime.now(UTC),
+                )
+            )
+            await session.commit()
+
+        assert await runner.run_pending() == 0
+
+    async def test_stop_requeues_running_job(self, maker, registry, runner: JobRunner):
+        """Stopping the runner puts an unfinished job back without using an attempt."""
+        job_id = await _enqueue(maker, registry, "test.sleep")
+        runner.start()
+        await _wait_for(maker, job_id, JobStatus.RUNNING)
+
+        await runner.stop(grace=0.05)
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.PENDING
+        assert job.attempts == 0
+        assert job.worker_id is None
+
+    async def test_builtin_purge_job(self, maker, runner: JobRunner):
+        """The built-in revoked token purge job deletes expired revocations."""
+        runner.registry = job_registry
+        async with maker() as session:
+            user = User(email="jobs@test.com", full_name="Jobs", hashed_password="x")
+            session.add(user)
+            await session.flush()
+            now = datetime.now(UTC)
+            session.add_all(
+                [
+                    RevokedToken(
+                        jti="expired",
+                        user_id=user.id,
+                        token_type="refresh",
+                        expires_at=now - timedelta(days=1),
+                    ),
+                    RevokedToken(
+                        jti="active",
+                        user_id=user.id,
+                        token_type="refresh",
+                        expires_at=now + timedelta(days=1),
+                    ),
+                ]
+            )
+            await session.commit()
+        job_id = await _enqueue(maker, job_registry, "revoked_tokens.purge")
+
+        await runner.run_pending()
+
+        job = await _get(maker, job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"deleted": 1}
+        assert job.max_attempts == 5  # noqa: PLR2004
+
+
+class TestScheduledJobs:
+    """Tests for periodic jobs enqueued by the runner."""
+
+    async def test_enqueues_once_per_interval(self, runner: JobRunner):
+        """A periodic kind is enqueued again only after its interval."""
+        runner.registry = job_registry
+        runner.schedules = {"fichajes.auto_close": 60}
+        now = datetime.now(UTC)
+
+        assert await runner.enqueue_scheduled(now) == ["fichajes.auto_close"]
+        assert await runner.enqueue_scheduled(now) == []
+
+        await runner.run_pending()
+        assert await runner.enqueue_scheduled(now + timedelta(seconds=30)) == []
+        assert await runner.enqueue_scheduled(now + timedelta(seconds=61)) == [
+            "fichajes.auto_close"
+        ]
+
+    async def test_auto_close_job(self, maker, runner: JobRunner):
+        """The periodic auto-close job closes forgotten check-ins."""
+        runner.registry = job_registry
+        runner.schedules = {"fichajes.auto_close": 60}
+        async with maker() as session:
+            user = User(email="jobs@test.com", full_name="Jobs", hashed_password="x")
+            session.add(user)
+            await session.flush()
+            session.add(Fichaje(user_id=user.id, check_in=datetime.now(UTC) - timedelta(days=1)))
+            await session.commit()
+
+        await runner.enqueue_scheduled()
+        await runner.run_pending()
+
+        async with maker() as session:
+            job = (await session.execute(select(Job))).scalar_one()
+            fichaje = (await session.execute(select(Fichaje))).scalar_one()
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"closed": 1}
+        assert job.max_attempts == 1
+        assert fichaje.status == FichajeStatus.PENDING_CORRECTION
+
+    def test_schedules_from_settings(self):
+        """The auto-close and partition schedules come from the settings; 0 disables them."""
+        runner = JobRunner.from_settings(Settings(fichaje_auto_close_interval_seconds=300))
+        assert runner.schedules == {"fichajes.auto_close": 300, "fichajes.partitions": 86400}
+
+        runner = JobRunner.from_settings(
+            Settings(fichaje_auto_close_interval_seconds=0, fichaje_partition_interval_seconds=0)
+        )
+        assert runner.schedules == {}
+
+    async def test_scheduler_task_enqueues(self, maker, runner: JobRunner):
+        """Starting the runner also starts the scheduler."""
+        runner.registry = job_registry
+        runner.schedules = {"fichajes.auto_close": 60}
+        runner.start()
+        try:
+            async with asyncio.timeout(5):
+                while True:
+                    async with maker() as session:
+                        job = (await session.execute(select(Job))).scalars().first()
+                    if job is not None and job.status == JobStatus.SUCCEEDED:
+                        break
+                    await asyncio.sleep(0.01)
+        finally:
+            await runner.stop()
+
+
+class TestJobCancellation:
+    """Tests for cancelling pending and running jobs."""
+
+    async def test_cancel_pending_job(self, maker, registry, runner: JobRunner):
+        """A pending job is cancelled immediately and never runs."""
+        job_id = await _enqueue(maker, registry, "test.sum", payload={"numbers": [1]})
+
+        async with maker() as session:
+            job = await JobService(session, registry).cancel_job(job_id)
+            await session.commit()
+
+        assert job.status == JobStatus.CANCELLED
+        assert await runner.run_pending() == 0
+
+    @pytest.mark.parametrize("kind", ["test.sleep", "test.steps"])
+    async def test_cancel_running_job(self, maker, registry, runner: JobRunner, kind: str):
+        """A running job stops on the next heartbeat or progress report."""
+        job_id = await _enqueue(maker, registry, kind)
+        runner.start()
+        try:
+            await _wait_for(maker, job_id, JobStatus.RUNNING)
+
+            async with maker() as session:
+                job = await JobService(session, registry).cancel_job(job_id)
+                await session.commit()
+            assert job.status == JobStatus.RUNNING
+            assert job.cancel_requested
+
+            job = await _wait_for(maker, job_id, JobStatus.CANCELLED)
+            assert job.finished_at is not None
+        finally:
+            await runner.stop()
+
+    async def test_cancel_finished_job_conflicts(self, maker, registry, runner: JobRunner):
+        """Finished jobs cannot be cancelled."""
+        job_id = await _enqueue(maker, registry, "test.sum", payload={"numbers": [1]})
+        await runner.run_pending()
+
+        async with maker() as session:
+            with pytest.raises(ConflictException):
+                await JobService(session, registry).cancel_job(job_id)
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+
+class TestJobsAPI:
+    """Tests for the /api/jobs endpoints."""
+
+    async def test_enqueue_job(self, hr_authenticated_client: AsyncClient, hr_user: User):
+        """HR enqueues a job and gets 202 with the pending job."""
+        response = await hr_authenticated_client.post(
+            "/api/jobs", json={"kind": "revoked_tokens.purge"}
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()
+        assert data["status"] == "pending"
+        assert data["progress"] == 0.0
+        assert data["created_by"] == hr_user.id
+        assert data["max_attempts"] == 5  # noqa: PLR2004
+
+    async def test_enqueue_unknown_kind(self, hr_authenticated_client: AsyncClient):
+        """Unknown job kinds are rejected."""
+        response = await hr_authenticated_client.post("/api/jobs", json={"kind": "nope"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_employee_cannot_use_jobs(self, authenticated_client: AsyncClient):
+        """Jobs are HR only."""
+        response = await authenticated_client.post(
+            "/api/jobs", json={"kind": "revoked_tokens.purge"}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_get_and_list_jobs(self, hr_authenticated_client: AsyncClient):
+        """A job can be fetched by ID and listed by status."""
+        created = await hr_authenticated_client.post(
+            "/api/jobs", json={"kind": "revoked_tokens.purge"}
+        )
+        job_id = created.json()["id"]
+
+        response = await hr_authenticated_client.get(f"/api/jobs/{job_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["kind"] == "revoked_tokens.purge"
+
+        response = await hr_authenticated_client.get("/api/jobs", params={"status": "pending"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [job["id"] for job in response.json()["jobs"]] == [job_id]
+        response = await hr_authenticated_client.get("/api/jobs", params={"status": "failed"})
+        assert response.json()["jobs"] == []
+
+    async def test_get_missing_job(self, hr_authenticated_client: AsyncClient):
+        """Unknown job IDs return 404."""
+        response = await hr_authenticated_client.get("/api/jobs/999")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_cancel_job(self, hr_authenticated_client: AsyncClient):
+        """Cancelling a pending job works once, then conflicts."""
+        created = await hr_authenticated_client.post(
+            "/api/jobs", json={"kind": "revoked_tokens.purge"}
+        )
+        job_id = created.json()["id"]
+
+        response = await hr_authenticated_client.post(f"/api/jobs/{job_id}/cancel")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "cancelled"
+
+        response = await hr_authenticated_client.post(f"/api/jobs/{job_id}/cancel")
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    async def test_list_job_kinds(self, hr_authenticated_client: AsyncClient):
+        """Registered kinds are listed with their description."""
+        response = await hr_authenticated_client.get("/api/jobs/kinds")
+
+        assert response.status_code == status.HTTP_200_OK
+        kinds = {kind["kind"]: kind for kind in response.json()}
+        assert "revoked_tokens.purge" in kinds
+        assert kinds["revoked_tokens.purge"]["description"]
@@ -0,0 +1,261 @@
+"""Tests for the monthly partitioning of fichaje and the check_in range filters."""
+
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from app.jobs import JobRunner, job_registry
+from app.models.fichaje import Fichaje
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.partitions import (
+    add_months,
+    create_month_partitions,
+    get_partitions,
+    is_partition_name,
+    partition_name,
+)
+from app.repositories.user_repository import UserRepository
+from app.services.fichaje_service import FichajeService
+from app.services.job_service import JobService
+
+Maker = async_sessionmaker[AsyncSession]
+
+BACKEND = Path(__file__).parent.parent
+BEFORE_PARTITIONING = "9a4c7e2f5b18"
+
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=UTC)
+
+
+async def _alembic(maker: Maker, *args: str) -> None:
+    """Run Alembic on the maker's database in a subprocess (env.py reads DATABASE_URL)."""
+    url = maker.kw["bind"].url.render_as_string(hide_password=False)
+    await asyncio.to_thread(
+        subprocess.run,
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND,
+        env={**os.environ, "DATABASE_URL": url},
+        check=True,
+        capture_output=True,
+    )
+
+
+async def _placement(session: AsyncSession) -> dict[int, str]:
+    """Table (partition) holding each fichaje, by id."""
+    result = await session.execute(text("SELECT id, tableoid::regclass::text FROM fichaje"))
+    return dict(result.tuples().all())
+
+
+# ============================================================================
+# NAMES AND MONTHS
+# ============================================================================
+
+
+class TestPartitionNames:
+    """Tests for the partition naming and month arithmetic."""
+
+    def test_partition_name(self):
+        """Monthly partitions are named after the table, year and month."""
+        assert partition_name("fichaje", date(2026, 3, 17)) == "fichaje_y2026m03"
+
+    def test_add_months_crosses_years(self):
+        """Adding months returns the first day of the month, across year boundaries."""
+        assert add_months(date(2026, 11, 20), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+        assert add_months(date(2026, 5, 1), 0) == date(2026, 5, 1)
+
+    def test_is_partition_name(self):
+        """Only monthly and default partitions of the table match."""
+        assert is_partition_name("fichaje", "fichaje_y2026m03")
+        assert is_partition_name("fichaje", "fichaje_default")
+        assert not is_partition_name("fichaje", "fichaje")
+        assert not is_partition_name("fichaje", "fichaje_unpartitioned")
+        assert not is_partition_name("fichaje", "solicitud_y2026m03")
+
+
+# ============================================================================
+# CHECK_IN RANGE FILTERS
+# ============================================================================
+
+
+class TestCheckInRangeFilters:
+    """Date filters are half-open check_in ranges in UTC (prunable, index-friendly)."""
+
+    async def test_day_boundaries(self, session: AsyncSession, employee_user: User):
+        """date_from and date_to include whole UTC days and nothing around them."""
+        for check_in in (
+            _utc(2026, 3, 1, 23, 30),
+            _utc(2026, 3, 2, 0, 0),
+            _utc(2026, 3, 2, 23, 0),
+            _utc(2026, 3, 3, 0, 0),
+        ):
+            session.add(
+                Fichaje(
+                    user_id=employee_user.id,
+                    check_in=check_in,
+                    check_out=check_in.replace(minute=30),
+                )
+            )
+        await session.commit()
+        repo = FichajeRepository(session)
+        day = date(2026, 3, 2)
+
+        rows = await repo.get_all(date_from=day, date_to=day)
+
+        assert [row.check_in.hour for row in rows] == [23, 0]
+        assert await repo.count(date_from=day, date_to=day) == 2  # noqa: PLR2004
+        assert await repo.count(date_from=day) == 3  # noqa: PLR2004
+        assert await repo.count(date_to=day) == 3  # noqa: PLR2004
+        assert await repo.calculate_total_hours(date_from=day, date_to=day) == 1.0
+
+
+# ============================================================================
+# FUTURE PARTITIONS
+# ============================================================================
+
+
+class TestCreatePartitions:
+    """Tests for the creation of future monthly partitions."""
+
+    @pytest.fixture
+    def postgresql_maker(self, concurrent_session_maker: Maker) -> Maker:
+        """Only the PostgreSQL run of the concurrent fixture: SQLite has no partitions."""
+        if concurrent_session_maker.kw["bind"].dialect.name != "postgresql":
+            pytest.skip("Partitioning needs PostgreSQL")
+        return concurrent_session_maker
+
+    async def test_unpartitioned_table_is_left_alone(self, session: AsyncSession):
+        """Without partitioning (SQLite) nothing is created."""
+        service = FichajeService(FichajeRepository(session), UserRepository(session))
+
+        assert await get_partitions(await session.connection(), "fichaje") is None
+        assert await service.create_partitions(months_ahead=3) == []
+
+    async def test_job(self, file_session_maker: Maker):
+        """The fichajes.partitions job stores the partitions it created."""
+        async with file_session_maker() as session:
+            await JobService(session).enqueue("fichajes.partitions")
+            await session.commit()
+
+        await JobRunner(file_session_maker, job_registry, concurrency=1).run_pending()
+
+        async with file_session_maker() as session:
+            job = (await session.execute(select(Job))).scalar_one()
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == {"created": []}
+
+    async def test_moves_rows_from_default_partition(self, postgresql_maker: Maker):
+        """Missing months are created and take their rows out of the default partition."""
+        async with postgresql_maker() as session:
+            await session.execute(text("DROP TABLE IF EXISTS probe"))
+            await session.execute(
+                text("CREATE TABLE probe (id int, at timestamptz NOT NULL) PARTITION BY RANGE (at)")
+            )
+            await session.execute(text("CREATE TABLE probe_default PARTITION OF probe DEFAULT"))
+            await session.execute(
+                text(
+                    "CREATE TABLE probe_y2026m03 PARTITION OF probe "
+                    "FOR VALUES FROM ('2026-03-01 00:00:00+00') TO ('2026-04-01 00:00:00+00')"
+                )
+            )
+            await session.execute(
+                text(
+                    "INSERT INTO probe VALUES (1, '2026-03-31 23:00:00+00'), "
+                    "(2, '2026-04-01 00:00:00+00'), (3, '2026-05-20 10:00:00+00')"
+                )
+            )
+
+            created = await create_month_partitions(
+                session, "probe", "at", date(2026, 3, 1), date(2026, 5, 1)
+            )
+            again = await create_month_partitions(
+                session, "probe", "at", date(2026, 3, 1), date(2026, 5, 1)
+            )
+            placement = dict(
+                (
+                    await session.execute(text("SELECT id, tableoid::regclass::text FROM probe"))
+                ).all()
+            )
+            await session.execute(text("DROP TABLE probe"))
+            await session.commit()
+
+        assert created == ["probe_y2026m04", "probe_y2026m05"]
+        assert again == []
+        assert placement == {1: "probe_y2026m03", 2: "probe_y2026m04", 3: "probe_y2026m05"}
+
+    async def test_migration_round_trip(self, postgresql_maker: Maker):
+        """The migration partitions fichaje keeping rows and ids, and its downgrade undoes it."""
+        engine = postgresql_maker.kw["bind"]
+        future = add_months(datetime.now(UTC).date(), 8)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+        try:
+            await _alembic(postgresql_maker, "upgrade", BEFORE_PARTITIONING)
+            async with postgresql_maker() as session:
+                await session.execute(
+                    text(
+                        'INSERT INTO "user" (email, full_name, hashed_password, role, is_active, '
+                        "dias_vacaciones_anuales, dias_vacaciones_disponibles, created_at, "
+                        "updated_at) VALUES ('p@test.com', 'P', '!', 'EMPLOYEE', true, 24, 24, "
+                        "now(), now())"
+                    )
+                )
+                await session.execute(
+                    text(
+                        "INSERT INTO fichaje (user_id, check_in, check_out, status, created_at, "
+                        "updated_at) SELECT id, at, NULL, 'VALID', now(), now() FROM \"user\", "
+                        "(VALUES (CAST(:old AS timestamp)), (CAST(:future AS timestamp))) AS v(at)"
+                    ),
+                    {
+                        # Columnas sin zona horaria: fechas UTC sin tzinfo
+                        "old": _utc(2024, 1, 15, 8).replace(tzinfo=None),
+                        "future": _utc(future.year, future.month, 10).replace(tzinfo=None),
+                    },
+                )
+                await session.commit()
+
+            await _alembic(postgresql_maker, "upgrade", "head")
+            async with postgresql_maker() as session:
+                before = await _placement(session)
+                # El id sigue saliendo de la misma secuencia
+                await session.execute(
+                    text(
+                        "INSERT INTO fichaje (user_id, check_in, status, created_at, updated_at) "
+                        "SELECT id, now(), 'VALID', now(), now() FROM \"user\""
+                    )
+                )
+                created = await create_month_partitions(
+                    session, "fichaje", "check_in", future, future
+                )
+                after = await _placement(session)
+                await session.commit()
+
+            await _alembic(postgresql_maker, "downgrade", BEFORE_PARTITIONING)
+            async with postgresql_maker() as session:
+                partitions = await get_partitions(await session.connection(), "fichaje")
+                ids = list(
+                    (await session.execute(text("SELECT id FROM fichaje ORDER BY id"))).scalars()
+                )
+        finally:
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+        assert before == {1: "fichaje_y2024m01", 2: "fichaje_default"}
+        assert created == [partition_name("fichaje", future)]
+        assert after[2] == partition_name("fichaje", future)
+        assert after[3] == partition_name("fichaje", datetime.now(UTC).date())
+        assert partitions is None
+        assert ids == [1, 2, 3]
@@ -0,0 +1,158 @@
+"""Tests for settings-driven password hashing, rehash on login and login timing."""
+
+import statistics
+import time
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import security
+from app.core.config import Settings
+from app.core.exceptions import AuthenticationException
+from app.core.security import build_password_context
+from app.models.user import User, UserRole
+from app.services.user_service import UserService
+
+
+def _context(**overrides):
+    """Password context built from settings with the given overrides."""
+    return build_password_context(Settings(**overrides))
+
+
+class TestPasswordContext:
+    """Tests for the password context built from settings."""
+
+    def test_uses_configured_bcrypt_rounds(self):
+        """New hashes use the configured cost."""
+        context = _context(bcrypt_rounds=5)
+
+        assert context.hash("password123").startswith("$2b$05$")
+
+    def test_cost_change_needs_update(self):
+        """Hashes with another cost are flagged for rehash in both directions."""
+        hashed = _context(bcrypt_rounds=5).hash("password123")
+
+        assert not _context(bcrypt_rounds=5).needs_update(hashed)
+        assert _context(bcrypt_rounds=6).needs_update(hashed)
+        assert _context(bcrypt_rounds=4).needs_update(hashed)
+
+    def test_argon2_without_backend_fails_fast(self):
+        """Choosing argon2 without argon2-cffi fails at startup, not at login."""
+        if security.argon2.has_backend():
+            pytest.skip("argon2 backend installed")
+
+        with pytest.raises(RuntimeError, match="argon2"):
+            _context(password_hash_scheme="argon2")
+
+    def test_argon2_migrates_bcrypt_hashes(self):
+        """With argon2id, bcrypt hashes still verify and are flagged for rehash."""
+        pytest.importorskip("argon2")
+        bcrypt_hash = _context(bcrypt_rounds=4).hash("password123")
+        context = _context(password_hash_scheme="argon2", argon2_memory_cost=1024)
+
+        verified, new_hash = context.verify_and_update("password123", bcrypt_hash)
+
+        assert verified
+        assert new_hash is not None
+        assert new_hash.startswith("$argon2id$")
+
+
+class TestRehashOnLogin:
+    """Tests for transparent rehash in UserService.authenticate_user."""
+
+    async def test_login_rehashes_outdated_hash(
+        self, client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A successful login replaces a hash made with an old cost."""
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=4))
+        user = User(
+            email="rehash@test.com",
+            full_name="Rehash User",
+            hashed_password=security.get_password_hash("password123"),
+            role=UserRole.EMPLOYEE,
+        )
+        session.add(user)
+        await session.commit()
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=5))
+
+        response = await client.post(
+            "/api/auth/login", json={"email": "rehash@test.com", "password": "password123"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert user.hashed_password.startswith("$2b$05$")
+        assert security.verify_password("password123", user.hashed_password)
+
+    async def test_failed_login_keeps_hash(
+        self, client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """A wrong password never touches the stored hash."""
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=4))
+        user = User(
+            email="rehash@test.com",
+            full_name="Rehash User",
+            hashed_password=security.get_password_hash("password123"),
+            role=UserRole.EMPLOYEE,
+        )
+        session.add(user)
+        await session.commit()
+        original = user.hashed_password
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=5))
+
+        response = await client.post(
+            "/api/auth/login", json={"email": "rehash@test.com", "password": "wrong-password"}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert user.hashed_password == original
+
+
+class TestLoginTiming:
+    """Tests for constant-time handling of unknown emails."""
+
+    SAMPLES = 25
+
+    @staticmethod
+    async def _time_failure(service: UserService, email: str) -> float:
+        """Time one failed authentication."""
+        start = time.perf_counter()
+        with pytest.raises(AuthenticationException):
+            await service.authenticate_user(email, "wrong-password")
+        return time.perf_counter() - start
+
+    async def test_unknown_email_latency_matches_wrong_password(
+        self, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Unknown emails and wrong passwords take overlapping times."""
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=8))
+        session.add(
+            User(
+                email="timing@test.com",
+                full_name="Timing User",
+                hashed_password=security.get_password_hash("password123"),
+                role=UserRole.EMPLOYEE,
+            )
+        )
+        await session.commit()
+        service = UserService(session)
+        await self._time_failure(service, "warmup@test.com")
+
+        # Intercalados para que el ruido de la máquina afecte por igual a ambos
+        known, unknown = [], []
+        for _ in range(self.SAMPLES):
+            known.append(await self._time_failure(service, "timing@test.com"))
+            unknown.append(await self._time_failure(service, "nobody@test.com"))
+
+        assert min(unknown) <= max(known)
+        assert min(known) <= max(unknown)
+        ratio = statistics.median(unknown) / statistics.median(known)
+        assert 0.75 < ratio < 1.33  # noqa: PLR2004
+
+    async def test_dummy_hash_follows_context(self, monkeypatch: pytest.MonkeyPatch):
+        """The dummy hash is regenerated with the current hashing parameters."""
+        monkeypatch.setattr(security, "pwd_context", _context(bcrypt_rounds=5))
+
+        assert security.dummy_password_hash().startswith("$2b$05$")
+        assert security.dummy_password_hash() == security.dummy_password_hash()
@@ -0,0 +1,389 @@
+"""Query-count tests for write and list endpoints.
+
+Each write endpoint must emit a single INSERT/UPDATE per mutated row and must
+not read the row back after writing it. List endpoints must select only the
+columns they show, joining `user` instead of loading full user rows.
+"""
+
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.presence import presence_roster
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> Generator[list[str]]:
+    """Record every SQL statement sent to the test database."""
+    recorded: list[str] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        recorded.append(statement.strip())
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield recorded
+    event.remove(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def pending_solicitud(session: AsyncSession, employee_user: User) -> Solicitud:
+    """Create a pending vacation request for employee."""
+    today = datetime.now(UTC).date()
+    solicitud = Solicitud(
+        user_id=employee_user.id,
+        tipo=SolicitudTipo.VACATION,
+        fecha_inicio=today + timedelta(days=10),
+        fecha_fin=today + timedelta(days=14),
+        dias_solicitados=5,
+        motivo="Vacaciones de verano planificadas",
+        status=SolicitudStatus.PENDING,
+    )
+    session.add(solicitud)
+    await session.commit()
+    return solicitud
+
+
+def _writes(recorded: list[str]) -> list[str]:
+    """Return the INSERT/UPDATE/DELETE statements."""
+    return [s for s in recorded if s.split(None, 1)[0].upper() in {"INSERT", "UPDATE", "DELETE"}]
+
+
+def _reads_after_first_write(recorded: list[str]) -> list[str]:
+    """Return the SELECT statements issued after the first write."""
+    writes = _writes(recorded)
+    if not writes:
+        return []
+    first_write = recorded.index(writes[0])
+    return [s for s in recorded[first_write:] if s.upper().startswith("SELECT")]
+
+
+# ============================================================================
+# TEST CLASSES
+# ============================================================================
+
+
+class TestFichajeWriteQueries:
+    """Query counts for fichaje write endpoints."""
+
+    async def test_check_in_single_insert(
+        self, authenticated_client: AsyncClient, statements: list[str]
+    ):
+        """Check-in inserts the row once and does not read it back."""
+        statements.clear()
+        response = await authenticated_client.post("/api/fichajes/check-in", json={})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("INSERT INTO fichaje")
+        assert _reads_after_first_write(statements) == []
+
+    async def test_check_out_single_update(
+        self,
+        authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        statements: list[str],
+    ):
+        """Check-out updates the row once and does not read it back."""
+        session.add(
+            Fichaje(
+                user_id=employee_user.id,
+                check_in=datetime.now(UTC) - timedelta(hours=2),
+                status=FichajeStatus.VALID,
+            )
+        )
+        await session.commit()
+
+        statements.clear()
+        response = await authenticated_client.post("/api/fichajes/check-out", json={})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["check_out"] is not None
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE fichaje")
+        assert _reads_after_first_write(statements) == []
+
+    async def test_approve_correction_single_update(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        hr_user: User,
+        statements: list[str],
+    ):
+        """Approving a correction updates the row once and reuses the approver."""
+        fichaje = Fichaje(
+            user_id=employee_user.id,
+            check_in=datetime.now(UTC) - timedelta(hours=8),
+            check_out=datetime.now(UTC),
+            status=FichajeStatus.PENDING_CORRECTION,
+            correction_reason="Olvidé fichar a la hora correcta",
+            correction_requested_at=datetime.now(UTC),
+        )
+        session.add(fichaje)
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.post(
+            f"/api/fichajes/{fichaje.id}/approve",
+            json={"approved": True, "approval_notes": "Aprobado"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["approved_by"] == hr_user.id
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE fichaje")
+        assert _reads_after_first_write(statements) == []
+
+    @pytest.mark.parametrize("count", [1, 25])
+    async def test_bulk_approve_constant_statements(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        statements: list[str],
+        count: int,
+    ):
+        """Bulk approval reads twice and writes once (executemany) whatever the batch size."""
+        start = datetime.now(UTC) - timedelta(days=count + 1)
+        fichajes = [
+            Fichaje(
+                user_id=employee_user.id,
+                check_in=start + timedelta(days=i),
+                status=FichajeStatus.PENDING_CORRECTION,
+                proposed_check_in=start + timedelta(days=i),
+                proposed_check_out=start + timedelta(days=i, hours=8),
+            )
+            for i in range(count)
+        ]
+        session.add_all(fichajes)
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.post(
+            "/api/fichajes/bulk-approve",
+            json={"items": [{"fichaje_id": f.id, "approved": True} for f in fichajes]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["approved"] == count
+        reads = [s for s in statements if s.upper().startswith("SELECT")]
+        assert len(reads) == 2  # noqa: PLR2004
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE fichaje")
+        assert _reads_after_first_write(statements) == []
+
+
+class TestSolicitudWriteQueries:
+    """Query counts for solicitud write endpoints."""
+
+    async def test_create_single_insert(
+        self, authenticated_client: AsyncClient, statements: list[str]
+    ):
+        """Creating a request inserts the row once and does not read it back."""
+        today = datetime.now(UTC).date()
+        statements.clear()
+        response = await authenticated_client.post(
+            "/api/vacaciones/",
+            json={
+                "tipo": "vacation",
+                "fecha_inicio": (today + timedelta(days=30)).isoformat(),
+                "fecha_fin": (today + timedelta(days=32)).isoformat(),
+                "motivo": "Vacaciones de otoño con la familia",
+            },
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["user_email"] == "employee@test.com"
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("INSERT INTO solicitud")
+        assert _reads_after_first_write(statements) == []
+
+    async def test_cancel_single_update(
+        self,
+        authenticated_client: AsyncClient,
+        pending_solicitud: Solicitud,
+        statements: list[str],
+    ):
+        """Cancelling updates the row once and does not read it back."""
+        statements.clear()
+        response = await authenticated_client.post(f"/api/vacaciones/{pending_solicitud.id}/cancel")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "cancelled"
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE solicitud")
+        assert _reads_after_first_write(statements) == []
+
+    async def test_review_approve_one_update_per_row(
+        self,
+        hr_authenticated_client: AsyncClient,
+        pending_solicitud: Solicitud,
+        statements: list[str],
+    ):
+        """Approving updates the request and the balance once each, with no re-reads."""
+        statements.clear()
+        response = await hr_authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/review",
+            json={"approved": True, "comentarios_revision": "Aprobada"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "approved"
+        assert data["reviewed_by_name"] == "Test HR"
+        writes = _writes(statements)
+        assert sorted(w.split()[1] for w in writes) == ["solicitud", "user"]
+        assert _reads_after_first_write(statements) == []
+
+    async def test_review_reject_single_update(
+        self,
+        hr_authenticated_client: AsyncClient,
+        pending_solicitud: Solicitud,
+        statements: list[str],
+    ):
+        """Rejecting only updates the request row."""
+        statements.clear()
+        response = await hr_authenticated_client.post(
+            f"/api/vacaciones/{pending_solicitud.id}/review",
+            json={"approved": False, "comentarios_revision": "Conflicto con proyecto"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        writes = _writes(statements)
+        assert len(writes) == 1
+        assert writes[0].startswith("UPDATE solicitud")
+        assert _reads_after_first_write(statements) == []
+
+    @pytest.mark.parametrize("count", [1, 25])
+    async def test_bulk_review_constant_statements(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        statements: list[str],
+        count: int,
+    ):
+        """Bulk review issues the same statements whatever the batch size."""
+        today = datetime.now(UTC).date()
+        solicitudes = [
+            Solicitud(
+                user_id=employee_user.id,
+                tipo=SolicitudTipo.VACATION,
+                fecha_inicio=today + timedelta(days=10 + 2 * i),
+                fecha_fin=today + timedelta(days=10 + 2 * i),
+                dias_solicitados=1,
+                motivo="Vacaciones para revisión masiva",
+                status=SolicitudStatus.PENDING,
+            )
+            for i in range(count)
+        ]
+        session.add_all(solicitudes)
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/bulk-review",
+            json={"items": [{"solicitud_id": s.id, "approved": True} for s in solicitudes]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["approved"] == count
+        reads = [s for s in statements if s.upper().startswith("SELECT")]
+        assert [r.split("FROM", 1)[1].split()[0] for r in reads] == ["solicitud", "user"]
+        assert [w.split()[1] for w in _writes(statements)] == ["solicitud", "user"]
+        assert _reads_after_first_write(statements) == []
+
+
+class TestListQueries:
+    """Column projection for list endpoints."""
+
+    async def test_fichajes_list_projects_user_columns(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        statements: list[str],
+    ):
+        """The fichaje listing joins user and never loads full user rows."""
+        session.add(
+            Fichaje(
+                user_id=employee_user.id,
+                check_in=datetime.now(UTC) - timedelta(hours=8),
+                check_out=datetime.now(UTC),
+                status=FichajeStatus.VALID,
+            )
+        )
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.get("/api/fichajes/")
+
+        assert response.status_code == status.HTTP_200_OK
+        item = response.json()["fichajes"][0]
+        assert item["user_email"] == "employee@test.com"
+        assert item["hours_worked"] == 8.0  # noqa: PLR2004
+        assert not any("hashed_password" in s for s in statements)
+        assert any("JOIN user" in s for s in statements)
+
+    async def test_solicitudes_list_projects_reviewer_name(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        pending_solicitud: Solicitud,
+        hr_user: User,
+        statements: list[str],
+    ):
+        """The request listing reads the reviewer name through a join."""
+        pending_solicitud.status = SolicitudStatus.REJECTED
+        pending_solicitud.reviewed_by = hr_user.id
+        session.add(pending_solicitud)
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.get("/api/vacaciones/")
+
+        assert response.status_code == status.HTTP_200_OK
+        item = response.json()["solicitudes"][0]
+        assert item["user_full_name"] == "Test Employee"
+        assert item["reviewed_by_name"] == "Test HR"
+        assert item["is_pending"] is False
+        assert not any("hashed_password" in s for s in statements)
+
+    async def test_presence_served_from_memory(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        hr_user: User,
+        statements: list[str],
+    ):
+        """The presence roster is answered without touching the database."""
+        presence_roster.clear()
+        await hr_authenticated_client.post("/api/fichajes/check-in", json={})
+        await session.commit()
+
+        statements.clear()
+        response = await hr_authenticated_client.get("/api/fichajes/presence")
+        presence_roster.clear()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["present"][0]["user_id"] == hr_user.id
+        assert statements == []
@@ -0,0 +1,175 @@
+"""Tests for login rate limiting."""
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.core import rate_limit, security
+from app.core.config import Settings
+from app.core.exceptions import RateLimitException
+from app.core.rate_limit import InMemoryTokenBuckets, LoginRateLimiter, login_rate_limiter
+from app.models.user import User
+from app.services import user_service
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Freeze the clock used by the token buckets."""
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def fast_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use the cheapest bcrypt cost for the dummy hash of unknown emails."""
+    monkeypatch.setattr(
+        security, "pwd_context", security.build_password_context(Settings(bcrypt_rounds=4))
+    )
+
+
+@pytest.fixture
+def verifications(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record every password verification done by the login."""
+    calls: list[str] = []
+    original = user_service.verify_and_update_password_async
+
+    async def counting(plain_password: str, hashed_password: str):
+        calls.append(plain_password)
+        return await original(plain_password, hashed_password)
+
+    monkeypatch.setattr(user_service, "verify_and_update_password_async", counting)
+    return calls
+
+
+async def _login(client: AsyncClient, email: str, password: str = "wrong-password"):
+    """Send a login attempt."""
+    return await client.post("/api/auth/login", json={"email": email, "password": password})
+
+
+class TestTokenBuckets:
+    """Tests for the in-memory token buckets."""
+
+    @pytest.mark.usefixtures("clock")
+    async def test_burst_then_reject(self):
+        """A bucket allows `capacity` takes and then reports the wait."""
+        buckets = InMemoryTokenBuckets()
+
+        results = [await buckets.take("k", capacity=3, refill_per_second=0.5) for _ in range(4)]
+
+        assert results[:3] == [0.0, 0.0, 0.0]
+        assert results[3] == pytest.approx(2.0)
+
+    async def test_refill_over_time(self, clock: FakeClock):
+        """Tokens come back at the refill rate, up to the capacity."""
+        buckets = InMemoryTokenBuckets()
+        for _ in range(3):
+            await buckets.take("k", capacity=3, refill_per_second=1.0)
+
+        clock.now += 1
+        assert await buckets.take("k", capacity=3, refill_per_second=1.0) == 0.0
+        assert await buckets.take("k", capacity=3, refill_per_second=1.0) > 0
+
+    @pytest.mark.usefixtures("clock")
+    async def test_keys_are_bounded(self):
+        """The number of buckets never exceeds max_keys."""
+        buckets = InMemoryTokenBuckets(max_keys=10)
+
+        for i in range(100):
+            await buckets.take(f"k{i}", capacity=3, refill_per_second=1.0)
+
+        assert len(buckets) <= 10  # noqa: PLR2004
+
+    async def test_ip_limit_does_not_consume_email(self, clock: FakeClock):
+        """A blocked IP cannot drain the attempts of someone else's account."""
+        limiter = LoginRateLimiter(
+            InMemoryTokenBuckets(),
+            ip_capacity=1,
+            ip_per_minute=0.5,
+            email_capacity=1,
+            email_per_minute=1,
+        )
+        await limiter.check("10.0.0.1", "victim@test.com")
+
+        clock.now += 60
+        with pytest.raises(RateLimitException):
+            await limiter.check("10.0.0.1", "victim@test.com")
+        await limiter.check("10.0.0.2", "victim@test.com")
+
+        assert limiter.metrics.rejected_ip == 1
+        assert limiter.metrics.rejected_email == 0
+
+
+@pytest.mark.usefixtures("clock", "fast_hashing")
+class TestLoginRateLimit:
+    """Tests for rate limiting on POST /api/auth/login."""
+
+    async def test_email_limit_returns_429(
+        self, client: AsyncClient, employee_user: User, verifications: list[str]
+    ):
+        """Past the email burst, login answers 429 without verifying passwords."""
+        burst = login_rate_limiter.email_capacity
+        for _ in range(burst):
+            response = await _login(client, employee_user.email)
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = await _login(client, employee_user.email, password="password123")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
+        assert len(verifications) == burst
+
+    async def test_email_limit_is_case_insensitive(self, client: AsyncClient, employee_user: User):
+        """Changing the case of the email does not reset the bucket."""
+        for _ in range(login_rate_limiter.email_capacity):
+            await _login(client, employee_user.email)
+
+        response = await _login(client, employee_user.email.upper())
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    async def test_ip_limit_across_emails(self, client: AsyncClient):
+        """Credential stuffing over many emails is limited by IP."""
+        for i in range(login_rate_limiter.ip_capacity):
+            await _login(client, f"user{i}@test.com")
+
+        response = await _login(client, "another@test.com")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    async def test_metrics_endpoint(
+        self, hr_authenticated_client: AsyncClient, employee_user: User
+    ):
+        """The metrics endpoint reports allowed and rejected attempts."""
+        for _ in range(login_rate_limiter.email_capacity + 1):
+            await _login(hr_authenticated_client, employee_user.email)
+
+        response = await hr_authenticated_client.get("/api/auth/login-rate-limit")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["allowed"] == login_rate_limiter.email_capacity
+        assert data["rejected_email"] == 1
+        assert data["tracked_keys"] == 2  # noqa: PLR2004
+
+    async def test_metrics_endpoint_requires_authentication(self, client: AsyncClient):
+        """The metrics are not public."""
+        response = await client.get("/api/auth/login-rate-limit")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_metrics_endpoint_is_hr_only(self, authenticated_client: AsyncClient):
+        """Employees cannot read the metrics."""
+        response = await authenticated_client.get("/api/auth/login-rate-limit")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
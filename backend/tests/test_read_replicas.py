@@ -0,0 +1,322 @@
+"""Tests for read-replica routing of GET endpoints.
+
+Two SQLite files stand in for the primary and the replica. Replication is
+simulated by seeding both with the same users; rows that only exist in one
+of them reveal which database served a request.
+"""
+
+import time
+from collections.abc import AsyncGenerator
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app import database
+from app.core.absence_calendar import absence_calendar_cache
+from app.core.exceptions import ConflictException
+from app.core.security import create_access_token
+from app.database import (
+    SESSION_READ_ROUTER_KEY,
+    SESSION_USER_ID_KEY,
+    SESSION_WRITES_KEY,
+    ReadReplicaRouter,
+    get_read_router,
+)
+from app.main import app
+from app.models.fichaje import Fichaje, FichajeStatus
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User, UserRole
+
+EMPLOYEE_ID = 1
+OTHER_ID = 2
+HR_ID = 3
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+async def _make_database(path: Path, notes: str) -> async_sessionmaker[AsyncSession]:
+    """Create a SQLite database with the shared users and one marker fichaje."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    async with maker() as session:
+        for user_id, role in (
+            (EMPLOYEE_ID, UserRole.EMPLOYEE),
+            (OTHER_ID, UserRole.EMPLOYEE),
+            (HR_ID, UserRole.HR),
+        ):
+            session.add(
+                User(
+                    id=user_id,
+                    email=f"user{user_id}@test.com",
+                    full_name=f"User {user_id}",
+                    hashed_password="!",
+                    role=role,
+                )
+            )
+        for user_id in (EMPLOYEE_ID, OTHER_ID):
+            session.add(
+                Fichaje(
+                    user_id=user_id,
+                    check_in=datetime.now(UTC) - timedelta(days=1, hours=8),
+                    check_out=datetime.now(UTC) - timedelta(days=1),
+                    status=FichajeStatus.VALID,
+                    notes=notes,
+                )
+            )
+        await session.commit()
+    return maker
+
+
+@pytest.fixture
+async def replica_router(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[ReadReplicaRouter]:
+    """Point the app at a primary and a replica SQLite file."""
+    primary = await _make_database(tmp_path / "primary.db", "primary")
+    replica = await _make_database(tmp_path / "replica.db", "replica")
+
+    router = ReadReplicaRouter(replicas=[replica], read_your_writes_seconds=60)
+    monkeypatch.setattr(database, "AsyncSessionLocal", primary)
+    app.dependency_overrides[get_read_router] = lambda: router
+
+    yield router
+
+    app.dependency_overrides.clear()
+    for maker in (primary, replica):
+        await maker.kw["bind"].dispose()
+
+
+@pytest.fixture
+async def api() -> AsyncGenerator[AsyncClient]:
+    """HTTP client without session overrides."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+    ) as client:
+        yield client
+
+
+def _auth(user_id: int) -> dict[str, str]:
+    """Authorization header for the given user."""
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+
+
+async def _served_by(api: AsyncClient, user_id: int) -> str:
+    """Return which database served the user's fichaje listing."""
+    response = await api.get("/api/fichajes/me", headers=_auth(user_id))
+    assert response.status_code == status.HTTP_200_OK
+    notes = {f["notes"] for f in response.json()["fichajes"] if f["notes"]}
+    assert len(notes) == 1
+    return notes.pop()
+
+
+# ============================================================================
+# TEST CLASSES
+# ============================================================================
+
+
+class TestReadReplicaRouting:
+    """Tests for routing GET endpoints to the replica."""
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_get_endpoints_use_replica(self, api: AsyncClient):
+        """Reads go to the replica when the user has not written."""
+        assert await _served_by(api, EMPLOYEE_ID) == "replica"
+
+        response = await api.get("/api/users/", headers=_auth(HR_ID))
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await api.get("/api/vacaciones/me", headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_read_your_writes_falls_back_to_primary(self, api: AsyncClient):
+        """After writing, the same user reads from the primary."""
+        response = await api.post("/api/fichajes/check-in", json={}, headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = await api.get("/api/fichajes/me/active", headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_200_OK
+
+        # Other users keep reading from the replica
+        assert await _served_by(api, OTHER_ID) == "replica"
+
+    async def test_replica_again_after_window(
+        self, replica_router: ReadReplicaRouter, api: AsyncClient
+    ):
+        """Once the window expires, reads go back to the replica."""
+        replica_router.read_your_writes_seconds = 0
+        response = await api.post("/api/fichajes/check-in", json={}, headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert await _served_by(api, EMPLOYEE_ID) == "replica"
+
+    async def test_read_your_writes_across_workers(
+        self, replica_router: ReadReplicaRouter, api: AsyncClient
+    ):
+        """A write handled by one worker pins the reads handled by another."""
+        response = await api.post("/api/fichajes/check-in", json={}, headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_201_CREATED
+        assert ReadReplicaRouter.COOKIE_NAME in response.cookies
+
+        # Otro worker: otra instancia del router, sin nada en memoria
+        app.dependency_overrides[get_read_router] = lambda: ReadReplicaRouter(
+            replicas=replica_router.replicas, read_your_writes_seconds=60
+        )
+
+        assert await _served_by(api, EMPLOYEE_ID) == "primary"
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_failed_commit_sets_no_cookie(self, monkeypatch: pytest.MonkeyPatch):
+        """A write whose commit fails does not open the read-your-writes window."""
+
+        async def failing_commit(_self: AsyncSession) -> None:
+            # Un error con handler propio: la respuesta pasa por el middleware
+            msg = "serialization failure"
+            raise ConflictException(msg)
+
+        monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+        async with AsyncClient(
+            transport=ASGITransport(app=app, raise_app_exceptions=False), base_url="http://test"
+        ) as api:
+            response = await api.post("/api/fichajes/check-in", json={}, headers=_auth(EMPLOYEE_ID))
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert ReadReplicaRouter.COOKIE_NAME not in response.cookies
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_absence_calendar_reads_primary(self, api: AsyncClient):
+        """Calendar months are cached per process, so they are never read from a replica."""
+        async with database.AsyncSessionLocal() as session:
+            session.add(
+                Solicitud(
+                    user_id=EMPLOYEE_ID,
+                    tipo=SolicitudTipo.VACATION,
+                    fecha_inicio=date(2026, 3, 2),
+                    fecha_fin=date(2026, 3, 3),
+                    dias_solicitados=2,
+                    motivo="Solo en el primario",
+                    status=SolicitudStatus.APPROVED,
+                )
+            )
+            await session.commit()
+        absence_calendar_cache.clear()
+
+        response = await api.get(
+            "/api/vacaciones/calendar",
+            params={"fecha_desde": "2026-03-01", "fecha_hasta": "2026-03-31"},
+            headers=_auth(HR_ID),
+        )
+        absence_calendar_cache.clear()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["absences"]) == 1
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_requests_without_writes_do_not_pin_primary(self, api: AsyncClient):
+        """Requests without writes do not count as writes."""
+        response = await api.post("/api/fichajes/check-out", json={}, headers=_auth(EMPLOYEE_ID))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        assert await _served_by(api, EMPLOYEE_ID) == "replica"
+
+    @pytest.mark.usefixtures("replica_router")
+    async def test_without_replicas_reads_primary(self, api: AsyncClient):
+        """With no replicas configured every read goes to the primary."""
+        app.dependency_overrides[get_read_router] = lambda: ReadReplicaRouter(
+            replicas=[], read_your_writes_seconds=60
+        )
+
+        assert await _served_by(api, EMPLOYEE_ID) == "primary"
+
+
+class TestReadReplicaRouter:
+    """Unit tests for ReadReplicaRouter."""
+
+    def test_use_primary_window(self):
+        """A write token pins its user to the primary only during the window."""
+        router = ReadReplicaRouter(replicas=[async_sessionmaker()], read_your_writes_seconds=60)
+        token = router.write_token(EMPLOYEE_ID)
+
+        assert router.use_primary(EMPLOYEE_ID, None) is False
+        assert router.use_primary(EMPLOYEE_ID, token) is True
+        assert router.use_primary(OTHER_ID, token) is False
+        assert (
+            router.use_primary(EMPLOYEE_ID, router.write_token(EMPLOYEE_ID, time.time() - 61))
+            is False
+        )
+
+        router.read_your_writes_seconds = 0
+        assert router.use_primary(EMPLOYEE_ID, token) is False
+
+    def test_token_is_shared_between_routers(self):
+        """Routers with the same key (other workers) accept the token; forged ones are ignored."""
+        writer = ReadReplicaRouter(
+            replicas=[async_sessionmaker()], read_your_writes_seconds=60, secret_key="k"
+        )
+        reader = ReadReplicaRouter(
+            replicas=[async_sessionmaker()], read_your_writes_seconds=60, secret_key="k"
+        )
+        other_key = ReadReplicaRouter(
+            replicas=[async_sessionmaker()], read_your_writes_seconds=60, secret_key="x"
+        )
+        token = writer.write_token(EMPLOYEE_ID)
+        _, written_at, signature = token.split(":")
+
+        assert reader.use_primary(EMPLOYEE_ID, token) is True
+        assert other_key.use_primary(EMPLOYEE_ID, token) is False
+        assert reader.use_primary(OTHER_ID, f"{OTHER_ID}:{written_at}:{signature}") is False
+        assert reader.use_primary(EMPLOYEE_ID, "garbage") is False
+
+    async def test_replicas_round_robin(self):
+        """Replica sessions are handed out in round-robin order."""
+        first = create_async_engine("sqlite+aiosqlite://")
+        second = create_async_engine("sqlite+aiosqlite://")
+        router = ReadReplicaRouter(
+            replicas=[async_sessionmaker(first), async_sessionmaker(second)],
+            read_your_writes_seconds=60,
+        )
+
+        binds = [router.replica_session().bind for _ in range(4)]
+
+        assert binds == [first, second, first, second]
+
+
+class TestWriteRecording:
+    """Writes are recorded for the cookie only once the outer transaction commits."""
+
+    @staticmethod
+    async def _write(session: AsyncSession, notes: str) -> None:
+        session.add(Fichaje(user_id=EMPLOYEE_ID, check_in=datetime.now(UTC), notes=notes))
+        await session.flush()
+
+    async def test_recorded_on_commit_only(self, replica_router: ReadReplicaRouter):
+        """Flushing, releasing a savepoint or rolling back records nothing; committing does."""
+        writes: list[tuple[ReadReplicaRouter, int]] = []
+        async with database.AsyncSessionLocal() as session:
+            session.info.update(
+                {
+                    SESSION_READ_ROUTER_KEY: replica_router,
+                    SESSION_USER_ID_KEY: EMPLOYEE_ID,
+                    SESSION_WRITES_KEY: writes,
+                }
+            )
+
+            await self._write(session, "rolled back")
+            await session.rollback()
+            async with session.begin_nested():
+                await self._write(session, "savepoint")
+            assert writes == []
+
+            await session.commit()
+
+        assert writes == [(replica_router, EMPLOYEE_ID)]
@@ -0,0 +1,230 @@
+"""Tests for refresh-token rotation and server-side revocation."""
+
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.revocation import BloomFilter, RevocationStore, revocation_store
+from app.core.security import create_refresh_token
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def clear_revocation_store() -> Generator[None]:
+    """Start every test with an empty in-memory revocation store."""
+    revocation_store.clear()
+    yield
+    revocation_store.clear()
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> Generator[list[str]]:
+    """Record every SQL statement sent to the test database."""
+    recorded: list[str] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, *_args):
+        recorded.append(statement.strip())
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield recorded
+    event.remove(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _login(client: AsyncClient) -> dict:
+    """Log in as the employee and return the token pair."""
+    response = await client.post(
+        "/api/auth/login", json={"email": "employee@test.com", "password": "password123"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def _bearer(token: str) -> dict[str, str]:
+    """Authorization header for a token."""
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ============================================================================
+# TEST CLASSES
+# ============================================================================
+
+
+class TestRefresh:
+    """Tests for POST /api/auth/refresh."""
+
+    async def test_login_returns_refresh_token(self, client: AsyncClient, employee_user: User):
+        """Login returns both an access token and a refresh token."""
+        tokens = await _login(client)
+
+        assert tokens["access_token"]
+        assert tokens["refresh_token"]
+        assert tokens["refresh_token"] != tokens["access_token"]
+
+    async def test_refresh_rotates_tokens(self, client: AsyncClient, employee_user: User):
+        """Refreshing returns a new usable pair."""
+        tokens = await _login(client)
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["refresh_token"] != tokens["refresh_token"]
+        assert data["user"]["id"] == employee_user.id
+        me = await client.get("/api/auth/me", headers=_bearer(data["access_token"]))
+        assert me.status_code == status.HTTP_200_OK
+
+    async def test_refresh_token_reuse_rejected(self, client: AsyncClient, employee_user: User):
+        """A refresh token can only be used once."""
+        tokens = await _login(client)
+        body = {"refresh_token": tokens["refresh_token"]}
+
+        first = await client.post("/api/auth/refresh", json=body)
+        second = await client.post("/api/auth/refresh", json=body)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_reuse_rejected_after_memory_reset(
+        self, client: AsyncClient, employee_user: User
+    ):
+        """Revocations are read back from the database (e.g. by another process)."""
+        tokens = await _login(client)
+        body = {"refresh_token": tokens["refresh_token"]}
+        await client.post("/api/auth/refresh", json=body)
+
+        revocation_store.clear()
+        response = await client.post("/api/auth/refresh", json=body)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_access_token_cannot_refresh(self, client: AsyncClient, employee_user: User):
+        """An access token is not accepted as a refresh token."""
+        tokens = await _login(client)
+
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["access_token"]}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_refresh_token_cannot_access(self, client: AsyncClient, employee_user: User):
+        """A refresh token is not accepted as an access token."""
+        token = create_refresh_token({"sub": str(employee_user.id)})
+
+        response = await client.get("/api/auth/me", headers=_bearer(token))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_refresh_inactive_user(self, client: AsyncClient, inactive_user: User):
+        """Inactive users cannot refresh."""
+        token = create_refresh_token({"sub": str(inactive_user.id)})
+
+        response = await client.post("/api/auth/refresh", json={"refresh_token": token})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestLogoutRevocation:
+    """Tests for server-side revocation on POST /api/auth/logout."""
+
+    async def test_logout_revokes_access_token(self, client: AsyncClient, employee_user: User):
+        """The access token is rejected after logout."""
+        tokens = await _login(client)
+        headers = _bearer(tokens["access_token"])
+
+        logout = await client.post("/api/auth/logout", headers=headers)
+        me = await client.get("/api/auth/me", headers=headers)
+
+        assert logout.status_code == status.HTTP_200_OK
+        assert me.status_code == status.HTTP_401_UNAUTHORIZED
+        assert me.json()["detail"] == "Token revocado"
+
+    async def test_logout_revokes_refresh_token(self, client: AsyncClient, employee_user: User):
+        """The refresh token sent on logout cannot be used afterwards."""
+        tokens = await _login(client)
+
+        await client.post(
+            "/api/auth/logout",
+            headers=_bearer(tokens["access_token"]),
+            json={"refresh_token": tokens["refresh_token"]},
+        )
+        response = await client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_logout_rejects_foreign_refresh_token(
+        self, client: AsyncClient, employee_user: User, hr_user: User
+    ):
+        """A refresh token of another user is not revoked on logout."""
+        tokens = await _login(client)
+        foreign = create_refresh_token({"sub": str(hr_user.id)})
+
+        response = await client.post(
+            "/api/auth/logout",
+            headers=_bearer(tokens["access_token"]),
+            json={"refresh_token": foreign},
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestRevocationStore:
+    """Tests for the in-memory front of the revocation store."""
+
+    async def test_valid_token_check_runs_no_query(
+        self, client: AsyncClient, employee_user: User, statements: list[str]
+    ):
+        """Once synced, checking a non-revoked token does not query revoked_token."""
+        tokens = await _login(client)
+        headers = _bearer(tokens["access_token"])
+        await client.get("/api/auth/me", headers=headers)
+
+        statements.clear()
+        response = await client.get("/api/auth/me", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not [s for s in statements if "revoked_token" in s]
+
+    async def test_sync_loads_revocations_from_database(
+        self, session: AsyncSession, employee_user: User
+    ):
+        """A store picks up revocations written by other processes."""
+        session.add(
+            RevokedToken(
+                jti="revoked-elsewhere",
+                user_id=employee_user.id,
+                token_type="access",
+                expires_at=datetime.now(UTC) + timedelta(minutes=5),
+            )
+        )
+        await session.commit()
+        store = RevocationStore(sync_interval=0)
+
+        assert await store.is_revoked(session, "revoked-elsewhere")
+        assert not await store.is_revoked(session, "never-revoked")
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert bloom.count <= len(items)
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 300  # noqa: PLR2004
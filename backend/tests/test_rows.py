@@ -0,0 +1,64 @@
+"""Tests for the read-only row dataclasses built from Core results."""
+
+import dataclasses
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.repositories.fichaje_repository import FichajeRepository
+from app.repositories.rows import FichajeRow, SolicitudRow, UserSnapshot
+from app.repositories.solicitud_repository import SolicitudRepository
+from app.repositories.user_repository import UserRepository
+
+
+def _field_names(cls: type) -> list[str]:
+    """Return the dataclass field names in declaration order."""
+    return [f.name for f in dataclasses.fields(cls)]
+
+
+class TestRowColumns:
+    """Rows are built by position, so queries must select fields in order."""
+
+    def test_fichaje_row_columns_match_fields(self, session: AsyncSession):
+        """The fichaje row query selects the FichajeRow fields in order."""
+        statement = FichajeRepository(session)._row_statement()
+
+        assert [c.name for c in statement.selected_columns] == _field_names(FichajeRow)
+
+    def test_solicitud_row_columns_match_fields(self, session: AsyncSession):
+        """The solicitud listing query selects the SolicitudRow fields in order."""
+        statement = SolicitudRepository(session)._list_statement()
+
+        assert [c.name for c in statement.selected_columns] == _field_names(SolicitudRow)
+
+
+class TestUserSnapshot:
+    """Tests for UserSnapshot."""
+
+    async def test_get_snapshot(self, session: AsyncSession, employee_user: User):
+        """The snapshot carries the user data without credentials."""
+        snapshot = await UserRepository(session).get_snapshot(employee_user.id)  # type: ignore
+
+        assert snapshot == UserSnapshot(
+            id=employee_user.id,  # type: ignore
+            email=employee_user.email,
+            full_name=employee_user.full_name,
+            role=employee_user.role,
+            is_active=employee_user.is_active,
+            dias_vacaciones_anuales=employee_user.dias_vacaciones_anuales,
+            dias_vacaciones_disponibles=employee_user.dias_vacaciones_disponibles,
+        )
+        assert not hasattr(snapshot, "hashed_password")
+
+    async def test_get_snapshot_missing_user(self, session: AsyncSession):
+        """A missing user returns None."""
+        assert await UserRepository(session).get_snapshot(999) is None
+
+    async def test_snapshot_is_frozen_and_slotted(self, session: AsyncSession, employee_user: User):
+        """Snapshots are immutable and have no per-instance __dict__."""
+        snapshot = await UserRepository(session).get_snapshot(employee_user.id)  # type: ignore
+
+        assert not hasattr(snapshot, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.email = "other@test.com"  # type: ignore
@@ -1,17 +1,20 @@
 """Tests para endpoints de solicitudes de vacaciones y ausencias."""
 
 from datetime import UTC, date, datetime, timedelta
+from functools import partial
 
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.absence_calendar import absence_calendar_cache
 from app.core.security import get_password_hash
 from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
 from app.models.user import User, UserRole
+from app.repositories.rows import AbsenceRow
 from app.repositories.user_repository import UserRepository
-from app.services.solicitud_service import calculate_business_days
+from app.services.solicitud_service import absences_by_day, calculate_business_days
 
 
 def get_today():
@@ -401,6 +404,24 @@ class TestListSolicitudes:
         assert data["total"] == 2
         assert len(data["solicitudes"]) == 2
 
+    async def test_list_my_solicitudes_serialization(
+        self,
+        authenticated_client: AsyncClient,
+        employee_solicitud_pending: Solicitud,
+        employee_user: User,
+    ):
+        """Los elementos del listado incluyen datos del usuario y fechas UTC con sufijo Z."""
+        response = await authenticated_client.get("/api/vacaciones/me")
+
+        assert response.status_code == status.HTTP_200_OK
+        item = response.json()["solicitudes"][0]
+        assert item["user_email"] == employee_user.email
+        assert item["user_full_name"] == employee_user.full_name
+        assert item["reviewed_by_name"] is None
+        assert item["reviewed_at"] is None
+        assert item["created_at"].endswith("Z")
+        assert item["is_pending"] is True
+
     async def test_list_my_solicitudes_filter_by_status(
         self,
         authenticated_client: AsyncClient,
@@ -452,6 +473,30 @@ class TestListSolicitudes:
         assert len(data["solicitudes"]) == 1
         assert data["skip"] == 0
         assert data["limit"] == 1
+        assert data["has_more"] is True
+
+    async def test_list_my_solicitudes_without_count(
+        self,
+        authenticated_client: AsyncClient,
+        employee_solicitud_pending: Solicitud,
+        employee_solicitud_approved: Solicitud,
+    ):
+        """Con count_strategy=none no se calcula el total, solo has_more."""
+        first = await authenticated_client.get(
+            "/api/vacaciones/me",
+            params={"skip": 0, "limit": 1, "count_strategy": "none"},
+        )
+        last = await authenticated_client.get(
+            "/api/vacaciones/me",
+            params={"skip": 1, "limit": 1, "count_strategy": "none"},
+        )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json()["total"] is None
+        assert first.json()["has_more"] is True
+        assert len(first.json()["solicitudes"]) == 1
+        assert last.json()["has_more"] is False
+        assert len(last.json()["solicitudes"]) == 1
 
 
 class TestGetSolicitud:
@@ -770,6 +815,335 @@ class TestReviewSolicitud:
         assert "propias solicitudes" in response.json()["detail"].lower()
 
 
+class TestBulkReviewSolicitudes:
+    """Tests para POST /api/vacaciones/bulk-review - Revisión masiva (HR)."""
+
+    @staticmethod
+    async def _pending(session: AsyncSession, user: User, offset: int, dias: int) -> Solicitud:
+        """Crea una solicitud de vacaciones pendiente."""
+        today = get_today()
+        solicitud = Solicitud(
+            user_id=user.id,
+            tipo=SolicitudTipo.VACATION,
+            fecha_inicio=today + timedelta(days=offset),
+            fecha_fin=today + timedelta(days=offset + dias - 1),
+            dias_solicitados=dias,
+            motivo="Vacaciones para revisión masiva",
+            status=SolicitudStatus.PENDING,
+        )
+        session.add(solicitud)
+        await session.commit()
+        await session.refresh(solicitud)
+        return solicitud
+
+    async def test_bulk_approve_groups_balance_decrement(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-V40: Aprobar varias solicitudes del mismo empleado descuenta la suma de días."""
+        balance_before = employee_user.dias_vacaciones_disponibles
+        first = await self._pending(session, employee_user, 10, 3)
+        second = await self._pending(session, employee_user, 20, 2)
+
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/bulk-review",
+            json={
+                "items": [
+                    {"solicitud_id": first.id, "approved": True},
+                    {"solicitud_id": second.id, "approved": True, "comentarios_revision": "OK"},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["approved"] == 2  # noqa: PLR2004
+        assert data["failed"] == 0
+        assert [r["status"] for r in data["results"]] == ["approved", "approved"]
+        assert all(r["version"] == 2 for r in data["results"])  # noqa: PLR2004
+
+        await session.refresh(employee_user)
+        assert employee_user.dias_vacaciones_disponibles == balance_before - 5
+        await session.refresh(second)
+        assert second.status == SolicitudStatus.APPROVED
+        assert second.comentarios_revision == "OK"
+
+    async def test_bulk_review_partial_failures(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+        hr_user: User,
+        employee_solicitud_approved: Solicitud,
+    ):
+        """TC-V41: Las decisiones inválidas se informan sin impedir el resto."""
+        balance_before = employee_user.dias_vacaciones_disponibles
+        rejected = await self._pending(session, employee_user, 40, 2)
+        approved = await self._pending(session, employee_user, 50, 1)
+        stale = await self._pending(session, employee_user, 60, 1)
+        own = await self._pending(session, hr_user, 10, 1)
+
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/bulk-review",
+            json={
+                "items": [
+                    {"solicitud_id": rejected.id, "approved": False},
+                    {"solicitud_id": 999999, "approved": True},
+                    {"solicitud_id": employee_solicitud_approved.id, "approved": False},
+                    {"solicitud_id": own.id, "approved": True},
+                    {"solicitud_id": stale.id, "approved": True, "version": 7},
+                    {"solicitud_id": approved.id, "approved": True},
+                    {"solicitud_id": rejected.id, "approved": True},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [(r["solicitud_id"], r["ok"], r["error"]) for r in data["results"]] == [
+            (rejected.id, True, None),
+            (999999, False, "not_found"),
+            (employee_solicitud_approved.id, False, "not_pending"),
+            (own.id, False, "own_request"),
+            (stale.id, False, "version_conflict"),
+            (approved.id, True, None),
+            (rejected.id, False, "duplicate"),
+        ]
+        assert (data["approved"], data["rejected"], data["failed"]) == (1, 1, 5)
+
+        # Solo se descuenta la aprobación válida; las fallidas no cambian
+        await session.refresh(employee_user)
+        assert employee_user.dias_vacaciones_disponibles == balance_before - 1
+        for solicitud in (stale, own):
+            await session.refresh(solicitud)
+            assert solicitud.status == SolicitudStatus.PENDING
+            assert solicitud.version == 1
+
+    async def test_employee_cannot_bulk_review(
+        self,
+        authenticated_client: AsyncClient,
+        employee_solicitud_pending: Solicitud,
+    ):
+        """TC-V42: Empleado no puede revisar en lote."""
+        response = await authenticated_client.post(
+            "/api/vacaciones/bulk-review",
+            json={"items": [{"solicitud_id": employee_solicitud_pending.id, "approved": True}]},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_bulk_review_requires_items(self, hr_authenticated_client: AsyncClient):
+        """TC-V43: El lote debe tener al menos una decisión."""
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/bulk-review", json={"items": []}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestAbsenceCalendar:
+    """Tests para GET /api/vacaciones/calendar - Calendario de ausencias (HR)."""
+
+    @pytest.fixture(autouse=True)
+    def _empty_calendar_cache(self):
+        """Cada test empieza con la caché del calendario vacía."""
+        absence_calendar_cache.clear()
+        yield
+        absence_calendar_cache.clear()
+
+    @staticmethod
+    async def _absence(
+        session: AsyncSession,
+        user: User,
+        fecha_inicio: date,
+        fecha_fin: date,
+        solicitud_status: SolicitudStatus,
+        tipo: SolicitudTipo = SolicitudTipo.VACATION,
+    ) -> Solicitud:
+        """Crea una solicitud con el estado indicado."""
+        solicitud = Solicitud(
+            user_id=user.id,
+            tipo=tipo,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            dias_solicitados=calculate_business_days(fecha_inicio, fecha_fin),
+            motivo="Ausencia para el calendario",
+            status=solicitud_status,
+        )
+        session.add(solicitud)
+        await session.commit()
+        await session.refresh(solicitud)
+        return solicitud
+
+    async def test_calendar_lists_absences_per_day(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-V44: El calendario lista aprobadas y pendientes por día, no rechazadas."""
+        approved = await self._absence(
+            session, employee_user, date(2026, 1, 28), date(2026, 2, 3), SolicitudStatus.APPROVED
+        )
+        pending = await self._absence(
+            session,
+            employee_user,
+            date(2026, 2, 2),
+            date(2026, 2, 2),
+            SolicitudStatus.PENDING,
+            SolicitudTipo.PERSONAL,
+        )
+        await self._absence(
+            session, employee_user, date(2026, 2, 2), date(2026, 2, 4), SolicitudStatus.REJECTED
+        )
+
+        response = await hr_authenticated_client.get(
+            "/api/vacaciones/calendar",
+            params={"fecha_desde": "2026-02-01", "fecha_hasta": "2026-02-04"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [a["solicitud_id"] for a in data["absences"]] == [approved.id, pending.id]
+        assert data["absences"][0]["user_full_name"] == employee_user.full_name
+        assert data["absences"][1]["tipo"] == "personal"
+        assert data["days"] == [
+            {"fecha": "2026-02-01", "solicitud_ids": [approved.id]},
+            {"fecha": "2026-02-02", "solicitud_ids": [approved.id, pending.id]},
+            {"fecha": "2026-02-03", "solicitud_ids": [approved.id]},
+            {"fecha": "2026-02-04", "solicitud_ids": []},
+        ]
+
+    async def test_calendar_without_pending(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-V45: Con include_pending=false solo aparecen las aprobadas."""
+        approved = await self._absence(
+            session, employee_user, date(2026, 3, 2), date(2026, 3, 3), SolicitudStatus.APPROVED
+        )
+        await self._absence(
+            session, employee_user, date(2026, 3, 3), date(2026, 3, 4), SolicitudStatus.PENDING
+        )
+
+        response = await hr_authenticated_client.get(
+            "/api/vacaciones/calendar",
+            params={
+                "fecha_desde": "2026-03-01",
+                "fecha_hasta": "2026-03-31",
+                "include_pending": "false",
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [a["solicitud_id"] for a in data["absences"]] == [approved.id]
+        assert len(data["days"]) == 31  # noqa: PLR2004
+        assert data["days"][3] == {"fecha": "2026-03-04", "solicitud_ids": []}
+
+    async def test_calendar_cache_invalidated_on_review(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-V46: Revisar una solicitud invalida los meses cacheados que toca."""
+        today = get_today()
+        fecha_inicio = today + timedelta(days=10)
+        solicitud = await self._absence(
+            session, employee_user, fecha_inicio, fecha_inicio, SolicitudStatus.PENDING
+        )
+        params = {"fecha_desde": fecha_inicio.isoformat(), "fecha_hasta": fecha_inicio.isoformat()}
+
+        first = await hr_authenticated_client.get("/api/vacaciones/calendar", params=params)
+        assert [a["solicitud_id"] for a in first.json()["absences"]] == [solicitud.id]
+        assert absence_calendar_cache.get((fecha_inicio.year, fecha_inicio.month)) is not None
+
+        response = await hr_authenticated_client.post(
+            f"/api/vacaciones/{solicitud.id}/review",
+            json={"approved": False, "comentarios_revision": "Coincide con el cierre"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        await session.commit()
+
+        second = await hr_authenticated_client.get("/api/vacaciones/calendar", params=params)
+        assert second.json()["absences"] == []
+
+    async def test_calendar_served_from_cache(
+        self,
+        hr_authenticated_client: AsyncClient,
+        session: AsyncSession,
+        employee_user: User,
+    ):
+        """TC-V47: Un mes ya consultado se sirve de la caché hasta que se invalida."""
+        solicitud = await self._absence(
+            session, employee_user, date(2026, 4, 6), date(2026, 4, 7), SolicitudStatus.PENDING
+        )
+        params = {"fecha_desde": "2026-04-01", "fecha_hasta": "2026-04-30"}
+        await hr_authenticated_client.get("/api/vacaciones/calendar", params=params)
+
+        # Cambio sin pasar por el servicio: la caché no se entera
+        solicitud.status = SolicitudStatus.CANCELLED
+        await session.commit()
+        cached = await hr_authenticated_client.get("/api/vacaciones/calendar", params=params)
+        assert [a["solicitud_id"] for a in cached.json()["absences"]] == [solicitud.id]
+
+        absence_calendar_cache.discard([(2026, 4)])
+        fresh = await hr_authenticated_client.get("/api/vacaciones/calendar", params=params)
+        assert fresh.json()["absences"] == []
+
+    async def test_calendar_invalid_range(self, hr_authenticated_client: AsyncClient):
+        """TC-V48: El rango debe estar ordenado y no superar 366 días."""
+        reversed_range = await hr_authenticated_client.get(
+            "/api/vacaciones/calendar",
+            params={"fecha_desde": "2026-02-10", "fecha_hasta": "2026-02-01"},
+        )
+        too_long = await hr_authenticated_client.get(
+            "/api/vacaciones/calendar",
+            params={"fecha_desde": "2026-01-01", "fecha_hasta": "2027-01-02"},
+        )
+
+        assert reversed_range.status_code == status.HTTP_400_BAD_REQUEST
+        assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_calendar_employee_forbidden(self, authenticated_client: AsyncClient):
+        """TC-V49: Un empleado no puede consultar el calendario del equipo."""
+        response = await authenticated_client.get(
+            "/api/vacaciones/calendar",
+            params={"fecha_desde": "2026-02-01", "fecha_hasta": "2026-02-28"},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_absences_by_day_clips_to_range(self):
+        """TC-V50: El barrido recorta las ausencias al rango y respeta el orden de inicio."""
+        row = partial(
+            AbsenceRow,
+            user_id=1,
+            user_full_name="Empleado",
+            tipo=SolicitudTipo.VACATION,
+            status=SolicitudStatus.APPROVED,
+        )
+        absences = [
+            row(solicitud_id=2, fecha_inicio=date(2026, 5, 3), fecha_fin=date(2026, 5, 3)),
+            row(solicitud_id=1, fecha_inicio=date(2026, 4, 20), fecha_fin=date(2026, 5, 2)),
+            row(solicitud_id=3, fecha_inicio=date(2026, 6, 1), fecha_fin=date(2026, 6, 5)),
+        ]
+
+        days = absences_by_day(absences, date(2026, 5, 1), date(2026, 5, 4))
+
+        assert days == [
+            (date(2026, 5, 1), (1,)),
+            (date(2026, 5, 2), (1,)),
+            (date(2026, 5, 3), (2,)),
+            (date(2026, 5, 4), ()),
+        ]
+
+
 class TestVacationBalance:
     """Tests para balance de vacaciones."""
 
@@ -905,6 +1279,36 @@ class TestHRListSolicitudes:
         data = response.json()
         assert all(s["status"] == "pending" for s in data["solicitudes"])
 
+    async def test_hr_list_estimated_count_falls_back_to_exact(
+        self,
+        hr_authenticated_client: AsyncClient,
+        employee_solicitud_pending: Solicitud,
+        other_employee_solicitud: Solicitud,
+    ):
+        """Sin PostgreSQL la estimación se sustituye por el conteo exacto."""
+        response = await hr_authenticated_client.get(
+            "/api/vacaciones/pending",
+            params={"count_strategy": "estimated", "limit": 1},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 2
+        assert data["total_estimated"] is False
+        assert data["has_more"] is True
+
+    async def test_hr_list_invalid_count_strategy(
+        self,
+        hr_authenticated_client: AsyncClient,
+    ):
+        """Una estrategia de conteo desconocida devuelve 422."""
+        response = await hr_authenticated_client.get(
+            "/api/vacaciones/",
+            params={"count_strategy": "approximate"},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     async def test_hr_filter_by_user(
         self,
         hr_authenticated_client: AsyncClient,
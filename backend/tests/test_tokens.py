@@ -0,0 +1,171 @@
+"""Tests for the JWT token service."""
+
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from jwt.utils import base64url_encode
+
+from app.core.tokens import TokenKey, TokenService
+
+CURRENT_SECRET = "current-secret-for-tests-0123456789abcdef"
+PREVIOUS_SECRET = "previous-secret-for-tests-0123456789abcdef"
+
+
+def _service(**kwargs) -> TokenService:
+    """Token service signing with the current HS256 key."""
+    key = TokenKey.load("current", "HS256", CURRENT_SECRET, signing=True)
+    return TokenService(key, **kwargs)
+
+
+def _previous_key() -> TokenKey:
+    """Verification-only key from a previous rotation."""
+    return TokenKey.load("previous", "HS256", PREVIOUS_SECRET, signing=False)
+
+
+class TestTokenService:
+    """Tests for signing and verification."""
+
+    def test_roundtrip_sets_kid(self):
+        """Tokens carry the kid of the signing key and decode to their claims."""
+        service = _service()
+
+        token = service.encode({"sub": "1"}, timedelta(minutes=5))
+
+        assert jwt.get_unverified_header(token)["kid"] == "current"
+        assert service.decode(token)["sub"] == "1"
+
+    def test_previous_key_still_verifies(self):
+        """Tokens signed with a rotated-out key verify while it is configured."""
+        old = TokenService(TokenKey.load("previous", "HS256", PREVIOUS_SECRET, signing=True))
+        token = old.encode({"sub": "1"}, timedelta(minutes=5))
+
+        assert _service(verification_keys=[_previous_key()]).decode(token)["sub"] == "1"
+        with pytest.raises(jwt.InvalidTokenError):
+            _service().decode(token)
+
+    def test_token_without_kid_uses_current_key(self):
+        """Tokens issued before kid headers are verified with the current key."""
+        token = jwt.encode({"sub": "1", "exp": 9_999_999_999}, CURRENT_SECRET, algorithm="HS256")
+
+        assert _service().decode(token)["sub"] == "1"
+
+    @pytest.mark.parametrize(
+        "header",
+        [b'{"alg":"HS256","kid":["x"]}', b'{"alg":"HS256","kid":{"a":1}}', b'["x"]', b"{", b"\xff"],
+    )
+    def test_malformed_header_with_several_keys(self, header: bytes):
+        """A forged header (non-string kid, non-object header) is a DecodeError, not a crash."""
+        service = _service(verification_keys=[_previous_key()])
+        token = b".".join([base64url_encode(header), base64url_encode(b"{}"), b"sig"]).decode()
+
+        with pytest.raises(jwt.DecodeError):
+            service.decode(token)
+
+    def test_algorithm_is_pinned_by_key(self):
+        """A token using another algorithm is rejected even with the right secret."""
+        token = jwt.encode(
+            {"sub": "1", "exp": 9_999_999_999},
+            CURRENT_SECRET,
+            algorithm="HS512",
+            headers={"kid": "current"},
+        )
+
+        with pytest.raises(jwt.InvalidAlgorithmError):
+            _service().decode(token)
+
+    def test_exp_is_required(self):
+        """Tokens without expiration are rejected."""
+        token = jwt.encode({"sub": "1"}, CURRENT_SECRET, algorithm="HS256")
+
+        with pytest.raises(jwt.MissingRequiredClaimError):
+            _service().decode(token)
+
+    def test_expired_token(self):
+        """Expired tokens raise ExpiredSignatureError."""
+        service = _service()
+        token = service.encode({"sub": "1"}, timedelta(minutes=-1))
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            service.decode(token)
+
+
+class TestTokenCache:
+    """Tests for the verified-token cache."""
+
+    def test_repeat_decode_skips_verification(self, monkeypatch: pytest.MonkeyPatch):
+        """A cached token is not verified again."""
+        service = _service()
+        token = service.encode({"sub": "1"}, timedelta(minutes=5))
+        service.decode(token)
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError
+
+        monkeypatch.setattr(service._decoder, "decode", fail)
+
+        assert service.decode(token)["sub"] == "1"
+
+    def test_cached_claims_are_copies(self):
+        """Mutating returned claims does not alter the cache."""
+        service = _service()
+        token = service.encode({"sub": "1"}, timedelta(minutes=5))
+
+        service.decode(token)["sub"] = "2"
+
+        assert service.decode(token)["sub"] == "1"
+
+    def test_cache_never_outlives_exp(self):
+        """A cached token still expires at its exp."""
+        service = _service(cache_ttl=3600)
+        token = service.encode({"sub": "1"}, timedelta(minutes=1))
+
+        claims = service.decode(token)
+
+        assert service._cache[token][1] == claims["exp"]
+
+    def test_cache_is_bounded(self):
+        """The cache does not grow past its maximum size."""
+        service = _service(cache_max_size=2)
+        for user_id in range(5):
+            service.decode(service.encode({"sub": str(user_id)}, timedelta(minutes=5)))
+
+        assert len(service._cache) == 2  # noqa: PLR2004
+
+
+class TestAsymmetricKeys:
+    """Tests for asymmetric keys (require pyjwt[crypto])."""
+
+    def test_rs256_roundtrip_and_jwks(self):
+        """RS256 tokens verify with the published public key."""
+        pytest.importorskip("cryptography")
+        from cryptography.hazmat.primitives import serialization  # noqa: PLC0415
+        from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: PLC0415
+
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        service = TokenService(TokenKey.load("rsa-1", "RS256", pem, signing=True))
+        token = service.encode({"sub": "1"}, timedelta(minutes=5))
+
+        (jwk,) = service.jwks()["keys"]
+        assert jwk["kid"] == "rsa-1"
+        assert "d" not in jwk
+        public_key = jwt.PyJWK(jwk).key
+        assert jwt.decode(token, public_key, algorithms=["RS256"])["sub"] == "1"
+
+
+class TestJWKSEndpoint:
+    """Tests for GET /api/auth/jwks."""
+
+    async def test_hmac_keys_are_not_published(self, client: AsyncClient):
+        """With HS256 the JWKS is empty."""
+        response = await client.get("/api/auth/jwks")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"keys": []}
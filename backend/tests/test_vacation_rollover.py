@@ -0,0 +1,330 @@
+"""Tests for the year-end vacation balance rollover."""
+
+from datetime import UTC, date, datetime
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.exceptions import BadRequestException, ConflictException
+from app.jobs import JobRunner, job_registry
+from app.models.job import Job, JobStatus
+from app.models.solicitud import Solicitud, SolicitudStatus, SolicitudTipo
+from app.models.user import User
+from app.models.vacation_rollover import (
+    VacationRollover,
+    VacationRolloverEntry,
+    VacationRolloverStatus,
+)
+from app.services.job_service import JobService
+from app.services.vacation_rollover_service import VacationRolloverService
+
+YEAR = datetime.now(UTC).year - 1
+
+# Balance al cerrar el año -> balance esperado con el tope por defecto (5 días)
+EXPECTED = {
+    "saver@test.com": (10.0, 29.0),  # arrastra 5, pierde 5
+    "spender@test.com": (3.0, 27.0),  # arrastra 3
+    "borrower@test.com": (-2.0, 22.0),  # deuda de 2 días
+    "planner@test.com": (4.0, 26.0),  # 4 + 3 ya aprobados para enero: arrastra 5, resta 3
+}
+
+
+async def _seed(session: AsyncSession) -> dict[str, User]:
+    """Users covering cap, below cap, debt and next-year approved vacations."""
+    users = {
+        email: User(
+            email=email,
+            full_name=email.split("@")[0].title(),
+            hashed_password="x",
+            dias_vacaciones_anuales=24,
+            dias_vacaciones_disponibles=before,
+        )
+        for email, (before, _) in EXPECTED.items()
+    }
+    session.add_all(users.values())
+    await session.flush()
+
+    def solicitud(user: User, start: date, end: date, dias: int, state: SolicitudStatus):
+        return Solicitud(
+            user_id=user.id,
+            tipo=SolicitudTipo.VACATION,
+            fecha_inicio=start,
+            fecha_fin=end,
+            dias_solicitados=dias,
+            motivo="Vacaciones de enero",
+            status=state,
+        )
+
+    next_january = date(YEAR + 1, 1, 12)
+    session.add_all(
+        [
+            solicitud(
+                users["planner@test.com"],
+                next_january,
+                date(YEAR + 1, 1, 14),
+                3,
+                SolicitudStatus.APPROVED,
+            ),
+            # Pendiente: todavía no se descontó, no cuenta
+            solicitud(
+                users["spender@test.com"],
+                next_january,
+                date(YEAR + 1, 1, 13),
+                2,
+                SolicitudStatus.PENDING,
+            ),
+        ]
+    )
+    await session.commit()
+    return users
+
+
+async def _balances(session: AsyncSession) -> dict[str, float]:
+    """Current balance per email, read from the database."""
+    result = await session.execute(select(User.email, User.dias_vacaciones_disponibles))
+    return dict(result.tuples().all())
+
+
+# ============================================================================
+# DRY-RUN
+# ============================================================================
+
+
+class TestRolloverPreview:
+    """Tests for the dry-run report."""
+
+    async def test_preview_totals(self, session: AsyncSession):
+        """The report aggregates carry-over, forfeits, debt and next-year days."""
+        await _seed(session)
+
+        report = await VacationRolloverService(session).preview(YEAR)
+
+        assert report.dry_run
+        assert report.users == len(EXPECTED)
+        assert report.users_capped == 2  # noqa: PLR2004
+        assert report.users_with_debt == 1
+        assert report.total_carried == 5 + 3 - 2 + 5
+        assert report.total_forfeited == 5 + 2
+        assert report.total_future_days == 3  # noqa: PLR2004
+
+    async def test_preview_writes_nothing(self, session: AsyncSession):
+        """A dry run leaves balances and audit tables untouched."""
+        await _seed(session)
+
+        await VacationRolloverService(session).preview(YEAR)
+
+        assert await _balances(session) == {e: before for e, (before, _) in EXPECTED.items()}
+        assert (await session.execute(select(func.count(VacationRollover.id)))).scalar() == 0
+
+    async def test_ratio_cap(self, session: AsyncSession):
+        """A ratio cap limits carry-over to a fraction of the annual days."""
+        await _seed(session)
+
+        report = await VacationRolloverService(session).preview(YEAR, max_carryover_ratio=0.1)
+
+        # Tope = min(5, 24 * 0.1) = 2.4
+        assert report.total_carried == pytest.approx(2.4 + 2.4 - 2 + 2.4)
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+
+class TestRolloverRun:
+    """Tests for applying the rollover."""
+
+    async def test_run_applies_balances_and_audit(self, session: AsyncSession):
+        """Balances are rolled over and every user gets an audit entry."""
+        users = await _seed(session)
+
+        rollover = await VacationRolloverService(session).run(YEAR, batch_size=3)
+
+        assert await _balances(session) == {e: after for e, (_, after) in EXPECTED.items()}
+        assert rollover.status == VacationRolloverStatus.COMPLETED
+        assert rollover.users_processed == len(EXPECTED)
+        assert rollover.total_carried == 11  # noqa: PLR2004
+        assert rollover.total_forfeited == 7  # noqa: PLR2004
+
+        entries = (
+            (
+                await session.execute(
+                    select(VacationRolloverEntry).where(
+                        VacationRolloverEntry.user_id == users["planner@test.com"].id
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [
+            (e.balance_before, e.future_days, e.carried_over, e.forfeited) for e in entries
+        ] == [(4.0, 3.0, 5.0, 2.0)]
+
+    async def test_run_is_idempotent_per_year(self, session: AsyncSession):
+        """A year can only be closed once."""
+        await _seed(session)
+        service = VacationRolloverService(session)
+        await service.run(YEAR)
+
+        with pytest.raises(ConflictException):
+            await service.run(YEAR)
+        with pytest.raises(ConflictException):
+            await service.preview(YEAR)
+        assert await _balances(session) == {e: after for e, (_, after) in EXPECTED.items()}
+
+    async def test_interrupted_run_resumes(self, session: AsyncSession):
+        """Re-running an interrupted rollover continues after the last committed batch."""
+        await _seed(session)
+        service = VacationRolloverService(session)
+        rollover = await service.start(YEAR)
+        await service.apply_next_batch(rollover, batch_size=2)
+        await session.commit()
+
+        rollover = await VacationRolloverService(session).run(YEAR, batch_size=2)
+
+        assert rollover.users_processed == len(EXPECTED)
+        assert await _balances(session) == {e: after for e, (_, after) in EXPECTED.items()}
+        count = select(func.count(VacationRolloverEntry.id))
+        assert (await session.execute(count)).scalar() == len(EXPECTED)
+
+    async def test_resume_with_other_caps_conflicts(self, session: AsyncSession):
+        """An interrupted rollover must be resumed with the caps it started with."""
+        await _seed(session)
+        service = VacationRolloverService(session)
+        await service.start(YEAR, max_carryover_days=5)
+        await session.commit()
+
+        with pytest.raises(ConflictException):
+            await service.start(YEAR, max_carryover_days=10)
+
+    async def test_cannot_close_unfinished_or_older_years(self, session: AsyncSession):
+        """The current year, future years and years before the last closed one are rejected."""
+        await _seed(session)
+        service = VacationRolloverService(session)
+
+        with pytest.raises(BadRequestException):
+            await service.preview(YEAR + 1)
+        with pytest.raises(BadRequestException):
+            await service.preview(YEAR + 2)
+
+        await service.run(YEAR)
+        with pytest.raises(ConflictException):
+            await service.preview(YEAR - 1)
+
+    async def test_rollover_job(self, file_session_maker: async_sessionmaker[AsyncSession]):
+        """The vacaciones.rollover job runs the rollover in batches with progress."""
+        async with file_session_maker() as session:
+            await _seed(session)
+            job = await JobService(session).enqueue(
+                "vacaciones.rollover", payload={"year": YEAR, "batch_size": 1}
+            )
+            await session.commit()
+
+        await JobRunner(file_session_maker, job_registry, concurrency=1).run_pending()
+
+        async with file_session_maker() as session:
+            job = await session.get(Job, job.id)
+            assert job is not None
+            assert job.status == JobStatus.SUCCEEDED
+            assert job.progress_message == f"{len(EXPECTED)}/{len(EXPECTED)} usuarios"
+            assert job.result is not None
+            assert job.result["users_processed"] == len(EXPECTED)
+            assert await _balances(session) == {e: after for e, (_, after) in EXPECTED.items()}
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+
+class TestRolloverAPI:
+    """Tests for the /api/vacaciones/rollover endpoints."""
+
+    async def test_preview_endpoint(self, hr_authenticated_client: AsyncClient, session):
+        """HR gets the dry-run report."""
+        await _seed(session)
+
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/rollover/preview", json={"year": YEAR}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["dry_run"] is True
+        assert data["users"] == len(EXPECTED) + 1  # + el usuario HR
+        assert data["max_carryover_days"] == 5  # noqa: PLR2004
+
+    async def test_employee_cannot_preview(self, authenticated_client: AsyncClient):
+        """The rollover is HR only."""
+        response = await authenticated_client.post(
+            "/api/vacaciones/rollover/preview", json={"year": YEAR}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_run_endpoint_enqueues_job(
+        self, hr_authenticated_client: AsyncClient, hr_user: User
+    ):
+        """Running the rollover enqueues a background job with the resolved caps."""
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/rollover", json={"year": YEAR, "max_carryover_ratio": 0.25}
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()
+        assert data["kind"] == "vacaciones.rollover"
+        assert data["payload"] == {
+            "year": YEAR,
+            "max_carryover_days": 5.0,
+            "max_carryover_ratio": 0.25,
+            "executed_by": hr_user.id,
+        }
+
+    async def test_run_endpoint_rejects_closed_year(
+        self, hr_authenticated_client: AsyncClient, session: AsyncSession
+    ):
+        """A closed year returns 409 instead of enqueuing a job."""
+        await _seed(session)
+        await VacationRolloverService(session).run(YEAR)
+
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/rollover", json={"year": YEAR}
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    async def test_run_endpoint_rejects_current_year(self, hr_authenticated_client: AsyncClient):
+        """The year in progress cannot be closed until it ends (400, no job)."""
+        response = await hr_authenticated_client.post(
+            "/api/vacaciones/rollover", json={"year": YEAR + 1}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "antes de que termine" in response.json()["detail"]
+
+    async def test_get_rollover_and_entries(
+        self, hr_authenticated_client: AsyncClient, session: AsyncSession
+    ):
+        """The rollover summary and its per-user audit trail are exposed."""
+        response = await hr_authenticated_client.get(f"/api/vacaciones/rollover/{YEAR}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        await _seed(session)
+        await VacationRolloverService(session).run(YEAR)
+
+        response = await hr_authenticated_client.get(f"/api/vacaciones/rollover/{YEAR}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "completed"
+
+        response = await hr_authenticated_client.get(
+            f"/api/vacaciones/rollover/{YEAR}/entries", params={"limit": 2}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == len(EXPECTED) + 1
+        assert len(data["entries"]) == 2  # noqa: PLR2004
+        assert data["has_more"] is True